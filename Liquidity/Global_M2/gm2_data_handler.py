@@ -10,9 +10,12 @@ Date: February 2026
 
 import sys
 import os
+import time
+import random
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Setup paths
 fdel = os.path.sep
@@ -129,6 +132,279 @@ def identify_outliers(series: pd.Series, method: str = 'iqr', threshold: float =
     
     return outlier_info     
 
+def ffill_columns(values: np.ndarray) -> np.ndarray:
+    """Forward fill NaNs down the columns of a 2D array (vectorized, leading NaNs stay NaN)."""
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(values, rows, axis=0)
+    filled[~np.logical_or.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+OUTLIER_METHODS = ('iqr', 'zscore', 'pct_change', 'magnitude', 'mad')
+
+def rolling_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """(rows x columns x window) view of the centered windows over the rows of a 2D array, NaN padded at the ends."""
+    half = window // 2
+    padded = np.pad(values, ((half, window - 1 - half), (0, 0)), constant_values=np.nan)
+    return np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+
+def nan_quantiles(values: np.ndarray, qs) -> list:
+    """Quantiles over the last axis ignoring NaNs (linear interpolation, as np.nanquantile / pd.Series.quantile),
+    one array per q in qs. Sorts once for all the quantiles, NaN where there are no valid values."""
+    ordered = np.sort(values, axis=-1)                  # NaNs sort to the end
+    n = (~np.isnan(ordered)).sum(axis=-1)
+    results = []
+    for q in qs:
+        pos = q * np.maximum(n - 1, 0)
+        lo = np.floor(pos).astype(int)
+        hi = np.ceil(pos).astype(int)
+        low = np.take_along_axis(ordered, lo[..., None], axis=-1)[..., 0]
+        high = np.take_along_axis(ordered, hi[..., None], axis=-1)[..., 0]
+        with np.errstate(invalid='ignore'):
+            result = low + (high - low) * (pos - lo)
+        result[n == 0] = np.nan
+        results.append(result)
+    return results
+
+def _nan_mean_std(values: np.ndarray):
+    """Mean and sample std (ddof=1) over the last axis ignoring NaNs, without the empty slice warnings."""
+    n = (~np.isnan(values)).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(values, axis=-1) / n
+        std = np.sqrt(np.nansum((values - mean[..., None]) ** 2, axis=-1) / (n - 1))
+    return mean, std
+
+def detect_outliers(values: np.ndarray, methods=('iqr',), window: int = None, threshold: float = 3.0,
+                    z_score_threshold: float = 3.0, iqr_multiplier: float = 1.5,
+                    pct_change_threshold: float = None) -> np.ndarray:
+    """
+    Run several outlier detection methods over every column of a (dates x countries) array at once.
+    
+    Parameters:
+    -----------
+    values : np.ndarray
+        (dates x countries) values, NaN where missing
+    methods : list
+        Any of 'iqr', 'zscore', 'pct_change', 'magnitude' (as in identify_outliers) and 'mad'
+    window : int or None
+        Centered rolling window (rows) for the iqr/zscore statistics. None uses each column's full sample
+        like identify_outliers. 'mad' always uses a rolling window (13 if None).
+    threshold : float
+        Level above which 'magnitude' flags a value
+    z_score_threshold : float
+        Cut-off for 'zscore' and for the robust z-score 0.6745 * (x - median) / MAD of 'mad'
+    iqr_multiplier : float
+        Multiplier for 'iqr'
+    pct_change_threshold : float
+        % change vs. the previous value above which 'pct_change' flags a value
+        
+    Returns:
+    --------
+    np.ndarray
+        (methods x dates x countries) bool mask, layer k holds the points flagged by methods[k]
+    """
+    unknown = [m for m in methods if m not in OUTLIER_METHODS]
+    if unknown:
+        raise ValueError(f"Unknown method(s): {unknown}. Use {', '.join(OUTLIER_METHODS)}")
+    if 'pct_change' in methods and pct_change_threshold is None:
+        raise ValueError("pct_change_threshold must be specified for 'pct_change' method")
+    
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    mask = np.zeros((len(methods),) + values.shape, dtype=bool)
+    windows = rolling_windows(values, window) if window else None
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for k, method in enumerate(methods):
+            if method == 'iqr':
+                Q1, Q3 = nan_quantiles(windows if window else values.T, (0.25, 0.75))
+                IQR = Q3 - Q1
+                flagged = (values < Q1 - iqr_multiplier * IQR) | (values > Q3 + iqr_multiplier * IQR)
+            elif method == 'zscore':
+                mean, std = _nan_mean_std(windows if window else values.T)
+                flagged = (std > 0) & (np.abs(values - mean) / std > z_score_threshold)
+            elif method == 'pct_change':
+                previous = np.vstack([np.full((1, values.shape[1]), np.nan), ffill_columns(values)[:-1]])
+                flagged = np.abs(values / previous - 1) * 100 > pct_change_threshold
+            elif method == 'magnitude':
+                flagged = values > threshold
+            elif method == 'mad':
+                mad_windows = windows if window else rolling_windows(values, 13)
+                median, = nan_quantiles(mad_windows, (0.5,))
+                mad, = nan_quantiles(np.abs(mad_windows - median[..., None]), (0.5,))
+                flagged = (mad > 0) & (0.6745 * np.abs(values - median) / mad > z_score_threshold)
+            mask[k] = flagged & valid
+    return mask
+
+def interpolate_flagged(values: np.ndarray, flags: np.ndarray) -> np.ndarray:
+    """
+    Replace the flagged points of each column with a linear interpolation (by row position) between the nearest
+    valid unflagged values on either side, or the nearest one at the ends of the column. Vectorized over all columns,
+    points that aren't flagged are returned unchanged.
+    """
+    keep = ~np.isnan(values) & ~flags
+    n = values.shape[0]
+    rows = np.arange(n)[:, None]
+    prev = np.maximum.accumulate(np.where(keep, rows, -1), axis=0)
+    nxt = np.minimum.accumulate(np.where(keep, rows, n)[::-1], axis=0)[::-1]
+    has_prev, has_next = prev >= 0, nxt < n
+    prev_vals = np.take_along_axis(values, np.clip(prev, 0, n - 1), axis=0)
+    next_vals = np.take_along_axis(values, np.clip(nxt, 0, n - 1), axis=0)
+    
+    weight = (rows - prev) / np.maximum(nxt - prev, 1)
+    filled = np.where(has_prev & has_next, prev_vals + (next_vals - prev_vals) * weight,
+                      np.where(has_prev, prev_vals, next_vals))
+    filled[~(has_prev | has_next)] = np.nan
+    return np.where(flags, filled, values)
+
+
+class CountryMatrix:
+    """
+    All country M2_USD series aligned once onto their shared (union) monthly index as one dense
+    float matrix, so that aggregates are matrix products with a 0/1 (or weight) vector per aggregate.
+    
+    Attributes:
+    -----------
+    index : pd.DatetimeIndex
+        Union of all the countries' dates
+    countries : list
+        Column order of the matrix
+    values : np.ndarray
+        (dates x countries) M2_USD values, NaN where a country has no value
+    present : np.ndarray
+        (dates x countries) bool, True where the date is in that country's index (even if the value is NaN)
+    starts, ends : np.ndarray
+        First and last date of each country's index
+    
+    When series_dict only holds the recent tail of each series (see Global_M2.update_aggregates), pass the
+    first date of each country's full history as starts so the aggregate windows stay the same.
+    """
+    def __init__(self, series_dict: dict, starts: dict = None):
+        self.countries = list(series_dict.keys())
+        self.columns = {country: j for j, country in enumerate(self.countries)}
+        indexes = [pd.DatetimeIndex(series.index) for series in series_dict.values()]
+        self.index = pd.DatetimeIndex(np.unique(np.concatenate([ix.values for ix in indexes]))) if indexes else pd.DatetimeIndex([])
+        
+        self.values = np.full((len(self.index), len(self.countries)), np.nan)
+        self.present = np.zeros(self.values.shape, dtype=bool)
+        for j, (ix, series) in enumerate(zip(indexes, series_dict.values())):
+            pos = self.index.get_indexer(ix)
+            self.values[pos, j] = pd.to_numeric(pd.Series(np.asarray(series)), errors='coerce').to_numpy(dtype=float)
+            self.present[pos, j] = True
+        starts = starts or {}
+        self.starts = np.array([pd.Timestamp(starts.get(country, ix[0])).to_datetime64()
+                                for country, ix in zip(self.countries, indexes)], dtype='datetime64[ns]')
+        self.ends = np.array([ix[-1].to_datetime64() for ix in indexes], dtype='datetime64[ns]')
+        self.valid = ~np.isnan(self.values)
+        self.filled_zero = np.where(self.valid, self.values, 0.0)
+    
+    def weights(self, definitions: dict) -> np.ndarray:
+        """(countries x aggregates) 0/1 matrix for {aggregate name: country list} (countries not in the matrix are ignored)."""
+        W = np.zeros((len(self.countries), len(definitions)))
+        for k, countries in enumerate(definitions.values()):
+            cols = [self.columns[c] for c in countries if c in self.columns]
+            W[cols, k] = 1.0
+        return W
+    
+    def aggregate(self, definitions: dict, use_ffill: bool = True) -> dict:
+        """
+        Build the aggregates for {name: country list} in one go.
+        
+        Each aggregate covers the dates any of its countries has, from the latest start to the earliest end of
+        its countries. Missing values count as 0 in the sum, the ffill version forward fills each country within
+        that window first.
+        
+        Returns:
+        --------
+        dict
+            {name: (aggregate, aggregate_ffill or None, coverage)}, coverage being the number of countries with a
+            value at each date
+        """
+        W = self.weights(definitions)
+        sums = self.filled_zero @ W                     # All raw aggregates in one product.
+        counts = self.valid.astype(float) @ W
+        in_agg = (self.present.astype(float) @ W) > 0
+        dates = self.index.values
+        
+        results = {}
+        for k, name in enumerate(definitions.keys()):
+            cols = np.flatnonzero(W[:, k])
+            if len(cols) == 0:
+                continue
+            rows = in_agg[:, k] & (dates >= self.starts[cols].max()) & (dates <= self.ends[cols].min())
+            index = self.index[rows]
+            aggregate = pd.Series(sums[rows, k], index=index, name=f'{name}_M2_USD')
+            coverage = pd.Series(counts[rows, k].astype(int), index=index, name=f'{name}_coverage')
+            aggregate_ffill = None
+            if use_ffill:
+                window = ffill_columns(self.values[np.ix_(rows, cols)])
+                aggregate_ffill = pd.Series(np.nan_to_num(window) @ W[cols, k], index=index, name=f'{name}_M2_USD_ffill')
+            results[name] = (aggregate, aggregate_ffill, coverage)
+        return results
+
+
+class OutlierMask:
+    """
+    Outliers flagged by detect_outliers across the country matrix, kept per method so every change made by
+    Global_M2.clean_outliers can be traced back to the method(s) that flagged it.
+    
+    Attributes:
+    -----------
+    methods : list
+        Detection methods, the first axis of mask
+    mask : np.ndarray
+        (methods x dates x countries) bool
+    index : pd.DatetimeIndex
+        Dates of the mask rows
+    countries : list
+        Countries of the mask columns
+    """
+    def __init__(self, methods, mask: np.ndarray, index: pd.DatetimeIndex, countries: list):
+        self.methods = list(methods)
+        self.mask = mask
+        self.index = index
+        self.countries = list(countries)
+    
+    @property
+    def combined(self) -> np.ndarray:
+        """(dates x countries) bool, flagged by any method."""
+        return self.mask.any(axis=0)
+    
+    def method_mask(self, method: str) -> pd.DataFrame:
+        """The points flagged by one method as a dates x countries DataFrame."""
+        return pd.DataFrame(self.mask[self.methods.index(method)], index=self.index, columns=self.countries)
+    
+    def flagged(self, values: np.ndarray = None) -> pd.DataFrame:
+        """
+        Audit table with one row per flagged point: date, country, original value (if values given)
+        and one bool column per method.
+        """
+        rows, cols = np.nonzero(self.combined)
+        table = pd.DataFrame({'date': self.index[rows], 'country': np.array(self.countries, dtype=object)[cols]})
+        if values is not None:
+            table['value'] = values[rows, cols]
+        for k, method in enumerate(self.methods):
+            table[method] = self.mask[k, rows, cols]
+        return table
+    
+    def report(self, values: np.ndarray) -> dict:
+        """Per country outlier info in the identify_outliers format, plus 'outlier_methods' (methods per outlier)."""
+        combined = self.combined
+        report = {}
+        for j, country in enumerate(self.countries):
+            rows = np.flatnonzero(combined[:, j])
+            report[country] = {
+                'outlier_indices': list(self.index[rows]),
+                'outlier_dates': [str(date) for date in self.index[rows]],
+                'outlier_values': values[rows, j].tolist(),
+                'outlier_methods': [[m for k, m in enumerate(self.methods) if self.mask[k, row, j]] for row in rows],
+                'method_used': ', '.join(self.methods)
+            }
+        return report
+
+
 ################## Class Definition ##################
 class Global_M2:
     """
@@ -164,6 +440,7 @@ class Global_M2:
         self.data_dict = {}
         self.tv = None
         self.failed_downloads = []
+        self.download_report = {}
         
         # Aggregate definitions
         self.aggregates = {
@@ -174,6 +451,9 @@ class Global_M2:
             'Top8': None
         }
         self.aggregate_series = {}
+        self.aggregate_coverage = {}
+        self._matrix_cache = None
+        self.outlier_mask = None
         
         # Load the country list configuration
         self._load_country_list()
@@ -197,9 +477,18 @@ class Global_M2:
         except Exception as e:
             raise Exception(f"Error loading country list: {str(e)}")
     
-    def download_data(self, n_bars=500, countries=None):
+    def download_data(self, n_bars=500, countries=None, max_workers=8, attempts=3, timeout=60, backoff=2.0,
+                      resume=False, filename='global_m2_data.h5', fetcher=None):
         """
-        Download M2 and FX data for specified countries.
+        Download M2 and FX data for specified countries, several countries at a time.
+        
+        Pulls go through the shared tvDatafeedz session pool (persistent websockets with event based
+        timeouts, safe to use from worker threads).
+        Each pull is retried with exponential backoff, a country that still fails is reported in
+        self.download_report / self.failed_downloads and doesn't hold up the rest. download_report maps each country
+        to {'status': 'ok' | 'failed' | 'stored' (resumed from file), 'error', 'seconds'}. A country whose FX pull
+        fails is 'failed' too: its M2 can't be converted to USD, so it is left out of data_dict rather than kept in
+        local currency where the aggregates would add it up as USD.
         
         Parameters:
         -----------
@@ -207,78 +496,63 @@ class Global_M2:
             Number of monthly bars to download (default: 500)
         countries : list or None
             List of specific countries to download. If None, downloads all countries.
+        max_workers : int
+            Number of countries downloaded at once
+        attempts : int
+            Tries per M2/FX pull before the country is marked as failed
+        timeout : float
+            Seconds allowed per pull attempt
+        backoff : float
+            Wait before the first retry in seconds, doubled for each further retry (plus up to 100% jitter)
+        resume : bool
+            Keep the countries already saved in the HDF5 file (filename) and only download the rest
+        filename : str
+            HDF5 file used when resume=True
+        fetcher : callable or None
+            fetcher(symbol, exchange, n_bars, timeout) -> DataFrame or None, replaces the TradingView pull
+            (e.g for offline testing)
             
         Returns:
         --------
         dict
             Dictionary with country names as keys and DataFrames as values
         """
-        # Initialize TradingView datafeed
-        self.tv = tvDatafeedz.TvDatafeed()
+        if fetcher is None:
+            fetcher = self._tv_fetcher(max_workers)
         
         # Determine which countries to process
         if countries is None:
             countries_to_process = self.country_list.index.tolist()
         else:
-            countries_to_process = countries
-        
-        print(f"\nStarting download for {len(countries_to_process)} countries...")
-        print("=" * 70)
+            countries_to_process = list(countries)
         
         # Reset data_dict and failed_downloads
         self.data_dict = {}
         self.failed_downloads = []
+        self.download_report = {}
+        
+        if resume:
+            stored = self.load_from_hdf5(filename) or {}
+            # HDF keys lose hyphens, match the stored countries on the key form of the name
+            stored = {self._hdf_key(c): df for c, df in stored.items()}
+            self.data_dict = {c: stored[self._hdf_key(c)] for c in countries_to_process if self._hdf_key(c) in stored}
+            for country in self.data_dict:
+                self.download_report[country] = {'status': 'stored', 'error': None, 'seconds': 0.0}
+            countries_to_process = [c for c in countries_to_process if c not in self.data_dict]
+            print(f"Resuming: {len(self.data_dict)} countries already stored in {filename}")
+        
+        print(f"\nStarting download for {len(countries_to_process)} countries ({max_workers} at a time)...")
+        print("=" * 70)
         
-        for i, country in enumerate(countries_to_process):
-            print(f"\n[{i+1}/{len(countries_to_process)}] Processing: {country}")
-            
-            try:
-                # Get country configuration
-                country_info = self.country_list.loc[country]
-                
-                m2_symbol = country_info['M2_Symbol']
-                m2_exchange = country_info['M2_exchange']
-                fx_symbol = country_info['FX_Symbol']
-                fx_exchange = country_info['FX_Exchange']
-                currency_code = country_info['M2_currency_code']
-                
-                print(f"  M2: {m2_symbol} @ {m2_exchange}")
-                print(f"  FX: {fx_symbol} @ {fx_exchange}")
-                print(f"  Currency: {currency_code}")
-                
-                # Download M2 data
-                m2_data = self._download_m2_data(m2_symbol, m2_exchange, n_bars)
-                
-                if m2_data is None:
-                    self.failed_downloads.append(f"{country}_M2")
-                    continue
-                
-                # Download FX data (skip if USD)
-                if currency_code == 'USD':
-                    print(f"  Skipping FX download (already in USD)")
-                    fx_data = None
-                else:
-                    fx_data = self._download_fx_data(fx_symbol, fx_exchange, n_bars, country)
-                
-                # Process and combine data
-                combined_df = self._process_country_data(
-                    country, m2_data, fx_data, currency_code, fx_symbol
-                )
-                
-                if combined_df is not None:
-                    self.data_dict[country] = combined_df
-                    print(f"  ✓ Successfully processed {country}")
-                    print(f"  Data range: {combined_df.index[0]} to {combined_df.index[-1]}")
-                    print(f"  Rows: {len(combined_df)}")
-                    
-            except Exception as e:
-                print(f"  ✗ Error processing {country}: {str(e)}")
-                self.failed_downloads.append(country)
-                continue
+        t0 = time.monotonic()
+        results = self._run_downloads({country: n_bars for country in countries_to_process}, fetcher,
+                                      max_workers, attempts, timeout, backoff)
+        self.data_dict.update({country: df for country, df in results.items() if df is not None})
+        self._sort_data_dict()
         
         # Summary
         print("\n" + "=" * 70)
-        print(f"\nDownload Summary:")
+        print(f"\nDownload Summary ({time.monotonic() - t0:.1f}s):")
         print(f"  Successfully downloaded: {len(self.data_dict)} countries")
         print(f"  Failed downloads: {len(self.failed_downloads)}")
         
@@ -287,34 +561,109 @@ class Global_M2:
         
         return self.data_dict
     
-    def _download_m2_data(self, symbol, exchange, n_bars):
-        """Download M2 data from TradingView."""
-        try:
-            m2_data = self.tv.multi_attempt_pull(
-                symbol=symbol,
-                exchange=exchange,
-                interval=tvDatafeedz.Interval.in_monthly,
-                n_bars=n_bars
-            )
-            return m2_data
-        except Exception as e:
-            print(f"    ✗ Failed to download M2 data: {str(e)}")
-            return None
+    def _tv_fetcher(self, max_workers=8):
+        """Fetcher pulling monthly bars through the shared tvDatafeedz session pool (thread-safe, no signals)."""
+        self.tv = tvDatafeedz.TvDatafeed(use_pool=True)
+        pool = tvDatafeedz.get_session_pool(self.tv.token, size=max(2, max_workers // 4))
+        
+        def fetcher(symbol, exchange, n_bars, timeout):
+            return pool.get_hist(symbol, exchange=exchange, interval=tvDatafeedz.Interval.in_monthly,
+                                 n_bars=n_bars, timeout=timeout, attempts=1)
+        return fetcher
     
-    def _download_fx_data(self, symbol, exchange, n_bars, country):
-        """Download FX data from TradingView."""
+    def _run_downloads(self, jobs, fetcher, max_workers=8, attempts=3, timeout=60, backoff=2.0):
+        """
+        Download {country: n_bars} on a thread pool, recording failures in self.failed_downloads and
+        self.download_report.
+        
+        Returns:
+        --------
+        dict
+            {country: combined DataFrame or None}
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(self._download_country, country, bars, fetcher, attempts, timeout, backoff): country
+                       for country, bars in jobs.items()}
+            for i, future in enumerate(as_completed(futures)):
+                country = futures[future]
+                combined_df, failures, seconds = future.result()
+                if combined_df is not None:
+                    print(f"[{i+1}/{len(futures)}] ✓ {country}: {combined_df.index[0]} to {combined_df.index[-1]}, "
+                          f"{len(combined_df)} rows ({seconds:.1f}s)")
+                else:
+                    print(f"[{i+1}/{len(futures)}] ✗ {country}: {'; '.join(failures.values())}")
+                results[country] = combined_df
+                self.failed_downloads.extend(failures.keys())
+                status = 'failed' if combined_df is None else 'ok'
+                self.download_report[country] = {'status': status,
+                                                 'error': '; '.join(failures.values()) or None, 'seconds': seconds}
+        return results
+    
+    def _sort_data_dict(self):
+        """Put data_dict in the configured country order rather than download completion order."""
+        order = {c: i for i, c in enumerate(self.country_list.index)}
+        self.data_dict = dict(sorted(self.data_dict.items(), key=lambda item: order.get(item[0], len(order))))
+    
+    @staticmethod
+    def _hdf_key(country):
+        """HDF5 key for a country name (spaces/hyphens replaced)."""
+        return country.replace(' ', '_').replace('-', '_')
+    
+    @staticmethod
+    def _pull_with_retry(fetcher, symbol, exchange, n_bars, attempts=3, timeout=60, backoff=2.0):
+        """Run a pull up to attempts times with exponential backoff + jitter. Raises the last error if all fail."""
+        error = None
+        for attempt in range(max(1, attempts)):
+            if attempt:
+                time.sleep(backoff * 2 ** (attempt - 1) * (1 + random.random()))
+            try:
+                data = fetcher(symbol, exchange, n_bars, timeout)
+                if data is not None and len(data) > 0:
+                    return data
+                error = ValueError(f"no data returned for {exchange}:{symbol}")
+            except Exception as e:
+                error = e
+        raise error
+    
+    def _download_country(self, country, n_bars, fetcher, attempts, timeout, backoff):
+        """
+        Download and process one country (runs on a worker thread).
+        
+        Returns:
+        --------
+        tuple
+            (combined DataFrame or None, {failed item: error message}, seconds taken)
+        """
+        t0 = time.monotonic()
+        failures = {}
         try:
-            fx_data = self.tv.multi_attempt_pull(
-                symbol=symbol,
-                exchange=exchange,
-                interval=tvDatafeedz.Interval.in_monthly,
-                n_bars=n_bars
-            )
-            return fx_data
+            country_info = self.country_list.loc[country]
+            fx_symbol = country_info['FX_Symbol']
+            currency_code = country_info['M2_currency_code']
+            
+            try:
+                m2_data = self._pull_with_retry(fetcher, country_info['M2_Symbol'], country_info['M2_exchange'],
+                                                n_bars, attempts, timeout, backoff)
+            except Exception as e:
+                failures[f"{country}_M2"] = f"M2 download failed: {e}"
+                return None, failures, time.monotonic() - t0
+            
+            # Download FX data (skip if USD)
+            fx_data = None
+            if currency_code != 'USD':
+                try:
+                    fx_data = self._pull_with_retry(fetcher, fx_symbol, country_info['FX_Exchange'],
+                                                    n_bars, attempts, timeout, backoff)
+                except Exception as e:
+                    failures[f"{country}_FX"] = f"FX download failed: {e}"
+            
+            combined_df = self._process_country_data(country, m2_data, fx_data, currency_code, fx_symbol)
+            return combined_df, failures, time.monotonic() - t0
+        
         except Exception as e:
-            print(f"    ✗ Failed to download FX data: {str(e)}")
-            self.failed_downloads.append(f"{country}_FX")
-            return None
+            failures[country] = f"Error processing {country}: {e}"
+            return None, failures, time.monotonic() - t0
     
     def _process_country_data(self, country, m2_data, fx_data, currency_code, fx_symbol):
         """
@@ -426,18 +775,12 @@ class Global_M2:
             with pd.HDFStore(save_path, mode='w') as store:
                 for country, df in self.data_dict.items():
                     # Clean country name for use as HDF key (replace spaces/special chars)
-                    key = country.replace(' ', '_').replace('-', '_')
+                    key = self._hdf_key(country)
                     store.put(key, df, format='table')
                     print(f"  Saved: {country} -> /{key}")
                 
                 # Also save metadata
-                metadata = pd.DataFrame({
-                    'country': list(self.data_dict.keys()),
-                    'rows': [len(df) for df in self.data_dict.values()],
-                    'start_date': [df.index[0] for df in self.data_dict.values()],
-                    'end_date': [df.index[-1] for df in self.data_dict.values()],
-                })
-                store.put('metadata', metadata, format='table')
+                store.put('metadata', self._metadata_frame(), format='table')
                 print(f"  Saved: metadata")
             
             print(f"\n✓ Successfully saved {len(self.data_dict)} countries to {save_path}")
@@ -482,10 +825,15 @@ class Global_M2:
             with pd.HDFStore(load_path, mode='r') as store:
                 keys = [key for key in store.keys() if key != '/metadata']
                 
-                # Load all DataFrames at once
+                # Country names from the metadata table (keys lose hyphens)
+                names = {}
+                if '/metadata' in store:
+                    names = {f'/{self._hdf_key(c)}': c for c in store['metadata']['country']}
+                
+                # Read every key through the open store
                 for key in keys:
-                    country = key.lstrip('/').replace('_', ' ')
-                    df = pd.read_hdf(load_path, key=key)
+                    country = names.get(key, key.lstrip('/').replace('_', ' '))
+                    df = store[key]
                     
                     # Rebuild the DataFrame with a fresh DatetimeIndex
                     # This avoids pandas/numpy compatibility issues
@@ -502,6 +850,148 @@ class Global_M2:
             print(f"✗ Error loading from HDF5: {str(e)}")
             return None
     
+    def _metadata_frame(self):
+        """Rows and first/last date (the update watermark) of every country in data_dict."""
+        return pd.DataFrame({
+            'country': list(self.data_dict.keys()),
+            'rows': [len(df) for df in self.data_dict.values()],
+            'start_date': [df.index[0] for df in self.data_dict.values()],
+            'end_date': [df.index[-1] for df in self.data_dict.values()],
+        })
+    
+    def watermarks(self):
+        """
+        Last observation date of each country, the point incremental updates continue from.
+        
+        Returns:
+        --------
+        dict
+            {country: pd.Timestamp}
+        """
+        return {country: df.index[-1] for country, df in self.data_dict.items() if len(df)}
+    
+    @staticmethod
+    def _first_change(old_df, new_df):
+        """
+        Earliest date at which new_df adds a row to old_df or revises one of its values (NaNs in new_df,
+        e.g FX not yet available at the start of a short pull, don't count as revisions). None if nothing changed.
+        """
+        new_dates = new_df.index[~new_df.index.isin(old_df.index)]
+        common = new_df.index.intersection(old_df.index)
+        revised = common[:0]
+        if len(common):
+            old_vals = old_df.loc[common].to_numpy(dtype=float)     # Same column layout (USD countries repeat a name)
+            new_vals = new_df.loc[common].to_numpy(dtype=float)
+            differs = ~np.isnan(new_vals) & ~np.isclose(old_vals, new_vals, rtol=1e-12, atol=0.0, equal_nan=True)
+            revised = common[differs.any(axis=1)]
+        changed = new_dates.union(revised)
+        return changed.min() if len(changed) else None
+    
+    def update_data(self, filename='global_m2_data.h5', path=None, countries=None, overlap=2, max_workers=8,
+                    attempts=3, timeout=60, backoff=2.0, fetcher=None, now=None):
+        """
+        Incremental refresh: pull only the bars after each country's watermark (plus overlap bars to catch
+        revisions), splice them into data_dict, append them to the format='table' datasets in the HDF5 file
+        and recompute only the trailing aggregate rows they affect (if aggregates have been created).
+        
+        Parameters:
+        -----------
+        filename : str
+            HDF5 file written by save_to_hdf5, loaded first if data_dict is empty
+        path : str or None
+            Directory of the HDF5 file. If None, uses the working directory.
+        countries : list or None
+            Countries to update, default all countries in data_dict
+        overlap : int
+            Extra bars pulled before the watermark, changed values there are rewritten
+        max_workers, attempts, timeout, backoff, fetcher :
+            As in download_data
+        now : str, pd.Timestamp or None
+            Date to update up to (used to size the pulls), default today
+            
+        Returns:
+        --------
+        dict
+            {country: (first changed date, number of rows written)} for the countries that changed
+        """
+        if not self.data_dict:
+            self.load_from_hdf5(filename, path)
+        if not self.data_dict:
+            print("No stored data to update. Run download_data() and save_to_hdf5() first.")
+            return None
+        
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        marks = self.watermarks()
+        countries_to_process = [c for c in (countries if countries is not None else self.data_dict) if c in marks]
+        jobs = {}
+        for country in countries_to_process:
+            months = (now.year - marks[country].year) * 12 + now.month - marks[country].month
+            jobs[country] = max(months, 0) + 1 + overlap
+        
+        if fetcher is None:
+            fetcher = self._tv_fetcher(max_workers)
+        self.failed_downloads = []
+        self.download_report = {}
+        
+        print(f"\nUpdating {len(jobs)} countries (up to {max(jobs.values(), default=0)} bars each)...")
+        print("=" * 70)
+        results = self._run_downloads(jobs, fetcher, max_workers, attempts, timeout, backoff)
+        
+        changes = {}
+        for country, new_df in results.items():
+            if new_df is None:
+                continue
+            old_df = self.data_dict[country]
+            cut = self._first_change(old_df, new_df)
+            if cut is None:
+                continue
+            tail = new_df[new_df.index >= cut].copy()
+            # The short FX pull can start after the first M2 bar (M2 is published later), leaving NaN FX rows that
+            # _first_change doesn't count as revisions. Keep the stored FX there and convert the (possibly revised)
+            # M2 with the stored rate. Positional, as USD countries repeat a column name.
+            vals = tail.to_numpy(dtype=float)
+            old_vals = old_df.reindex(tail.index).to_numpy(dtype=float)
+            missing = np.isnan(vals)
+            vals[missing] = old_vals[missing]
+            rows = missing[:, -1] & ~missing[:, 0]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                vals[rows, -1] = vals[rows, 0] * (old_vals[rows, -1] / old_vals[rows, 0])
+            tail.iloc[:, :] = vals
+            self.data_dict[country] = pd.concat([old_df[old_df.index < cut], tail])
+            changes[country] = (cut, tail)
+        
+        print("\n" + "=" * 70)
+        print(f"\nUpdate Summary: {len(changes)} countries changed, {sum(len(t) for _, t in changes.values())} rows, "
+              f"{len(self.failed_downloads)} failed downloads")
+        if not changes:
+            return {}
+        
+        self._append_to_hdf5(changes, filename, path)
+        if self.aggregate_series:
+            self.update_aggregates(min(cut for cut, _ in changes.values()))
+        return {country: (cut, len(tail)) for country, (cut, tail) in changes.items()}
+    
+    def _append_to_hdf5(self, changes, filename='global_m2_data.h5', path=None):
+        """
+        Write {country: (cut date, new rows)} to the HDF5 file: rows from the cut date on are removed from the
+        country's table and the new rows appended, new countries are written in full. Only the metadata table is
+        rewritten.
+        """
+        save_path = (self.wd if path is None else Path(path)) / filename
+        print(f"\nAppending updates to HDF5 file: {save_path}")
+        with pd.HDFStore(save_path, mode='a') as store:
+            for country, (cut, tail) in changes.items():
+                key = self._hdf_key(country)
+                if f'/{key}' in store:
+                    removed = store.remove(key, where=f"index >= '{pd.Timestamp(cut).isoformat()}'")
+                    store.append(key, tail, format='table')
+                    print(f"  Appended: {country} -> /{key} ({len(tail)} rows, {removed or 0} replaced)")
+                else:
+                    store.put(key, self.data_dict[country], format='table')
+                    print(f"  Saved: {country} -> /{key}")
+            store.put('metadata', self._metadata_frame(), format='table')
+        return str(save_path)
+    
     def get_country_data(self, country):
         """
         Get data for a specific country.
@@ -594,68 +1084,43 @@ class Global_M2:
         
         print(f"\nCreating '{name}' aggregate from {len(available_countries)} countries...")
         
-        # Collect all M2_USD series
-        country_series = {}
-        date_ranges = []
-        
-        for country in available_countries:
-            df = self.data_dict[country]
-            m2_usd_col = df.columns[-1]  # Last column is M2_USD
-            series = df[m2_usd_col].copy()
-            
-            # Ensure it's a Series
-            if isinstance(series, pd.DataFrame):
-                series = series.iloc[:, 0]
-            
-            country_series[country] = series
-            date_ranges.append((series.index[0], series.index[-1]))
-        
-        # Find the common date range (intersection)
-        earliest_start = max([dr[0] for dr in date_ranges])
-        latest_end = min([dr[1] for dr in date_ranges])
-        
-        print(f"  Date range: {earliest_start} to {latest_end}")
-        
-        # Create a common index
-        # Get all unique dates from all series
-        all_dates = set()
-        for series in country_series.values():
-            all_dates.update(series.index)
-        
-        # Sort and create DatetimeIndex
-        common_index = pd.DatetimeIndex(sorted(all_dates))
-        common_index = common_index[(common_index >= earliest_start) & (common_index <= latest_end)]
-        
-        # Create the aggregate series
-        aggregate = pd.Series(0.0, index=common_index, name=f'{name}_M2_USD')
-        
-        # Sum up each country's contribution
-        for country, series in country_series.items():
-            # Reindex to common index
-            series_aligned = series.reindex(common_index)
-            # Add to aggregate (NaN values don't contribute)
-            aggregate = aggregate.add(series_aligned, fill_value=0)
+        result = self.country_matrix().aggregate({name: available_countries}, use_ffill=use_ffill).get(name)
+        if result is None or result[0].empty:
+            print("✗ The countries have no overlapping date range")
+            return None
+        aggregate, aggregate_ffill, coverage = result
+        self.aggregate_coverage[name] = coverage
         
+        print(f"  Date range: {aggregate.index[0]} to {aggregate.index[-1]}")
         print(f"  ✓ Aggregate created: {len(aggregate)} data points")
         print(f"  Total M2 (latest): ${aggregate.iloc[-1]:.2e}")
         
         if use_ffill:
-            # Create forward-filled version for handling missing recent data
-            aggregate_ffill = pd.Series(0.0, index=common_index, name=f'{name}_M2_USD_ffill')
-            
-            for country, series in country_series.items():
-                # Reindex and forward fill
-                series_aligned = series.reindex(common_index)
-                series_filled = series_aligned.fillna(method='ffill')
-                # Add to aggregate
-                aggregate_ffill = aggregate_ffill.add(series_filled, fill_value=0)
-            
             print(f"  Total M2 (ffill, latest): ${aggregate_ffill.iloc[-1]:.2e}")
-            
             return aggregate, aggregate_ffill
         else:
             return aggregate
     
+    def _m2_usd_series(self, country):
+        """The M2_USD (last) column of a country's DataFrame as a Series."""
+        df = self.data_dict[country]
+        series = df[df.columns[-1]]
+        if isinstance(series, pd.DataFrame):
+            series = series.iloc[:, 0]
+        return series
+    
+    def country_matrix(self):
+        """
+        All countries' M2_USD series aligned into one CountryMatrix. Cached until data_dict changes
+        (countries added/removed/replaced or their M2_USD values edited).
+        """
+        key = tuple((country, id(df), df.shape, float(np.nansum(pd.to_numeric(df.iloc[:, -1], errors='coerce').to_numpy(dtype=float))))
+                    for country, df in self.data_dict.items())
+        if self._matrix_cache is None or self._matrix_cache[0] != key:
+            series = {country: self._m2_usd_series(country) for country, df in self.data_dict.items() if len(df)}
+            self._matrix_cache = (key, CountryMatrix(series))
+        return self._matrix_cache[1]
+    
     def create_all_aggregates(self, use_ffill=True):
         """
         Create all predefined aggregate series.
@@ -679,20 +1144,31 @@ class Global_M2:
         print(f"{'='*70}")
         
         self.aggregate_series = {}
+        self.aggregate_coverage = {}
         
+        definitions = {}
         for agg_name, countries in self.aggregates.items():
             if not countries:
                 print(f"\n⚠ Skipping {agg_name}: no countries defined")
                 continue
-            
-            result = self.create_aggregate(countries, name=agg_name, use_ffill=use_ffill)
-            
-            if result:
-                if use_ffill:
-                    self.aggregate_series[agg_name] = result[0]
-                    self.aggregate_series[f'{agg_name}_ffill'] = result[1]
-                else:
-                    self.aggregate_series[agg_name] = result
+            missing_countries = [c for c in countries if c not in self.data_dict]
+            if missing_countries:
+                print(f"\n⚠ Warning: {agg_name}, {len(missing_countries)} countries not in data: {missing_countries}")
+            definitions[agg_name] = [c for c in countries if c in self.data_dict]
+        
+        # Every aggregate comes out of the same aligned country matrix.
+        results = self.country_matrix().aggregate(definitions, use_ffill=use_ffill) if self.data_dict else {}
+        
+        for agg_name, (aggregate, aggregate_ffill, coverage) in results.items():
+            if aggregate.empty:
+                print(f"\n✗ {agg_name}: the countries have no overlapping date range")
+                continue
+            print(f"\n'{agg_name}' aggregate from {len(definitions[agg_name])} countries: {aggregate.index[0]} to {aggregate.index[-1]}, "
+                  f"{len(aggregate)} data points, latest ${aggregate.iloc[-1]:.2e}")
+            self.aggregate_series[agg_name] = aggregate
+            if use_ffill:
+                self.aggregate_series[f'{agg_name}_ffill'] = aggregate_ffill
+            self.aggregate_coverage[agg_name] = coverage
         
         print(f"\n{'='*70}")
         print(f"✓ Created {len([k for k in self.aggregate_series.keys() if not k.endswith('_ffill')])} aggregates")
@@ -700,6 +1176,54 @@ class Global_M2:
         
         return self.aggregate_series
     
+    def update_aggregates(self, since, use_ffill=True):
+        """
+        Recompute only the aggregate rows from date since on, after the country data changed from that date
+        (see update_data). Uses each country's values from since on plus its last valid value before since
+        (the forward fill seed), so the result matches a full create_all_aggregates() run.
+        
+        Parameters:
+        -----------
+        since : str or pd.Timestamp
+            First date with changed country data
+        use_ffill : bool
+            Whether to update the forward-filled versions
+            
+        Returns:
+        --------
+        dict
+            Dictionary with aggregate names and their series
+        """
+        since = pd.Timestamp(since)
+        definitions = {name: [c for c in countries if c in self.data_dict]
+                       for name, countries in self.aggregates.items() if countries and name in self.aggregate_series}
+        definitions = {name: countries for name, countries in definitions.items() if countries}
+        if not definitions or (use_ffill and any(f'{name}_ffill' not in self.aggregate_series for name in definitions)):
+            return self.create_all_aggregates(use_ffill=use_ffill)
+        
+        tails, starts = {}, {}
+        for country in {c for countries in definitions.values() for c in countries}:
+            series = self._m2_usd_series(country)
+            before = series[series.index < since].dropna()
+            tail = pd.concat([before.iloc[-1:], series[series.index >= since]])
+            if tail.empty:
+                # Nothing to seed this country from, the trailing rows alone can't reproduce the aggregate
+                return self.create_all_aggregates(use_ffill=use_ffill)
+            tails[country] = tail
+            starts[country] = series.index[0]
+        
+        results = CountryMatrix(tails, starts=starts).aggregate(definitions, use_ffill=use_ffill)
+        splice = lambda old, new: pd.concat([old[old.index < since], new[new.index >= since]])
+        for name, (aggregate, aggregate_ffill, coverage) in results.items():
+            self.aggregate_series[name] = splice(self.aggregate_series[name], aggregate)
+            if use_ffill:
+                self.aggregate_series[f'{name}_ffill'] = splice(self.aggregate_series[f'{name}_ffill'], aggregate_ffill)
+            if name in self.aggregate_coverage:
+                self.aggregate_coverage[name] = splice(self.aggregate_coverage[name], coverage)
+            print(f"  Updated '{name}' from {since.date()}: {(aggregate.index >= since).sum()} rows recomputed, "
+                  f"latest ${self.aggregate_series[name].iloc[-1]:.2e}")
+        return self.aggregate_series
+    
     def save_aggregates(self, path=None, format: str = 'hdf5'):
         """
         Save aggregate series to files.
@@ -764,26 +1288,33 @@ class Global_M2:
     
     def clean_outliers(self, method='iqr', threshold=3.0, z_score_threshold=3.0, 
                        iqr_multiplier=1.5, pct_change_threshold=None, 
-                       interpolation_method='linear', countries=None):
+                       interpolation_method='linear', countries=None, window=None):
         """
         Identify and correct outliers in the M2 data by replacing them with interpolated values.
         
+        All the countries are checked at once on the aligned country matrix (see detect_outliers), with one or
+        several methods. The flags of each method are kept in self.outlier_mask (an OutlierMask) for auditing.
+        
         Parameters:
         -----------
-        method : str
-            Outlier detection method: 'iqr', 'zscore', 'pct_change', or 'magnitude'
+        method : str or list
+            Outlier detection method(s): 'iqr', 'zscore', 'pct_change', 'magnitude' or 'mad' (rolling median/MAD).
+            A point flagged by any of the methods is replaced.
         threshold : float
             Threshold for magnitude-based detection
         z_score_threshold : float
-            Number of standard deviations for z-score method
+            Number of standard deviations for z-score method (robust z-score for 'mad')
         iqr_multiplier : float
             Multiplier for IQR method
         pct_change_threshold : float
             Percentage change threshold for pct_change method
         interpolation_method : str
-            Pandas interpolation method ('linear', 'polynomial', 'spline', etc.)
+            'linear' (vectorized over all countries) or any other pandas interpolation method
+            ('polynomial', 'spline', etc.), applied country by country
         countries : list or None
             List of specific countries to clean. If None, cleans all countries.
+        window : int or None
+            Rolling window (months) for the iqr/zscore/mad statistics, None uses the full history for iqr/zscore
             
         Returns:
         --------
@@ -794,82 +1325,64 @@ class Global_M2:
             print("No data loaded. Run download_data() or load_from_hdf5() first.")
             return None
         
+        methods = [method] if isinstance(method, str) else list(method)
+        
         # Determine which countries to process
         if countries is None:
             countries_to_process = list(self.data_dict.keys())
         else:
             countries_to_process = countries
-        
-        outlier_report = {}
+        for country in countries_to_process:
+            if country not in self.data_dict:
+                print(f"\n  ⚠ {country} not found in data")
         
         print(f"\n{'='*70}")
-        print(f"Cleaning Outliers - Method: {method}")
+        print(f"Cleaning Outliers - Method: {', '.join(methods)}")
         print(f"{'='*70}")
         
-        for country in countries_to_process:
-            if country not in self.data_dict:
-                print(f"\n  ⚠ {country} not found in data")
-                continue
-            
-            print(f"\n  Processing: {country}")
+        matrix = self.country_matrix()
+        cols = [matrix.columns[c] for c in countries_to_process if c in matrix.columns]
+        values = matrix.values[:, cols]
+        mask = detect_outliers(values, methods, window=window, threshold=threshold,
+                               z_score_threshold=z_score_threshold, iqr_multiplier=iqr_multiplier,
+                               pct_change_threshold=pct_change_threshold)
+        self.outlier_mask = OutlierMask(methods, mask, matrix.index, [matrix.countries[j] for j in cols])
+        flags = self.outlier_mask.combined
+        outlier_report = self.outlier_mask.report(values)
+        
+        if interpolation_method == 'linear':
+            cleaned = interpolate_flagged(values, flags)
+        else:
+            cleaned = values.copy()
+            for j in np.flatnonzero(flags.any(axis=0)):
+                present = matrix.present[:, cols[j]]
+                series = pd.Series(np.where(flags[present, j], np.nan, values[present, j]), index=matrix.index[present])
+                series = series.interpolate(method=interpolation_method).bfill().ffill()
+                cleaned[present, j] = np.where(flags[present, j], series.to_numpy(), values[present, j])
+        
+        for j in np.flatnonzero(flags.any(axis=0)):
+            country = self.outlier_mask.countries[j]
+            info = outlier_report[country]
             df = self.data_dict[country]
+            rows = matrix.index.get_indexer(df.index)
             
-            # Focus on the M2_USD column (the last column)
-            m2_usd_col = df.columns[-1]
-            m2_series = df[m2_usd_col].copy()
-            
-            # Ensure we have a Series, not a DataFrame
-            if isinstance(m2_series, pd.DataFrame):
-                m2_series = m2_series.iloc[:, 0]
-            
-            # Convert to Series if needed and ensure proper dtype
-            m2_series = pd.Series(m2_series.values, index=m2_series.index, name=m2_usd_col)
-            
-            # Identify outliers
-            outlier_info = identify_outliers(
-                m2_series,
-                method=method,
-                threshold=threshold,
-                z_score_threshold=z_score_threshold,
-                iqr_multiplier=iqr_multiplier,
-                pct_change_threshold=pct_change_threshold
-            )
+            # Write the M2_USD column (the last column) back and rescale M2 in local currency by the same factor,
+            # which keeps it consistent with the FX conversion whichever way round the FX pair is quoted
+            data = df.to_numpy(dtype=float, copy=True)
+            old_usd, local = data[:, -1].copy(), data[:, 0].copy()
+            new_usd = cleaned[rows, j]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                conversion = old_usd / local
+                data[:, 0] = np.where(np.isfinite(conversion) & (conversion != 0), new_usd / conversion, local)
+            data[:, -1] = new_usd
+            self.data_dict[country] = pd.DataFrame(data, index=df.index, columns=df.columns)
             
-            # Store outlier info
-            outlier_report[country] = outlier_info
-            
-            # If outliers found, replace with NaN and interpolate
-            if len(outlier_info['outlier_indices']) > 0:
-                print(f"    → Replacing {len(outlier_info['outlier_indices'])} outliers with interpolated values")
-                
-                # Create a copy of the series
-                cleaned_series = m2_series.copy()
-                
-                # Set outliers to NaN
-                for idx in outlier_info['outlier_indices']:
-                    cleaned_series.loc[idx] = np.nan
-                
-                # Interpolate missing values
-                cleaned_series = cleaned_series.interpolate(method=interpolation_method)
-                
-                # If there are still NaNs at the beginning or end, use forward/backward fill
-                cleaned_series = cleaned_series.fillna(method='bfill').fillna(method='ffill')
-                
-                # Update the DataFrame
-                self.data_dict[country][m2_usd_col] = cleaned_series
-                
-                # Also update the M2 in local currency if needed
-                if df.columns[0] != m2_usd_col:  # If not USD country
-                    # Recalculate M2 local from M2 USD and FX rate
-                    fx_rate = df[df.columns[1]]  # FX rate column
-                    self.data_dict[country][df.columns[0]] = cleaned_series / fx_rate
-                
-                print(f"    ✓ Outliers cleaned and interpolated")
-            else:
-                print(f"    ✓ No outliers detected")
+            print(f"\n  {country}: replaced {len(info['outlier_indices'])} outliers with interpolated values")
+            for date, value, flagged_by in zip(info['outlier_dates'], info['outlier_values'], info['outlier_methods']):
+                print(f"    Date: {date}, Value: {float(value):.2e} ({', '.join(flagged_by)})")
         
         print(f"\n{'='*70}")
-        print(f"Outlier Cleaning Complete")
+        print(f"Outlier Cleaning Complete: {int(flags.sum())} outliers in {int(flags.any(axis=0).sum())} of {len(cols)} countries")
         print(f"{'='*70}\n")
         
         return outlier_report
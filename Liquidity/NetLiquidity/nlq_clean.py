@@ -31,6 +31,9 @@ sys.path.append(project_root)
 wd = os.path.dirname(os.path.abspath(__file__))
 fdel = os.sep
 
+# Saved NetLiquidity state used by the incremental updater (see NetLiquidity.update / update_net_liquidity)
+NLQ_STATE_PATH = os.path.join(project_root, "User_Data", "NLQ_Data", "nlq_state.pkl")
+
 from MacroBackend import Pull_Data, PriceImporter, Utilities
 
 
@@ -76,7 +79,8 @@ class NLQDataFetcher:
     def fetch_fred_series(self, 
                          series_codes: List[str], 
                          start_date: str, 
-                         end_date: str) -> Dict[str, pd.Series]:
+                         end_date: str,
+                         save: Optional[bool] = None) -> Dict[str, pd.Series]:
         """
         Fetch multiple FRED series using the Pull_Data.dataset class.
         
@@ -84,6 +88,7 @@ class NLQDataFetcher:
             series_codes: List of FRED series codes to fetch
             start_date: Start date in 'YYYY-MM-DD' format
             end_date: End date in 'YYYY-MM-DD' format
+            save: Save the series to disk, defaults to self.save_data (don't save partial pulls over the full files)
             
         Returns:
             Dictionary mapping series codes to pandas Series with data
@@ -124,7 +129,7 @@ class NLQDataFetcher:
                     fred_data[series_code] = series_data
                     
                     # Save to disk if requested
-                    if self.save_data:
+                    if self.save_data if save is None else save:
                         self._save_fred_series(series_code, series_data)
                         
                     print(f"Successfully fetched {series_code}: {len(series_data)} observations")
@@ -358,6 +363,55 @@ class NLQDataFetcher:
         }
         
         return core_data
+    
+    def get_nlq_updates(self, 
+                        since: Dict[str, pd.Timestamp],
+                        use_qe_only: bool = False,
+                        lookback_days: int = 35) -> Dict[str, pd.Series]:
+        """
+        Fetch only the recent part of the core NLQ series, for NetLiquidity.update().
+        
+        Args:
+            since: Last stored date of each component (NetLiquidity.watermarks())
+            use_qe_only: If True, use RESPPNTNWW (QE only), else use WALCL (total assets)
+            lookback_days: Days before each watermark to fetch again, to pick up revisions
+            
+        Returns:
+            Dictionary with the new/revised observations of each core data series (core_data keys)
+        """
+        print("=== Fetching NLQ Updates ===")
+        lookback = pd.Timedelta(days=lookback_days)
+        fred_codes = {
+            'fed_balance_sheet': 'RESPPNTNWW' if use_qe_only else 'WALCL',
+            'reverse_repo': 'RRPONTSYD',
+            'tga_fred_weekly': 'WTREGEN'
+        }
+        starts = {key: pd.Timestamp(since[key]) - lookback if since.get(key) is not None else pd.Timestamp("2000-01-01")
+                  for key in list(fred_codes) + ['tga_treasury_daily']}
+        
+        start_date = min(starts[key] for key in fred_codes).strftime('%Y-%m-%d')
+        end_date = datetime.datetime.today().strftime('%Y-%m-%d')
+        fred_data = self.fetch_fred_series(list(fred_codes.values()), start_date, end_date, save=False)
+        
+        # The Treasury pull is already incremental (from the last date in the local TGA file)
+        tga_daily = self.fetch_tga_data_treasury_api()
+        
+        updates = {key: fred_data.get(code, pd.Series(dtype=float)) for key, code in fred_codes.items()}
+        updates['tga_treasury_daily'] = tga_daily
+        return {key: series[series.index >= starts[key]] if len(series) else series for key, series in updates.items()}
+
+
+def _first_change(old: pd.Series, new: pd.Series) -> Optional[pd.Timestamp]:
+    """Earliest date at which new adds an observation to old or revises one of its values, None if nothing changed.
+    Both series must have sorted, unique dates."""
+    if len(old) == 0:
+        return new.index[0] if len(new) else None
+    old_dates, new_dates = old.index.values, new.index.values
+    pos = np.minimum(np.searchsorted(old_dates, new_dates), len(old_dates) - 1)
+    matched = old_dates[pos] == new_dates
+    same = np.isclose(old.to_numpy(dtype=float)[pos], new.to_numpy(dtype=float), rtol=1e-12, atol=0.0, equal_nan=True)
+    changed = ~(matched & same)
+    return new.index[np.argmax(changed)] if changed.any() else None
 
 
 class NetLiquidity:
@@ -370,7 +424,23 @@ class NetLiquidity:
     1. Weekly frequency using raw FRED data (no resampling)
     2. Daily frequency with FRED TGA (all FRED data resampled to daily)
     3. Daily frequency with Treasury API TGA (most accurate, daily updates)
+    
+    Once calculated, the results can be saved (save_state) and kept up to date with update(), which
+    only recomputes the tail of the series affected by the new observations.
     """
+    
+    # Component attributes by core_data key
+    COMPONENTS = {
+        'fed_balance_sheet': 'fed_balance_sheet',
+        'reverse_repo': 'reverse_repo',
+        'tga_fred_weekly': 'tga_fred',
+        'tga_treasury_daily': 'tga_treasury'
+    }
+    # Attributes saved by save_state()
+    STATE_ATTRS = ['input_settings', 'start_date', 'end_date', 'series_type', 'revision_window',
+                   'fed_balance_sheet', 'reverse_repo', 'tga_fred', 'tga_treasury',
+                   'nlq_weekly', 'nlq_daily_treasury', 'daily_index',
+                   'fed_balance_sheet_daily', 'reverse_repo_daily', 'tga_fred_daily', 'tga_treasury_daily']
 
     def __init__(self, input_settings: pd.DataFrame = None, core_data: Dict[str, Union[pd.Series, str]] = None):
         """
@@ -427,6 +497,11 @@ class NetLiquidity:
         self.fed_balance_sheet_daily = None
         self.reverse_repo_daily = None
         self.tga_fred_daily = None
+        self.tga_treasury_daily = None
+        
+        # Observations older than this many days before a component's last date trigger a full
+        # recalculation in update() rather than a tail recompute
+        self.revision_window = 35
         
         print(f"NetLiquidity initialized with {self.series_type} Fed balance sheet")
         self._validate_data()
@@ -570,12 +645,12 @@ class NetLiquidity:
             self.reverse_repo_daily = self.resample_to_daily(self.reverse_repo)
         
         # Resample TGA Treasury to daily
-        tga_treasury_daily = self.resample_to_daily(self.tga_treasury)
+        self.tga_treasury_daily = self.resample_to_daily(self.tga_treasury)
         
         # Calculate NLQ
         self.nlq_daily_treasury = pd.Series(
             self.fed_balance_sheet_daily - 
-            tga_treasury_daily - 
+            self.tga_treasury_daily - 
             self.reverse_repo_daily,
             name='NLQ Daily Treasury (Bil $)'
         )
@@ -613,18 +688,171 @@ class NetLiquidity:
         self.create_daily_index(start_date, end_date)
         
         # Calculate all versions
-        nlq_weekly = self.calculate_nlq_weekly()
-        nlq_daily_treasury = self.calculate_nlq_daily_treasury()
+        self.calculate_nlq_weekly()
+        self.calculate_nlq_daily_treasury()
         
+        return self._results()
+    
+    def _results(self) -> Dict[str, pd.Series]:
+        """The NLQ series and daily components, as returned by calculate_all() and update()."""
         return {
-            'nlq_weekly': nlq_weekly,
-            'nlq_daily_treasury': nlq_daily_treasury,
+            'nlq_weekly': self.nlq_weekly,
+            'nlq_daily_treasury': self.nlq_daily_treasury,
             'fed_balance_sheet_daily': self.fed_balance_sheet_daily,
             'reverse_repo_daily': self.reverse_repo_daily,
             'tga_fred_daily': self.tga_fred_daily,
-            'tga_treasury_daily': self.resample_to_daily(self.tga_treasury)
+            'tga_treasury_daily': self.tga_treasury_daily
         }
     
+    def watermarks(self) -> Dict[str, Optional[pd.Timestamp]]:
+        """Last observation date of each component (core_data keys), None for empty components."""
+        return {key: getattr(self, attr).index[-1] if len(getattr(self, attr)) else None
+                for key, attr in self.COMPONENTS.items()}
+    
+    def update(self, 
+               new_data: Dict[str, pd.Series], 
+               end_date: Optional[str] = None) -> Dict[str, pd.Series]:
+        """
+        Bring the calculated NLQ series up to date with new (or revised) component observations.
+        
+        New observations are merged into the components (overwriting revised values). Only the part of the
+        daily and weekly NLQ series from the earliest changed date on is recomputed, which gives the same
+        result as calculate_all() on the merged data. Changes older than revision_window days before a
+        component's last date, or a missing previous calculation, fall back to calculate_all().
+        
+        Args:
+            new_data: Dictionary of new observations by core_data key ('fed_balance_sheet', 'reverse_repo',
+                'tga_fred_weekly', 'tga_treasury_daily'), e.g from NLQDataFetcher.get_nlq_updates()
+            end_date: New end date of the daily index (defaults to today, never moves back)
+            
+        Returns:
+            Dictionary with all NLQ series, as calculate_all()
+        """
+        print("\n=== Updating NLQ ===")
+        changed = {}
+        full_recalc = self.nlq_daily_treasury is None or self.nlq_weekly is None or self.daily_index is None
+        
+        for key, new in new_data.items():
+            if key not in self.COMPONENTS or new is None or len(new) == 0:
+                continue
+            attr = self.COMPONENTS[key]
+            old = getattr(self, attr)
+            if not isinstance(new.index, pd.DatetimeIndex):
+                new = new.copy()
+                new.index = pd.to_datetime(new.index)
+            if new.index.has_duplicates:
+                new = new[~new.index.duplicated(keep='last')]
+            if not new.index.is_monotonic_increasing:
+                new = new.sort_index()
+            
+            # Only the part of the component from the first new date on can change
+            split = old.index.searchsorted(new.index[0]) if len(old) else 0
+            old_tail = old.iloc[split:]
+            cut = _first_change(old_tail, new)
+            if cut is None:
+                continue
+            if len(old) and cut < old.index[-1] - pd.Timedelta(days=self.revision_window):
+                print(f"{key}: change at {cut.date()} is older than the {self.revision_window} day revision window, recalculating in full")
+                full_recalc = True
+            
+            # New values replace the old ones on the same dates, old dates the update doesn't cover are kept
+            tail = pd.concat([old_tail[~old_tail.index.isin(new.index)], new]).sort_index() if len(old_tail) else new
+            merged = pd.concat([old.iloc[:split], tail])
+            merged.name = old.name if old.name is not None else new.name
+            setattr(self, attr, merged)
+            changed[key] = cut
+            print(f"{key}: {len(new)} observations, changed from {cut.date()}")
+        
+        if end_date is None:
+            end_date = datetime.datetime.today().strftime('%Y-%m-%d')
+        new_end = pd.to_datetime(end_date)
+        if self.daily_index is not None and len(self.daily_index) and new_end < self.daily_index[-1]:
+            new_end = self.daily_index[-1]
+        self.end_date = new_end.strftime('%Y-%m-%d')
+        
+        if full_recalc:
+            self.fed_balance_sheet_daily = None
+            self.reverse_repo_daily = None
+            return self.calculate_all()
+        
+        # Weekly NLQ only depends on same date values, recompute it from the first changed date
+        weekly_changes = [changed[key] for key in ('fed_balance_sheet', 'reverse_repo', 'tga_fred_weekly') if key in changed]
+        if weekly_changes:
+            weekly_cut = min(weekly_changes)
+            since = lambda series: series.iloc[series.index.searchsorted(weekly_cut):]
+            weekly_tail = pd.Series(
+                since(self.fed_balance_sheet) - since(self.tga_fred) - since(self.reverse_repo),
+                name='NLQ Weekly (Bil $)').dropna()
+            self.nlq_weekly = pd.concat([self.nlq_weekly.iloc[:self.nlq_weekly.index.searchsorted(weekly_cut)], weekly_tail])
+        
+        # Daily series: from the first changed date (or the old end of the index when only extending it)
+        old_end = self.daily_index[-1]
+        daily_changes = [changed[key] for key in ('fed_balance_sheet', 'reverse_repo', 'tga_treasury_daily') if key in changed]
+        daily_cut = min(daily_changes + [old_end + pd.Timedelta(days=1)])
+        daily_cut = max(daily_cut, self.daily_index[0])
+        if daily_cut <= new_end:
+            tail_index = pd.date_range(daily_cut, new_end, freq='D')
+            before = lambda series: series.iloc[:series.index.searchsorted(daily_cut)]
+            self.daily_index = self.daily_index[:self.daily_index.searchsorted(daily_cut)].append(tail_index)
+            
+            tails = {}
+            for attr in ('fed_balance_sheet', 'reverse_repo', 'tga_treasury'):
+                series = getattr(self, attr)
+                # Only the last observation before the tail is needed for the forward fill
+                start = max(series.index.searchsorted(daily_cut, side='right') - 1, 0)
+                tails[attr] = self.resample_to_daily(series.iloc[start:], index=tail_index)
+                setattr(self, f'{attr}_daily', pd.concat([before(getattr(self, f'{attr}_daily')), tails[attr]]))
+            
+            nlq_tail = pd.Series(
+                tails['fed_balance_sheet'] - tails['tga_treasury'] - tails['reverse_repo'],
+                name='NLQ Daily Treasury (Bil $)').dropna()
+            self.nlq_daily_treasury = pd.concat([before(self.nlq_daily_treasury), nlq_tail])
+            print(f"NLQ Daily (Treasury) recomputed from {daily_cut.date()}: {len(nlq_tail)} observations")
+        
+        if len(self.nlq_daily_treasury) > 0:
+            print(f"Latest value: ${self.nlq_daily_treasury.iloc[-1]:.2f} billion")
+        return self._results()
+    
+    def save_state(self, path: Optional[str] = None) -> str:
+        """
+        Save the components and calculated NLQ series so that later runs can update() them.
+        
+        Args:
+            path: Pickle file to write (defaults to NLQ_STATE_PATH)
+            
+        Returns:
+            Path of the saved file
+        """
+        path = path or NLQ_STATE_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pd.to_pickle({attr: getattr(self, attr, None) for attr in self.STATE_ATTRS}, path)
+        print(f"Saved NLQ state to {path}")
+        return path
+    
+    @classmethod
+    def load_state(cls, path: Optional[str] = None) -> 'NetLiquidity':
+        """
+        Restore a NetLiquidity object saved with save_state(), without fetching any data.
+        
+        Args:
+            path: Pickle file to read (defaults to NLQ_STATE_PATH)
+        """
+        path = path or NLQ_STATE_PATH
+        nlq = cls.__new__(cls)
+        # Defaults as set by __init__, for attributes missing from (or None in) older state files
+        nlq.__dict__.update({attr: None for attr in cls.STATE_ATTRS})
+        nlq.__dict__.update({attr: pd.Series(dtype=float) for attr in cls.COMPONENTS.values()})
+        nlq.series_type = 'total_assets'
+        nlq.revision_window = 35
+        nlq.__dict__.update({attr: value for attr, value in pd.read_pickle(path).items() if value is not None})
+        if nlq.end_date is None:
+            nlq.end_date = datetime.datetime.today().strftime('%Y-%m-%d')
+        nlq.core_data = {key: getattr(nlq, attr) for key, attr in cls.COMPONENTS.items()}
+        nlq.core_data['series_type'] = nlq.series_type
+        last = nlq.daily_index[-1].date() if nlq.daily_index is not None and len(nlq.daily_index) else None
+        print(f"Loaded NLQ state from {path}, daily index to {last}")
+        return nlq
+    
     def get_latest_values(self) -> Dict[str, float]:
         """Get the latest values for all NLQ series and components."""
         latest = {}
@@ -671,6 +899,37 @@ class NetLiquidity:
         print("="*60 + "\n")
 
 
+def update_net_liquidity(state_path: Optional[str] = None, 
+                         end_date: Optional[str] = None,
+                         fetcher: Optional[NLQDataFetcher] = None) -> NetLiquidity:
+    """
+    Daily refresh: load the saved NLQ state, fetch only the recent observations and update the series.
+    Runs a full calculation (and saves it) the first time, when there is no saved state yet.
+    
+    Args:
+        state_path: State file (defaults to NLQ_STATE_PATH)
+        end_date: End date of the daily index (defaults to today)
+        fetcher: NLQDataFetcher to use (a new one if None)
+        
+    Returns:
+        The updated NetLiquidity object
+    """
+    state_path = state_path or NLQ_STATE_PATH
+    if not os.path.exists(state_path):
+        print(f"No saved NLQ state at {state_path}, running a full calculation")
+        nlq = NetLiquidity()
+        nlq.calculate_all()
+    else:
+        nlq = NetLiquidity.load_state(state_path)
+        fetcher = fetcher or NLQDataFetcher(save_data=True)
+        updates = fetcher.get_nlq_updates(nlq.watermarks(), use_qe_only=nlq.series_type == 'QE_only',
+                                          lookback_days=nlq.revision_window)
+        nlq.update(updates, end_date=end_date)
+    
+    nlq.save_state(state_path)
+    return nlq
+
+
 def test_data_fetching():
     """Test function to verify data fetching works correctly."""
     print("Testing NLQ data fetching...")
@@ -14,8 +14,15 @@ ABS Data (Python - Preferred):
 ABS Data (R - Legacy):
     get_abs_series_from_excel(excel_file_path, series_id, verbose) -> (pd.Series, pd.Series)
         Extract ABS series from Excel file
-    abs_download_with_r(series_id, save_path, r_script_path) -> str
-        Download ABS data using R script (returns Excel file path)
+    abs_download_with_r(series_id, save_path, r_script_path, timeout) -> (pd.Series, pd.Series)
+        Download ABS data using the R worker (or a one-off R script)
+    abs_download_batch_with_r(series_ids, save_path, timeout) -> (dict, dict)
+        Download many ABS series in one R worker job
+
+R worker:
+    RWorker / get_r_worker()
+        Long-lived Rscript process (r_worker.r) that runs jobs sent over a pipe, so that R startup and
+        package loading are only paid once per session rather than once per request
 
 RBA Data (R only):
     browse_rba_tables(searchterm) -> pd.DataFrame
@@ -35,7 +42,15 @@ import shutil
 import pandas as pd
 import subprocess
 import json
-from typing import Tuple, Optional
+import queue
+import itertools
+import threading
+import atexit
+import time
+from typing import Tuple, Optional, Dict, List, Union
+
+R_WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "r_worker.r")
+R_JOB_TIMEOUT = 300   # Seconds per job (per series for ABS batches), a hung job gets its worker killed & restarted.
 
 
 def find_header_end(index) -> int:
@@ -119,17 +134,169 @@ def get_abs_series_python(
     return data_series, metadata_series
 
 
+# ============================================================================
+# R WORKER
+# ============================================================================
+
+class RWorkerError(RuntimeError):
+    """Raised for errors inside an R worker job or when the worker process dies."""
+
+
+class RWorker(object):
+    """
+    One long-lived Rscript process running a line-delimited JSON job loop (r_worker.r by default).
+    
+    R runs one job at a time so calls are queued on a lock and sent one by one, the timeout of a call
+    only counts time spent on that job. A job that times out gets the process killed, a process that
+    dies is restarted on the next call and the call that hit the dead process is retried.
+    
+    Parameters:
+    -----------
+    script : str
+        Path of the R worker script
+    rscript : str
+        Rscript executable
+    """
+    def __init__(self, script: str = R_WORKER_SCRIPT, rscript: str = "Rscript"):
+        self.script = script
+        self.rscript = rscript
+        self.proc = None
+        self.restarts = -1
+        self.last_stderr = ""
+        self._ids = itertools.count(1)
+        self._responses = None
+        self._job_lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        if self.alive:
+            return
+        if not os.path.isfile(self.script):
+            raise FileNotFoundError(f"R worker script not found: {self.script}")
+        responses = queue.Queue()
+        self.proc = subprocess.Popen(
+            [self.rscript, self.script],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', bufsize=1
+        )
+        self._responses = responses
+        self.restarts += 1
+        threading.Thread(target=self._read_stdout, args=(self.proc, responses), daemon=True).start()
+        threading.Thread(target=self._drain_stderr, args=(self.proc,), daemon=True).start()
+
+    def _read_stdout(self, proc, responses: queue.Queue):
+        for line in proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                responses.put(json.loads(line))
+            except json.JSONDecodeError:
+                print("[R] Non JSON line from worker:", line[:200])
+        proc.wait()
+        responses.put(None)  # Process gone.
+
+    def _drain_stderr(self, proc):
+        for line in proc.stderr:
+            self.last_stderr = line.rstrip()
+
+    def _kill(self):
+        proc, self.proc = self.proc, None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
+    def _run_job(self, method: str, params: dict, timeout: float):
+        if not self.alive:
+            self.start()
+        req_id = next(self._ids)
+        try:
+            self.proc.stdin.write(json.dumps({"id": req_id, "method": method, "params": params or {}}) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            self._kill()
+            raise ConnectionError(f"R worker pipe closed: {e}")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                msg = self._responses.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self._kill()
+                raise TimeoutError(f"R worker job '{method}' timed out after {timeout}s, worker killed.")
+            if msg is None:
+                raise ConnectionError(f"R worker exited with code {self.proc.returncode if self.proc else None}: {self.last_stderr}")
+            if msg.get("id") != req_id:
+                continue  # Late answer to a job that already timed out.
+            if "error" in msg:
+                raise RWorkerError(msg["error"])
+            return msg.get("result")
+
+    def call(self, method: str, params: dict = None, timeout: float = R_JOB_TIMEOUT, retries: int = 1):
+        """Run a job on the worker and return its result, starting/restarting the R process if needed."""
+        with self._job_lock:
+            for attempt in range(retries + 1):
+                try:
+                    return self._run_job(method, params, timeout)
+                except ConnectionError as e:
+                    # Only a dead/broken process is retried, errors raised by the R code and timeouts are not.
+                    if attempt == retries:
+                        raise RWorkerError(str(e))
+                    print(f"[R] Worker died during '{method}' job ({e}), restarting it.")
+
+    def ping(self, timeout: float = 30) -> bool:
+        """Health check, True if the worker answers a ping within timeout."""
+        try:
+            return bool(self.call("ping", timeout=timeout).get("pong"))
+        except Exception:
+            return False
+
+    def close(self):
+        proc, self.proc = self.proc, None
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=2)
+            except Exception:
+                proc.kill()
+
+
+_r_worker = None
+_r_worker_lock = threading.Lock()
+
+def get_r_worker() -> RWorker:
+    """Shared R worker for this process, started on first use and closed at exit."""
+    global _r_worker
+    with _r_worker_lock:
+        if _r_worker is None:
+            _r_worker = RWorker()
+            atexit.register(_r_worker.close)
+        return _r_worker
+
+
 # ============================================================================
 # ABS FUNCTIONS - R FALLBACK (LEGACY)
 # ============================================================================
 
+def _default_abs_save_path() -> str:
+    module_dir = os.path.dirname(__file__)
+    project_root = os.path.dirname(os.path.dirname(module_dir))
+    return os.path.join(project_root, "User_Data", "ABS", "LastPull")
+
+
 def abs_download_with_r(
     series_id: str,
     save_path: Optional[str] = None,
-    r_script_path: Optional[str] = None
+    r_script_path: Optional[str] = None,
+    timeout: float = R_JOB_TIMEOUT
 ) -> tuple[pd.Series, pd.Series]:
     """
-    Download ABS series using R script (legacy method).
+    Download ABS series using R (legacy method).
+    
+    Runs on the shared R worker (see get_r_worker) unless r_script_path is given, in which case that
+    script is run in a one-off Rscript process like before.
     
     Parameters:
     -----------
@@ -138,11 +305,14 @@ def abs_download_with_r(
     save_path : str, optional
         Directory to save Excel file. Defaults to User_Data/ABS/LastPull
     r_script_path : str, optional
-        Path to R script. Defaults to abs_get_series.r in this directory
+        Path to a standalone R script taking "series_id,save_path" as its argument (e.g abs_get_series.r)
+    timeout : float
+        Seconds to wait for the download
         
     Returns:
     --------
-    str : Full path to downloaded Excel file
+    Tuple[pd.Series, pd.Series]
+        (data_series, metadata_series)
     
     Raises:
     -------
@@ -152,14 +322,14 @@ def abs_download_with_r(
     if not series_id:
         raise ValueError("series_id must be provided")
     
-    # Set default paths
     if save_path is None:
-        module_dir = os.path.dirname(__file__)
-        project_root = os.path.dirname(os.path.dirname(module_dir))
-        save_path = os.path.join(project_root, "User_Data", "ABS", "LastPull")
+        save_path = _default_abs_save_path()
     
     if r_script_path is None:
-        r_script_path = os.path.join(os.path.dirname(__file__), 'abs_get_series.r')
+        results, errors = abs_download_batch_with_r([series_id], save_path=save_path, timeout=timeout)
+        if series_id in errors:
+            raise errors[series_id]
+        return results[series_id]
     
     if not os.path.isfile(r_script_path):
         raise FileNotFoundError(f"R script not found: {r_script_path}")
@@ -169,7 +339,8 @@ def abs_download_with_r(
     process = subprocess.run(
         ['Rscript', r_script_path, input_string],
         capture_output=True, 
-        text=True
+        text=True,
+        timeout=timeout
     )
     
     output = process.stdout.strip()
@@ -185,10 +356,75 @@ def abs_download_with_r(
     return data_series, metadata_series
 
 
+def abs_download_batch_with_r(
+    series_ids: List[str],
+    save_path: Optional[str] = None,
+    timeout: float = R_JOB_TIMEOUT
+) -> Tuple[Dict[str, Tuple[pd.Series, pd.Series]], Dict[str, Exception]]:
+    """
+    Download a batch of ABS series in a single R worker job.
+    
+    Each workbook is read once even if several of the series come from it, and file management
+    (copy to Full_Sheets, LastPull cleanup) is done once for the whole batch.
+    
+    Parameters:
+    -----------
+    series_ids : list of str
+        ABS series IDs
+    save_path : str, optional
+        Directory to save Excel files. Defaults to User_Data/ABS/LastPull
+    timeout : float
+        Seconds allowed per series, the job times out after timeout * len(series_ids)
+        
+    Returns:
+    --------
+    Tuple[dict, dict]
+        ({series_id: (data_series, metadata_series)}, {series_id: exception}) for the series that
+        succeeded & failed respectively
+    """
+    series_ids = list(dict.fromkeys(sid.strip() for sid in series_ids if sid and sid.strip()))
+    if not series_ids:
+        raise ValueError("series_ids must be provided")
+    if save_path is None:
+        save_path = _default_abs_save_path()
+    
+    job = get_r_worker().call(
+        "abs_series",
+        {"series_ids": series_ids, "save_path": save_path},
+        timeout=timeout * len(series_ids)
+    )
+    job = job or {}
+    
+    results, errors, workbooks = {}, {}, {}
+    for series_id in series_ids:
+        outcome = job.get(series_id) or {"error": "No result returned by R worker"}
+        if "error" in outcome:
+            errors[series_id] = ValueError(f"R script error: {outcome['error']}")
+            print(f"[R] Failed to download series {series_id}: {outcome['error']}")
+            continue
+        excel_path = outcome["path"]
+        print(f"[R] Downloaded series {series_id} to: {excel_path}")
+        try:
+            if excel_path not in workbooks:
+                workbooks[excel_path] = pd.read_excel(excel_path, sheet_name=None, index_col=0)
+            results[series_id] = get_abs_series_from_excel(
+                excel_file_path=excel_path, series_id=series_id, verbose=True,
+                all_data=workbooks[excel_path], manage_files=False
+            )
+        except (FileNotFoundError, ValueError) as e:
+            errors[series_id] = e
+    
+    if workbooks:
+        _manage_abs_file_storage(list(workbooks.keys()), verbose=True)
+    return results, errors
+
+
 def get_abs_series_from_excel(
     excel_file_path: str,
     series_id: str,
-    verbose: bool = False
+    verbose: bool = False,
+    all_data: Optional[Dict[str, pd.DataFrame]] = None,
+    manage_files: bool = True
 ) -> Tuple[pd.Series, pd.Series]:
     """
     Extract ABS series from Excel file.
@@ -204,6 +440,10 @@ def get_abs_series_from_excel(
         Series ID to extract from file
     verbose : bool
         Print debug information
+    all_data : dict, optional
+        Already loaded sheets of the file (pd.read_excel(..., sheet_name=None, index_col=0))
+    manage_files : bool
+        Copy the file to Full_Sheets and clean up LastPull
         
     Returns:
     --------
@@ -223,7 +463,8 @@ def get_abs_series_from_excel(
         print(f"[Excel] Looking for series: {series_id}")
     
     # Load all sheets
-    all_data = pd.read_excel(excel_file_path, sheet_name=None, index_col=0)
+    if all_data is None:
+        all_data = pd.read_excel(excel_file_path, sheet_name=None, index_col=0)
     data_sheets = [sheet for sheet in all_data.keys() if "Data" in sheet]
     
     # Find series in data sheets
@@ -256,7 +497,8 @@ def get_abs_series_from_excel(
     series = data.iloc[:, column_index]
     
     # File management
-    _manage_abs_file_storage(excel_file_path, verbose)
+    if manage_files:
+        _manage_abs_file_storage(excel_file_path, verbose)
     
     # Parse series data
     start_index = find_header_end(series.index)
@@ -303,34 +545,35 @@ def get_abs_series_from_excel(
     return data_series, metadata_series
 
 
-def _manage_abs_file_storage(excel_file_path: str, verbose: bool = False):
+def _manage_abs_file_storage(excel_file_path: Union[str, List[str]], verbose: bool = False):
     """
-    Copy Excel file to Full_Sheets and clean up LastPull directory.
+    Copy Excel file(s) to Full_Sheets and clean up LastPull directory.
     
-    Internal helper function for file management.
+    Internal helper function for file management. Files in LastPull other than the given ones are deleted.
     """
     try:
         module_dir = os.path.dirname(__file__)
         project_root = os.path.dirname(os.path.dirname(module_dir))
+        excel_file_paths = [excel_file_path] if isinstance(excel_file_path, str) else list(excel_file_path)
         
         # Copy to Full_Sheets
         dest_dir = os.path.join(project_root, "User_Data", "ABS", "Full_Sheets")
         os.makedirs(dest_dir, exist_ok=True)
-        dest_path = os.path.join(dest_dir, os.path.basename(excel_file_path))
-        
-        if os.path.abspath(excel_file_path) != os.path.abspath(dest_path):
-            shutil.copy2(excel_file_path, dest_path)
-            if verbose:
-                print(f"[File] Copied to Full_Sheets: {dest_path}")
+        for path in excel_file_paths:
+            dest_path = os.path.join(dest_dir, os.path.basename(path))
+            if os.path.abspath(path) != os.path.abspath(dest_path):
+                shutil.copy2(path, dest_path)
+                if verbose:
+                    print(f"[File] Copied to Full_Sheets: {dest_path}")
         
         # Clean up LastPull directory
         last_pull_dir = os.path.join(project_root, "User_Data", "ABS", "LastPull")
-        current_file = os.path.basename(excel_file_path)
+        current_files = {os.path.basename(path) for path in excel_file_paths}
         
         if os.path.exists(last_pull_dir):
             for file_name in os.listdir(last_pull_dir):
                 file_path = os.path.join(last_pull_dir, file_name)
-                if os.path.isfile(file_path) and file_name != current_file:
+                if os.path.isfile(file_path) and file_name not in current_files:
                     os.remove(file_path)
                     if verbose:
                         print(f"[File] Deleted old file: {file_name}")
@@ -344,6 +587,14 @@ def _manage_abs_file_storage(excel_file_path: str, verbose: bool = False):
 # RBA FUNCTIONS (R ONLY)
 # ============================================================================
 
+def _rba_call(method: str, params: dict, timeout: float = R_JOB_TIMEOUT):
+    """Run a readrba job on the shared R worker (see read_rba.r for the one-off script equivalent)."""
+    try:
+        return get_r_worker().call(method, params, timeout=timeout)
+    except RWorkerError as e:
+        raise ValueError(f"R worker error: {e}")
+
+
 def browse_rba_tables(searchterm: str = "rate") -> pd.DataFrame:
     """
     Search RBA tables by keyword using R readrba package.
@@ -357,30 +608,11 @@ def browse_rba_tables(searchterm: str = "rate") -> pd.DataFrame:
     --------
     pd.DataFrame : Matching RBA tables
     """
-    module_dir = os.path.dirname(__file__)
-    rba_script_path = os.path.join(module_dir, "read_rba.r")
-    
-    input_dict = {
-        "func": "browse_tables",
-        "searchterm": searchterm
-    }
-    
-    process = subprocess.run(
-        ['Rscript', rba_script_path, json.dumps(input_dict)],
-        capture_output=True, 
-        text=True
-    )
-    
-    output = process.stdout.strip()
-    print(f"\n[RBA] Browse tables results:\n{output}\n")
-    
-    try:
-        json_data = json.loads(output)
-        df = pd.DataFrame(json_data)
-        print(f"[RBA] Columns: {df.columns.tolist()}")
-        return df
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Failed to decode R output: {e}")
+    json_data = _rba_call("rba_browse_tables", {"searchterm": searchterm})
+    df = pd.DataFrame(json_data)
+    print(f"\n[RBA] Browse tables results:\n{df}\n")
+    print(f"[RBA] Columns: {df.columns.tolist()}")
+    return df
 
 
 def browse_rba_series(searchterm: str = "rate") -> pd.DataFrame:
@@ -396,31 +628,12 @@ def browse_rba_series(searchterm: str = "rate") -> pd.DataFrame:
     --------
     pd.DataFrame : Matching RBA series with columns renamed to 'id' and 'title'
     """
-    module_dir = os.path.dirname(__file__)
-    rba_script_path = os.path.join(module_dir, "read_rba.r")
-    
-    input_dict = {
-        "func": "browse_series",
-        "searchterm": searchterm
-    }
-    
-    process = subprocess.run(
-        ['Rscript', rba_script_path, json.dumps(input_dict)],
-        capture_output=True, 
-        text=True
+    json_data = _rba_call("rba_browse_series", {"searchterm": searchterm})
+    df = pd.DataFrame(json_data).rename(
+        columns={"series_id": "id", "table_title": "title"}
     )
-    
-    output = process.stdout.strip()
-    
-    try:
-        json_data = json.loads(output)
-        df = pd.DataFrame(json_data).rename(
-            columns={"series_id": "id", "table_title": "title"}
-        )
-        print(f"[RBA] Columns: {df.columns.tolist()}")
-        return df
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Failed to decode R output: {e}")
+    print(f"[RBA] Columns: {df.columns.tolist()}")
+    return df
 
 
 def get_rba_series(
@@ -447,31 +660,11 @@ def get_rba_series(
         project_root = os.path.dirname(os.path.dirname(module_dir))
         save_path = os.path.join(project_root, "User_Data", "RBA")
     
-    module_dir = os.path.dirname(__file__)
-    rba_script_path = os.path.join(module_dir, "read_rba.r")
-    
-    input_dict = {
-        "func": "get_series",
-        "series_id": series_id,
-        "rba_path": save_path
-    }
-    
-    process = subprocess.run(
-        ['Rscript', rba_script_path, json.dumps(input_dict)],
-        capture_output=True, 
-        text=True
-    )
-    
-    output = process.stdout.strip()
-
+    json_data = _rba_call("rba_get_series", {"series_id": series_id, "rba_path": save_path})
+    df = pd.DataFrame(json_data)
     if verbose:
-        print(f"\n[RBA] {output}\n")
-    
-    try:
-        json_data = json.loads(output)
-        return pd.DataFrame(json_data)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Failed to decode R output: {e}")
+        print(f"\n[RBA] {df}\n")
+    return df
 
 
 # ============================================================================
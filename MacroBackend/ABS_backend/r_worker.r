@@ -0,0 +1,93 @@
+# Long-lived R worker used by abs_series_by_r.RWorker. Speaks line-delimited JSON over stdin/stdout:
+#   request:  {"id": 1, "method": "abs_series", "params": {...}}
+#   response: {"id": 1, "result": ...}  or  {"id": 1, "error": "message"}
+# Jobs are run one at a time in the order received. Only responses go to stdout, anything the libraries print
+# while running a job is captured and passed on to stderr so it can't break the protocol.
+suppressPackageStartupMessages(library(jsonlite))
+
+input <- file("stdin", open = "r")
+
+newest_xlsx <- function(save_path) {
+  files <- list.files(save_path, pattern = "\\.xlsx$", full.names = TRUE)
+  if (length(files) == 0) {
+    return(NULL)
+  }
+  file_info <- file.info(files)
+  rownames(file_info)[which.max(file_info$mtime)]
+}
+
+# Download a batch of ABS series, one read_abs call per series. Returns {series_id: {"path": xlsx} or {"error": msg}},
+# a failure on one series doesn't fail the rest of the batch.
+abs_series <- function(params) {
+  suppressPackageStartupMessages(library(readabs))
+  save_path <- params$save_path
+  dir.create(save_path, showWarnings = FALSE, recursive = TRUE)
+  results <- list()
+  for (series_id in params$series_ids) {
+    results[[series_id]] <- tryCatch({
+      read_abs(series_id = series_id, path = save_path)
+      newest_file <- newest_xlsx(save_path)
+      if (is.null(newest_file)) list(error = "No Excel files were saved") else list(path = newest_file)
+    }, error = function(e) list(error = conditionMessage(e)))
+  }
+  results
+}
+
+load_readrba <- function() {
+  suppressPackageStartupMessages(library(readrba))
+}
+
+methods <- list(
+  ping = function(params) list(pong = TRUE, pid = Sys.getpid()),
+  abs_series = abs_series,
+  rba_get_series = function(params) {
+    load_readrba()
+    read_rba(series_id = params$series_id, path = params$rba_path)
+  },
+  rba_get_table = function(params) {
+    load_readrba()
+    read_rba(table_no = params$table_no, cur_hist = c("current", "historical"), path = params$rba_path)
+  },
+  rba_browse_tables = function(params) {
+    load_readrba()
+    browse_rba_tables(params$searchterm)
+  },
+  rba_browse_series = function(params) {
+    load_readrba()
+    browse_rba_series(params$searchterm)
+  }
+)
+
+respond <- function(msg) {
+  cat(toJSON(msg, auto_unbox = TRUE, dataframe = "rows", null = "null", na = "null", digits = NA), "\n", sep = "")
+  flush(stdout())
+}
+
+run_handler <- function(handler, params) {
+  result <- NULL
+  printed <- utils::capture.output(result <- handler(params))
+  if (length(printed) > 0) {
+    writeLines(printed, con = stderr())
+  }
+  result
+}
+
+while (length(line <- readLines(input, n = 1, warn = FALSE)) > 0) {
+  if (!nzchar(trimws(line))) {
+    next
+  }
+  request <- tryCatch(fromJSON(line), error = function(e) NULL)
+  if (is.null(request) || !is.list(request)) {
+    respond(list(id = NULL, error = "Invalid request"))
+    next
+  }
+  handler <- if (is.character(request$method)) methods[[request$method]] else NULL
+  if (is.null(handler)) {
+    respond(list(id = request$id, error = paste("Unknown method:", request$method)))
+    next
+  }
+  tryCatch(
+    respond(list(id = request$id, result = run_handler(handler, request$params))),
+    error = function(e) respond(list(id = request$id, error = conditionMessage(e)))
+  )
+}
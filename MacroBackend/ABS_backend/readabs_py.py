@@ -5,6 +5,9 @@ This module provides a Python-based interface to the ABS and RBA data using the
 readabs package, replacing the R-based implementation that had issues with series
 ID handling.
 
+ABS lookups go through ABSIndexService (get_abs_index()): the master index is loaded once into memory with a
+series id -> row dict and a tokenized title index, and downloaded catalogs are cached on disk with a TTL.
+
 Main ABS functions:
 - search_series_by_id(): Search for a series by its ABS series ID
 - search_series_by_catalog(): Search for series within a catalog number
@@ -21,8 +24,12 @@ Main RBA functions:
 
 import os
 import sys
+import time
+import pickle
+import threading
+from collections import OrderedDict
 import pandas as pd
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 import readabs as ra
 
 wd = os.path.dirname(os.path.abspath(__file__))
@@ -31,7 +38,184 @@ parent = os.path.dirname(wd); grampa = os.path.dirname(parent)
 
 sys.path.append(grampa)  # Adds MacroBackend to path
 
-from MacroBackend.Utilities import Search_DF_np
+from MacroBackend.Utilities import read_index_table, load_search_index
+
+MASTER_INDEX_PATH = wd+fdel+"abs_master_index.h5"
+CATALOG_CACHE_DIR = grampa+fdel+"User_Data"+fdel+"ABS"+fdel+"catalog_cache"
+CATALOG_CACHE_TTL = 24*3600   # Seconds before a cached catalog is downloaded again.
+
+
+class ABSIndexService(object):
+    """
+    In-memory ABS master index plus an on-disk cache of downloaded catalogs.
+
+    The master index (abs_master_index.h5) is read once and kept until the file's modification time or size
+    changes. Series id -> catalogue number / metadata lookups are dict lookups, title searches use a tokenized
+    index (Utilities.SearchIndex). Catalogs read with ra.read_abs_cat are pickled to cache_dir and reused for
+    catalog_ttl seconds, a cache file that fails to load is discarded and the catalog downloaded again. Series ids
+    seen in cached catalogs are added to the id lookup so that series missing from the master index are only
+    searched for once.
+
+    Parameters:
+    -----------
+    index_path : str
+        Path of the master index file (.h5 with key 'data', .csv or .xlsx)
+    cache_dir : str
+        Directory for cached catalogs
+    catalog_ttl : float
+        Seconds a cached catalog is used for
+    memory_catalogs : int
+        Number of catalogs also kept in memory
+    """
+    id_col = 'Series ID'
+    catalog_col = 'Catalogue number'
+    title_cols = ['Data Item Description', 'Series ID']
+
+    def __init__(self, index_path: str = MASTER_INDEX_PATH, cache_dir: str = CATALOG_CACHE_DIR,
+                 catalog_ttl: float = CATALOG_CACHE_TTL, memory_catalogs: int = 4):
+        self.index_path = index_path
+        self.cache_dir = cache_dir
+        self.catalog_ttl = catalog_ttl
+        self.memory_catalogs = memory_catalogs
+        self._stamp = None
+        self._index = None
+        self._rows = {}           # series id -> list of row positions in the master index
+        self._catalog_ids = {}    # series id -> catalogue number, for series found in cached catalogs
+        self._catalogs = OrderedDict()
+        self._lock = threading.RLock()
+
+    # ---- master index ----
+    def _ensure_index(self) -> Optional[pd.DataFrame]:
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamp != self._stamp:
+                index = read_index_table(self.index_path)
+                ids = index[self.id_col] if self.id_col in index.columns else index.index.to_series()
+                rows = {}
+                for pos, sid in enumerate(ids.astype(str).str.strip()):
+                    rows.setdefault(sid, []).append(pos)
+                self._index, self._rows, self._stamp = index, rows, stamp
+            return self._index
+
+    @property
+    def master_index(self) -> Optional[pd.DataFrame]:
+        return self._ensure_index()
+
+    def index_rows(self, series_id: str) -> Optional[pd.DataFrame]:
+        """Master index rows for a series id (a series can be in more than one catalog), None if not there."""
+        index = self._ensure_index()
+        if index is None:
+            return None
+        positions = self._rows.get(str(series_id).strip())
+        return index.iloc[positions] if positions else None
+
+    def catalogue_for(self, series_id: str) -> Optional[str]:
+        """Catalogue number for a series id, from the master index or previously read catalogs."""
+        rows = self.index_rows(series_id)
+        if rows is not None and self.catalog_col in rows.columns:
+            return rows[self.catalog_col].iloc[0]
+        return self._catalog_ids.get(str(series_id).strip())
+
+    def metadata_for(self, series_id: str, catalog_num: Optional[str] = None) -> Optional[pd.Series]:
+        """Master index row for a series id, optionally restricted to one catalog."""
+        rows = self.index_rows(series_id)
+        if rows is None:
+            return None
+        if catalog_num is not None and self.catalog_col in rows.columns:
+            rows = rows[rows[self.catalog_col] == catalog_num]
+        return rows.iloc[0] if not rows.empty else None
+
+    def search_titles(self, search_term: str) -> pd.DataFrame:
+        """Master index rows whose description/series id contain all the words in search_term (prefix matched)."""
+        index = self._ensure_index()
+        if index is None:
+            return pd.DataFrame()
+        cols = [col for col in self.title_cols if col in index.columns]
+        return load_search_index(self.index_path, search_cols=cols or None).search(search_term)
+
+    # ---- catalogs ----
+    def _catalog_path(self, cat: str) -> str:
+        safe = "".join(ch if ch.isalnum() or ch in "._-" else "_" for ch in str(cat))
+        return self.cache_dir+fdel+f"cat_{safe}.pkl"
+
+    def _read_cached_catalog(self, cat: str):
+        path = self._catalog_path(cat)
+        try:
+            if time.time() - os.path.getmtime(path) > self.catalog_ttl:
+                return None
+            with open(path, 'rb') as f:
+                data_dict, metadata_df = pickle.load(f)
+            if not isinstance(data_dict, dict) or not isinstance(metadata_df, pd.DataFrame):
+                raise ValueError("unexpected cache content")
+            return data_dict, metadata_df
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding unreadable ABS catalog cache {path}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _write_cached_catalog(self, cat: str, data_dict: dict, metadata_df: pd.DataFrame):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._catalog_path(cat)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump((data_dict, metadata_df), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not cache ABS catalog {cat}: {e}")
+
+    def read_catalog(self, cat: str, verbose: bool = False, refresh: bool = False) -> Tuple[dict, pd.DataFrame]:
+        """ra.read_abs_cat(cat) through the memory & disk caches. refresh=True forces a download."""
+        key = str(cat)
+        with self._lock:
+            if not refresh and key in self._catalogs:
+                stamp, result = self._catalogs[key]
+                if time.time() - stamp <= self.catalog_ttl:
+                    self._catalogs.move_to_end(key)
+                    return result
+        result = None if refresh else self._read_cached_catalog(key)
+        if result is None:
+            if verbose:
+                print(f"Downloading ABS catalog {key}")
+            result = ra.read_abs_cat(cat=cat, verbose=verbose)
+            self._write_cached_catalog(key, *result)
+        with self._lock:
+            self._catalogs[key] = (time.time(), result)
+            self._catalogs.move_to_end(key)
+            while len(self._catalogs) > self.memory_catalogs:
+                self._catalogs.popitem(last=False)
+            metadata_df = result[1]
+            if metadata_df is not None and 'series_id' in metadata_df.columns:
+                for sid in metadata_df['series_id'].astype(str).str.strip():
+                    self._catalog_ids.setdefault(sid, key)
+        return result
+
+    def clear(self):
+        """Drop the in-memory state (the disk cache is kept)."""
+        with self._lock:
+            self._stamp = None; self._index = None; self._rows = {}
+            self._catalog_ids = {}; self._catalogs.clear()
+
+
+_abs_index = None
+_abs_index_lock = threading.Lock()
+
+def get_abs_index() -> ABSIndexService:
+    """Shared ABSIndexService for this process."""
+    global _abs_index
+    with _abs_index_lock:
+        if _abs_index is None:
+            _abs_index = ABSIndexService()
+        return _abs_index
 
 
 def search_series_by_id(series_id: str, catnum: Optional[float] =  None, verbose: bool = False) -> Optional[Dict[str, Any]]:
@@ -53,18 +237,27 @@ def search_series_by_id(series_id: str, catnum: Optional[float] =  None, verbose
     try:
         if verbose:
             print(f"Searching for series ID: {series_id}")
+        index = get_abs_index()
         
-        # Get the ABS catalogue to search metadata
-        catalogue = ra.abs_catalogue(cache_only=False, verbose=verbose)
+        if catnum is None:
+            catnum = index.catalogue_for(series_id)
         
-        if catalogue is None or catalogue.empty:
+        if catnum is not None:
+            catalogs = [catnum]
+        else:
+            # Get the ABS catalogue to search metadata
+            catalogue = ra.abs_catalogue(cache_only=False, verbose=verbose)
+            if catalogue is None or catalogue.empty:
+                return None
             print("No catalogue number supplied, we will search through all available catalogs, this'll take some time...")
-            for catnum in catalogue.index:
-                data_dict, metadata_df = ra.read_abs_cat(cat=catnum, verbose=verbose)
-                series_mask = metadata_df['series_id'].astype(str) == series_id
-                if series_mask.any():
-                    return metadata_df[series_mask].iloc[0].to_dict()
-
+            catalogs = list(catalogue.index)
+        
+        for cat in catalogs:
+            data_dict, metadata_df = index.read_catalog(cat, verbose=verbose)
+            series_mask = metadata_df['series_id'].astype(str) == series_id
+            if series_mask.any():
+                return metadata_df[series_mask].iloc[0].to_dict()
+        return None
     
     except Exception as e:
         print(f"Error searching for series {series_id}: {e}")
@@ -98,7 +291,7 @@ def search_series_by_catalog(
             print(f"Searching catalog {catalog_num}")
         
         # Read the entire catalog
-        data_dict, metadata_df = ra.read_abs_cat(cat=catalog_num, verbose=verbose)
+        data_dict, metadata_df = get_abs_index().read_catalog(catalog_num, verbose=verbose)
         
         if search_terms is None:
             return metadata_df
@@ -160,7 +353,7 @@ def get_series_metadata(
                 print(f"Getting metadata for {series_id} from catalog {catalog_num}")
             
             # Read the catalog data and metadata
-            data_dict, metadata_df = ra.read_abs_cat(cat=catalog_num, verbose=verbose)
+            data_dict, metadata_df = get_abs_index().read_catalog(catalog_num, verbose=verbose)
             
             # Find the series in metadata
             series_mask = metadata_df['series_id'].astype(str) == series_id
@@ -340,7 +533,7 @@ def search_by_description(
             print(f"Searching catalog {catalog_num} for description: {description_filter}")
         
         # Get the catalog metadata
-        _, metadata_df = ra.read_abs_cat(cat=catalog_num, verbose=verbose)
+        _, metadata_df = get_abs_index().read_catalog(catalog_num, verbose=verbose)
         
         # Search in common description columns
         desc_columns = ['description', 'series', 'did', 'table_title']
@@ -399,7 +592,7 @@ def get_abs_catalogue(
 
 def get_catalogue_num_for_series(series_id: str) -> str:
         """
-        Get the catalogue number for a given series ID by searching the ABS master index, loaded from file (HDFStore)
+        Get the catalogue number for a given series ID from the ABS master index (see ABSIndexService).
 
         Parameters:
 
@@ -410,17 +603,7 @@ def get_catalogue_num_for_series(series_id: str) -> str:
         str
             The catalogue number associated with the series ID
         """
-        masterIndex = pd.read_hdf(wd+fdel+"abs_master_index.h5", key='data')
-        result = Search_DF_np(masterIndex, series_id, verbose=False)
-        if result is not None and not result.empty:
-            if isinstance(result, pd.DataFrame):
-                catalog_num = result.loc['Catalogue number'].iloc[0]
-            elif isinstance(result, pd.Series):
-                catalog_num = result.loc['Catalogue number']
-            else:
-                catalog_num = None
-        else:
-            catalog_num = None
+        catalog_num = get_abs_index().catalogue_for(series_id)
 
         if catalog_num is None:
             raise ValueError(f"Series ID {series_id} not found in any catalog")
@@ -435,27 +618,15 @@ def get_metadata_from_index(series_id: str, catalog_num: str) -> Optional[pd.Ser
     -----------
     series_id : str
         The ABS series ID to look up
+    catalog_num : str or None
+        Only return the entry for this catalog if given
 
     Returns:
     --------
     pd.Series or None
         Series containing metadata for the specified series, or None if not found
     """
-    masterIndex = pd.read_hdf(wd+fdel+"abs_master_index.h5", key='data')
-
-    if catalog_num is not None:
-        result = masterIndex[(masterIndex['Catalogue number'] == catalog_num) & (masterIndex['Series ID'] == series_id)]
-        if not result.empty:
-            return result.iloc[0]
-        else:
-            return None
-    else:
-        result = Search_DF_np(masterIndex, series_id, use_cols=['Data Item Description', "Series ID"], verbose=False)
-
-    if result is not None and not result.empty:
-        return result.iloc[0]
-    else:
-        return None
+    return get_abs_index().metadata_for(series_id, catalog_num=catalog_num)
 
 
 # ============================================================================
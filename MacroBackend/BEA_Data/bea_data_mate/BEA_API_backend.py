@@ -190,40 +190,22 @@ class BEA_Data(pybea.client.BureauEconomicAnalysisClient):
         SeriesInfo = pd.Series(Data.iloc[0],name=tDesc)
         SeriesInfo.drop(['LineDescription','NoteRef','LineNumber','TimePeriod','DataValue'],axis=0,inplace=True)   
 
-    ################## Split the table into separate time-series.
-        i = 0; names = []; codes = []
-        for cat in categories:
-            category = pd.DataFrame(Data[Data['LineDescription'] == cat])
-            category.drop_duplicates("TimePeriod",inplace=True)
-            if frequency == 'M':
-                periods = category["TimePeriod"].to_list()
-                refd = [str(per).replace('M',"-") for per in periods]
-                idx = pd.PeriodIndex(refd,freq = frequency)
-                category.drop("TimePeriod",axis=1,inplace=True)
-            else:
-                idx = pd.PeriodIndex(category["TimePeriod"],freq = frequency)
-            dtI = idx.to_timestamp(freq=frequency, how='start')
-            category.set_index(dtI,inplace=True)
-            catSeries = pd.Series(category["DataValue"],name=cat)
-            names.append(cat); codes.append(str(category['SeriesCode'].iloc[0]))
-
-            if i == 0:
-                FinalData = catSeries.copy()
-            else:
-                if len(FinalData.index.difference(catSeries.index)) > 0:
-                    NanSeries = pd.Series(np.nan,index=FinalData.index.difference(catSeries.index))
-                    bilp = pd.concat([NanSeries,catSeries],axis=0); bilp.rename(catSeries.name,inplace=True)
-                    if (FinalData.index.is_monotonic_increasing or FinalData.index.is_monotonic_decreasing) and \
-                        (bilp.index.is_monotonic_increasing or bilp.index.is_monotonic_decreasing):
-                            bilp = bilp.sort_index().reindex(index=FinalData.index.sort_values(), method='pad')
-                    FinalData = pd.concat([FinalData,bilp],axis=1)
-                else:    
-                    FinalData = pd.concat([FinalData,catSeries],axis=1)
-            i += 1
-        FinalData.index.rename("TimePeriod",inplace=True)      
-        # Apply the conversion function to the entire DataFrame
-        for column in FinalData.columns:
-            FinalData[column] = FinalData[column].apply(convert_to_float_with_commas)  
+    ################## Reshape the long table into one column per line, in a single pass.
+        # Lines sharing a LineDescription become one column, keeping the first value for each period.
+        long = Data.drop_duplicates(['LineDescription','TimePeriod'])
+        periods = long['TimePeriod'].astype(str)
+        if frequency == 'M':
+            periods = periods.str.replace('M', '-', regex=False)
+        # Parse each distinct period once, e.g. "2020M01" or "2020Q1", rather than once per row.
+        uniq = periods.unique()
+        dtI = pd.PeriodIndex(uniq, freq = frequency).to_timestamp(freq=frequency, how='start')
+        values = pd.to_numeric(long['DataValue'].astype(str).str.replace(',', '', regex=False), errors='coerce').astype(float)
+        long = pd.DataFrame({"TimePeriod": periods.map(dict(zip(uniq, dtI))).to_numpy(),
+                             "LineDescription": long['LineDescription'].to_numpy(), "DataValue": values.to_numpy()})
+        FinalData = long.pivot(index="TimePeriod", columns="LineDescription", values="DataValue").reindex(columns=categories)
+        FinalData.columns.name = None
+        names = list(categories)
+        codes = Data.drop_duplicates('LineDescription')['SeriesCode'].astype(str).to_list()
         SeriesCodes = pd.Series(codes,index=names)     
         SeriesInfo = pd.concat([SeriesInfo,SeriesCodes],axis=0).rename('SeriesInfo')
         return SeriesInfo,FinalData   
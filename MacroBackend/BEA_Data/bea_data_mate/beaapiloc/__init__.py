@@ -1,7 +1,7 @@
 __all__ = ['api_request', 'get_data', 'get_data_set_list', 'get_parameter_list',
            'get_parameter_values', 'update_metadata', 'search_metadata',
            'get_parameter_values_filtered', 'to_wide_vars_in_cols',
-           'to_wide_vars_in_rows', 'ThrottlingCaller', 'BEAAPIError', 'BEAAPIFailure',
+           'to_wide_vars_in_rows', 'ThrottlingCaller', 'SlidingWindowLimiter', 'BEAAPIError', 'BEAAPIFailure',
            'BEAAPIResponseError', 'BEAAPIPkgException']
 from .beaapi_error import BEAAPIError, BEAAPIFailure, BEAAPIResponseError, BEAAPIPkgException
 from .api_request import api_request
@@ -12,7 +12,7 @@ from .get_parameter_values import get_parameter_values
 from .get_parameter_values_filtered import get_parameter_values_filtered
 from .update_metadata import update_metadata
 from .search_metadata import search_metadata
-from .throttling_caller import ThrottlingCaller
+from .throttling_caller import ThrottlingCaller, SlidingWindowLimiter
 
 #: Max lenght of API responses per minute before throttling happens
 MAX_DATA_PER_MINUTE = 100 * 1000 * 1024
@@ -97,12 +97,9 @@ def api_request(beaspec: Dict[str, str], as_string: bool = False, as_dict: bool
     bea_url = 'https://apps.bea.gov/api/data/?%s' % params
 
     if throttle:
-        from .throttling_caller import throttling_data, ThrottlingCaller
+        from .throttling_caller import throttling_data, get_throttling_caller
         userid = beaspec['userid']
-        if userid not in throttling_data:
-            throttling_data[userid] = ThrottlingCaller()
-
-        throttling_data[userid].wait_until_available()
+        get_throttling_caller(userid).wait_until_available()
 
     # Make the API call and, for now, just return the response
     with urllib.request.urlopen(bea_url) as f:
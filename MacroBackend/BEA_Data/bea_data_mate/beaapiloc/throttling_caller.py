@@ -5,61 +5,222 @@
 # If the user exceeds this a `urllib.error.HTTPError` is raised (with the error's
 # `.code==429`) and they will be denied access for 1 hour.
 #
-# Like https://github.com/tomasbasham/ratelimit but incorporates size limits
+# Like https://github.com/tomasbasham/ratelimit but incorporates size limits.
+#
+# Usage is tracked in a sliding window log: a deque of (time, requests, size, errors)
+# events plus running totals, expired from the left as time moves on. As the BEA
+# limits cap requests per minute the log never holds more than a few hundred events,
+# so every operation is O(1) amortized. Set BEAAPI_THROTTLE_DIR to share the limits
+# between processes through a small JSON state file per user id.
+import os
+import json
 import time
+import hashlib
+import asyncio
+import datetime
+import threading
+from collections import deque
 from typing import Callable, Union, Optional, Dict
-import pandas as pd
 import beaapiloc
 
 
+class _FileLock(object):
+    # Minimal cross-process lock: exclusive creation of a lock file next to the state file.
+    def __init__(self, path: str, timeout: float = 10.0, stale: float = 30.0):
+        self.path = path + '.lock'
+        self.timeout = timeout
+        self.stale = stale
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale:
+                        os.remove(self.path)  # Left behind by a crashed process.
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not acquire throttling state lock {self.path}")
+                time.sleep(0.01)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class SlidingWindowLimiter(object):
+    # Limits requests, response bytes and errors over a sliding time window.
+    # reserve() never sleeps: it books a request slot at the earliest allowed time and
+    # returns how long the caller has to wait for it. All methods are thread-safe and
+    # only hold the lock briefly, so they can also be used from asyncio code.
+    def __init__(self, max_requests: int, max_bytes: float, max_errors: int,
+                 window: float = 60.0, margin: float = 1.0,
+                 state_file: Optional[str] = None, clock: Callable[[], float] = time.time):
+        self.limits = (max_requests, max_bytes, max_errors)
+        self.window = window
+        self.margin = margin
+        self.state_file = state_file
+        self.clock = clock
+        self._events = deque()  # [time, requests, size, errors], times non-decreasing
+        self._totals = [0, 0.0, 0]
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._events and self._events[0][0] + self.window <= now:
+            t, r, s, e = self._events.popleft()
+            self._totals[0] -= r
+            self._totals[1] -= s
+            self._totals[2] -= e
+
+    def _free_at(self, dim: int, limit: float) -> float:
+        # Earliest time at which the window total of dimension dim drops below limit.
+        total = self._totals[dim]
+        if total < limit:
+            return 0.0
+        for event in self._events:
+            total -= event[dim + 1]
+            if total < limit:
+                return event[0] + self.window
+        return 0.0
+
+    def _append(self, t: float, requests: int = 0, size: float = 0.0, errors: int = 0) -> None:
+        if self._events:
+            t = max(t, self._events[-1][0])  # Keep the log ordered for _expire.
+        self._events.append([t, requests, size, errors])
+        self._totals[0] += requests
+        self._totals[1] += size
+        self._totals[2] += errors
+
+    def _load(self) -> None:
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._events = deque(state.get("events", []))
+        self._totals = [sum(e[1] for e in self._events), sum(e[2] for e in self._events),
+                        sum(e[3] for e in self._events)]
+        self._blocked_until = state.get("blocked_until", 0.0)
+
+    def _save(self) -> None:
+        tmp = self.state_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({"events": list(self._events), "blocked_until": self._blocked_until}, f)
+        os.replace(tmp, self.state_file)
+
+    def _update(self, func: Callable[[float], float]):
+        # Run func(now) on the current state, syncing with the state file if there is one.
+        with self._lock:
+            if self.state_file is None:
+                now = self.clock()
+                self._expire(now)
+                return func(now)
+            with _FileLock(self.state_file):
+                self._load()
+                now = self.clock()
+                self._expire(now)
+                result = func(now)
+                self._save()
+                return result
+
+    def reserve(self) -> float:
+        """Book a request slot, returns the seconds to wait before making the request (0 if none)."""
+        def _reserve(now):
+            start = max([now, self._blocked_until] +
+                        [self._free_at(dim, limit) for dim, limit in enumerate(self.limits)])
+            delay = start - now
+            if delay > 0:
+                delay += self.margin
+            self._append(now + delay, requests=1)
+            return delay
+        return self._update(_reserve)
+
+    def record(self, size: float = 0.0, errors: int = 0, requests: int = 0,
+               at: Optional[float] = None) -> None:
+        """Add response bytes/errors (and requests not booked through reserve) to the window."""
+        self._update(lambda now: self._append(now if at is None else at, requests, size, errors))
+
+    def block_for(self, seconds: float) -> None:
+        """Hold off all requests for the given number of seconds from now."""
+        def _block(now):
+            self._blocked_until = max(self._blocked_until, now + seconds)
+        self._update(_block)
+
+    @property
+    def blocked_until(self) -> float:
+        return self._blocked_until
+
+    def usage(self) -> Dict[str, float]:
+        """Requests, bytes and errors in the current window."""
+        def _usage(now):
+            return dict(zip(("requests", "size", "errors"), self._totals))
+        return self._update(_usage)
+
+    def events(self) -> list:
+        with self._lock:
+            return [list(e) for e in self._events]
+
+
+def _to_epoch(n: Union[float, datetime.datetime]) -> float:
+    if isinstance(n, datetime.datetime):
+        if n.tzinfo is None:  # Naive times (e.g pd.Timestamp.now()) are local time.
+            return time.mktime(n.timetuple()) + n.microsecond / 1e6
+        return n.astimezone(datetime.timezone.utc).timestamp()
+    return float(n)
+
+
 class ThrottlingCaller(object):
     # An instance of this class encapsulates information to self-throttle api calls.
     # Just wrap a bea callable and they will be called slow
     # enough to not go over the BEA limits.
-    def __init__(self):
-        self.rel_queries = pd.DataFrame({'time': pd.Series(dtype='datetime64[ns]'),
-                                         'size': pd.Series(dtype='float'),
-                                         'errors': pd.Series(dtype='int')})
-        self.wait_prev_failure = False
+    def __init__(self, state_file: Optional[str] = None, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.limiter = SlidingWindowLimiter(beaapiloc.MAX_REQUESTS_PER_MINUTE,
+                                            beaapiloc.MAX_DATA_PER_MINUTE,
+                                            beaapiloc.MAX_ERRORS_PER_MINUTE,
+                                            state_file=state_file, clock=clock)
+        self.sleep = sleep
+        self._booked = 0  # Requests reserved through wait_until_available not yet logged.
+        self._booked_lock = threading.Lock()
 
-    def wait_until_available(self) -> None:
+    @property
+    def wait_prev_failure(self) -> bool:
+        return self.limiter.blocked_until > self.limiter.clock()
+
+    @wait_prev_failure.setter
+    def wait_prev_failure(self, value: bool) -> None:
         # If the previous one failed, it might have been a large volume,
         # but we won't know. So be conservative
-        if self.wait_prev_failure:
-            time.sleep(60)
-            self.wait_prev_failure = False
-            return
+        if value:
+            self.limiter.block_for(60)
+
+    def reserve(self) -> float:
+        # Non-sleeping: books a request slot and returns the seconds to wait for it.
+        delay = self.limiter.reserve()
+        with self._booked_lock:
+            self._booked += 1
+        return delay
 
-        # wait till not-too-many requests
-        n = pd.Timestamp.now()
-        mask = self.rel_queries['time'] >= n - pd.Timedelta(1, "minute")
-        if self.rel_queries[mask].shape[0] >= beaapiloc.MAX_REQUESTS_PER_MINUTE:
-            # allowable in the last minute
-            n_not_allow = self.rel_queries.shape[0] - beaapiloc.MAX_REQUESTS_PER_MINUTE + 1
-            allowable_mask = self.rel_queries.index >= n_not_allow
-            oldest_allowable_ts = self.rel_queries[allowable_mask]['time'].min()
-            time.sleep(60 - (n - oldest_allowable_ts).seconds + 1)
-
-        # wait till not too much volume
-        n = pd.Timestamp.now()
-        mask = self.rel_queries['time'] >= n - pd.Timedelta(1, "minute")
-        if self.rel_queries['size'][mask].sum() >= beaapiloc.MAX_DATA_PER_MINUTE:
-            rev_cumsum = self.rel_queries.iloc[::-1]['size'].cumsum().iloc[::-1]
-            allowable_mask = rev_cumsum < beaapiloc.MAX_DATA_PER_MINUTE
-            oldest_allowable_ts = self.rel_queries[allowable_mask]['time'].min()
-            time.sleep(60 - (n - oldest_allowable_ts).seconds + 1)
-
-        # wait till not-too-many errors
-        n = pd.Timestamp.now()
-        mask = self.rel_queries['time'] >= n - pd.Timedelta(1, "minute")
-        if self.rel_queries['errors'][mask].sum() >= beaapiloc.MAX_ERRORS_PER_MINUTE:
-            rev_cumsum = self.rel_queries.iloc[::-1]['errors'].cumsum().iloc[::-1]
-            allowable_mask = rev_cumsum < beaapiloc.MAX_ERRORS_PER_MINUTE
-            oldest_allowable_ts = self.rel_queries[allowable_mask]['time'].min()
-            time.sleep(60 - (n - oldest_allowable_ts).seconds + 1)
+    def wait_until_available(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            self.sleep(delay)
+
+    async def wait_until_available_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
     def wait_full_reset(self) -> None:
-        time.sleep(60)
+        self.sleep(60)
 
     def single_call(self, beacall: Callable) -> None:
         self.wait_until_available()
@@ -75,17 +236,42 @@ class ThrottlingCaller(object):
         return(bea_tbl)
 
     def log_query(self, size: Union[int, float], err: bool = False,
-                  n: Optional[pd.Timestamp] = None) -> None:
-        if n is None:
-            n = pd.Timestamp.now()
+                  n: Optional[Union[float, datetime.datetime]] = None) -> None:
+        # A query that went through wait_until_available/reserve already has its
+        # request counted, otherwise count it here.
+        with self._booked_lock:
+            booked = self._booked > 0
+            if booked:
+                self._booked -= 1
+        self.limiter.record(size=size or 0, errors=int(err), requests=0 if booked else 1,
+                            at=None if n is None else _to_epoch(n))
+
+    @property
+    def rel_queries(self):
+        # Events in the current window as a DataFrame (time, size, errors), like the old log.
+        import pandas as pd
+        events = self.limiter.events()
+        return pd.DataFrame({'time': pd.to_datetime([e[0] for e in events], unit='s'),
+                             'size': [float(e[2]) for e in events],
+                             'errors': [int(e[3]) for e in events]})
+
 
-        # Otherwise get "PerformanceWarning: DataFrame is highly fragmented."
-        # from normal insertion rel_queries.loc[self.rel_queries.shape[0]] = (n, size)
-        self.rel_queries = pd.concat([self.rel_queries,
-                                      pd.DataFrame({'time': [n], 'size': [size],
-                                                    'errors':[int(err)]})],
-                                     axis=0).reset_index(drop=True)
+# Global to keep track of throlling data (by user id)
+throttling_data: Dict[str, ThrottlingCaller] = {}
+_throttling_lock = threading.Lock()
 
 
-# Global to keep track of throlling data (by )
-throttling_data : Dict[str, ThrottlingCaller] = {}
+def get_throttling_caller(userid: str) -> ThrottlingCaller:
+    # Shared ThrottlingCaller for a user id, with state in $BEAAPI_THROTTLE_DIR if set.
+    with _throttling_lock:
+        if userid not in throttling_data:
+            state_dir = os.environ.get("BEAAPI_THROTTLE_DIR")
+            state_file = None
+            if state_dir:
+                os.makedirs(state_dir, exist_ok=True)
+                # A hash of the full key: no part of the key ends up in the file name, and keys sharing a prefix
+                # don't share a limiter.
+                key_hash = hashlib.sha256(userid.encode("utf-8")).hexdigest()[:16]
+                state_file = os.path.join(state_dir, f"bea_throttle_{key_hash}.json")
+            throttling_data[userid] = ThrottlingCaller(state_file=state_file)
+        return throttling_data[userid]
@@ -51,7 +51,7 @@ def search_series(search_string, series:pd.Series):  ##This unction will be used
 def UpdateGNMetrics(APIKey:str) -> pd.DataFrame: #Use this to occaisonally update the excel file containing the list of all GN metrics. 
     print('Updating excel file that has the list of all GlassNode metrics/endpoints.....')
     #make API request
-    res = requests.get("https://api.glassnode.com/v1/metadata/metrics", params={'a': 'BTC', 'api_key': APIKey})
+    res = Utilities.http_get("https://api.glassnode.com/v1/metadata/metrics", params={'a': 'BTC', 'api_key': APIKey})
     #convert to pandas dataframe
     print("Raw response text from Glassnode API for metrics list: ", res.text[:500])  #Print first 500 characters of response text for debugging
     df = pd.read_json(io.StringIO(res.text), convert_dates=['t'])
@@ -96,9 +96,9 @@ def GetMetric(path:str,APIKey:str = None, params:dict=None, format: str='json'):
             quit()
         else:
             params['api_key'] = key
-        r = requests.get(url, params)
+        r = Utilities.http_get(url, params)
     else:    
-        r = requests.get(url, params={'a': 'BTC', 'api_key': APIKey, 'f': format})
+        r = Utilities.http_get(url, params={'a': 'BTC', 'api_key': APIKey, 'f': format})
     
     if r.status_code != 200:
         print('Failure! What went wrong?',r.status_code, r.reason)
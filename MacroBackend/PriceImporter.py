@@ -13,6 +13,7 @@ import sys
 import re
 import enum
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 wd = os.path.dirname(os.path.realpath(__file__))
 parent = os.path.dirname(wd)
@@ -21,7 +22,7 @@ sys.path.append(parent); sys.path.append(wd);
 print("Current working directory: ", wd, "\nParent directory: ", parent)
 
 from tvDatafeedz import TvDatafeed, Interval #This package 'tvDatafeed' is not available through pip, ive included in the project folder. 
-from MacroBackend import Utilities
+from MacroBackend import Utilities, growth
 
 ## ACCTION BELOW... ######################################################################################################################################
 class TimeInterval(enum.Enum):
@@ -46,7 +47,7 @@ def CoinGeckoPriceHistory(CoinID: str, TimeLength: int = 365, api_key: str = Non
     if api_key is None:
         TimeLength = 365
     url = r'https://api.coingecko.com/api/v3/coins/'+CoinID+r'/market_chart?vs_currency=usd&days='+str(TimeLength)+r'&interval=daily' 
-    r = requests.get(url)           #Requests calls the coin gecko API. I'll have to figure out how to add trading view too. 
+    r = Utilities.http_get(url)           #Requests calls the coin gecko API. I'll have to figure out how to add trading view too. 
     print("Coin gecko API response: \n",r)
     df = pd.DataFrame.from_dict(r.json())
 
@@ -87,7 +88,7 @@ def GetFullListofCoinsCG() -> pd.DataFrame:
         pd.DataFrame: DataFrame containing the list of coins with their IDs and symbols.
     """
     url = 'https://api.coingecko.com/api/v3/coins/list'
-    r = requests.get(url)   #Requests calls the coin gecko API. I'll have to figure out how to add trading view too. 
+    r = Utilities.http_get(url)   #Requests calls the coin gecko API. I'll have to figure out how to add trading view too. 
     df = pd.read_csv(io.StringIO(r.text))
     df = pd.DataFrame.from_dict(r.json())
     return df
@@ -323,24 +324,20 @@ def pullyfseries(ticker: str, start: str = "2020-01-01", end: str = None, interv
     return PriceData, ticker, SeriesInfo
 
 def YoYCalcFromDaily(series): 
+    """YoY % change of a series on a calendar daily grid, value at t vs. value at t - 365 days. Non daily data is 
+    resampled to daily & forward filled first. See growth.yoy_growth for a version that keeps the input frequency."""
     print('\nYoY calcuation on series: , data frequency: ',pd.infer_freq(series.index))
     if series.index.inferred_freq != 'D':
         print('Resampling',series.name,'to daily frequency for YoY calculation....')
-        series = series.resample('D').mean()
-        series.fillna(method='ffill',inplace=True) #This'l make it daily data even if weekly data is input. 
-    YoYCalc = [np.nan for i in range(len(series))]
-    YoYSeries = pd.Series(YoYCalc,index=series.index)
-    for i in range(365,len(series),1):
-        YoYSeries.iloc[i] = (((series[series.index[i]]-series[series.index[i-365]])/series[series.index[i-365]])*100)
-    #print('After YoY calc: ',YoYSeries.tail(54),len(YoYSeries))        
+        series = growth.to_daily(series) #This'l make it daily data even if weekly data is input. 
+    YoYSeries = growth.pct_growth(series, offset=pd.Timedelta(days=365))
+    YoYSeries.name = None
     return YoYSeries   
 
 def YoY4Monthly(series:pd.Series): #Input monthly data and get out monthly series.
     series.fillna(method='ffill',inplace=True)
-    YoYCalc = [np.nan for i in range(12)]
-    for i in range(12,len(series),1):
-        YoYCalc.append(((series[i]-series[i-12])/series[i-12])*100)
-    YoYSeries = pd.Series(YoYCalc,index=series.index,name='YoY % change')    
+    YoYSeries = growth.pct_growth(series, periods=12)
+    YoYSeries.name = 'YoY % change'
     return YoYSeries        
 
 def FREDSearch(search_text:str,apiKey:str, save_output: bool = True):
@@ -350,7 +347,7 @@ def FREDSearch(search_text:str,apiKey:str, save_output: bool = True):
     for searchType in searchTypes:
         searchType = "&search_type="+searchType
         search = "https://api.stlouisfed.org/fred/series/search?search_text="+search_text+searchType  
-        r = requests.get(search+"&api_key="+myFredAPI_key+fileType)
+        r = Utilities.http_get(search+"&api_key="+myFredAPI_key+fileType)
         df = pd.json_normalize(r.json())
         df2 = pd.DataFrame.from_dict(df['seriess'][0])
         if i == 0:
@@ -524,7 +521,12 @@ def PullFredSeries(series:str,apikey:str,start="1776-07-04",filetype="&file_type
         start = "1776-07-04"
           
     series_header = "https://api.stlouisfed.org/fred/series?series_id="      ##This pulls data series from FRED API. 
-    r = requests.get(series_header+series+"&observation_start="+start+"&api_key="+apikey+filetype)
+    series_data = "https://api.stlouisfed.org/fred/series/observations?series_id="  
+    # Series info and observations are requested at the same time over the shared keep-alive session.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        info_req = pool.submit(Utilities.http_get, series_header+series+"&observation_start="+start+"&api_key="+apikey+filetype)
+        data_req = pool.submit(Utilities.http_get, series_data+series+"&observation_start="+start+"&api_key="+apikey+filetype)
+        r, r_data = info_req.result(), data_req.result()
     print('FRED API response: ',r.status_code)
     if r.status_code != 200:
         print('Attempt to get series: ',series,' info from FRED has failed. Error message: ',r.text, 
@@ -535,8 +537,7 @@ def PullFredSeries(series:str,apikey:str,start="1776-07-04",filetype="&file_type
     df2 = df2.squeeze()
     SeriesInfo = pd.Series(df2,name=series)
     
-    series_data = "https://api.stlouisfed.org/fred/series/observations?series_id="  
-    r = requests.get(series_data+series+"&observation_start="+start+"&api_key="+apikey+filetype)
+    r = r_data
     if r.status_code != 200:
         print('Attempt to get series: ',series,' data from FRED has failed. Check internet connection perhaps. Pulling out')
         quit()
@@ -579,64 +580,24 @@ def PullFredSeries(series:str,apikey:str,start="1776-07-04",filetype="&file_type
     TheData = TheData[startChart:endDate]    
     return SeriesInfo, TheData    
 
-def PullTGA_Data(AccountName = 'Federal Reserve Account',start_date='2000-01-01') -> pd.DataFrame:
-    urlBase = 'https://api.fiscaldata.treasury.gov/services/api/fiscal_service'
-    TrGenAccBal = '/v1/accounting/dts/operating_cash_balance'
-    fields = '?fields=record_date,account_type,close_today_bal,open_today_bal,open_month_bal'
-    filters = '&filter=record_date:gte:'+start_date
+TREASURY_API_URL = 'https://api.fiscaldata.treasury.gov/services/api/fiscal_service'
 
-    FullData = pd.DataFrame(); exceptions = 0
-    for i in range(10000):
-        if exceptions > 5: 
-            print('Enuff of dis shit...')
-            break  
-
-        if i == 0:
-            url = urlBase+TrGenAccBal+fields+filters
-            NextDSStart = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
-            LastSetFinDay = start_date
-
-        elif i > 0 and NextDSStart is not None and NextDSStart >= datetime.date.today():
-            break    
-        else:
-            filt = '&filter=record_date:gte:'+str(NextDSStart)
-            url = urlBase+TrGenAccBal+fields+filt
-            LastSetFinDay = LastDay
+def PullTGA_Data(AccountName = 'Federal Reserve Account',start_date='2000-01-01', max_workers: int = 6) -> pd.DataFrame:
+    """
+    Daily Treasury Statement operating cash balance rows for one account type, e.g. 'Treasury General Account (TGA) Closing Balance'.
+    Pages of the operating_cash_balance table are pulled concurrently via treasury_api_paginated. Returns a DataFrame indexed by record_date.
+    """
+    data = treasury_api_paginated(endpoint='/v1/accounting/dts/operating_cash_balance', start_date=start_date,
+                                  fields='record_date,account_type,close_today_bal,open_today_bal,open_month_bal',
+                                  page_size=1000, max_workers=max_workers)
+    if data.empty or 'account_type' not in data.columns:
+        print("No TGA data returned from treasury API for start date: ", start_date)
+        return pd.DataFrame()
 
-        try:
-            r = requests.get(url)
-            print('TGA API Request number: '+str(i)+',', url)
-            if r.status_code != 200:
-                print("Couldn't pull data from this date: ",NextDSStart)
-                print(r.text)
-                exceptions += 1  
-                continue
-            df = pd.json_normalize(r.json())
-            data = pd.json_normalize(df['data'][0])
-            print(data)
-            if len(data) < 1:
-                break
-            df.drop('data',axis=1,inplace=True)
-        
-            data.set_index('record_date',inplace=True)
-            extracted = data[data['account_type'] == AccountName]
-            TheData = extracted.sort_index()
-            print(TheData)
-            DayOne = datetime.datetime.strptime(TheData.index[0],'%Y-%m-%d').date()
-            LastDay = datetime.datetime.strptime(TheData.index[len(TheData)-1],'%Y-%m-%d').date()
-            NextDSStart = LastDay + datetime.timedelta(days=1)
-            EndDateStr = TheData.index[len(TheData)-1]; print('Will start next dataset pull at: ',NextDSStart)
-            DateDiff = LastDay - DayOne
-            print('\nData from: ',DayOne,type(DayOne),' to ',LastDay,type(LastDay),'. DataLength: ',len(TheData),'TimeDelta (days): ',DateDiff.days)
-            FullData= pd.concat([FullData,TheData],axis=0)
-
-            if i > 0 and LastSetFinDay == LastDay:
-                break
-        except Exception as e: 
-            print(e)
-            print('Exception, may be at end of data or those cunts changed the names in the table or sumtin, have a few more tries & then pull out.')
-            exceptions += 1    
-            
+    data.set_index('record_date',inplace=True)
+    FullData = data[data['account_type'] == AccountName].sort_index()
+    if len(FullData) > 0:
+        print('\nTGA data from: ',FullData.index[0],' to ',FullData.index[-1],'. DataLength: ',len(FullData))
     return FullData
 
 def tresury_api(endpoint: str = '/v1/accounting/mts/mts_table_1', start_date: str = "all_history", fields: str = "", filters: str = "") -> pd.DataFrame:
@@ -653,21 +614,37 @@ def tresury_api(endpoint: str = '/v1/accounting/mts/mts_table_1', start_date: st
    
     url = urlBase+endpoint+fields+filters
 
-    r = requests.get(url)
+    r = Utilities.http_get(url)
     df = pd.json_normalize(r.json())
     data = pd.json_normalize(df['data'][0])
 
     return data
 
+def _treasury_get_json(session: requests.Session, url: str, max_retries: int = 5) -> dict:
+    """GET a Treasury API url and return the JSON, retrying with exponential backoff. Raises after max_retries failures."""
+    for attempt in range(max_retries):
+        try:
+            r = session.get(url, timeout=60)
+            r.raise_for_status()
+            return r.json()
+        except Exception as e:
+            if attempt == max_retries - 1:
+                raise
+            time.sleep(2 ** attempt)  # Exponential backoff
+
 def treasury_api_paginated(endpoint: str = '/v1/accounting/mts/mts_table_1', 
                           start_date: str = "1900-01-01",
                           end_date: str = None,
                           fields: str = "", 
                           filters: str = "",
                           page_size: int = 1000,
-                          max_retries: int = 5) -> pd.DataFrame:
+                          max_retries: int = 5,
+                          max_workers: int = 6,
+                          session: requests.Session = None,
+                          base_url: str = None) -> pd.DataFrame:
     """
-    Get paginated data from Treasury API with specified page size
+    Get paginated data from Treasury API with specified page size. The first page gives the page count (meta total-pages),
+    the remaining pages are then fetched concurrently and the frame is assembled once, in page order, at the end.
     **Parameters**
     - endpoint: str - API endpoint
     - start_date: str - Start date for data
@@ -676,9 +653,13 @@ def treasury_api_paginated(endpoint: str = '/v1/accounting/mts/mts_table_1',
     - filters: str - Filters to apply to data
     - page_size: int - Number of records per page
     - max_retries: int - Number of retries for failed requests
+    - max_workers: int - Max number of pages requested at once
+    - session: requests.Session - Session to use, defaults to the shared pooled session without transport retries
+    (Utilities.http.no_retry_session), as failed pages are already retried here max_retries times.
+    - base_url: str - API root, defaults to TREASURY_API_URL
     """
     
-    base_url = 'https://api.fiscaldata.treasury.gov/services/api/fiscal_service'
+    base_url = TREASURY_API_URL if base_url is None else base_url
     
      # Build query parameters
     params = []
@@ -702,50 +683,51 @@ def treasury_api_paginated(endpoint: str = '/v1/accounting/mts/mts_table_1',
     
     print(f"Debug - Final URL: {base_url}{endpoint}{query}")  # Debug URL
 
-    
-    # Get total count first
+    if session is None:
+        session = Utilities.http.no_retry_session
+
+    def get_page(page: int):
+        return _treasury_get_json(session, f"{base_url}{endpoint}{query}&page[number]={page}", max_retries=max_retries)
+
+    # First page gives total count/pages
     try:
-        initial_url = f"{base_url}{endpoint}{query}"
-        r = requests.get(initial_url)
-        r.raise_for_status()
-        metadata = r.json().get('meta', {})
+        first = get_page(1)
+        metadata = first.get('meta', {})
         total_count = metadata.get('total-count', 0)
-        total_pages = (total_count + page_size - 1) // page_size
+        total_pages = metadata.get('total-pages', (total_count + page_size - 1) // page_size)
         print(f"Total records: {total_count}, Pages needed: {total_pages}")
     except Exception as e:
         print(f"Error getting total count: {e}")
         return pd.DataFrame()
-    
-    # Get all pages
-    full_data = pd.DataFrame()
-    for page in range(1, total_pages + 1):
-        page_url = f"{base_url}{endpoint}{query}&page[number]={page}"
-            
-        # Retry logic
-        for attempt in range(max_retries):
-            try:
-                r = requests.get(page_url)
-                r.raise_for_status()
-                response = r.json()
-                break
-            except Exception as e:
-                if attempt == max_retries - 1:
+
+    responses = {1: first}
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {page: pool.submit(get_page, page) for page in range(2, total_pages + 1)}
+            for page, fut in futures.items():
+                try:
+                    responses[page] = fut.result()
+                except Exception as e:
                     print(f"Failed to get page {page} after {max_retries} attempts: {e}")
-                    return full_data
-                time.sleep(2 ** attempt)  # Exponential backoff
-                
-        # Extract data
+                    responses[page] = None
+
+    # Extract data, stopping at the first failed or empty page as pages after it would leave a gap
+    frames = []
+    for page in range(1, total_pages + 1):
+        response = responses.get(page)
+        if response is None:
+            break
         try:
             df = pd.json_normalize(response['data'])
             if df.empty:
                 break
-            full_data = pd.concat([full_data, df], ignore_index=True)
+            frames.append(df)
             print(f"Retrieved page {page}/{total_pages} ({len(df)} records)")
-            
         except Exception as e:
             print(f"Error processing page {page}: {e}")
             break
-            
+
+    full_data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     print(f"Retrieved {len(full_data)} total records")
     return full_data
 
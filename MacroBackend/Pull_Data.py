@@ -15,11 +15,21 @@ from MacroBackend.ABS_backend import abs_series_by_r
 from MacroBackend.Glassnode import GlassNode_API
 import datetime
 import pandas as pd
+import numpy as np
 import nasdaqdatalink as ndl
 import tedata as ted ##This is my package that scrapes data from Trading Economics
 import json
+import time
+import threading
+import hashlib
 import concurrent.futures
 
+try:
+    import pyarrow
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 def tedata_search(searchstr: str = "gdp", wait_time: int = 5):
     """Search Trading Economics for data series matching a keyword.
 
@@ -211,8 +221,10 @@ class dataset(object):
     def _load_bea_table(self, dataset_name: str, table_code: str, frequency: str) -> tuple[pd.DataFrame, pd.Series]:
         """Load a full BEA table, using the HDF5 cache when available.
 
-        On a cache miss the table is fetched from the BEA API via
-        ``BEA_Data.Get_BEA_Data()`` and then persisted to the cache.
+        On a cache miss, or when the cached table is older than
+        ``PULL_CACHE_TTL['bea']``, the table is fetched from the BEA API via
+        ``BEA_Data.Get_BEA_Data()`` and then persisted to the cache. An expired
+        table is still returned if the re-pull fails.
 
         Args:
             dataset_name: Canonical BEA dataset (e.g. 'NIPA').
@@ -232,22 +244,34 @@ class dataset(object):
         data_key = f"bea_{key_root}_data"
         meta_key = f"bea_{key_root}_meta"
 
+        stale = None
         if os.path.isfile(cache_path):
             try:
-                cached_data = pd.read_hdf(cache_path, key=data_key)
-                cached_meta_df = pd.read_hdf(cache_path, key=meta_key)
+                with pd.HDFStore(cache_path, mode='r') as store:
+                    cached_data = store[data_key]
+                    cached_meta_df = store[meta_key]
+                    cached_at = getattr(store.get_storer(data_key).attrs, 'cached_at', 0)
                 cached_meta = cached_meta_df.squeeze(axis=1) if isinstance(cached_meta_df, pd.DataFrame) else pd.Series(cached_meta_df)
                 cached_data.index = pd.DatetimeIndex(cached_data.index)
-                print(f"Loaded BEA table from cache: {dataset_name}, {table_code}, {frequency}")
-                return cached_data, pd.Series(cached_meta, dtype='object')
+                if time.time() - cached_at <= PULL_CACHE_TTL['bea']:
+                    print(f"Loaded BEA table from cache: {dataset_name}, {table_code}, {frequency}")
+                    return cached_data, pd.Series(cached_meta, dtype='object')
+                # Expired (or cached before tables were timestamped), re-pull but keep it as a fallback.
+                stale = (cached_data, pd.Series(cached_meta, dtype='object'))
             except Exception:
                 pass
 
         info_path = wd + fdel + 'BEA_Data' + fdel + 'Datasets' + fdel + 'BEAAPI_Info.xlsx'
-        bea = bea_data_mate.BEA_API_backend.BEA_Data(api_key=self.api_keys['bea'], BEA_Info_filePath=info_path)
-        bea.Get_BEA_Data(dataset=dataset_name, tCode=table_code, frequency=frequency, year='ALL')
-        if bea.Data is None:
-            raise get_data_failure(f"BEA table pull failed for dataset={dataset_name}, table={table_code}, frequency={frequency}")
+        try:
+            bea = bea_data_mate.BEA_API_backend.BEA_Data(api_key=self.api_keys['bea'], BEA_Info_filePath=info_path)
+            bea.Get_BEA_Data(dataset=dataset_name, tCode=table_code, frequency=frequency, year='ALL')
+            if bea.Data is None:
+                raise get_data_failure(f"BEA table pull failed for dataset={dataset_name}, table={table_code}, frequency={frequency}")
+        except Exception as e:
+            if stale is None:
+                raise
+            print(f"BEA table refresh failed, using the expired cached table for {table_code}. Error: {e}")
+            return stale
 
         table_data = pd.DataFrame(bea.Data['Series_Split']).copy()
         table_data.index = pd.DatetimeIndex(table_data.index)
@@ -256,6 +280,8 @@ class dataset(object):
         try:
             table_data.to_hdf(cache_path, key=data_key, mode='a')
             table_meta.to_frame(name='value').to_hdf(cache_path, key=meta_key, mode='a')
+            with pd.HDFStore(cache_path, mode='a') as store:
+                store.get_storer(data_key).attrs.cached_at = time.time()
         except Exception as e:
             print(f"Warning: failed to persist BEA cache for {table_code}. Error: {e}")
 
@@ -604,7 +630,8 @@ class dataset(object):
     def get_data(self, source: str, data_code: str, start_date: str = "1800-01-01", exchange_code: str = None, 
                  end_date: str = datetime.date.today().strftime('%Y-%m-%d'), data_freq: str = "1d", dtype: str = "close",
                  capitalize_column_names: bool = False,
-                 asset: str = "BTC", resolution: str = '24h', format: str = 'json', timeout: int = 60):
+                 asset: str = "BTC", resolution: str = '24h', format: str = 'json', timeout: int = 60, use_cache: bool = False,
+                 max_stale: float = None):
         """
         The get_data method is responsible for pulling data from various sources. Pulled data will be stored in 3 important 
         attributes: 
@@ -623,6 +650,11 @@ class dataset(object):
         - dtype: str, the type of data you want to pull, default is "close", other options are "OHLCV" for open, high, low, close, volume data.
         - capitalize_column_names: bool, default is False, if True, the column names of the data will be capitalized.
         - timeout: int, default 60 - timeout in seconds for the data pull operation
+        - use_cache: bool, default False - serve the pull from the on-disk PullCache when it holds a fresh copy (see PULL_CACHE_TTL)
+        and store new pulls in it. If the cache's max_stale is set, stale entries are returned straight away and refreshed in the
+        background. False always pulls from the source.
+        - max_stale: float, default None - seconds past the TTL for which a stale cached copy is served (and refreshed in the
+        background), overriding the cache's max_stale for this pull. The shared pullers pass PULL_CACHE_MAX_STALE.
         """
         
         self.data_freq = data_freq
@@ -651,6 +683,27 @@ class dataset(object):
         self.d_type = dtype 
 
         print("Looking for data from source: ", self.source, "data code: ", self.data_code)
+
+        cache = get_pull_cache() if use_cache and self.source not in UNCACHED_SOURCES else None
+        if cache is not None:
+            cache_key = cache.make_key(self.source, data_code, start_date=start_date, end_date=end_date, exchange_code=exchange_code,
+                                       data_freq=data_freq, dtype=dtype, asset=asset, resolution=resolution, format=format)
+            cached_data, cached_info, cached_attrs, state = cache.get(cache_key, max_stale=max_stale)
+            if state != 'miss':
+                print(f"Loaded {self.data_code} from the pull cache ({state}).")
+                self.data, self.SeriesInfo = cached_data, cached_info
+                for attr, value in cached_attrs.items():
+                    setattr(self, attr, value)
+                if state == 'stale':
+                    def fetch():
+                        ds = dataset()
+                        ds.get_data(source, data_code, start_date, exchange_code=exchange_code, end_date=end_date, data_freq=data_freq,
+                                    dtype=dtype, asset=asset, resolution=resolution, format=format, timeout=timeout, use_cache=False)
+                        return self.source, data_code, ds.data, ds.SeriesInfo, {a: getattr(ds, a, None) for a in CACHED_ATTRS}
+                    cache.revalidate(cache_key, fetch)
+                if capitalize_column_names and dtype != "close" and len(self.data.columns) > 0:
+                    self.data.columns = self.data.columns.str.capitalize()
+                return
         
         # Run pull_data in a separate thread and enforce timeout using futures.
         # This avoids using `signal` (which only works in main thread) and is
@@ -669,6 +722,9 @@ class dataset(object):
             # propagate real errors from pull_data
             raise e
 
+        if cache is not None and isinstance(self.data, (pd.Series, pd.DataFrame)):
+            cache.put(cache_key, self.source, data_code, self.data, self.SeriesInfo, {a: getattr(self, a, None) for a in CACHED_ATTRS})
+
         if capitalize_column_names and dtype != "close" and len(self.data.columns) > 0:
             self.data.columns = self.data.columns.str.capitalize()
 
@@ -747,7 +803,435 @@ class glassnode_data(object):
         self.data = GlassNode_API.GetMetric(path = self.metric_path, APIKey = self.keys['glassnode'], params = params)
         self.seriesInfo = pd.Series({"source": "glassnode", "metric_short": self.metric, "metric_full": self.metric_path, "asset": asset,
                            "tier": tier, "resolution": resolution, "format": format, "paramsDomain": paramsDomain} , name = "metadata_gn")
-               
+
+####### Pull cache ###################################################
+# Seconds that a cached pull stays fresh, per source. Local file sources (saveddata, hdfstores) and the table sources that
+# return frames (abs_tables, rba_tables) are not cached. Sources missing here use DEFAULT_PULL_CACHE_TTL.
+PULL_CACHE_TTL = {'fred': 6*3600, 'bea': 24*3600, 'abs_series': 24*3600, 'rba_series': 24*3600, 'nasdaq': 6*3600,
+                  'tedata': 6*3600, 'glassnode': 3600, 'coingecko': 1800, 'tv': 900, 'yfinance': 900, 'yfinance2': 900}
+DEFAULT_PULL_CACHE_TTL = 3600
+UNCACHED_SOURCES = ['saveddata', 'hdfstores', 'abs_tables', 'rba_tables']
+# The batch and repeat pullers (pull_many and so watchlists, the OpenBB backend, Chartist) share pulls through the cache
+# unless the MACRO_PULL_CACHE environment variable is set to 0. They are also served entries up to PULL_CACHE_MAX_STALE
+# seconds past the TTL, which are refreshed in the background.
+PULL_CACHE_ENABLED = os.environ.get('MACRO_PULL_CACHE', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+PULL_CACHE_MAX_STALE = 24*3600
+# dataset attributes that pull_data may change (e.g. tv splits "ticker,exchange", fred sets dataName to the series id).
+# They are stored with each entry and set again when the pull is served from the cache.
+CACHED_ATTRS = ['dataName', 'data_code', 'exchange_code', 'data_freq', 'start_date', 'end_date']
+
+class _FileLock(object):
+    # Minimal cross-process lock: exclusive creation of a lock file next to the locked file.
+    def __init__(self, path: str, timeout: float = 10.0, stale: float = 30.0):
+        self.path = path + '.lock'
+        self.timeout = timeout
+        self.stale = stale
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale:
+                        os.remove(self.path)  # Left behind by a crashed process.
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not acquire lock {self.path}")
+                time.sleep(0.01)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def _to_json_value(value):
+    """Tag the values that JSON can't hold (timestamps, dates, numpy scalars) so they come back with their type."""
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return {'__type__': 'timestamp', 'value': str(pd.Timestamp(value).isoformat())}
+    if isinstance(value, datetime.datetime):
+        return {'__type__': 'datetime', 'value': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__type__': 'date', 'value': value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+def _from_json_value(value):
+    if isinstance(value, dict) and '__type__' in value:
+        if value['__type__'] == 'timestamp':
+            return pd.Timestamp(value['value'])
+        if value['__type__'] == 'datetime':
+            return datetime.datetime.fromisoformat(value['value'])
+        if value['__type__'] == 'date':
+            return datetime.date.fromisoformat(value['value'])
+    return value
+
+class PullCache(object):
+    """On-disk cache of ``dataset`` pulls keyed by (source, data code, frequency, date range...).
+
+    Each pull is stored as its own Parquet file (HDF5 if pyarrow is not installed) under ``cache_dir``, with
+    an ``index.json`` holding keys, timestamps, sizes, the SeriesInfo and the dataset attributes of every entry. An
+    entry younger than its source's TTL is fresh. If ``max_stale`` is set, an entry up to ``max_stale`` seconds past
+    the TTL is stale: it is still served, but the caller should revalidate it in the background (stale-while-revalidate).
+    Older entries are misses. When the files on disk exceed ``max_bytes``, least recently used entries are evicted.
+
+    Several processes can share one cache folder: ``index.json`` is rewritten under a lock file and merged with the
+    entries other processes have added since it was last read.
+
+    Args:
+        cache_dir: Folder for the cache files.
+        max_bytes: Size bound of the cache on disk.
+        ttls: Per-source TTLs in seconds overriding PULL_CACHE_TTL.
+        max_stale: Seconds past the TTL for which a stale entry is still served, default 0 (never serve stale data).
+    """
+
+    def __init__(self, cache_dir: str = parent + fdel + 'User_Data' + fdel + 'pull_cache', max_bytes: int = 512 * 1024**2,
+                 ttls: dict = None, max_stale: float = 0.0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = dict(PULL_CACHE_TTL, **(ttls or {}))
+        self.max_stale = max_stale
+        self.ext = '.parquet' if PARQUET_AVAILABLE else '.h5'
+        self.index_path = cache_dir + fdel + 'index.json'
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'puts': 0, 'evictions': 0, 'revalidations': 0}
+        self._lock = threading.RLock()
+        self._revalidating = set()
+        self._removed = {}  # key -> 'created' of entries dropped here, so merging doesn't bring them back.
+        self._pending = set()  # Keys put here and not yet written to index.json.
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = {}
+        self._index_mtime = None
+        self._sync_index()
+
+    @staticmethod
+    def make_key(source: str, data_code: str, **params) -> str:
+        """Hash of the pull parameters, used as the entry's key and file name."""
+        raw = json.dumps({'source': source, 'data_code': data_code, **params}, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def ttl(self, source: str) -> float:
+        return self.ttls.get(source, DEFAULT_PULL_CACHE_TTL)
+
+    def _read_index(self) -> dict:
+        if os.path.isfile(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Pull cache index unreadable, starting a new one. Error: {e}")
+        return {}
+
+    def _merge(self, disk: dict):
+        # Newest entry per key wins. Entries we dropped stay dropped unless they were re-pulled since, and entries
+        # missing from disk were evicted by another process (unless we have just put them).
+        for key in [k for k in self._index if k not in disk and k not in self._pending]:
+            del self._index[key]
+        for key, entry in disk.items():
+            if key in self._removed and entry['created'] <= self._removed[key]:
+                continue
+            mine = self._index.get(key)
+            if mine is None or entry['created'] > mine['created']:
+                if mine is not None:
+                    entry['last_access'] = max(entry['last_access'], mine['last_access'])
+                self._index[key] = entry
+            else:
+                mine['last_access'] = max(entry['last_access'], mine['last_access'])
+
+    def _sync_index(self):
+        """Merge in entries written by other processes if index.json changed since we last read or wrote it."""
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            self._merge(self._read_index())
+            self._index_mtime = mtime
+
+    def _write_index(self):
+        with _FileLock(self.index_path):
+            self._merge(self._read_index())
+            self._evict()
+            tmp = self.index_path + f'.{os.getpid()}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self.index_path)
+            self._removed.clear(); self._pending.clear()
+            self._index_mtime = os.path.getmtime(self.index_path)
+
+    def get(self, key: str, max_stale: float = None) -> tuple:
+        """Look up an entry. max_stale overrides self.max_stale for this lookup.
+
+        Returns:
+            tuple: (data, SeriesInfo, attrs, state) with state 'fresh' or 'stale', or (None, None, None, 'miss').
+            attrs is the dict of CACHED_ATTRS values the dataset had after the pull.
+        """
+        with self._lock:
+            self._sync_index()
+            entry = self._index.get(key)
+            age = time.time() - entry['created'] if entry is not None else None
+            max_stale = self.max_stale if max_stale is None else max_stale
+            if entry is None or age > self.ttl(entry['source']) + max_stale:
+                self.stats['misses'] += 1
+                return None, None, None, 'miss'
+            entry = dict(entry)
+        # Read the file without holding the lock, other threads keep using the cache meanwhile.
+        try:
+            data = self._read_file(self.cache_dir + fdel + entry['file'], entry)
+        except Exception as e:
+            print(f"Pull cache entry for {entry['data_code']} unreadable, dropping it. Error: {e}")
+            with self._lock:
+                if key in self._index and self._index[key]['created'] == entry['created']:
+                    self._drop(key)
+                    self._write_index()
+                self.stats['misses'] += 1
+            return None, None, None, 'miss'
+        state = 'fresh' if age <= self.ttl(entry['source']) else 'stale'
+        with self._lock:
+            if key in self._index:
+                self._index[key]['last_access'] = time.time()
+            self.stats['hits' if state == 'fresh' else 'stale_hits'] += 1
+        info = pd.Series([_from_json_value(v) for v in entry['SeriesInfo'].values()], index=list(entry['SeriesInfo'].keys()),
+                         dtype='object', name=entry.get('info_name'))
+        if entry.get('info_dtype', 'object') != 'object':
+            try:
+                info = info.astype(entry['info_dtype'])
+            except (TypeError, ValueError):
+                pass
+        attrs = {k: _from_json_value(v) for k, v in entry.get('attrs', {}).items()}
+        return data, info, attrs, state
+
+    def put(self, key: str, source: str, data_code: str, data, SeriesInfo: pd.Series = None, attrs: dict = None):
+        """Store a pulled Series/DataFrame, its SeriesInfo and the dataset attributes, then evict down to
+        ``max_bytes`` if needed."""
+        if not isinstance(data, (pd.Series, pd.DataFrame)) or data.empty:
+            return
+        fname = key + self.ext
+        path = self.cache_dir + fdel + fname
+        # Write to a private temp file and swap it in, so readers never see a half written file.
+        tmp = path + f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            self._write_file(tmp, data)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Failed to write pull cache entry for {data_code}. Error: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        info = SeriesInfo if isinstance(SeriesInfo, pd.Series) else pd.Series([], dtype='object')
+        with self._lock:
+            self._index[key] = {'source': source, 'data_code': data_code, 'file': fname, 'created': time.time(),
+                                'last_access': time.time(), 'size': os.path.getsize(path),
+                                'is_series': isinstance(data, pd.Series), 'name': None if not isinstance(data, pd.Series) or data.name is None else str(data.name),
+                                'SeriesInfo': {str(k): _to_json_value(v) for k, v in info.items()},
+                                'info_name': None if info.name is None else str(info.name), 'info_dtype': str(info.dtype),
+                                'attrs': {k: _to_json_value(v) for k, v in (attrs or {}).items()}}
+            self._removed.pop(key, None); self._pending.add(key)
+            self.stats['puts'] += 1
+            self._write_index()
+
+    def _write_file(self, path: str, data):
+        frame = data.to_frame(name='value') if isinstance(data, pd.Series) else data.copy()
+        frame.columns = [str(col) for col in frame.columns]
+        if PARQUET_AVAILABLE:
+            frame.to_parquet(path)
+        else:
+            frame.to_hdf(path, key='data', mode='w')
+
+    def _read_file(self, path: str, entry: dict):
+        frame = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_hdf(path, key='data')
+        if entry.get('is_series'):
+            return frame['value'].rename(entry.get('name'))
+        return frame
+
+    def _drop(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._removed[key] = max(entry['created'], self._removed.get(key, 0))
+            try:
+                os.remove(self.cache_dir + fdel + entry['file'])
+            except OSError:
+                pass
+
+    def _evict(self):
+        total = sum(e['size'] for e in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]['size']
+            self._drop(key)
+            self.stats['evictions'] += 1
+
+    def revalidate(self, key: str, fetch):
+        """Refresh a stale entry in a background thread. ``fetch()`` must return (source, data_code, data, SeriesInfo, attrs)."""
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+            self.stats['revalidations'] += 1
+
+        def run():
+            try:
+                source, data_code, data, info, attrs = fetch()
+                self.put(key, source, data_code, data, info, attrs)
+            except Exception as e:
+                print(f"Background refresh of cached pull failed: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def clear(self):
+        with self._lock:
+            self._sync_index()
+            for key in list(self._index):
+                self._drop(key)
+            self._write_index()
+
+_pull_cache = None
+_pull_cache_lock = threading.Lock()
+
+def get_pull_cache() -> PullCache:
+    """The PullCache shared by all ``dataset`` objects in this process, created on first use."""
+    global _pull_cache
+    with _pull_cache_lock:
+        if _pull_cache is None:
+            _pull_cache = PullCache()
+        return _pull_cache
+
+####### Batch pulls ##################################################
+# Max number of simultaneous pulls allowed per source when many series are pulled at once with pull_many.
+# Keyless scrapers (tv, yfinance) and the slow table-based APIs (BEA, ABS) get small caps so we don't get throttled/banned.
+SOURCE_CONCURRENCY = {'fred': 8, 'tv': 3, 'yfinance': 4, 'yfinance2': 4, 'bea': 2, 'abs_series': 2,
+                      'rba_series': 2, 'coingecko': 2, 'glassnode': 2, 'nasdaq': 2, 'tedata': 1}
+DEFAULT_SOURCE_CONCURRENCY = 2
+
+def _pull_single(source: str, data_code: str, start_date: str = "1800-01-01", exchange_code: str = None,
+                 timeout: int = 60, **kwargs) -> tuple:
+    """Pull one series with a fresh ``dataset`` object, through the pull cache (see PULL_CACHE_ENABLED). Used as the
+    default worker for ``pull_many``.
+
+    Returns:
+        tuple: (data, SeriesInfo)
+
+    Raises:
+        TimeoutError: If the dataset pull timed out.
+        get_data_failure: If the pull returned no data.
+    """
+    kwargs.setdefault('use_cache', PULL_CACHE_ENABLED)
+    kwargs.setdefault('max_stale', PULL_CACHE_MAX_STALE)
+    ds = dataset()
+    ds.get_data(source, data_code, start_date, exchange_code=exchange_code, timeout=timeout, **kwargs)
+    if ds.data is None:
+        raise get_data_failure(f"No data returned for {data_code} from {source}.")
+    if isinstance(ds.data, pd.Series) and str(ds.data.name) == f"Timeout_{ds.data_code}":
+        raise TimeoutError(f"Data pull timed out after {timeout} seconds.")
+    return ds.data, ds.SeriesInfo
+
+def pull_many(jobs: dict, timeout: int = 60, retries: int = 1, retry_wait: float = 2.0, max_workers: int = 16,
+              source_limits: dict = None, pull_func=None) -> dict:
+    """Pull many series concurrently, with a separate concurrency cap for each source.
+
+    Each series is pulled in its own worker thread, but no more than ``source_limits[source]`` pulls from
+    the same source run at the same time. A failing or hanging series never stops the others, its error
+    is recorded in the result map instead. Total time therefore scales with the slowest source rather than
+    with the number of series.
+
+    Parameters:
+    - jobs: dict - {key: {"source": str, "data_code": str, "start_date": str, "exchange_code": str, ...}}. Any extra
+    keys in the job dict are passed through to ``pull_func`` (and on to ``dataset.get_data`` by default).
+    - timeout: int, default 60 - timeout in seconds for each attempt at pulling a single series.
+    - retries: int, default 1 - number of extra attempts made for a series after a failure or timeout.
+    - retry_wait: float, default 2.0 - seconds to wait before a retry, doubled after each failed attempt.
+    - max_workers: int, default 16 - total number of worker threads.
+    - source_limits: dict, default None - per-source caps overriding those in SOURCE_CONCURRENCY.
+    - pull_func: callable, default None - function(source, data_code, start_date, exchange_code, timeout, **kwargs)
+    returning (data, SeriesInfo). Defaults to pulling with a ``dataset`` object.
+
+    Returns:
+    - dict: {key: {"data", "SeriesInfo", "error", "attempts", "elapsed"}}. "data" and "SeriesInfo" are None and
+    "error" holds the last exception for series that could not be pulled.
+    """
+    pull_func = _pull_single if pull_func is None else pull_func
+    limits = dict(SOURCE_CONCURRENCY)
+    if source_limits is not None:
+        limits.update({str(k).lower(): v for k, v in source_limits.items()})
+
+    semaphores = {}
+    for job in jobs.values():
+        src = str(job["source"]).lower()
+        if src not in semaphores:
+            semaphores[src] = threading.BoundedSemaphore(max(1, int(limits.get(src, DEFAULT_SOURCE_CONCURRENCY))))
+
+    def attempt(job: dict, sem: threading.BoundedSemaphore):
+        # Run the pull in a daemon thread so that a hung request can be abandoned once the timeout passes.
+        # The thread owns the source slot and only gives it back when the pull really ends, so abandoned
+        # pulls still count against the source cap and retries can't pile up on top of them. Waiting in the
+        # queue for a slot is not part of the per-series timeout.
+        sem.acquire()
+        outcome = {}
+        kwargs = {k: v for k, v in job.items() if k not in ("source", "data_code", "start_date", "exchange_code")}
+
+        def target():
+            try:
+                outcome["result"] = pull_func(job["source"], job["data_code"], job.get("start_date", "1800-01-01"),
+                                              job.get("exchange_code"), timeout, **kwargs)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                sem.release()
+
+        thread = threading.Thread(target=target, daemon=True)
+        try:
+            thread.start()
+        except Exception:
+            sem.release()
+            raise
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            raise TimeoutError(f"Data pull timed out after {timeout} seconds.")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def run_job(key, job: dict) -> dict:
+        sem = semaphores[str(job["source"]).lower()]
+        t0 = time.perf_counter()
+        last_error = None
+        wait = retry_wait
+        for n in range(retries + 1):
+            try:
+                data, info = attempt(job, sem)
+                return {"data": data, "SeriesInfo": info, "error": None, "attempts": n + 1,
+                        "elapsed": time.perf_counter() - t0}
+            except Exception as e:
+                last_error = e
+                print(f"Pull attempt {n + 1} failed for {job['data_code']} from {job['source']}: {e}")
+            if n < retries:
+                time.sleep(wait)
+                wait *= 2
+        return {"data": None, "SeriesInfo": None, "error": last_error, "attempts": retries + 1,
+                "elapsed": time.perf_counter() - t0}
+
+    results = {}
+    if not jobs:
+        return results
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as ex:
+        futures = {ex.submit(run_job, key, job): key for key, job in jobs.items()}
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
 if __name__ == "__main__":
     
     me_data = dataset()
@@ -9,16 +9,27 @@ import sys
 import os
 import re
 import json
+import functools
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Union, Tuple, List
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 from openpyxl import load_workbook
 import sys
+try:
+    import numexpr
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
 
 #######  Add the parent directory to the path so that the MacroBackend module can be imported.  #######
 wd = os.path.dirname(__file__); parent = os.path.dirname(wd)
 fdel = os.path.sep
 sys.path.append(parent)
+from MacroBackend import growth
 
 ### Workig code below ##################################################################
 
@@ -133,70 +144,38 @@ def EqualSpacedTicks(numTicks, data: Union[pd.Series, pd.DataFrame] = None,
         tickLabs = [char+labSuffix for char in tickLabs]
     return Ticks, tickLabs
 
+def _legacy_growth_prep(data, freq: str):
+    """Resample business day & sub-daily data to daily like the old helpers did and return (data, frequency group)."""
+    group = growth.freq_group(freq)
+    if group == 'D' and freq.split('-')[0] != 'D':
+        print('Resampling',freq,'frequency to daily....')
+        data = growth.to_daily(data)
+        print('Frequency after resample:, ',pd.infer_freq(data.index))
+    return data, group
+
 def MonthPeriodAnnGrowth(data:pd.Series,months:int): ###### Calculate the X month annualized growth in a series e.g 3M annualized %. 
+    """Rolling mean of the period on period % change over X months, scaled to a year. Kept for existing callers,
+    growth.annualized_growth gives the compounded X month annualized rate for any frequency. 
+    Raises ValueError if the frequency can't be handled (this used to quit())."""
     freq = pd.infer_freq(data.index);           #months is the number of months to calculate the annualized % change over.  
     print('Calculating the',months,'month annualized % change for the series: ',data.name)
     print('Frequency of input time series, ',data.name,':',freq)    
-    split = freq.split('-')
-    MonthlyList = ['M','SM','BM','CBM','MS','SMS','BMS','CBMS', 'WOM']
-    QuarterList = ['Q','BQ','QS','BQS']
-    AnnualList = ['A', 'Y','BA', 'BY', 'AS', 'YS','BAS', 'BYS']
-
-    if split[0] == 'B' or split[0] == 'C':
-        print('Resampling business day frequency to daily....')
-        data = data.resample('D').mean()
-        data.fillna(method='ffill',inplace=True)
-        freq = pd.infer_freq(data.index); split = freq.split('-')
-        print('Frequency after resample:, ',freq)
-    elif split[0] == 'H' or split[0] == 'BH':
-        print('Resampling hourly frequency to daily....')
-        data = data.resample('D').mean()
-        freq = pd.infer_freq(data.index); split = freq.split('-')
-        print('Frequency after resample:, ',freq)
-    DeltaPC = data.pct_change(); DeltaPC *= 100   #Seems that pct_change give 0 - 1 not 0 - 100 %. 
-    print("DeltaPC: ",DeltaPC)
-    
-    if split[0] == 'D':
-        print('Daily frequency period.')
-        period = months*30; print('Ann. period = ',period,"days.")
-        MA = DeltaPC.rolling(period).mean()
-        print(MA)
-        MA *= 365.25/period
-        print(MA)
-    elif split[0] == 'W':
-        print('Weekly frequency period.')
-        period = months*4
-        MA = DeltaPC.rolling(period).mean()
-        MA *= 52.18/period
-    elif any(split[0] == monthly for monthly in MonthlyList):       
-        print('Monthly frequency period.')
-        period = months
-        MA = DeltaPC.rolling(period).mean()
-        MA *= 12/period
-    elif any(split[0] == quarter for quarter in QuarterList):  
-        print('Quarter frequency period.')  
-        print(np.mod(months,3))
-        if months < 3 or np.mod(months,3) != 0:
-            print('You have quarterly data, months input must be a multiple of 3.')
-            quit()
-        else: 
-            period = int(months/3); print(period)
-            MA = DeltaPC.rolling(period).mean()
-            MA *= 4/period
-    elif any(split[0] == year for year in AnnualList):    
-        print('Yearly frequency period.')
-        if months < 12:
-            print('You have yearly data, so cannot calculate an annualized rate for < 12 months.')
-            quit()
-        else:    
-            period = int(months/12)
-            MA = DeltaPC.rolling(period).mean()
-    else:
-        print('What is the frequency of the data series, ',data.name,'. Get that sorted first. ')
-        quit()    
+    if freq is None:
+        raise ValueError(f'Could not infer the frequency of the data series, {data.name}. Get that sorted first.')
+    data, group = _legacy_growth_prep(data, freq)
+    period = growth.legacy_ann_period(group, months)
+    print('Ann. period = ',period,group)
+
+    DeltaPC = growth.pct_growth(data.ffill(), periods=1)   #Same as pct_change() but without the fill_method deprecation.
+    MA = DeltaPC.rolling(period).mean()
+    if group != 'Y':
+        MA *= growth.PERIODS_PER_YEAR[group]/period
     return MA
 
-def MonthPeriodAnnGrowth2(data,months:int): ###### Calculate the X month annualized growth in a series e.g 3M annualized %. 
+def MonthPeriodAnnGrowth2(data,months:int): ###### Calculate the X month % change in a series, lagging by the number of periods in X months.
+    """X month % change (not annualized) for Series or DataFrame input. Irregular data is resampled to daily first. 
+    See growth.period_growth / growth.annualized_growth for the date aligned versions. 
+    Raises ValueError if the frequency can't be handled (this used to quit())."""
     if type(data) == pd.DataFrame:
         data = pd.DataFrame(data)
     else:
@@ -205,111 +184,151 @@ def MonthPeriodAnnGrowth2(data,months:int): ###### Calculate the X month annuali
    
     if freq is None:
         print('Could not infer frequency of series, resampling to daily...')
-        data = data.resample('D').mean(); data.fillna(method='ffill', inplace=True)
+        data = growth.to_daily(data)
         freq = 'D'
 
     print('Calculating the',months,'month annualized % change for the series.')
     print('Frequency of input time series:',freq)    
-    if '-' in freq:
-        split = freq.split('-')
-    else:
-        split = freq    
-    MonthlyList = ['M','SM','BM','CBM','MS','SMS','BMS','CBMS', 'WOM']
-    QuarterList = ['Q','BQ','QS','BQS']
-    AnnualList = ['A', 'Y','BA', 'BY', 'AS', 'YS','BAS', 'BYS']
-
-    if split[0] == 'B' or split[0] == 'C':
-        print('Resampling business day frequency to daily....')
-        data = data.resample('D').mean()
-        data.fillna(method='ffill',inplace=True)
-        freq = pd.infer_freq(data.index); split = freq.split('-')
-        print('Frequency after resample:, ',freq)
-    elif split[0] == 'H' or split[0] == 'BH':
-        print('Resampling hourly frequency to daily....')
-        data = data.resample('D').mean()
-        freq = pd.infer_freq(data.index); split = freq.split('-')
-        print('Frequency after resample:, ',freq)
+    data, group = _legacy_growth_prep(data, freq)
+    period = growth.legacy_ann_period(group, months, days_per_month=30.416)
+    print('Ann. period = ',round(period),group)
     
-    if split[0] == 'D':
-        print('Daily frequency period.'); d_freq = 'D'
-        period = months*30.416; print('Ann. period = ',period,"days.")
-    elif split[0] == 'W':
-        print('Weekly frequency period.'); d_freq = 'W'
-        period = months*4 ; print('Ann. period = ',period,"weeks.")
-    elif any(split[0] == monthly for monthly in MonthlyList):
-        print('Monthly frequency period.'); d_freq = 'M'
-        period = months ; print('Ann. period = ',period,"months.")
-    elif any(split[0] == quarter for quarter in QuarterList):  
-        print('Quarter frequency period.'); d_freq = 'Q'
-        print(np.mod(months,3))
-        if months < 3 or np.mod(months,3) != 0:
-            print('You have quarterly data, months input must be a multiple of 3.')
-            quit()
-        else: 
-            period = int(months/3); print(period)
-        print('Ann. period = ',period,"quarters.")    
-    elif any(split[0] == year for year in AnnualList):    
-        print('Yearly frequency period.'); d_freq = 'Y'
-        if months < 12:
-            print('You have yearly data, so cannot calculate an annualized rate for < 12 months.')
-            quit()
-        else:    
-            period = int(months/12)
-        print('Ann. period = ',period,"years.")    
-    else:
-        print('What is the frequency of the data series, ','. Get that sorted first. ')
-        quit()
-    print(round(period),d_freq)
-    AnnPC = data.pct_change(periods=round(period))
-    AnnPC *= 100; print(AnnPC) 
-   
+    AnnPC = growth.pct_growth(data.ffill(), periods=round(period))
     return AnnPC
 
+#### Expression compiler for StringMathOp. An expression like "(1 + 2) / 3 * 100.0" is parsed once into a small AST,
+# constant sub-expressions are folded and the tree is rendered to a single expression over the column arrays. That is
+# evaluated with numexpr (blocked, multi-threaded, no full size temporaries) when installed and the data is long enough
+# to make it worthwhile, else as one compiled numpy expression. Integer tokens are references to the components via
+# StringMathOp.colMap, numbers with a decimal point ("100.0", ".5") are constants.
+
+_EXPR_TOKEN = re.compile(r'\s*(?:(\d+\.\d*|\.\d+)|(\d+)|([-+*/()]))')
+_EXPR_OPS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+NUMEXPR_MIN_ROWS = 10000
+
+class CompiledExpression(object):
+    """A parsed & constant folded StringMathOp expression, get these from compile_expression(), which caches them."""
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.refs = []   # Column reference numbers in order of first use. 
+        self._tokens = self._tokenize(expression)
+        self._pos = 0
+        self.tree = self._parse_sum()
+        if self._pos < len(self._tokens):
+            raise ValueError(f"Invalid expression, unexpected '{self._tokens[self._pos][1]}' in: {expression}")
+        del self._tokens
+        self.source = self._render(self.tree)
+        self.code = compile(self.source, '<StringMathOp>', 'eval')
+
+    @staticmethod
+    def _tokenize(expression: str) -> list:
+        tokens, pos = [], 0
+        expression = expression.rstrip()
+        while pos < len(expression):
+            match = _EXPR_TOKEN.match(expression, pos)
+            if match is None:
+                raise ValueError(f"Invalid character '{expression[pos:].lstrip()[0]}' in expression: {expression}")
+            const, ref, op = match.groups()
+            if const is not None:
+                tokens.append(('const', float(const)))
+            elif ref is not None:
+                tokens.append(('ref', int(ref)))
+            else:
+                tokens.append(('op', op))
+            pos = match.end()
+        if not tokens:
+            raise ValueError("Empty expression")
+        return tokens
+
+    def _peek(self):
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else (None, None)
+
+    def _parse_sum(self):    # sum := product (('+' | '-') product)*
+        node = self._parse_product()
+        while self._peek() in (('op', '+'), ('op', '-')):
+            self._pos += 1
+            node = self._fold(self._tokens[self._pos-1][1], node, self._parse_product())
+        return node
+
+    def _parse_product(self):    # product := unary (('*' | '/') unary)*
+        node = self._parse_unary()
+        while self._peek() in (('op', '*'), ('op', '/')):
+            self._pos += 1
+            node = self._fold(self._tokens[self._pos-1][1], node, self._parse_unary())
+        return node
+
+    def _parse_unary(self):    # unary := ('-' | '+') unary | atom
+        kind, value = self._peek()
+        if (kind, value) == ('op', '-'):
+            self._pos += 1
+            operand = self._parse_unary()
+            return ('const', -operand[1]) if operand[0] == 'const' else ('neg', operand)
+        elif (kind, value) == ('op', '+'):
+            self._pos += 1
+            return self._parse_unary()
+        return self._parse_atom()
+
+    def _parse_atom(self):    # atom := const | ref | '(' sum ')'
+        kind, value = self._peek()
+        self._pos += 1
+        if kind == 'const':
+            return ('const', value)
+        elif kind == 'ref':
+            if value not in self.refs:
+                self.refs.append(value)
+            return ('ref', value)
+        elif value == '(':
+            node = self._parse_sum()
+            if self._peek() != ('op', ')'):
+                raise ValueError("Missing closing parenthesis")
+            self._pos += 1
+            return node
+        elif kind is None:
+            raise ValueError(f"Invalid expression, ends with an operator: {self.expression}")
+        raise ValueError(f"Invalid operator position: {value}")
+
+    @staticmethod
+    def _fold(op: str, left: tuple, right: tuple) -> tuple:
+        if left[0] == 'const' and right[0] == 'const':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return ('const', float(_EXPR_OPS[op](np.float64(left[1]), np.float64(right[1]))))
+        return ('bin', op, left, right)
+
+    def _render(self, node: tuple) -> str:
+        if node[0] == 'const':
+            return f"({node[1]!r})"
+        elif node[0] == 'ref':
+            return f"c{node[1]}"
+        elif node[0] == 'neg':
+            return f"(-{self._render(node[1])})"
+        return f"({self._render(node[2])} {node[1]} {self._render(node[3])})"
+
+    def evaluate(self, arrays: dict) -> np.ndarray:
+        """Evaluate over {ref number: 1D float array}. All arrays must be the same length."""
+        local = {f"c{ref}": arrays[ref] for ref in self.refs}
+        length = len(next(iter(local.values()))) if local else 0
+        local.update({'inf': np.inf, 'nan': np.nan})   # Folded constants may render as inf or nan.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if NUMEXPR_AVAILABLE and length >= NUMEXPR_MIN_ROWS:
+                return numexpr.evaluate(self.source, local_dict=local)
+            return np.array(eval(self.code, {'__builtins__': {}}, local), dtype=float)   # Copy, a bare column ref would be a view.
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Parse & compile a StringMathOp expression, cached by the expression string."""
+    return CompiledExpression(expression)
+
 class StringMathOp:
+    """Evaluate a math expression string over DataFrame columns, e.g "(1 + 2) / 3". Numbers in the expression refer
+    to the components (column names) via indexes, constants need a decimal point ("2.0"). Supports + - * / unary minus
+    and brackets. Expressions are compiled once & cached, see compile_expression."""
     def __init__(self, data: pd.DataFrame, components: list, indexes: list):
-        self.operators = {
-            '+': (operator.add, 1),      # (operator, precedence)
-            '-': (operator.sub, 1),
-            '*': (operator.mul, 2),
-            '/': (operator.truediv, 2),
-        }
         self.Data = data
         self.components = components
         self.indexes = indexes
         self.colMap = dict(zip(indexes, components))
         self.counter = 0
 
-    def op(self, MathOpStr: list) -> pd.Series:
-        # Process operators in order of precedence (2 then 1)
-        for precedence in [2, 1]:
-            x = 0
-            while x < len(MathOpStr):
-                if (isinstance(MathOpStr[x], str) and 
-                    MathOpStr[x] in self.operators and 
-                    self.operators[MathOpStr[x]][1] == precedence):
-                    
-                    if x == 0 or x >= len(MathOpStr)-1:
-                        raise ValueError(f"Invalid operator position: {MathOpStr[x]}")
-                        
-                    left = MathOpStr[x-1]
-                    right = MathOpStr[x+1]
-                    operator_func = self.operators[MathOpStr[x]][0]
-                    
-                    result = operator_func(left, right)
-                    result = pd.Series(result, name=f"RES_{self.counter}")
-                    
-                    # Replace the operation with its result
-                    MathOpStr[x-1] = result
-                    del MathOpStr[x:x+2]
-                    continue
-                    
-                x += 1
-                
-        if len(MathOpStr) != 1:
-            raise ValueError(f"Invalid expression, multiple terms remain: {MathOpStr}")
-            
-        return MathOpStr[0]
-
     def validate_parentheses(self, expression: str) -> bool:
         count = 0
         for char in expression:
@@ -324,43 +343,21 @@ class StringMathOp:
     def func(self, MathOpStr: str) -> pd.Series:
         if not self.validate_parentheses(MathOpStr):
             raise ValueError("Unbalanced parentheses")
-            
         print(f'Processing: {MathOpStr}, iteration: {self.counter}')
+        compiled = compile_expression(MathOpStr)
         df = self.Data
-        results = {}
-        tokens = []
-
-        # Handle nested parentheses
-        while '(' in MathOpStr:
-            start = MathOpStr.rfind('(')
-            end = MathOpStr.find(')', start)
-            if end == -1:
-                raise ValueError("Missing closing parenthesis")
-                
-            inner_result = self.func(MathOpStr[start+1:end])
-            key = f'RES_{self.counter}'
-            results[key] = inner_result
-            MathOpStr = MathOpStr[:start] + key + MathOpStr[end+1:]
-            self.counter += 1
-
-        # Tokenize and process
-        for token in re.split(r'(\W)', MathOpStr):
-            if not token or token.isspace():
-                continue
-                
-            if token in self.operators:
-                tokens.append(token)
-            elif token in results:
-                tokens.append(results[token])
-            elif token.isdigit():
-                try:
-                    column = df[self.colMap[int(token)]]
-                    tokens.append(column)
-                except KeyError as e:
-                    raise ValueError(f"Invalid column reference: {token}")
-
-        result = self.op(tokens)
-        result = pd.Series(result, index=df.index, name=result.name)
+        arrays = {}
+        for ref in compiled.refs:
+            try:
+                arrays[ref] = df[self.colMap[ref]].to_numpy(dtype=float)
+            except KeyError:
+                raise ValueError(f"Invalid column reference: {ref}")
+
+        values = compiled.evaluate(arrays)
+        if values.ndim == 0:    # Expression with constants only.
+            values = np.full(len(df.index), float(values))
+        result = pd.Series(values, index=df.index, name=f"RES_{self.counter}")
+        self.counter += 1
         self.ComputedIndex = result.copy()
         return result
 
@@ -833,6 +830,163 @@ def Search_DF_np(df: Union[pd.DataFrame, pd.Series], searchTerm: str,
         df = og_df
     return df.loc[result.index]
 
+class SearchIndex(object):
+    """
+    In-memory inverted index over the text columns of a source index table (BEA, ABS, Glassnode, CoinGecko etc.).
+
+    Every cell of the searched columns is lower-cased and split into alphanumeric tokens, and each token maps to the sorted
+    row positions that contain it. Results are the same as Search_DF_np: each comma-separated term must be found as a
+    case-insensitive substring of some cell of the row (AND across terms), so "PI" finds "CPI" and "gross dom" finds
+    "Gross domestic product". The index narrows the rows down first: every alphanumeric run in a term must be a substring
+    of one of the row's tokens, which is looked up in the vocabulary and answered by intersecting posting lists, smallest
+    first. Terms that are more than a single alphanumeric run (phrases, punctuation) are then checked against the cells
+    of the remaining candidate rows only. Terms with regex characters in them skip the index and are matched by a
+    case-insensitive regex scan like Search_DF_np.
+
+    **Parameters:**
+    - df: pd.DataFrame - the table to index.
+    - search_cols: list, default None - columns to index, all columns if None.
+    """
+    token_pattern = r"[a-z0-9]+"
+    regex_chars = set("*^$[]|\\?()+{}")
+
+    def __init__(self, df: pd.DataFrame, search_cols: list = None):
+        self.df = df
+        self.search_cols = list(df.columns) if search_cols is None else list(search_cols)
+        missing_cols = [col for col in self.search_cols if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"Columns not found in DataFrame: {missing_cols}")
+        self._token_cache = {}
+        self._build()
+
+    def _build(self):
+        n = len(self.df)
+        findall = re.compile(self.token_pattern).findall
+        self._cells = []; tokens = []; rows = []
+        for col in self.search_cols:
+            values = self.df[col].astype(str).str.lower().to_numpy(dtype=object)
+            self._cells.append(values)
+            # Tokenize each distinct cell once, then repeat its tokens for every row holding that cell.
+            codes, uniq = pd.factorize(values)
+            cell_tokens = [findall(u) for u in uniq]
+            counts = np.fromiter(map(len, cell_tokens), dtype=np.int64, count=len(cell_tokens))
+            flat = np.array([t for toks in cell_tokens for t in toks], dtype=object)
+            per_row = counts[codes]
+            total = int(per_row.sum())
+            if total == 0:
+                continue
+            first = np.concatenate(([0], np.cumsum(counts)[:-1]))[codes]
+            within = np.arange(total) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+            tokens.append(flat[np.repeat(first, per_row) + within])
+            rows.append(np.repeat(np.arange(n, dtype=np.int64), per_row))
+
+        # Postings are stored CSR style: the rows of vocab[i] are self._rows[self._offsets[i]:self._offsets[i + 1]].
+        if not tokens:
+            self.vocab = []; self._rows = np.array([], dtype=np.int64); self._offsets = np.zeros(1, dtype=np.int64)
+        else:
+            # Sort & dedupe (token, row) pairs as integer keys, with the tokens factorized in sorted order.
+            tok_codes, vocab = pd.factorize(np.concatenate(tokens), sort=True)
+            keys = np.sort(tok_codes.astype(np.int64) * n + np.concatenate(rows))
+            keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+            key_tok = keys // n
+            self.vocab = list(vocab)
+            self._rows = keys % n
+            self._offsets = np.searchsorted(key_tok, np.arange(len(vocab) + 1))
+        # The whole vocabulary as one newline separated string, so finding the tokens that contain a substring is a
+        # single C-level scan. _vocab_starts holds the offset of each token in it.
+        self._vocab_text = "\n".join(self.vocab)
+        self._vocab_starts = np.cumsum([0] + [len(t) + 1 for t in self.vocab[:-1]]) if self.vocab else np.array([], dtype=np.int64)
+
+    def token_rows(self, token: str) -> np.ndarray:
+        """Sorted row positions of all rows having a token that contains the given token."""
+        if token in self._token_cache:
+            return self._token_cache[token]
+        hits = [m.start() for m in re.finditer(re.escape(token), self._vocab_text)]
+        ids = np.unique(np.searchsorted(self._vocab_starts, hits, side="right") - 1) if hits else []
+        if len(ids) == 0:
+            rows = np.array([], dtype=np.int64)
+        elif len(ids) == 1:
+            rows = self._rows[self._offsets[ids[0]]:self._offsets[ids[0] + 1]]
+        else:
+            rows = np.unique(np.concatenate([self._rows[self._offsets[i]:self._offsets[i + 1]] for i in ids]))
+        if len(self._token_cache) > 1024:
+            self._token_cache.clear()
+        self._token_cache[token] = rows
+        return rows
+
+    def _match_rows(self, rows: np.ndarray, pattern: str) -> np.ndarray:
+        """Subset of rows with a cell in the searched columns containing pattern (case-insensitive regex, as Search_DF_np)."""
+        if set(pattern) & (self.regex_chars | {"."}):
+            search = re.compile(pattern, re.IGNORECASE).search
+            test = lambda cell: search(cell) is not None
+        else:
+            pattern = pattern.lower()
+            test = lambda cell: pattern in cell
+        keep = np.zeros(len(rows), dtype=bool)
+        for cells in self._cells:
+            todo = np.flatnonzero(~keep)
+            if len(todo) == 0:
+                break
+            keep[todo] = np.fromiter(map(test, cells[rows[todo]]), dtype=bool, count=len(todo))
+        return rows[keep]
+
+    def search_rows(self, searchTerm: str) -> np.ndarray:
+        """Row positions matching all comma separated terms in searchTerm."""
+        postings = []; patterns = []
+        for term in [t.strip() for t in str(searchTerm).split(",") if t.strip()]:
+            if set(term) & self.regex_chars:
+                patterns.append(term.replace('*', '.*'))
+                continue
+            toks = re.findall(self.token_pattern, term.lower())
+            postings.extend(self.token_rows(tok) for tok in toks)
+            if toks != [term.lower()]:
+                # A term that is a single alphanumeric run is in a cell whenever one of the cell's tokens contains it,
+                # other terms (phrases, punctuation) are checked against the candidate rows' cells.
+                patterns.append(term)
+
+        rows = None
+        for posting in sorted(postings, key=len):
+            rows = posting if rows is None else np.intersect1d(rows, posting, assume_unique=True)
+            if len(rows) == 0:
+                return rows
+        if rows is None:
+            rows = np.arange(len(self.df))
+        for pattern in patterns:
+            rows = self._match_rows(rows, pattern)
+        return rows
+
+    def search(self, searchTerm: str) -> pd.DataFrame:
+        """Rows of the indexed table matching searchTerm, as a new DataFrame."""
+        return self.df.iloc[self.search_rows(searchTerm)].copy()
+
+_search_index_cache = {}
+
+def read_index_table(path: str) -> pd.DataFrame:
+    """Read a source index table from a .csv, .xlsx or .h5/.h5s (key 'data') file."""
+    ext = path.split(".")[-1]
+    if ext == "csv":
+        return pd.read_csv(path, index_col=0)
+    elif ext == "xlsx":
+        return pd.read_excel(path, index_col=0)
+    elif ext == "h5" or ext == "h5s":
+        return pd.read_hdf(path, key='data')
+    else:
+        raise ValueError(f"File extension not recognized for {path}, please use .csv, .xlsx or .h5s")
+
+def load_search_index(path: str, search_cols: list = None) -> SearchIndex:
+    """
+    Return the SearchIndex for a source index file, building it on first use. The index is kept in memory and reused
+    until the file's modification time or size changes, then it is rebuilt from the new file.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), None if search_cols is None else tuple(search_cols))
+    cached = _search_index_cache.get(key)
+    if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    index = SearchIndex(read_index_table(path), search_cols=search_cols)
+    _search_index_cache[key] = ((stat.st_mtime_ns, stat.st_size), index)
+    return index
+
 def CheckIndexDifference(series1:Union[pd.DataFrame, pd.Series], series2:Union[pd.DataFrame, pd.Series]):
     diffs = (series1.index.difference(series2.index), series2.index.difference(series1.index))
     differences = False
@@ -1024,6 +1178,93 @@ def match_series_lengths(series1: pd.Series, series2: pd.Series) -> tuple[pd.Ser
 
     return series1_trimmed, series2_trimmed
 
+####### Shared HTTP session ########
+# The API fetchers (FRED, treasury, CoinGecko, Glassnode...) share one requests.Session so that TCP/TLS connections
+# to each host are kept alive & reused rather than opened for every request.
+class HTTPSessionManager(object):
+    """
+    Holds a pooled requests.Session with transport level retries.
+
+    **Parameters:**
+    - pool_connections: int - number of hosts to keep connection pools for.
+    - pool_maxsize: int - max connections kept alive per host, set this >= the number of threads pulling from one host.
+    - retries: int - retries made for connection errors and retryable status codes (429, 5xx).
+    - backoff_factor: float - retry n waits backoff_factor * 2**(n-1) seconds (Retry-After headers are respected).
+    - backoff_jitter: float - random extra wait of up to this many seconds added to each backoff.
+    - timeout: float - default timeout for requests made with the get method.
+    """
+    def __init__(self, pool_connections: int = 16, pool_maxsize: int = 16, retries: int = 3, backoff_factor: float = 0.5,
+                 backoff_jitter: float = 0.5, timeout: float = 60):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.timeout = timeout
+        self._session = None
+        self._no_retry_session = None
+        self._lock = threading.Lock()
+
+    def _make_retry(self) -> Retry:
+        kwargs = dict(total=self.retries, connect=self.retries, read=self.retries, status=self.retries,
+                      backoff_factor=self.backoff_factor, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(["GET", "HEAD"]), respect_retry_after_header=True, raise_on_status=False)
+        try:
+            return Retry(backoff_jitter=self.backoff_jitter, **kwargs)
+        except TypeError:   # urllib3 < 2 has no jitter option.
+            return Retry(**kwargs)
+
+    def _make_session(self, max_retries) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, max_retries=max_retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = self._make_session(self._make_retry())
+            return self._session
+
+    @property
+    def no_retry_session(self) -> requests.Session:
+        """Pooled session without transport retries, for callers that run their own retry loop. Retrying in both
+        places would multiply the attempts (and the backoff waits) for every failing request."""
+        with self._lock:
+            if self._no_retry_session is None:
+                self._no_retry_session = self._make_session(0)
+            return self._no_retry_session
+
+    def get(self, url: str, params: dict = None, retry: bool = True, **kwargs) -> requests.Response:
+        """requests.get through the pooled session, using the manager's default timeout unless one is given.
+        Pass retry=False when the caller retries failed requests itself."""
+        kwargs.setdefault("timeout", self.timeout)
+        return (self.session if retry else self.no_retry_session).get(url, params=params, **kwargs)
+
+    def configure(self, **settings):
+        """Change settings (pool_maxsize, retries...), the session is rebuilt with them on next use."""
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise ValueError(f"Unknown HTTPSessionManager setting: {name}")
+            setattr(self, name, value)
+        self.close()
+
+    def close(self):
+        with self._lock:
+            for session in (self._session, self._no_retry_session):
+                if session is not None:
+                    session.close()
+            self._session = None; self._no_retry_session = None
+
+http = HTTPSessionManager()
+
+def http_get(url: str, params: dict = None, retry: bool = True, **kwargs) -> requests.Response:
+    """GET through the shared, pooled session of this module (Utilities.http). retry=False skips the transport retries."""
+    return http.get(url, params=params, retry=retry, **kwargs)
+
 ####### API keys class ########
 class api_keys():
 
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+
+#### Vectorized growth rate calculations: YoY, MoM annualized and X month annualized % change. #########
+# Values are aligned by date rather than by position where that makes sense: for each timestamp t the base value is the
+# last observation at or before t - offset, found with one searchsorted call over the whole index (an as-of lookup).
+# Regular monthly/quarterly/yearly data is lagged by position instead, as month-end dates don't survive DateOffset
+# arithmetic (2020-02-29 - 1 month = 2020-01-29, which would as-of back to 2019-12-31).
+
+FREQ_GROUPS = {
+    'D': ['D', 'C', 'B', 'H', 'BH', 'CBH', 'T', 'S', 'L', 'U', 'N'],
+    'W': ['W'],
+    'M': ['M', 'ME', 'SM', 'SME', 'BM', 'BME', 'CBM', 'CBME', 'MS', 'SMS', 'BMS', 'CBMS', 'WOM', 'LWOM'],
+    'Q': ['Q', 'QE', 'BQ', 'BQE', 'QS', 'BQS'],
+    'Y': ['A', 'Y', 'AE', 'YE', 'BA', 'BY', 'BAE', 'BYE', 'AS', 'YS', 'BAS', 'BYS']}
+SUB_DAILY = ['h', 'bh', 'cbh', 'min', 's', 'ms', 'us', 'ns']   # Lower case aliases from pandas >= 2.2, 'ms' clashes with 'MS'.
+PERIODS_PER_YEAR = {'D': 365.25, 'W': 52.18, 'M': 12, 'Q': 4, 'Y': 1}
+MONTHS_PER_PERIOD = {'M': 1, 'Q': 3, 'Y': 12}
+
+def freq_group(freq: str) -> str:
+    """Map a pandas frequency alias (e.g 'W-SUN', 'MS', 'QE-DEC', 'B', '2h') onto one of 'D', 'W', 'M', 'Q' or 'Y'.
+    Sub-daily and business day aliases map to 'D'. Raises ValueError for anything else."""
+    if not freq:
+        raise ValueError('No frequency given, cannot classify the series frequency.')
+    base = str(freq).split('-')[0].lstrip('0123456789')
+    if base in SUB_DAILY:
+        return 'D'
+    base = base.upper()
+    for group, aliases in FREQ_GROUPS.items():
+        if base in aliases:
+            return group
+    raise ValueError(f'Unsupported frequency "{freq}", expected daily, weekly, monthly, quarterly or yearly data.')
+
+def _check_index(data: Union[pd.Series, pd.DataFrame], datetime: bool = True) -> Union[pd.Series, pd.DataFrame]:
+    """Type check the input and sort a date/period index. With datetime=False (lag by position) any index is accepted,
+    a RangeIndex or other non date index is left in the order given."""
+    if not isinstance(data, (pd.Series, pd.DataFrame)):
+        raise TypeError(f'Expected a pandas Series or DataFrame, got {type(data).__name__}.')
+    if datetime and not isinstance(data.index, pd.DatetimeIndex):
+        raise TypeError('Growth calculations by date need a DatetimeIndex on the input data.')
+    if isinstance(data.index, (pd.DatetimeIndex, pd.PeriodIndex)) and not data.index.is_monotonic_increasing:
+        data = data.sort_index()
+    return data
+
+def infer_freq_group(data: Union[pd.Series, pd.DataFrame]) -> str:
+    """Frequency group of the data index, falling back to the median spacing between observations when pandas
+    can't infer a frequency (gaps, holidays, irregular data)."""
+    index = data.index
+    freq = pd.infer_freq(index) if len(index) >= 3 else None
+    if freq is not None:
+        return freq_group(freq)
+    if len(index) < 2:
+        raise ValueError('Need at least two observations to work out the frequency of the data.')
+    days = float(np.median(np.diff(index.asi8))) / 86400e9
+    if days < 4:
+        return 'D'
+    elif days < 20:
+        return 'W'
+    elif days < 45:
+        return 'M'
+    elif days < 135:
+        return 'Q'
+    return 'Y'
+
+def to_daily(data: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame]:
+    """Resample to calendar daily frequency (mean), forward filling the gaps. Used to put business day, sub-daily
+    or irregular data onto the same grid as the legacy helpers."""
+    return _check_index(data).resample('D').mean().ffill()
+
+def lagged_values(data: Union[pd.Series, pd.DataFrame], offset: Union[pd.DateOffset, pd.Timedelta, str],
+                  tolerance: Union[pd.Timedelta, str] = None) -> Union[pd.Series, pd.DataFrame]:
+    """Values as of (t - offset) for every timestamp t in the index, as a frame/series aligned to the input index.
+
+    **Parameters:**
+    - data: Series or DataFrame with a DatetimeIndex.
+    - offset: pd.DateOffset (e.g pd.DateOffset(years=1)), pd.Timedelta or a timedelta string like '365D'.
+    - tolerance: Optional max distance between (t - offset) and the observation used. Base values further back than
+    this are NaN.
+
+    Timestamps where (t - offset) falls before the start of the data get NaN.
+    """
+    data = _check_index(data)
+    index = data.index
+    if isinstance(offset, str):
+        offset = pd.Timedelta(offset)
+    target = index - offset
+    pos = index.searchsorted(target, side='right') - 1
+    valid = pos >= 0
+    pos = np.clip(pos, 0, None)
+    if tolerance is not None:
+        valid &= (target - index[pos]) <= pd.Timedelta(tolerance)
+
+    values = data.to_numpy(dtype=float)[pos]
+    values[~valid] = np.nan
+    if isinstance(data, pd.DataFrame):
+        return pd.DataFrame(values, index=index, columns=data.columns)
+    return pd.Series(values, index=index, name=data.name)
+
+def pct_growth(data: Union[pd.Series, pd.DataFrame], periods: int = None, offset: Union[pd.DateOffset, pd.Timedelta, str] = None,
+               tolerance: Union[pd.Timedelta, str] = None) -> Union[pd.Series, pd.DataFrame]:
+    """% change vs. a lagged base value. Give either periods (lag by position, like pct_change without the
+    forward fill) or offset (lag by date, see lagged_values). Output is in % (0 - 100), aligned to the input index.
+    Only offset needs a DatetimeIndex, periods works on any index (e.g a RangeIndex or PeriodIndex)."""
+    if (periods is None) == (offset is None):
+        raise ValueError('Give exactly one of periods or offset.')
+    data = _check_index(data, datetime=offset is not None)
+    if periods is not None:
+        if int(periods) < 1:
+            raise ValueError(f'periods must be a positive integer, got {periods}.')
+        base = data.astype(float).shift(int(periods))
+    else:
+        base = lagged_values(data, offset, tolerance=tolerance)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (data.astype(float) / base - 1) * 100
+
+def _annualize(growth_pc: Union[pd.Series, pd.DataFrame], years: float, compound: bool = True):
+    if compound:
+        with np.errstate(invalid='ignore'):
+            return ((1 + growth_pc / 100) ** (1 / years) - 1) * 100
+    return growth_pc / years
+
+def period_growth(data: Union[pd.Series, pd.DataFrame], months: int, annualize: bool = False, compound: bool = True,
+                  freq: str = None) -> Union[pd.Series, pd.DataFrame]:
+    """% growth over the last X months for any frequency of input data.
+
+    **Parameters:**
+    - data: Series or DataFrame with a DatetimeIndex.
+    - months: Number of months to measure the change over.
+    - annualize: Annualize the X month change (e.g 3M annualized %).
+    - compound: When annualizing, compound the rate ((1 + g)^(12/months) - 1) rather than scaling it linearly (g * 12/months).
+    - freq: Optional frequency group ('D', 'W', 'M', 'Q', 'Y') or pandas alias, inferred from the index if not given.
+
+    Monthly, quarterly and yearly data are lagged by position, so months must be a whole number of periods for those.
+    Daily, weekly and irregular data are lagged by date with pd.DateOffset(months=months).
+    """
+    if months is None or months <= 0:
+        raise ValueError(f'months must be > 0, got {months}.')
+    data = _check_index(data)
+    group = freq_group(freq) if freq is not None else infer_freq_group(data)
+    if group in MONTHS_PER_PERIOD:
+        per = MONTHS_PER_PERIOD[group]
+        if months % per != 0:
+            raise ValueError(f'Data has frequency "{group}", months must be a multiple of {per}, got {months}.')
+        growth_pc = pct_growth(data, periods=int(months // per))
+    else:
+        growth_pc = pct_growth(data, offset=pd.DateOffset(months=int(months)))
+    if annualize:
+        growth_pc = _annualize(growth_pc, months / 12, compound=compound)
+    return growth_pc
+
+def yoy_growth(data: Union[pd.Series, pd.DataFrame], freq: str = None) -> Union[pd.Series, pd.DataFrame]:
+    """Year on year % change for data of any frequency."""
+    return period_growth(data, 12, freq=freq)
+
+def annualized_growth(data: Union[pd.Series, pd.DataFrame], months: int, compound: bool = True,
+                      freq: str = None) -> Union[pd.Series, pd.DataFrame]:
+    """X month annualized % change, e.g months = 3 for 3M annualized, for data of any frequency."""
+    return period_growth(data, months, annualize=True, compound=compound, freq=freq)
+
+def mom_annualized(data: Union[pd.Series, pd.DataFrame], compound: bool = True, freq: str = None) -> Union[pd.Series, pd.DataFrame]:
+    """Month on month % change, annualized."""
+    return period_growth(data, 1, annualize=True, compound=compound, freq=freq)
+
+def legacy_ann_period(group: str, months: int, days_per_month: float = 30) -> Union[int, float]:
+    """Number of periods the legacy Utilities.MonthPeriodAnnGrowth helpers use for an X month window, raising
+    ValueError where they used to quit()."""
+    if group == 'D':
+        return months * days_per_month
+    elif group == 'W':
+        return months * 4
+    elif group == 'M':
+        return months
+    elif group == 'Q':
+        if months < 3 or months % 3 != 0:
+            raise ValueError(f'You have quarterly data, months input must be a multiple of 3, got {months}.')
+        return int(months / 3)
+    elif group == 'Y':
+        if months < 12:
+            raise ValueError(f'You have yearly data, so cannot calculate an annualized rate for < 12 months, got {months}.')
+        return int(months / 12)
+    raise ValueError(f'Unsupported frequency group "{group}".')
@@ -4,6 +4,10 @@ import json
 from pprint import pprint
 import re
 import os
+import threading
+import itertools
+import atexit
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 
 wd = os.path.dirname(os.path.abspath(__file__))
 fdel = os.path.sep
@@ -24,61 +28,207 @@ def remove_ansi_escape_sequences(s):
     ansi_escape_pattern = re.compile(r'\x1b\[[0-9;]*m')
     return ansi_escape_pattern.sub('', s)
 
-def js_search_tv(searchstr: str) -> dict:
-    data_str = json.dumps(searchstr)
+####### Persistent node workers
+# Spawning node for every search/fetch costs a few hundred ms of startup & module loading, so calls go to long-lived
+# js_worker.js processes instead. Each worker speaks line-delimited JSON-RPC over stdin/stdout and handles many
+# in-flight requests at once; a worker that dies is restarted on the next call.
 
-    # Prepare environment with NODE_PATH
-    env = os.environ.copy()
-    if node_path:
-        env['NODE_PATH'] = node_path
+class NodeWorkerError(Exception):
+    pass
 
-    # Run Node.js process and pass data with UTF-8 encoding
-    result = subprocess.run(['node', wd+fdel+'searchTV_js.js'], 
-                          input=data_str, text=True, capture_output=True, env=env, encoding='utf-8', errors='replace')
-    print("Return code:", result.returncode)
+class NodeWorker(object):
+    """
+    One long-lived node process running a line-delimited JSON-RPC script (js_worker.js by default).
 
-    if result.returncode != 0:
-        print("Error:", result.stderr)
-        return {"error": result.stderr, "success": False}
-    
+    **Parameters:**
+    - script: str - path of the JS worker script.
+    - env: dict - environment for the node process, defaults to os.environ with NODE_PATH set.
+    """
+    def __init__(self, script: str = wd+fdel+'js_worker.js', env: dict = None):
+        self.script = script
+        self.env = env
+        self.proc = None
+        self.restarts = -1
+        self.last_stderr = ""
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def start(self):
+        with self._lock:
+            if self.alive:
+                return
+            # Anything still waiting on a previous, dead process will never be answered.
+            stale, self._pending = self._pending, {}
+            for fut in stale.values():
+                if not fut.done():
+                    fut.set_exception(NodeWorkerError("node worker exited"))
+            env = self.env
+            if env is None:
+                env = os.environ.copy()
+                if node_path:
+                    env['NODE_PATH'] = node_path
+            self.proc = subprocess.Popen(['node', self.script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace',
+                                         bufsize=1, env=env)
+            self.restarts += 1
+            threading.Thread(target=self._read_stdout, args=(self.proc,), daemon=True).start()
+            threading.Thread(target=self._drain_stderr, args=(self.proc,), daemon=True).start()
+
+    def _read_stdout(self, proc):
+        for line in proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                msg = json.loads(line)
+            except json.JSONDecodeError:
+                print("NodeWorker, non JSON line from worker:", remove_ansi_escape_sequences(line)[:200])
+                continue
+            with self._lock:
+                fut = self._pending.pop(msg.get("id"), None)
+            if fut is None:
+                continue
+            if "error" in msg:
+                fut.set_exception(NodeWorkerError(msg["error"]))
+            else:
+                fut.set_result(msg.get("result"))
+        # stdout closed: the process exited, fail whatever was waiting on it.
+        proc.wait()
+        with self._lock:
+            if proc is self.proc:
+                pending, self._pending = self._pending, {}
+            else:
+                pending = {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(NodeWorkerError(f"node worker exited with code {proc.returncode}"))
+
+    def _drain_stderr(self, proc):
+        for line in proc.stderr:
+            self.last_stderr = remove_ansi_escape_sequences(line.rstrip())
+
+    def submit(self, method: str, params: dict = None) -> Future:
+        """Send a request and return a Future for its result. Starts/restarts the worker if needed."""
+        if not self.alive:
+            self.start()
+        fut = Future()
+        with self._lock:
+            req_id = next(self._ids)
+            fut.request_id = req_id
+            self._pending[req_id] = fut
+            try:
+                self.proc.stdin.write(json.dumps({"id": req_id, "method": method, "params": params or {}}) + "\n")
+                self.proc.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError) as e:
+                self._pending.pop(req_id, None)
+                fut.set_exception(NodeWorkerError(f"node worker pipe closed: {e}"))
+        return fut
+
+    def call(self, method: str, params: dict = None, timeout: float = 60):
+        fut = self.submit(method, params)
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Stop tracking the request, a late answer from the worker is then just dropped.
+            with self._lock:
+                self._pending.pop(fut.request_id, None)
+            raise
+
+    def ping(self, timeout: float = 5) -> bool:
+        """Health check, True if the worker answers a ping within timeout."""
+        try:
+            return bool(self.call("ping", timeout=timeout).get("pong"))
+        except Exception:
+            return False
+
+    def close(self):
+        with self._lock:
+            proc, self.proc = self.proc, None
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=2)
+            except Exception:
+                proc.kill()
+
+class NodeWorkerPool(object):
+    """
+    A set of NodeWorker processes, requests go to the worker with the fewest in-flight calls. A call that fails because
+    its worker died is retried once on a restarted worker.
+
+    **Parameters:**
+    - size: int - number of node processes.
+    - script: str - path of the JS worker script.
+    """
+    def __init__(self, size: int = 2, script: str = wd+fdel+'js_worker.js', env: dict = None):
+        self.workers = [NodeWorker(script=script, env=env) for _ in range(max(1, size))]
+
+    def call(self, method: str, params: dict = None, timeout: float = 60, retries: int = 1):
+        for attempt in range(retries + 1):
+            worker = min(self.workers, key=lambda w: (not w.alive, w.in_flight))
+            try:
+                return worker.call(method, params, timeout=timeout)
+            except NodeWorkerError as e:
+                # Errors raised inside the JS method are not retried, only a dead/broken process is.
+                if worker.alive or attempt == retries:
+                    raise
+                print(f"Node worker died during '{method}' call ({e}), restarting it.")
+
+    def ping(self, timeout: float = 5) -> bool:
+        return all(w.ping(timeout=timeout) for w in self.workers)
+
+    def close(self):
+        for w in self.workers:
+            w.close()
+
+_node_pool = None
+_node_pool_lock = threading.Lock()
+
+def get_node_pool(size: int = 2) -> NodeWorkerPool:
+    """Module wide NodeWorkerPool, created on first use and closed at interpreter exit."""
+    global _node_pool
+    with _node_pool_lock:
+        if _node_pool is None:
+            _node_pool = NodeWorkerPool(size=size)
+            atexit.register(_node_pool.close)
+        return _node_pool
+
+def js_search_tv(searchstr: str) -> dict:
     try:
-        # Parse the JSON response directly
-        response = json.loads(result.stdout.strip())
-        print("Parsed JSON response:", response)
-        
-        # Convert list to numbered dictionary format if it's a list
-        if isinstance(response, list):
-            full_dict = {}
-            for i, item in enumerate(response):
-                full_dict[i] = item
-            return full_dict
-        else:
-            return response
-            
-    except json.JSONDecodeError as e:
-        print("Failed to parse JSON response:", e)
-        print("Raw output:", result.stdout)
-        return {"error": "JSON parse error", "success": False}
+        response = get_node_pool().call("tv_search", {"searchstr": searchstr})
+    except Exception as e:
+        print("Error:", e)
+        return {"error": str(e), "success": False}
+    print("Parsed JSON response:", response)
+
+    # Convert list to numbered dictionary format if it's a list
+    if isinstance(response, list):
+        full_dict = {}
+        for i, item in enumerate(response):
+            full_dict[i] = item
+        return full_dict
+    else:
+        return response
 
 def js_search_yf(searchstr: str) -> str:
-    data_str = json.dumps(searchstr)
-
-    # Prepare environment with NODE_PATH
-    env = os.environ.copy()
-    if node_path:
-        env['NODE_PATH'] = node_path
-
-    # Run Node.js process and pass data with UTF-8 encoding
-    result = subprocess.run(['node', wd+fdel+'yfinance2_js.js'], 
-                          input=data_str, text=True, capture_output=True, env=env, encoding='utf-8', errors='replace')
-    if result.returncode != 0:
-        print("Error:", result.stderr)
+    try:
+        result = get_node_pool().call("yf_search", {"searchstr": searchstr})
+    except Exception as e:
+        print("Error:", e)
         return None
     else:
         print("Success with yfinance request.")
-    #print("Return code:", result.returncode, "\n\n", result.stderr, "\n\n", 'stdout:', result.stdout, result.stdout)
 
-    return result.stdout
+    return json.dumps(result)
 
 def process_yf_stdout(input: str) -> dict:
     
@@ -114,54 +264,24 @@ def search_yf_tickers(searchstr: str) -> tuple:
 
 def js_search_yf_enhanced(searchstr: str) -> dict:
     """Enhanced Yahoo Finance search using Node.js script with better error handling"""
-    data_str = json.dumps(searchstr)
-
-    # Prepare environment with NODE_PATH
-    env = os.environ.copy()
-    if node_path:
-        env['NODE_PATH'] = node_path
-
-    # Run Node.js process and pass data via stdin with UTF-8 encoding
-    result = subprocess.run(['node', wd+fdel+'yfinance2_js.js'], 
-                          input=data_str, text=True, capture_output=True, env=env, encoding='utf-8', errors='replace')
-    
-    if result.returncode != 0:
-        print("Error in yfinance search:", result.stderr)
-        return {"quotes": [], "news": [], "error": result.stderr}
-    
     try:
-        response = json.loads(result.stdout)
-        return response
-    except json.JSONDecodeError as e:
-        print("Failed to parse JSON response:", e)
-        return {"quotes": [], "news": [], "error": "JSON parse error"}
+        return get_node_pool().call("yf_search", {"searchstr": searchstr})
+    except Exception as e:
+        print("Error in yfinance search:", e)
+        return {"quotes": [], "news": [], "error": str(e)}
 
-def js_get_historical_data(symbol: str, start_date: str, end_date: str, interval: str = "1d") -> dict:
+def js_get_historical_data(symbol: str, start_date: str, end_date: str, interval: str = "1d", timeout: float = 120) -> dict:
     """Get historical data using Node.js Yahoo Finance script"""
     # Convert dates to timestamps
     start_timestamp = int(pd.Timestamp(start_date).timestamp())
     end_timestamp = int(pd.Timestamp(end_date).timestamp())
-    
-    # Prepare environment with NODE_PATH
-    env = os.environ.copy()
-    env['NODE_PATH'] = node_path
-    
-    # Run Node.js process with command line arguments and UTF-8 encoding
-    cmd = ['node', wd+fdel+'yfinance2_js.js', 'fetch', symbol, 
-           str(start_timestamp), str(end_timestamp), interval]
-    
-    result = subprocess.run(cmd, text=True, capture_output=True, env=env, encoding='utf-8', errors='replace')
-    
-    if result.returncode != 0:
-        print("Error fetching historical data:", result.stderr)
-        return {"success": False, "error": result.stderr, "data": []}
-    
+
+    params = {"symbol": symbol, "period1": start_timestamp, "period2": end_timestamp, "interval": interval}
     try:
-        response = json.loads(result.stdout)
-        return response
-    except json.JSONDecodeError as e:
-        print("Failed to parse JSON response:", e)
-        return {"success": False, "error": "JSON parse error", "data": []}
+        return get_node_pool().call("yf_fetch", params, timeout=timeout)
+    except Exception as e:
+        print("Error fetching historical data:", e)
+        return {"success": False, "error": str(e), "data": []}
 
 def convert_js_data_to_pandas(js_data) -> pd.DataFrame:
     """Convert JavaScript data to pandas DataFrame - handles both historical data and search results"""
@@ -0,0 +1,58 @@
+// Long-lived worker used by js_funcs.NodeWorker. Speaks line-delimited JSON-RPC over stdin/stdout:
+//   request:  {"id": 1, "method": "yf_search", "params": {...}}
+//   response: {"id": 1, "result": ...}  or  {"id": 1, "error": "message"}
+// Requests are handled concurrently, responses may come back in any order. Only responses go to stdout,
+// anything else the libraries log must go to stderr.
+const readline = require('readline');
+const path = require('path');
+
+// Libraries are only loaded on first use so that a missing package only breaks the methods that need it.
+const modules = {};
+function lazy(name) {
+    if (!modules[name]) {
+        modules[name] = require(path.join(__dirname, name));
+    }
+    return modules[name];
+}
+
+const methods = {
+    ping: async () => ({ pong: true, pid: process.pid }),
+    tv_search: async (params) => lazy('searchTV_js.js').searchTV(params.searchstr),
+    yf_search: async (params) => lazy('yfinance2_js.js').searchSymbols(params.searchstr),
+    yf_fetch: async (params) => lazy('yfinance2_js.js').fetchData(params.symbol, params.period1, params.period2, params.interval || '1d'),
+};
+
+// Keep stray console.log output from libraries off the protocol channel.
+console.log = (...args) => console.error(...args);
+
+function respond(msg) {
+    process.stdout.write(JSON.stringify(msg) + '\n');
+}
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+
+rl.on('line', async (line) => {
+    if (!line.trim()) {
+        return;
+    }
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (error) {
+        respond({ id: null, error: `Invalid request: ${error.message}` });
+        return;
+    }
+    const handler = methods[request.method];
+    if (!handler) {
+        respond({ id: request.id, error: `Unknown method: ${request.method}` });
+        return;
+    }
+    try {
+        const result = await handler(request.params || {});
+        respond({ id: request.id, result: result });
+    } catch (error) {
+        respond({ id: request.id, error: error.message });
+    }
+});
+
+rl.on('close', () => process.exit(0));
@@ -17,28 +17,36 @@
 const fs = require('fs');
 const TradingView = require('@mathieuc/tradingview');
 
-// Reading input from stdin
-let data = '';
-process.stdin.on('data', chunk => {
-    data += chunk;
-});
-
-process.stdin.on('end', async () => {
-    try {
-        // Parse the JSON data
-        const searchstr = JSON.parse(data.trim());
-        
-        // Use the TradingView library to search market
-        const results = await TradingView.searchMarket(searchstr);
-        const limitedResults = results.slice(0, 30);
-        
-        // Output the result as JSON
-        console.log(JSON.stringify(limitedResults));
-    } catch (error) {
-        console.error(JSON.stringify({
-            error: error.message,
-            success: false
-        }));
-        process.exit(1);
-    }
-});
\ No newline at end of file
+async function searchTV(searchstr) {
+    const results = await TradingView.searchMarket(searchstr);
+    return results.slice(0, 30);
+}
+
+module.exports = { searchTV };
+
+if (require.main === module) {
+    // Reading input from stdin
+    let data = '';
+    process.stdin.on('data', chunk => {
+        data += chunk;
+    });
+
+    process.stdin.on('end', async () => {
+        try {
+            // Parse the JSON data
+            const searchstr = JSON.parse(data.trim());
+
+            // Use the TradingView library to search market
+            const limitedResults = await searchTV(searchstr);
+
+            // Output the result as JSON
+            console.log(JSON.stringify(limitedResults));
+        } catch (error) {
+            console.error(JSON.stringify({
+                error: error.message,
+                success: false
+            }));
+            process.exit(1);
+        }
+    });
+}
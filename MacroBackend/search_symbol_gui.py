@@ -595,21 +595,14 @@ class Ui_MainWindow(QtWidgets.QMainWindow):
                             print(f"Failed to build local BEA index. Error: {e}")
                             return
 
-                    ext = self.source_table_path.split(".")[-1]
-                    if ext == "csv":
-                        df = pd.read_csv(self.source_table_path, index_col=0)
-                    elif ext == "xlsx":
-                        df = pd.read_excel(self.source_table_path, index_col=0)
-                    elif ext == "h5" or ext == "h5s":
-                        df = pd.read_hdf(self.source_table_path, key='data')
-                    else:
-                        print("File extension not recognized, please use .csv, .xlsx or .h5s")
+                    # The source index file is loaded & tokenized once, then reused until the file changes.
+                    try:
+                        index = Utilities.load_search_index(self.source_table_path,
+                                                            search_cols=None if search_these_cols == "all" else search_these_cols)
+                    except ValueError as e:
+                        print(e)
                         return
-                    
-                    if search_these_cols == "all":
-                        results = Utilities.Search_DF_np(df, term, index_or_cols='cols')
-                    else:
-                        results = Utilities.Search_DF_np(df, term, index_or_cols='cols', use_cols = search_these_cols)
+                    results = index.search(term)
 
                     if results.empty:
                         print("No results found, check search terms.")
@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
 import seaborn as sns
 from scipy import stats
+from scipy.fft import next_fast_len
 from statsmodels.tsa.stattools import adfuller, kpss
 
 import sys
@@ -40,6 +41,55 @@ def qd_corr(series1: pd.Series, series2: pd.Series) -> float:
 
     return qd_corr
 
+def _window_sums(cumsum: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Sums over the windows [start, end) from a cumulative sum that has a leading zero."""
+    return cumsum[ends] - cumsum[starts]
+
+def _cumsum0(a: np.ndarray) -> np.ndarray:
+    return np.concatenate(([0.0], np.cumsum(a)))
+
+def _window_rows(arrays: tuple, starts: np.ndarray, window: int, max_elements: int = 2**21):
+    """Yield (rows, views) where views are the (len(rows), window) windows starting at starts[rows] of each array,
+    taken from sliding_window_view in chunks so that at most about max_elements values are copied at a time."""
+    views = [np.lib.stride_tricks.sliding_window_view(a, window) for a in arrays]
+    step = max(1, max_elements // max(window, 1))
+    for i in range(0, len(starts), step):
+        rows = np.arange(i, min(i + step, len(starts)))
+        yield rows, [v[starts[rows]] for v in views]
+
+# Window sums taken as differences of cumulative sums lose about eps * (cumulative sum) / (window sum) of relative
+# precision. Windows whose sums of squares are below this fraction of the running cumulative sum are recomputed directly.
+_UNSTABLE_FRACTION = 1e-6
+
+def rolling_qd_windows(series1: pd.Series, series2: pd.Series, windows: list) -> dict:
+    """
+    Rolling Quant-Dare correlation for several window lengths at once. The cumulative sums of x*y, x² and y² are
+    computed once and each window is then just a difference of two cumulative sums, so cost is O(n) per window.
+    NaN values count as zero, like the pandas sums in qd_corr.
+
+    :param series1: The first pandas Series.
+    :param series2: The second pandas Series.
+    :param windows: List of window sizes.
+
+    :return: dict of {window: pd.Series} with the same values and index that rolling_qd gives for each window.
+    """
+    if len(series1) != len(series2):
+        raise ValueError("Series must have the same length")
+
+    x = np.nan_to_num(series1.to_numpy(dtype=float)); y = np.nan_to_num(series2.to_numpy(dtype=float))
+    cxy = _cumsum0(x * y); cxx = _cumsum0(x * x); cyy = _cumsum0(y * y)
+    n = len(x); out = {}
+    for window in windows:
+        ends = np.arange(window, n + 1); starts = ends - window
+        sxx = _window_sums(cxx, starts, ends); syy = _window_sums(cyy, starts, ends)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            qd = _window_sums(cxy, starts, ends) / np.sqrt(sxx * syy)
+            unstable = np.flatnonzero((sxx <= _UNSTABLE_FRACTION * cxx[ends]) | (syy <= _UNSTABLE_FRACTION * cyy[ends]))
+            for rows, (xs, ys) in _window_rows((x, y), starts[unstable], window):
+                qd[unstable[rows]] = (xs * ys).sum(axis=1) / np.sqrt((xs * xs).sum(axis=1) * (ys * ys).sum(axis=1))
+        out[window] = pd.Series(qd, index=series1.index[window - 1:])
+    return out
+
 def rolling_qd(series1: pd.Series, series2: pd.Series, window: int = 1) -> pd.Series:
     """
     Calculates the rolling Quant-Dare correlation between two pandas Series.
@@ -50,35 +100,285 @@ def rolling_qd(series1: pd.Series, series2: pd.Series, window: int = 1) -> pd.Se
 
     :return: A pandas Series containing the rolling Quant-Dare correlation values.
     """
+    return rolling_qd_windows(series1, series2, [window])[window]
 
-    if len(series1) != len(series2):
-        raise ValueError("Series must have the same length")
-    
-    rolling_corrs = []
-    for i in range(window - 1, len(series1)):
-        window_series1 = series1[i - (window - 1):i + 1]
-        window_series2 = series2[i - (window - 1):i + 1]
-        corr = qd_corr(window_series1, window_series2)
-        rolling_corrs.append(corr)
-    
-    return pd.Series(rolling_corrs, index=series1.index[window - 1:])
+def rolling_pearson_windows(x: np.ndarray, y: np.ndarray, windows: list) -> dict:
+    """
+    Rolling Pearson correlation of two aligned arrays for several window lengths in one go. The value at position i
+    is the correlation over positions [i-window, i), i.e. the window ends just before i, with NaN for i < window.
+    Pairs where either value is NaN are left out, as with pd.Series.corr.
 
-def rolling_corr(series1: pd.Series, series2: pd.Series, window: int, method: str = "pearson") -> pd.Series:
-    """Calculate rolling correlation between two time series"""
-    # Ensure both series are aligned to same index
+    Window sums of x, y, x², y² and x*y come from cumulative sums of the data centred on its mean, which keeps the
+    sums small. Windows where the variance is tiny relative to the cumulative sum of squares (where the subtraction
+    in var = Sxx - Sx²/n would lose precision) are recomputed directly.
+
+    :return: dict of {window: np.ndarray} of length len(x).
+    """
+    x = np.asarray(x, dtype=float); y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    mx = x[valid].mean() if valid.any() else 0.0
+    my = y[valid].mean() if valid.any() else 0.0
+    xc = np.where(valid, x - mx, 0.0); yc = np.where(valid, y - my, 0.0)
+    c_n = _cumsum0(valid.astype(float))
+    c_x = _cumsum0(xc); c_y = _cumsum0(yc)
+    c_xx = _cumsum0(xc * xc); c_yy = _cumsum0(yc * yc); c_xy = _cumsum0(xc * yc)
+
+    n = len(x); out = {}
+    for window in windows:
+        corr = np.full(n, np.nan)
+        ends = np.arange(window, n)
+        if window < 1 or len(ends) == 0:
+            out[window] = corr
+            continue
+        starts = ends - window
+        cnt = _window_sums(c_n, starts, ends)
+        sx = _window_sums(c_x, starts, ends); sy = _window_sums(c_y, starts, ends)
+        sxx = _window_sums(c_xx, starts, ends); syy = _window_sums(c_yy, starts, ends)
+        sxy = _window_sums(c_xy, starts, ends)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vx = sxx - sx * sx / cnt
+            vy = syy - sy * sy / cnt
+            r = (sxy - sx * sy / cnt) / np.sqrt(vx * vy)
+
+        # Recompute windows where cancellation may have eaten the precision. Rounding error in the window sums scales
+        # with the size of the running cumulative sums, so compare the variances against those. The direct two-pass
+        # calculation is done for all those windows at once on sliding_window_view slices.
+        unstable = np.flatnonzero((cnt >= 2) & ((vx <= _UNSTABLE_FRACTION * c_xx[ends]) | (vy <= _UNSTABLE_FRACTION * c_yy[ends])))
+        for rows, (xs, ys, ms) in _window_rows((x, y, valid), starts[unstable], window):
+            k = ms.sum(axis=1)
+            dx = np.where(ms, xs, 0.0); dy = np.where(ms, ys, 0.0)
+            dx = np.where(ms, xs - (dx.sum(axis=1) / k)[:, None], 0.0)
+            dy = np.where(ms, ys - (dy.sum(axis=1) / k)[:, None], 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                den = np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+                r[unstable[rows]] = np.where(den > 0, (dx * dy).sum(axis=1) / den, np.nan)
+        r[cnt < 2] = np.nan
+        corr[ends] = np.clip(r, -1.0, 1.0)
+        out[window] = corr
+    return out
+
+def rolling_corr_windows(series1: pd.Series, series2: pd.Series, windows: list, method: str = "pearson") -> pd.DataFrame:
+    """Rolling correlation between two time series for several window lengths, returned as a DataFrame with one
+    column per window. Pearson is vectorized (see rolling_pearson_windows), other methods fall back to
+    calculating each window separately."""
     common_idx = series1.index.intersection(series2.index)
     s1 = series1.loc[common_idx]
     s2 = series2.loc[common_idx]
-    
-    # Calculate rolling correlation directly
-    rolling_corr = pd.Series(
-        index=common_idx,
-        data=[s1.iloc[i-window:i].corr(s2.iloc[i-window:i], method=method) 
-              if i >= window else np.nan 
-              for i in range(len(common_idx))]
-    )
-    
-    return rolling_corr
+
+    if method == "pearson":
+        corrs = rolling_pearson_windows(s1.to_numpy(dtype=float), s2.to_numpy(dtype=float), windows)
+    else:
+        corrs = {window: [s1.iloc[i-window:i].corr(s2.iloc[i-window:i], method=method) 
+                          if i >= window else np.nan 
+                          for i in range(len(common_idx))] for window in windows}
+    return pd.DataFrame(corrs, index=common_idx, columns=list(dict.fromkeys(windows)))
+
+def rolling_corr(series1: pd.Series, series2: pd.Series, window: int, method: str = "pearson") -> pd.Series:
+    """Calculate rolling correlation between two time series"""
+    return rolling_corr_windows(series1, series2, [window], method=method)[window]
+
+def cross_corr_lags(series1: pd.Series, series2: pd.Series, max_lag: int, lags: list = None) -> pd.Series:
+    """
+    Pearson correlation between series1 and series2 shifted by every lag from -max_lag to max_lag, all at once using FFTs.
+    The value at lag k equals series1.corr(series2.shift(k)), so positive k means series2 leads series1 by k periods.
+
+    NaN gaps are handled by masked normalization: the count, sums and sums of squares of the overlapping valid pairs are
+    cross-correlations of the zero-filled data with the validity masks, so each lag uses only the pairs where both values
+    exist, as pd.Series.corr does. The series are aligned on their index first and shifts are positional.
+
+    :param series1: The static series.
+    :param series2: The series that is shifted.
+    :param max_lag: Largest shift to evaluate, in periods of the index.
+    :param lags: Optional subset of lags to return, default is every lag from -max_lag to max_lag.
+
+    :return: pd.Series of correlations indexed by lag. Use .idxmax() for the optimal lag.
+    """
+    aligned = pd.concat([series1, series2], axis=1)
+    x = aligned.iloc[:, 0].to_numpy(dtype=float); y = aligned.iloc[:, 1].to_numpy(dtype=float)
+    n = len(x)
+    mx = ~np.isnan(x); my = ~np.isnan(y)
+    # Centre on the means so that the FFT rounding error stays small relative to the variances.
+    xz = np.where(mx, x - (x[mx].mean() if mx.any() else 0.0), 0.0)
+    yz = np.where(my, y - (y[my].mean() if my.any() else 0.0), 0.0)
+    mx = mx.astype(float); my = my.astype(float)
+
+    size = next_fast_len(2 * n - 1)
+    fx = {name: np.fft.rfft(a, size) for name, a in (("m", mx), ("x", xz), ("xx", xz * xz))}
+    fy = {name: np.conj(np.fft.rfft(a, size)) for name, a in (("m", my), ("y", yz), ("yy", yz * yz))}
+
+    all_lags = np.arange(-max_lag, max_lag + 1)
+    pos = np.mod(all_lags, size)   # circular position of each lag in the inverse FFT
+    def xcorr(a, b):
+        # sum over t of a[t] * b[t - k] for every lag k
+        return np.fft.irfft(fx[a] * fy[b], size)[pos]
+
+    cnt = np.rint(xcorr("m", "m"))
+    sx = xcorr("x", "m"); sy = xcorr("m", "y")
+    sxx = xcorr("xx", "m"); syy = xcorr("m", "yy"); sxy = xcorr("x", "y")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vx = sxx - sx * sx / cnt
+        vy = syy - sy * sy / cnt
+        corr = (sxy - sx * sy / cnt) / np.sqrt(vx * vy)
+    corr[(cnt < 2) | (np.abs(all_lags) >= n) | (vx <= 0) | (vy <= 0)] = np.nan
+    curve = pd.Series(np.clip(corr, -1.0, 1.0), index=all_lags, name="corr")
+    return curve if lags is None else curve.reindex(lags)
+
+def to_returns(data: pd.DataFrame, return_type: str = "log") -> pd.DataFrame:
+    """Convert price/level columns to returns: "log", "pct", "diff" or "level" (unchanged). Gaps are not filled."""
+    if return_type == "log":
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log(data / data.shift(1)).replace([np.inf, -np.inf], np.nan)
+    elif return_type == "pct":
+        return data.pct_change(fill_method=None).replace([np.inf, -np.inf], np.nan)
+    elif return_type == "diff":
+        return data.diff()
+    elif return_type == "level":
+        return data
+    raise ValueError(f"return_type must be 'log', 'pct', 'diff' or 'level', not {return_type}")
+
+def _block_moments(xa: np.ndarray, va: np.ndarray, xb: np.ndarray, vb: np.ndarray) -> tuple:
+    """Cumulative (over time, with a leading zero row) pairwise moment tensors of shape (n+1, A, B) for two blocks of
+    mean-centred columns xa, xb (zero where missing) with validity masks va, vb. Sums only count dates where both
+    columns of a pair have values."""
+    def cum(t):
+        return np.concatenate((np.zeros((1,) + t.shape[1:]), np.cumsum(t, axis=0)), axis=0)
+    fa = va.astype(float); fb = vb.astype(float)
+    c_n = cum(np.einsum('ta,tb->tab', fa, fb))
+    c_x = cum(np.einsum('ta,tb->tab', xa, fb)); c_y = cum(np.einsum('ta,tb->tab', fa, xb))
+    c_xx = cum(np.einsum('ta,tb->tab', xa * xa, fb)); c_yy = cum(np.einsum('ta,tb->tab', fa, xb * xb))
+    c_xy = cum(np.einsum('ta,tb->tab', xa, xb))
+    return c_n, c_x, c_y, c_xx, c_yy, c_xy
+
+def rolling_cov_corr_matrix(data: pd.DataFrame, windows: list, return_type: str = "level", chunk_size: int = 16,
+                            min_periods: int = None, step: int = 1, dropna: bool = True) -> pd.DataFrame:
+    """
+    Rolling covariance & Pearson correlation for every pair of columns in data, for several window lengths at once.
+    Values match pandas' a.rolling(window).cov(b) / .corr(b) (window ending on, and including, each date, sample
+    covariance) which is what efficient_cov_corr gives for a single pair.
+
+    Per block of columns, cumulative sums over time of the pairwise moments (count, Σx, Σy, Σx², Σy², Σxy, counting only
+    dates where both series have data) are built as (n, A, B) tensors. Every window of every pair is then a difference
+    of two rows of those tensors, so cost is O(n·N²) per window rather than O(n·N²·window). The columns are processed
+    in blocks of chunk_size to keep the tensors to about 6·n·chunk_size² floats in memory. Data are centred on their
+    column means first, and windows where the variance is tiny next to the cumulative sums are recomputed directly.
+
+    :param data: DataFrame of aligned series, one per column.
+    :param windows: list of window lengths (rows).
+    :param return_type: "level" to use data as is, or "log", "pct", "diff" returns computed from it first.
+    :param chunk_size: number of columns per block.
+    :param min_periods: min number of pairwise valid rows in a window for a value, defaults to the window length.
+    :param step: only output every step-th date, to cap the size of the output.
+    :param dropna: drop rows with no covariance value (e.g. the first window-1 dates).
+
+    :return: long format DataFrame with columns date, window, series1, series2, cov, corr. One row per date, window
+    and unordered pair (series1 comes before series2 in data's column order).
+    """
+    data = to_returns(pd.DataFrame(data), return_type)
+    names = list(data.columns); n, N = data.shape
+    x = data.to_numpy(dtype=float)
+    valid = ~np.isnan(x)
+    with np.errstate(invalid='ignore'):
+        means = np.where(valid.any(axis=0), np.nanmean(np.where(valid, x, np.nan), axis=0), 0.0) if n else np.zeros(N)
+    xc = np.where(valid, x - means, 0.0)
+    rows = np.arange(0, n, max(1, int(step)))
+    blocks = [np.arange(i, min(i + chunk_size, N)) for i in range(0, N, chunk_size)]
+
+    out = []
+    for bi, A in enumerate(blocks):
+        for B in blocks[bi:]:
+            c_n, c_x, c_y, c_xx, c_yy, c_xy = _block_moments(xc[:, A], valid[:, A], xc[:, B], valid[:, B])
+            ia, ib = np.meshgrid(A, B, indexing='ij')
+            keep = ia < ib     # each unordered pair once
+            if not keep.any():
+                continue
+            for window in windows:
+                mp = window if min_periods is None else min_periods
+                ends = rows + 1; starts = np.maximum(ends - window, 0)
+                ok = rows >= min(mp, window) - 1
+                ends, starts, at = ends[ok], starts[ok], rows[ok]
+                if len(at) == 0:
+                    continue
+                cnt = c_n[ends] - c_n[starts]
+                sx = c_x[ends] - c_x[starts]; sy = c_y[ends] - c_y[starts]
+                sxx = c_xx[ends] - c_xx[starts]; syy = c_yy[ends] - c_yy[starts]
+                sxy = c_xy[ends] - c_xy[starts]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    cxy = sxy - sx * sy / cnt
+                    vx = sxx - sx * sx / cnt; vy = syy - sy * sy / cnt
+                    cov = cxy / (cnt - 1)
+                    corr = cxy / np.sqrt(vx * vy)
+
+                unstable = (cnt >= 2) & ((vx <= _UNSTABLE_FRACTION * c_xx[ends]) | (vy <= _UNSTABLE_FRACTION * c_yy[ends])) & keep
+                for k, a, b in zip(*np.nonzero(unstable)):
+                    sl = slice(starts[k], ends[k]); m = valid[sl, A[a]] & valid[sl, B[b]]
+                    xs = x[sl, A[a]][m]; ys = x[sl, B[b]][m]
+                    dx = xs - xs.mean(); dy = ys - ys.mean()
+                    den = np.sqrt((dx * dx).sum() * (dy * dy).sum())
+                    cov[k, a, b] = (dx * dy).sum() / (len(xs) - 1)
+                    corr[k, a, b] = (dx * dy).sum() / den if den > 0 else np.nan
+
+                low = cnt < max(mp, 2)
+                cov[low] = np.nan; corr[low] = np.nan
+                corr = np.clip(corr, -1.0, 1.0)
+                # One (pair, date) row per unordered pair, the dates of each pair stay contiguous and in order.
+                out.append((window, ia[keep], ib[keep], at, cov[:, keep].T, corr[:, keep].T))
+
+    if not out:
+        return pd.DataFrame(columns=["date", "window", "series1", "series2", "cov", "corr"])
+    # Order the per pair segments by window and series names (ranked in sorted order), rather than sorting millions
+    # of output rows on strings.
+    rank = np.empty(N, dtype=np.int64); rank[pd.Series(names).sort_values(kind="stable").index] = np.arange(N)
+    segments = sorted((window, rank[a], rank[b], ci, j) for ci, (window, pa, pb, _, _, _) in enumerate(out)
+                      for j, (a, b) in enumerate(zip(pa, pb)))
+    lengths = np.array([len(out[ci][3]) for _, _, _, ci, _ in segments])
+    at = np.concatenate([out[ci][3] for _, _, _, ci, _ in segments])
+    cov = np.concatenate([out[ci][4][j] for _, _, _, ci, j in segments])
+    corr = np.concatenate([out[ci][5][j] for _, _, _, ci, j in segments])
+    window = np.repeat([seg[0] for seg in segments], lengths)
+    labels = np.array(names, dtype=object)
+    pa = np.repeat([out[ci][1][j] for _, _, _, ci, j in segments], lengths)
+    pb = np.repeat([out[ci][2][j] for _, _, _, ci, j in segments], lengths)
+    if dropna:
+        ok = ~np.isnan(cov)
+        at, window, pa, pb, cov, corr = at[ok], window[ok], pa[ok], pb[ok], cov[ok], corr[ok]
+    return pd.DataFrame({"date": data.index[at], "window": window, "series1": labels[pa], "series2": labels[pb],
+                         "cov": cov, "corr": corr})
+
+def watchlist_corr_matrix(watchlist, windows: list = [30, 90, 365], ids: list = None, return_type: str = "log",
+                          resample_to: str = None, chunk_size: int = 16, min_periods: int = None, step: int = 1) -> pd.DataFrame:
+    """
+    Rolling correlation/covariance screen across the series of a Watchlist, see rolling_cov_corr_matrix.
+
+    :param watchlist: a MacroBackend.watchlist.Watchlist with its datasets loaded (get_watchlist_data or load_watchlist_data).
+    :param windows: list of window lengths, in periods of the aligned data.
+    :param ids: the dataset ids to include, all datasets if None. DataFrame datasets use their "Close" column if they
+    have one and are skipped otherwise.
+    :param return_type: "log", "pct", "diff" or "level".
+    :param resample_to: pandas frequency to align the series on (last value per period), e.g. "W" or "M". If None they
+    are aligned on the union of their dates and missing values are left out pairwise.
+    :return: long format DataFrame with columns date, window, series1, series2, cov, corr.
+    """
+    datasets = watchlist["watchlist_datasets"]
+    ids = list(datasets.keys()) if ids is None else ids
+    columns = {}
+    for i in ids:
+        ser = datasets[i]
+        if isinstance(ser, pd.DataFrame):
+            if "Close" in ser.columns:
+                ser = ser["Close"]
+            elif ser.shape[1] == 1:
+                ser = ser.squeeze(axis=1)
+            else:
+                print(f"Skipping {i}, it is a DataFrame with columns {list(ser.columns)} and no 'Close' column.")
+                continue
+        ser = pd.to_numeric(ser, errors='coerce')
+        ser.index = pd.DatetimeIndex(ser.index)
+        columns[i] = ser[~ser.index.duplicated(keep='last')]
+    data = pd.DataFrame(columns).sort_index()
+    if resample_to is not None:
+        data = data.resample(resample_to).last()
+    return rolling_cov_corr_matrix(data, windows, return_type=return_type, chunk_size=chunk_size,
+                                   min_periods=min_periods, step=step)
 
 def check_stationarity(series):
     # Augmented Dickey-Fuller test
@@ -269,27 +569,24 @@ class Pair_stats(object):
         print("Whole time qd correlation between log returns,"+self.ser1_title+" vs "+self.ser2_title+":", self.full_qdCorr)
         print("Rolling stats Windows: ", self.windows)
         names = self.ser1_title+"_"+self.ser2_title
+        # All windows are computed in one go for each of price series, log returns, YoY returns & percentage returns.
+        corr_sets = {
+            "_Corr_": rolling_corr_windows(self.data[self.series1.name], self.data[self.series2.name], self.windows, method=corr_method),
+            "_RetCorr_": rolling_corr_windows(self.data["ret_" + self.ser1_title], self.data["ret_" + self.ser2_title], self.windows, method=corr_method),
+            "_retYoY_": rolling_corr_windows(self.data["retYoY_" + self.ser1_title], self.data["retYoY_" + self.ser2_title], self.windows, method=corr_method),
+            "_PctRetCorr_": rolling_corr_windows(self.data["retPct_" + self.ser1_title], self.data["retPct_" + self.ser2_title], self.windows, method=corr_method)
+        }
+        try:
+            qd_corrs = rolling_qd_windows(self.data["ret_" + self.ser1_title], self.data["ret_" + self.ser2_title], self.windows)
+        except Exception as ahshitfckdup:
+            qd_corrs = {}
+            print("Could not calculate the corr using the quant dare formula, for this pair, ", self.ser1_title, "&", self.ser2_title, "\nError message: ", ahshitfckdup)
+
         for window in self.windows:
-            # For price series
-            self.data[names + "_Corr_" + str(window)] = rolling_corr(self.data[self.series1.name], self.data[self.series2.name], 
-                window, method=corr_method)
-            
-            # For log returns
-            self.data[names + "_RetCorr_" + str(window)] = rolling_corr(self.data["ret_" + self.ser1_title], self.data["ret_" + self.ser2_title], 
-                window, method=corr_method)
-            
-            # For YoY returns
-            self.data[names + "_retYoY_" + str(window)] = rolling_corr(self.data["retYoY_" + self.ser1_title], self.data["retYoY_" + self.ser2_title], 
-                window, method=corr_method)
-            
-            # For percentage returns
-            self.data[names + "_PctRetCorr_" + str(window)] = rolling_corr(
-                self.data["retPct_" + self.ser1_title], self.data["retPct_" + self.ser2_title], window, 
-                method=corr_method)
-            try:
-                self.data[names + "_qdCorr_" + str(window)] = rolling_qd(self.data["ret_" + self.ser1_title], self.data["ret_" + self.ser2_title], window)
-            except Exception as ahshitfckdup:
-                print("Could not calculate the corr using the quant dare formula, for this pair, ", self.ser1_title, "&", self.ser2_title, "\nError message: ", ahshitfckdup)
+            for label, corrs in corr_sets.items():
+                self.data[names + label + str(window)] = corrs[window]
+            if window in qd_corrs:
+                self.data[names + "_qdCorr_" + str(window)] = qd_corrs[window]
             self.data[names + "_beta_" + str(window)] = self.data[names + "_Corr_" + str(window)] * (self.data["ret_" + self.ser1_title].rolling(window=window).std() / self.data["ret_" + self.ser2_title].rolling(window=window).std())
             self.data[names + "_alpha_" + str(window)] = self.data[self.series1.name].rolling(window=window).mean() - self.data[names + "_beta_" + str(window)] * self.data[self.series2.name].rolling(window=window).mean()
 
@@ -506,28 +803,44 @@ class Pair_stats(object):
         Note that this does not use log returns of series1 and series2 and is therefore not recommended for financial data
         or any other series that deviate significantly from stationarity and normality."""
 
-        correlations = []; backcorrs = []
-        for i in range(n+1):
-            shifted_series2 = self.series2.shift(i)
-            correlation = self.series1.corr(shifted_series2, method=self.corr_method)
-            correlations.append(correlation)
-        for i in range(n+1):
-            shifted_series1 = self.series1.shift(i)
-            backcorr = self.series2.corr(shifted_series1, method=self.corr_method)
-            backcorrs.append(backcorr)
+        if self.corr_method == "pearson":
+            curve = cross_corr_lags(self.series1, self.series2, n)
+            correlations = curve.loc[0:n].to_list()
+            backcorrs = curve.loc[-n:0].to_list()[::-1]
+        else:
+            correlations = [self.series1.corr(self.series2.shift(i), method=self.corr_method) for i in range(n+1)]
+            backcorrs = [self.series2.corr(self.series1.shift(i), method=self.corr_method) for i in range(n+1)]
 
         print("Correlations for shifted series2: ", correlations)
-        optimal_lag = correlations.index(max(correlations))
-        highest_correlation = max(correlations)
         backcorr_ser = pd.Series(backcorrs[::-1], index=range(-(n+1), 0))
         self.lag_test = pd.concat([backcorr_ser, pd.Series(correlations, index=range(n+1))], axis=0)
+        if np.all(np.isnan(correlations)):
+            # e.g. a constant series or too little overlap at every lag
+            print("No lag gives a valid correlation between the two series.")
+            return None, np.nan
+        optimal_lag = int(np.nanargmax(correlations))
+        highest_correlation = correlations[optimal_lag]
         
         return optimal_lag, highest_correlation
     
+    def _lag_returns(self, ser2: pd.Series, yoy: bool = False) -> pd.Series:
+        periods = self.per_in_year if yoy else 1
+        return np.log(ser2/ser2.shift(periods))
+
+    @property
+    def shiftmatrix(self) -> pd.DataFrame:
+        """ The static returns series from the last find_optimal_ret_lag run alongside the returns of the other series
+        shifted by each tested lag (columns named by lag). Built on demand as it is large for wide lag scans."""
+        if not hasattr(self, "_lag_scan"):
+            return None
+        ser1, rets2, lags = self._lag_scan
+        return pd.concat([ser1] + [rets2.shift(i).rename(i) for i in lags], axis=1)
+
     def find_optimal_ret_lag(self, n, yoy: bool = False, increment: int = 1):
         """ Find the optimal lag-time that yields the highest correlation between the returns of the two series. 
         parameter n: int, the maximum number of lags to test. The function will test lags from 0 to n and -n to 0.
-        concatenating the results into a series. The lags are periods of the datetime index of the series."""
+        concatenating the results into a series. The lags are periods of the datetime index of the series.
+        With the pearson method all lags are evaluated at once with cross_corr_lags."""
 
         if yoy:
             print("Using YoY log returns for the cross-correlation analysis, periods in a year, ", self.per_in_year)
@@ -536,20 +849,15 @@ class Pair_stats(object):
             ser1 = self.data["ret_"+self.ser1_title]
         ser2 = self.data[self.ser2_title]
 
-        ## Shift series and calculate correlations
-        shifted = {}; correlations = {}
-        output_data = pd.DataFrame([ser1])
-        # Shift series 1 forward, corresponding to series 2 being shifted back...
-        for i in range(-n, n+1, increment): 
-            shifted_series2 = ser2.shift(i)
-            if yoy:
-                shifted_series2_rets = np.log(shifted_series2/shifted_series2.shift(self.per_in_year))
-            else:
-                shifted_series2_rets = np.log(shifted_series2/shifted_series2.shift(1))
-            shifted[i] = shifted_series2_rets
-            correlation = ser1.corr(shifted_series2_rets, method=self.corr_method)
-            correlations[i] = correlation
-            output_data = pd.concat([output_data, shifted_series2_rets], axis=1)
+        ## Shifting the price series and then taking returns is the same as shifting the returns.
+        rets2 = self._lag_returns(ser2, yoy=yoy)
+        lags = list(range(-n, n+1, increment))
+        if self.corr_method == "pearson":
+            correlations = cross_corr_lags(ser1, rets2, n, lags=lags).to_dict()
+        else:
+            correlations = {i: ser1.corr(rets2.shift(i), method=self.corr_method) for i in lags}
+        shifted = {i: rets2.shift(i) for i in range(-n, n+1, increment*5)}
+        self._lag_scan = (ser1, rets2, lags)
     
         ### Plot the shifted series for inspection, normalize plotted series to between 0 & 1 and offset in Y for easy viewing.
         fig1, ax1 = plt.subplots(1, 1, figsize=(12, 5))
@@ -576,7 +884,6 @@ class Pair_stats(object):
         ax2.set_xlabel("Time shift of "+self.ser2_title+" (number of periods)")
         ax2.set_ylabel("Correlation (Pearson)")
         
-        self.shiftmatrix = output_data
         self.lag_plot = fig1
         self.lag_plot2 = fig2
         return optimal_lag, highest_correlation
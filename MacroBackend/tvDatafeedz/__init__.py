@@ -1,3 +1,3 @@
-from .main import TvDatafeed, Interval
+from .main import TvDatafeed, Interval, TVSessionPool, get_session_pool
 
 __version__ = "2.1.0"
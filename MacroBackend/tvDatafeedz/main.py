@@ -5,8 +5,11 @@ import logging
 import random
 import re
 import string
+import threading
+import itertools
+import numpy as np
 import pandas as pd
-from websocket import create_connection
+from websocket import create_connection, WebSocketTimeoutException
 import requests
 import json
 import os
@@ -36,6 +39,134 @@ custom_headers = {
 def timeout_handler(signum, frame):
     raise TimeoutError("Data pull timed out")
 
+def generate_session_id(prefix: str = "cs_") -> str:
+    return prefix + "".join(random.choice(string.ascii_lowercase) for i in range(12))
+
+def format_symbol(symbol, exchange, contract: int = None):
+    if ":" in symbol:
+        pass
+    elif contract is None:
+        symbol = f"{exchange}:{symbol}"
+    elif isinstance(contract, int):
+        symbol = f"{exchange}:{symbol}{contract}!"
+    else:
+        raise ValueError("not a valid contract")
+    return symbol
+
+def ws_message(func, param_list) -> str:
+    """Build a TV websocket packet: the JSON message prefixed with the ~m~<length>~m~ header."""
+    st = json.dumps({"m": func, "p": param_list}, separators=(",", ":"))
+    return "~m~" + str(len(st)) + "~m~" + st
+
+class TVFrameParser:
+    """Incremental parser for the ~m~<length>~m~<payload> packets that TV sends over the websocket.
+
+    Text from each ws.recv() is fed in as it arrives. Complete packets are decoded and returned straight away,
+    a packet that is split across frames is held until the rest of it arrives. Returns a list of (kind, payload)
+    tuples, kind being "message" (decoded JSON dict), "heartbeat" (the raw ~h~ payload, which must be echoed back)
+    or "raw" (anything that is not JSON, like the server hello)."""
+
+    def __init__(self):
+        self._buf = ""
+
+    def feed(self, text: str) -> list:
+        buf = self._buf + text
+        out = []; pos = 0
+        while pos < len(buf):
+            if "~m~".startswith(buf[pos:pos + 3]) and len(buf) - pos < 3:
+                break
+            if not buf.startswith("~m~", pos):
+                nxt = buf.find("~m~", pos)
+                if nxt == -1:
+                    pos = len(buf)
+                    break
+                pos = nxt
+            end = buf.find("~m~", pos + 3)
+            if end == -1:
+                break
+            try:
+                length = int(buf[pos + 3:end])
+            except ValueError:
+                pos = end
+                continue
+            start = end + 3
+            if len(buf) < start + length:
+                break
+            payload = buf[start:start + length]
+            pos = start + length
+            if payload.startswith("~h~"):
+                out.append(("heartbeat", payload))
+                continue
+            try:
+                out.append(("message", json.loads(payload)))
+            except ValueError:
+                out.append(("raw", payload))
+        self._buf = buf[pos:]
+        return out
+
+class BarBuffer:
+    """Preallocated numpy buffer of [timestamp, open, high, low, close, volume] rows, grown by doubling when full.
+    Bars are written straight from the decoded "timescale_update"/"du" messages."""
+
+    def __init__(self, capacity: int = 5000):
+        self.values = np.full((max(int(capacity), 16), 6), np.nan)
+        self.n = 0
+
+    def add_series_update(self, update: dict) -> int:
+        """Add the bars found in the second parameter of a timescale_update/du message. Returns number of bars added."""
+        added = 0
+        for series in update.values():
+            if not isinstance(series, dict) or not isinstance(series.get("s"), list):
+                continue
+            bars = series["s"]
+            if self.n + len(bars) > len(self.values):
+                grown = np.full((max(2 * len(self.values), self.n + len(bars)), 6), np.nan)
+                grown[:self.n] = self.values[:self.n]
+                self.values = grown
+            for bar in bars:
+                v = bar.get("v", [])[:6]
+                self.values[self.n, :len(v)] = v
+                self.n += 1
+            added += len(bars)
+        return added
+
+    def to_frame(self, symbol: str) -> pd.DataFrame:
+        """Return the bars as the symbol/open/high/low/close/volume frame that get_hist returns, or None if empty."""
+        if self.n == 0:
+            logger.error("no data, please check the exchange and symbol")
+            return None
+        vals = self.values[:self.n]
+        data = pd.DataFrame(vals[:, 1:], columns=["open", "high", "low", "close", "volume"],
+                            index=pd.Index([datetime.datetime.fromtimestamp(ts) for ts in vals[:, 0]], name="datetime"))
+        data["volume"] = data["volume"].fillna(0.0)
+        data = data[~data.index.duplicated(keep="last")]
+        data.insert(0, "symbol", value=symbol)
+        return data
+
+def collect_bars(recv, parser: TVFrameParser = None, buffer: BarBuffer = None, send=None):
+    """Read frames with recv() until "series_completed", decoding packets into a BarBuffer as they arrive.
+    Heartbeats are echoed back through send() if it is given."""
+    parser = TVFrameParser() if parser is None else parser
+    buffer = BarBuffer() if buffer is None else buffer
+    while True:
+        try:
+            result = recv()
+        except Exception as e:
+            logger.error(e)
+            break
+        done = False
+        for kind, msg in parser.feed(result):
+            if kind == "heartbeat" and send is not None:
+                send("~m~" + str(len(msg)) + "~m~" + msg)
+            elif kind == "message" and isinstance(msg, dict):
+                if msg.get("m") in ("timescale_update", "du"):
+                    buffer.add_series_update(msg["p"][1])
+                elif msg.get("m") == "series_completed":
+                    done = True
+        if done:
+            break
+    return buffer
+
 class Interval(enum.Enum):
     in_1_minute = "1"
     in_3_minute = "3"
@@ -63,12 +194,15 @@ class TvDatafeed:
         self,
         username: str = None,
         password: str = None,
+        use_pool: bool = False,
     ) -> None:
         """Create TvDatafeed object
 
         Args:
             username (str, optional): tradingview username. Defaults to None.
             password (str, optional): tradingview password. Defaults to None.
+            use_pool (bool, optional): pull data through the shared TVSessionPool, reusing open websockets instead of
+                opening a new one for every symbol. Defaults to False.
         """
 
         self.ws_debug = False
@@ -80,6 +214,7 @@ class TvDatafeed:
                 "you are using nologin method, data you access may be limited"
             )
 
+        self.use_pool = use_pool
         self.ws = None
         self.session = self.__generate_session()
         self.chart_session = self.__generate_chart_session()
@@ -134,30 +269,14 @@ class TvDatafeed:
 
     @staticmethod
     def __generate_session():
-        stringLength = 12
-        letters = string.ascii_lowercase
-        random_string = "".join(random.choice(letters)
-                                for i in range(stringLength))
-        return "qs_" + random_string
+        return generate_session_id("qs_")
 
     @staticmethod
     def __generate_chart_session():
-        stringLength = 12
-        letters = string.ascii_lowercase
-        random_string = "".join(random.choice(letters)
-                                for i in range(stringLength))
-        return "cs_" + random_string
-
-    @staticmethod
-    def __prepend_header(st):
-        return "~m~" + str(len(st)) + "~m~" + st
-
-    @staticmethod
-    def __construct_message(func, param_list):
-        return json.dumps({"m": func, "p": param_list}, separators=(",", ":"))
+        return generate_session_id("cs_")
 
     def __create_message(self, func, paramList):
-        return self.__prepend_header(self.__construct_message(func, paramList))
+        return ws_message(func, paramList)
 
     def __send_message(self, func, args):
         m = self.__create_message(func, args)
@@ -165,73 +284,13 @@ class TvDatafeed:
             print(m)   
         self.ws.send(m)
 
-    def receive_ohlcv_data(self, symbol: str = "TICKER"):
-        raw_data = ""
-        while True:
-            try:
-                result = self.ws.recv()
-                raw_data = raw_data + result + "\n"
-            except Exception as e:
-                logger.error(e)
-                break
-            if "series_completed" in result:
-                break
-        return self.__create_df(raw_data, symbol)    
-
-    @staticmethod
-    def __create_df(raw_data, symbol):
-        try:
-            out = re.search('"s":\[(.+?)\}\]', raw_data).group(1)
-            x = out.split(',{"')
-            data = list()
-            volume_data = True
-
-            for xi in x:
-                xi = re.split("\[|:|,|\]", xi)
-                ts = datetime.datetime.fromtimestamp(float(xi[4]))
-
-                row = [ts]
-
-                for i in range(5, 10):
-
-                    # skip converting volume data if does not exists
-                    if not volume_data and i == 9:
-                        row.append(0.0)
-                        continue
-                    try:
-                        row.append(float(xi[i]))
-
-                    except ValueError:
-                        volume_data = False
-                        row.append(0.0)
-                        logger.debug('no volume data')
-
-                data.append(row)
-
-            data = pd.DataFrame(
-                data, columns=["datetime", "open",
-                               "high", "low", "close", "volume"]
-            ).set_index("datetime")
-            data.insert(0, "symbol", value=symbol)
-            return data
-        except AttributeError:
-            logger.error("no data, please check the exchange and symbol")
+    def receive_ohlcv_data(self, symbol: str = "TICKER", n_bars: int = 5000):
+        buffer = collect_bars(self.ws.recv, buffer=BarBuffer(n_bars), send=self.ws.send)
+        return buffer.to_frame(symbol)
 
     @staticmethod
     def __format_symbol(symbol, exchange, contract: int = None):
-
-        if ":" in symbol:
-            pass
-        elif contract is None:
-            symbol = f"{exchange}:{symbol}"
-
-        elif isinstance(contract, int):
-            symbol = f"{exchange}:{symbol}{contract}!"
-
-        else:
-            raise ValueError("not a valid contract")
-
-        return symbol
+        return format_symbol(symbol, exchange, contract)
 
     def get_hist(
         self,
@@ -259,6 +318,10 @@ class TvDatafeed:
             symbol=symbol, exchange=exchange, contract=fut_contract
         )
 
+        if self.use_pool:
+            return get_session_pool(self.token).get_hist(symbol, interval=interval, n_bars=n_bars,
+                                                         extended_session=extended_session, time_zone="exchange")
+
         interval = interval.value
 
         self.__create_connection()
@@ -321,22 +384,9 @@ class TvDatafeed:
         self.__send_message("switch_timezone", [
                             self.chart_session, "exchange"])
 
-        raw_data = ""
-
         logger.debug(f"getting data for {symbol}...")
 
-        while True:
-            try:
-                result = self.ws.recv()
-                raw_data = raw_data + result + "\n"
-            except Exception as e:
-                logger.error(e)
-                break
-
-            if "series_completed" in result:
-                break 
-
-        return self.__create_df(raw_data, symbol)
+        return self.receive_ohlcv_data(symbol, n_bars)
 
     def search_symbol(self, text: str, exchange: str = ''):
         url = self.__search_url.format(text, exchange)
@@ -360,6 +410,9 @@ class TvDatafeed:
         collection_method: int = 0) -> pd.DataFrame:
         
         symbol = self.__format_symbol(symbol=symbol, exchange=exchange, contract=fut_contract)
+        if self.use_pool and collection_method == 0:
+            return get_session_pool(self.token).get_hist(symbol, interval=interval, n_bars=n_bars,
+                                                         extended_session=extended_session, time_zone=time_zone)
         interval = interval.value
         print("Symbol:Exchange: ", symbol, "\n time interval: ", interval, '\n number of bars requested: ',n_bars)
 
@@ -387,18 +440,18 @@ class TvDatafeed:
         if collection_method == 0:  ##Use create_series function to get the data. 
             self.__send_message("create_series", [self.chart_session, "sds_1","s1", "symbol_1", interval, n_bars,""])
             logger.debug(f"getting data for {symbol}...")
-            full_data = self.receive_ohlcv_data(symbol)
+            full_data = self.receive_ohlcv_data(symbol, n_bars)
 
         elif collection_method == 1:  #Get the data through repeated calls of "request_more_data" function. 
             self.__send_message("create_series", [self.chart_session, "sds_1","s1", "symbol_1", interval, 300,""])
             logger.debug(f"getting data for {symbol}...")
-            full_data = self.receive_ohlcv_data(symbol); bars = 300
+            full_data = self.receive_ohlcv_data(symbol, 300); bars = 300
             print(full_data)
 
             while bars <= n_bars:
                 print("Bars already collected: ", bars)
                 self.__send_message("request_more_data", [self.chart_session, "sds_1", 300])
-                new_data = self.receive_ohlcv_data(symbol)
+                new_data = self.receive_ohlcv_data(symbol, 300)
                 print(new_data)
                 full_data = pd.concat([full_data, new_data], axis = 0)
                 bars += 300 
@@ -441,6 +494,187 @@ class TvDatafeed:
                     return None   
         return data
 
+TV_WS_URL = "wss://data.tradingview.com/socket.io/websocket"
+
+class _ChartRequest:
+    def __init__(self, symbol: str, n_bars: int):
+        self.symbol = symbol
+        self.buffer = BarBuffer(n_bars)
+        self.done = threading.Event()
+        self.error = None
+
+class TVConnection:
+    """A single authenticated TV websocket that stays open and carries several chart sessions at once.
+
+    A reader thread decodes packets as they arrive, echoes heartbeats to keep the socket alive and routes
+    each message to the chart session named in its first parameter. Each get_hist call opens its own chart
+    session on the socket and deletes it when the series is complete."""
+
+    def __init__(self, token: str = "unauthorized_user_token", url: str = TV_WS_URL, headers: str = None, timeout: int = 30):
+        self.token = token
+        self.parser = TVFrameParser()
+        self._requests = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self.ws = create_connection(url, headers=headers or json.dumps({"Origin": "https://data.tradingview.com"}), timeout=timeout)
+        self.alive = True
+        self.send("set_auth_token", [token])
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._requests)
+
+    def _send_raw(self, packet: str):
+        with self._send_lock:
+            self.ws.send(packet)
+
+    def send(self, func, args):
+        self._send_raw(ws_message(func, args))
+
+    def _read_loop(self):
+        while self.alive:
+            try:
+                text = self.ws.recv()
+            except WebSocketTimeoutException:
+                continue
+            except Exception as e:
+                self._fail_all(ConnectionError(f"TV websocket closed: {e}"))
+                return
+            if not text:
+                continue
+            for kind, msg in self.parser.feed(text):
+                if kind == "heartbeat":
+                    try:
+                        self._send_raw("~m~" + str(len(msg)) + "~m~" + msg)
+                    except Exception as e:
+                        logger.error(e)
+                elif kind == "message" and isinstance(msg, dict):
+                    self._dispatch(msg)
+
+    def _dispatch(self, msg: dict):
+        m = msg.get("m"); p = msg.get("p", [])
+        if m in ("critical_error", "protocol_error"):
+            self._fail_all(ConnectionError(f"TV {m}: {p}"))
+            return
+        if not p:
+            return
+        req = self._requests.get(p[0])
+        if req is None:
+            return
+        if m in ("timescale_update", "du"):
+            req.buffer.add_series_update(p[1])
+        elif m == "series_completed":
+            req.done.set()
+        elif m in ("symbol_error", "series_error"):
+            req.error = f"{m}: {p[1:]}"
+            req.done.set()
+
+    def _fail_all(self, error: Exception):
+        self.alive = False
+        with self._lock:
+            for req in self._requests.values():
+                req.error = error
+                req.done.set()
+
+    def get_hist(self, symbol: str, interval: str = "1D", n_bars: int = 10, extended_session: bool = False,
+                 time_zone: str = "exchange", timeout: int = 60) -> pd.DataFrame:
+        """Pull bars for an already formatted EXCHANGE:SYMBOL on its own chart session. Returns None if TV has no data
+        for the symbol. Raises TimeoutError or ConnectionError if the socket stalls or drops."""
+        cs = generate_session_id("cs_")
+        req = _ChartRequest(symbol, n_bars)
+        with self._lock:
+            self._requests[cs] = req
+        try:
+            self.send("chart_create_session", [cs, ""])
+            self.send("resolve_symbol", [cs, "symbol_1", '={"symbol":"' + symbol + '","adjustment":"splits","session":'
+                                         + ('"regular"' if not extended_session else '"extended"') + "}"])
+            self.send("create_series", [cs, "s1", "s1", "symbol_1", interval, n_bars])
+            self.send("switch_timezone", [cs, time_zone])
+            if not req.done.wait(timeout):
+                raise TimeoutError(f"TV data pull timed out after {timeout} seconds for {symbol}")
+            if isinstance(req.error, Exception):
+                raise req.error
+            if req.error is not None:
+                logger.error(f"no data for {symbol}, {req.error}")
+                return None
+            return req.buffer.to_frame(symbol)
+        finally:
+            with self._lock:
+                self._requests.pop(cs, None)
+            if self.alive:
+                try:
+                    self.send("chart_delete_session", [cs])
+                except Exception as e:
+                    logger.error(e)
+
+    def close(self):
+        self.alive = False
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+class TVSessionPool:
+    """Pool of persistent TVConnections. Requests go to the open connection with the fewest chart sessions
+    in flight, dead connections are replaced on the next request. At most size*sessions_per_socket pulls run
+    at the same time, extra callers wait for a free slot."""
+
+    def __init__(self, token: str = "unauthorized_user_token", size: int = 2, sessions_per_socket: int = 4,
+                 url: str = TV_WS_URL, timeout: int = 30):
+        self.token = token
+        self.url = url
+        self.timeout = timeout
+        self._conns = [None] * max(1, size)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, size) * max(1, sessions_per_socket))
+        self._rr = itertools.count()
+
+    def _connection(self) -> TVConnection:
+        with self._lock:
+            for i, conn in enumerate(self._conns):
+                if conn is None or not conn.alive:
+                    self._conns[i] = TVConnection(self.token, url=self.url, timeout=self.timeout)
+                    return self._conns[i]
+            start = next(self._rr)
+            order = [self._conns[(start + k) % len(self._conns)] for k in range(len(self._conns))]
+            return min(order, key=lambda c: c.in_flight)
+
+    def get_hist(self, symbol: str, exchange: str = "NSE", interval: Interval = Interval.in_daily, n_bars: int = 10,
+                 fut_contract: int = None, extended_session: bool = False, time_zone: str = "exchange",
+                 timeout: int = 60, attempts: int = 2) -> pd.DataFrame:
+        """Same arguments and output as TvDatafeed.get_hist, using the pooled sockets. A pull that fails because its
+        socket dropped or timed out is retried, dropped sockets are replaced with new ones, up to attempts times."""
+        symbol = format_symbol(symbol, exchange, fut_contract)
+        interval = interval.value if isinstance(interval, Interval) else str(interval)
+        with self._slots:
+            for n in range(attempts):
+                try:
+                    conn = self._connection()
+                    return conn.get_hist(symbol, interval=interval, n_bars=n_bars, extended_session=extended_session,
+                                         time_zone=time_zone, timeout=timeout)
+                except (TimeoutError, ConnectionError, OSError) as e:
+                    logger.error(f"pooled TV pull attempt {n + 1} failed for {symbol}: {e}")
+        return None
+
+    def close(self):
+        with self._lock:
+            for conn in self._conns:
+                if conn is not None:
+                    conn.close()
+            self._conns = [None] * len(self._conns)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_session_pool(token: str = "unauthorized_user_token", size: int = 2) -> TVSessionPool:
+    """Return the TVSessionPool shared by all TvDatafeed objects using the same auth token."""
+    with _pools_lock:
+        if token not in _pools:
+            _pools[token] = TVSessionPool(token, size=size)
+        return _pools[token]
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
     tv = TvDatafeed()(level=logging.DEBUG)
@@ -8,6 +8,17 @@ import numpy as np
 import re
 import base64
 import gc
+import json
+import shutil
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
 
 # Path helpers (used by defaults in the class)
 wd = os.path.dirname(__file__)
@@ -101,6 +112,322 @@ def strip_timezone_from_df(df: pd.DataFrame) -> pd.DataFrame:
     
     return df_copy
 
+def is_placeholder(data: Union[pd.Series, pd.DataFrame, None]) -> bool:
+    """True for the error/timeout placeholder Series that get_watchlist_data stores in place of a failed pull:
+    a Series named Timeout_<id>/Error_<id>, or a Series of text with no numeric values."""
+    if not isinstance(data, pd.Series):
+        return False
+    if str(data.name).startswith(("Timeout_", "Error_")):
+        return True
+    return data.dtype == object and len(data) > 0 and pd.to_numeric(data, errors='coerce').isna().all()
+
+def last_timestamp(data: Union[pd.Series, pd.DataFrame, None]) -> Optional[pd.Timestamp]:
+    """Return the last timestamp in a stored dataset, or None if it is a failed-pull placeholder or its index is not
+    datetime-like. Integer indexes are never read as epoch timestamps, only DatetimeIndexes and date strings count."""
+    if data is None or len(data) == 0 or is_placeholder(data):
+        return None
+    idx = data.index
+    if not isinstance(idx, pd.DatetimeIndex):
+        if idx.inferred_type not in ("datetime64", "datetime", "date", "string"):
+            return None
+        idx = pd.to_datetime(idx, errors='coerce')
+    if idx.isna().all():
+        return None
+    return idx.max()
+
+def merge_series_delta(old: Union[pd.Series, pd.DataFrame], new: Union[pd.Series, pd.DataFrame], rtol: float = 1e-9):
+    """
+    Merge newly pulled observations into a stored dataset. Where the two overlap the new values win,
+    so revisions published by the source replace the stored ones.
+
+    Parameters:
+    - old: pd.Series or pd.DataFrame - the stored dataset.
+    - new: pd.Series or pd.DataFrame - the freshly pulled observations, usually only the recent tail.
+    - rtol: float, default 1e-9 - relative tolerance when checking overlapping values for revisions.
+
+    Returns:
+    - merged: the full merged dataset.
+    - new_rows: the rows of new that lie after the end of old.
+    - revisions: pd.Series indexed by the overlapping dates whose values changed, holding the largest absolute change
+    on each date (NaN where a value was added or removed rather than changed).
+    """
+    old = old.copy(); new = new.copy()
+    old.index = pd.DatetimeIndex(old.index); new.index = pd.DatetimeIndex(new.index)
+    old = old[~old.index.duplicated(keep='last')].sort_index()
+    new = new[~new.index.duplicated(keep='last')].sort_index()
+    if isinstance(old, pd.Series) and isinstance(new, pd.DataFrame) and new.shape[1] == 1:
+        new = new.squeeze(axis=1)
+    if isinstance(new, pd.Series) and isinstance(old, pd.Series):
+        new = new.rename(old.name)
+
+    overlap = old.index.intersection(new.index)
+    old_ov = pd.DataFrame(old.loc[overlap]); new_ov = pd.DataFrame(new.loc[overlap])
+    old_vals = old_ov.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    new_vals = new_ov.reindex(columns=old_ov.columns).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    changed = ~np.isclose(new_vals, old_vals, rtol=rtol, atol=0.0, equal_nan=True)
+    rows = changed.any(axis=1)
+    abs_diff = np.where(changed, np.abs(new_vals - old_vals), np.nan)[rows]
+    max_diff = np.array([np.nanmax(r) if np.isfinite(r).any() else np.nan for r in abs_diff])
+    revisions = pd.Series(max_diff, index=overlap[rows], name='max_abs_revision', dtype=float)
+
+    new_rows = new[new.index > old.index.max()] if len(old) else new
+    merged = pd.concat([old[~old.index.isin(new.index)], new]).sort_index()
+    return merged, new_rows, revisions
+
+############ Parquet storage backend ################
+# Watchlist datasets can be stored as one hive-partitioned Parquet dataset (<name>.parquet folder) instead of the .h5s store.
+# Rows are in long format: series_id, date, column, value, text, partitioned on a path-safe version of the series id so that
+# reads of a few series only open those series' files. Numbers go in value, anything that isn't a number (labels, flags,
+# timestamps, placeholder messages) goes in text as a string. A sidecar table (_series_meta.parquet) records how to rebuild
+# each dataset: Series or DataFrame, its name, its original column order and the dtype of each column.
+
+PARQUET_META_FILE = "_series_meta.parquet"
+
+def _split_column(col: pd.Series) -> tuple:
+    """Split one column into (float values, text values) for the long table."""
+    if pd.api.types.is_bool_dtype(col) or (pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_datetime64_any_dtype(col)):
+        return col.to_numpy(dtype=float, na_value=np.nan), np.full(len(col), None, dtype=object)
+    if pd.api.types.is_datetime64_any_dtype(col) or isinstance(col.dtype, pd.PeriodDtype):
+        text = col.astype(str).to_numpy(dtype=object)
+        text[col.isna().to_numpy()] = None
+        return np.full(len(col), np.nan), text
+    # object/string/category columns: numbers stay numbers, everything else is kept as text.
+    values = pd.to_numeric(col, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    keep = np.isnan(values) & col.notna().to_numpy()
+    text = np.full(len(col), None, dtype=object)
+    text[keep] = col[keep].astype(str).to_numpy(dtype=object)
+    return values, text
+
+def _restore_column(values: pd.Series, text: pd.Series, dtype: str) -> pd.Series:
+    """Inverse of _split_column, dtype is the str() of the original column's dtype."""
+    if dtype.startswith("datetime64"):
+        out = pd.to_datetime(text)
+        try:
+            return out.astype(dtype)
+        except (TypeError, ValueError):
+            return out
+    if dtype.startswith("period"):
+        return text.astype(dtype)
+    if text.notna().any() or dtype in ("object", "string", "category", "str"):
+        out = values.astype(object).where(text.isna(), text)
+        return out.astype(dtype) if dtype in ("string", "category") else out
+    try:
+        if values.isna().any() and (dtype.startswith("int") or dtype == "bool"):
+            return values   # Missing values came in with the pull, the column can't go back to int/bool.
+        return values.astype(dtype)
+    except (TypeError, ValueError):
+        return values
+
+def datasets_to_long(datasets: dict) -> tuple:
+    """
+    Convert a dict of Series/DataFrames into the long table stored in a watchlist Parquet dataset. Columns of any dtype
+    are kept: numbers in value, other values as strings in text.
+
+    Returns:
+    - long: pd.DataFrame with columns part, series_id, date, column, value, text.
+    - meta: pd.DataFrame with columns series_id, kind ('series' or 'frame'), name, columns (json list of the column names)
+    and dtypes (json list of the column dtypes).
+    """
+    out = {"part": [], "series_id": [], "date": [], "column": [], "value": [], "text": []}; meta = []
+    for key, data in datasets.items():
+        if data is None or len(data) == 0:
+            continue
+        key = str(key)
+        is_series = isinstance(data, pd.Series)
+        frame = data.to_frame(name="value") if is_series else pd.DataFrame(data)
+        idx = frame.index if isinstance(frame.index, pd.DatetimeIndex) else pd.to_datetime(frame.index, errors='coerce')
+        if getattr(idx, "tz", None) is not None:
+            idx = idx.tz_localize(None)
+        cols = ["value"] if is_series else [str(c) for c in frame.columns]
+        split = [_split_column(frame.iloc[:, i]) for i in range(frame.shape[1])]
+        n_rows, n_cols = frame.shape
+        out["part"].append(np.full(n_rows * n_cols, sanitize_hdf_key(key), dtype=object))
+        out["series_id"].append(np.full(n_rows * n_cols, key, dtype=object))
+        out["date"].append(np.repeat(idx.to_numpy(dtype="datetime64[ns]"), n_cols))
+        out["column"].append(np.tile(np.array(cols, dtype=object), n_rows))
+        out["value"].append(np.column_stack([s[0] for s in split]).ravel())
+        out["text"].append(np.column_stack([s[1] for s in split]).ravel())
+        meta.append({"series_id": key, "kind": "series" if is_series else "frame",
+                     "name": None if not is_series or data.name is None else str(data.name), "columns": json.dumps(cols),
+                     "dtypes": json.dumps([str(frame.dtypes.iloc[i]) for i in range(n_cols)])})
+    # Concatenate the column arrays directly, pd.concat of many frames with object columns is several times slower.
+    long = pd.DataFrame({col: np.concatenate(arrays) if arrays else np.array([], dtype="datetime64[ns]" if col == "date" else
+                                                                             float if col == "value" else object)
+                         for col, arrays in out.items()})
+    long = long[long["date"].notna()]
+    return long, pd.DataFrame(meta, columns=["series_id", "kind", "name", "columns", "dtypes"])
+
+def long_to_datasets(long: pd.DataFrame, meta: pd.DataFrame) -> dict:
+    """Rebuild the {series_id: Series/DataFrame} dict from the long table & sidecar meta table of a Parquet dataset."""
+    datasets = {}
+    meta = meta.set_index("series_id")
+    for key, rows in long.groupby("series_id", sort=False):
+        info = meta.loc[key] if key in meta.index else None
+        wide = rows.pivot(index="date", columns="column", values="value").sort_index()
+        wide.index = pd.DatetimeIndex(wide.index); wide.index.name = None; wide.columns.name = None
+        cols = json.loads(info["columns"]) if info is not None else list(wide.columns)
+        wide = wide.reindex(columns=cols)
+        dtypes = json.loads(info["dtypes"]) if info is not None else ["float64"] * len(cols)
+        has_text = rows["text"].notna().any()
+        if has_text or any(d != "float64" for d in dtypes):
+            text = rows.pivot(index="date", columns="column", values="text").sort_index().reindex(columns=cols)
+            text.index = wide.index
+            wide = pd.DataFrame({c: _restore_column(wide[c], text[c], d) for c, d in zip(cols, dtypes)}, index=wide.index)
+        if info is not None and info["kind"] == "series":
+            datasets[key] = wide["value"].rename(info["name"])
+        else:
+            datasets[key] = wide
+    return datasets
+
+def write_watchlist_parquet(datasets: dict, path: str, compression: str = "zstd") -> str:
+    """
+    Write watchlist datasets to a partitioned Parquet dataset folder at path. The dataset is written to a temporary
+    folder next to path and then swapped in, so readers never see a half written dataset and a failed write leaves
+    the previous one in place.
+    """
+    if not PARQUET_AVAILABLE:
+        raise ImportError("pyarrow is needed for the parquet watchlist storage backend, pip install pyarrow.")
+    long, meta = datasets_to_long(datasets)
+    tmp_path = f"{path}.tmp-{os.getpid()}"; old_path = f"{path}.old-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    try:
+        table = pa.Table.from_pandas(long.sort_values(["series_id", "date"]), preserve_index=False)
+        # An all-empty text column would be inferred as null type, store it as string in every file.
+        table = table.set_column(table.schema.get_field_index("text"), "text", table.column("text").cast(pa.string()))
+        pq.write_to_dataset(table, root_path=tmp_path, partition_cols=["part"], compression=compression)
+        os.makedirs(tmp_path, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(meta, preserve_index=False), tmp_path + fdel + PARQUET_META_FILE)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    # os.replace can't overwrite a non-empty folder, move the old one aside first.
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path
+
+def read_watchlist_parquet(path: str, ids: list = None, start_date: str = None, end_date: str = None) -> dict:
+    """
+    Read datasets from a watchlist Parquet dataset folder. Filters on series id and date range are pushed down to
+    the Parquet reader, so only the matching partitions and row groups are read, using memory mapped files.
+
+    Parameters:
+    - path: str - the <name>.parquet dataset folder.
+    - ids: list, default None - series ids to read, all if None.
+    - start_date, end_date: str, default None - only read observations within this date range (inclusive).
+
+    Returns:
+    - dict: {series_id: pd.Series or pd.DataFrame}
+    """
+    if not PARQUET_AVAILABLE:
+        raise ImportError("pyarrow is needed for the parquet watchlist storage backend, pip install pyarrow.")
+    filters = []
+    if ids is not None:
+        ids = [str(i) for i in ids]
+        filters += [("part", "in", list({sanitize_hdf_key(i) for i in ids})), ("series_id", "in", ids)]
+    if start_date is not None:
+        filters.append(("date", ">=", pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append(("date", "<=", pd.Timestamp(end_date)))
+    table = pq.read_table(path, columns=["series_id", "date", "column", "value", "text"], filters=filters or None,
+                          memory_map=True, partitioning="hive")
+    meta = pq.read_table(path + fdel + PARQUET_META_FILE, memory_map=True).to_pandas()
+    long = table.to_pandas()
+    long["series_id"] = long["series_id"].astype(str)
+    return long_to_datasets(long, meta)
+
+def coerce_datetime_index(data: Union[pd.Series, pd.DataFrame], name: str = "") -> Union[pd.Series, pd.DataFrame]:
+    """Convert the index of a dataset read back from the store to a DatetimeIndex if it isn't one already."""
+    if not isinstance(data.index, pd.DatetimeIndex):
+        try:
+            # Try to infer datetime from the index (handles int64 timestamps, strings, etc.)
+            data.index = pd.to_datetime(data.index, errors='coerce')
+            print(f"Converted index to DatetimeIndex for series: {name}")
+        except Exception as e:
+            print(f"Could not convert index to DatetimeIndex for series: {name}. Error: {e}")
+            # Leave as-is; update_metadata will handle the fallback
+    return data
+
+class LazyDatasets(MutableMapping):
+    """
+    Dict-like container of watchlist datasets that reads each dataset from the store only when it is first accessed.
+    Opening a watchlist then only needs the list of keys, and memory use grows with the datasets actually used.
+
+    Datasets read from the store are kept in an LRU cache of at most cache_size entries (unbounded if None) and are
+    re-read if evicted. Datasets assigned in memory (new pulls, refreshed or renamed series) are kept until the watchlist
+    is saved, they are never evicted. "key in datasets", len() and iteration over keys never read from the store.
+
+    **Parameters:**
+    - keys: list - the dataset keys available in the store.
+    - loader: callable - loader(key) returns the dataset for key from the store.
+    - postprocess: callable, default None - postprocess(key, data) applied to each dataset after it is loaded.
+    - cache_size: int, default None - max number of loaded datasets kept in memory.
+    """
+    def __init__(self, keys: list, loader, postprocess=None, cache_size: int = None):
+        self._keys = dict.fromkeys(keys)
+        self._loader = loader
+        self.postprocess = postprocess
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pinned = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key in self._pinned:
+                return self._pinned[key]
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            if key not in self._keys:
+                raise KeyError(key)
+            data = self._loader(key)
+            self.loads += 1
+            if self.postprocess is not None:
+                data = self.postprocess(key, data)
+            self._cache[key] = data
+            if self.cache_size is not None:
+                while len(self._cache) > max(self.cache_size, 0):
+                    self._cache.popitem(last=False)
+            return data
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._keys[key] = None
+            if self._cache.get(key) is value:
+                return
+            self._cache.pop(key, None)
+            self._pinned[key] = value
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._keys:
+                raise KeyError(key)
+            del self._keys[key]
+            self._cache.pop(key, None)
+            self._pinned.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"LazyDatasets({len(self)} datasets, {len(self._cache) + len(self._pinned)} loaded)"
+
+    def is_loaded(self, key) -> bool:
+        return key in self._pinned or key in self._cache
+
+    def load_all(self) -> dict:
+        """Read every dataset and return them all in a plain dict."""
+        return {key: self[key] for key in self}
+
 ############ Pydantic Common Metadata Model ################
 
 # Comprehensive frequency mapping dictionary
@@ -415,6 +742,7 @@ class Watchlist(dict):
     dataframe and the index contains different metadata categories such as "source", "observation_start", "observation_end", "frequency", "units".
     - 'watchlist_datasets': dict - contains pandas Series and/or DataFrame objects, with the keys being the asset/ticker/macrodata codes. This is not
     created until the method "get_watchlist_data" is called, which pulls data from the source listed for each asset/ticker/macrodata code in the watchlist.
+    After load_watchlist_data this is a LazyDatasets mapping that reads each dataset from the store on first access.
     
     *** __init__ Parameters :***
     - watchlist_data: pd.DataFrame, default None - a DataFrame containing the list of assets/tickers/macrodata codes to be watched, with columns 'id' and 'source'.
@@ -422,6 +750,8 @@ class Watchlist(dict):
     dataframe and the index contains different metadata categories such as "source", "observation_start", "observation_end", "frequency", "units".
     - watchlist_name: str, default "base_watchlist" - the name of the watchlist.
     - watchlists_path: str, default parent+fdel+"User_Data"+fdel+"Watchlists" - the path to the folder where watchlists are saved, relative to this file.
+    - storage_format: str, default "hdf" - how the datasets are saved, "hdf" for a <name>.h5s HDFStore or "parquet" for a partitioned
+    <name>.parquet dataset (needs pyarrow). Loading a watchlist picks up whichever one exists, preferring parquet.
     
     The Watchlist  object can be initialized with watchlist and metadata data, that you may have gotten from the search_symbol_gui or created manually
     or you can just init a blank watchlist and add data to it later, using the GUI or manually.
@@ -436,8 +766,11 @@ class Watchlist(dict):
     - insert_data: inserts data into the watchlist_datasets dictionary.
     - drop_data: drops data from the watchlist_datasets dictionary.
     """
-    def __init__(self, watchlist_data=None, metadata_data=None, watchlist_name: str = "base_watchlist", watchlists_path: str = parent+fdel+"User_Data"+fdel+"Watchlists"):
+    def __init__(self, watchlist_data=None, metadata_data=None, watchlist_name: str = "base_watchlist", watchlists_path: str = parent+fdel+"User_Data"+fdel+"Watchlists",
+                 storage_format: str = "hdf"):
         super().__init__()
+        if storage_format not in ("hdf", "parquet"):
+            raise ValueError(f"storage_format must be 'hdf' or 'parquet', not {storage_format}")
         # Initialize watchlist and metadata as pandas DataFrames
         self.name = watchlist_name
         self.watchlists_path = watchlists_path
@@ -446,6 +779,7 @@ class Watchlist(dict):
         self['watchlist_datasets'] = {}
         self['full_metadata'] = {}
         self.storepath = None
+        self.storage_format = storage_format
 
         self.source_labels = {
             'bea': 'BEA', 'tv': "Trading View", "rba_series": "RBA",
@@ -492,6 +826,10 @@ class Watchlist(dict):
         
         self.storepath = os.path.splitext(filepath)[0] + ".h5s"
         self.storepath  = self.watchlists_path + fdel + self.name + fdel + self.name + ".h5s"
+        parquet_path = self.watchlists_path + fdel + self.name + fdel + self.name + ".parquet"
+        if PARQUET_AVAILABLE and os.path.isdir(parquet_path):
+            self.storepath = parquet_path
+            self.storage_format = "parquet"
         
         # ENHANCED DEBUG: Check before index manipulation
         print(f"=== BEFORE INDEX MANIPULATION ===")
@@ -550,16 +888,20 @@ class Watchlist(dict):
         self['watchlist'] = pd.concat([self['watchlist'], watchlist_data], axis=0)
         self['metadata'] = pd.concat([self['metadata'], metadata_data], axis=1)
 
+    def _save_name(self) -> str:
+        """Folder and file name the watchlist is saved under: the name part of self.name, spaces replaced by underscores."""
+        return os.path.basename(self.name).replace(" ", "_")
+
     def save_watchlist(self, path: str = parent+fdel+"User_Data"+fdel+"Watchlists"):
         """save_watchlist method.
 
         This function saves the watchlist data to an Excel file with two sheets 'watchlist' and 'metadata'. 
-        It also saves your data series if you have pulled the data first using the get_watchlist_data method.
+        It also saves your data series if you have pulled the data first using the get_watchlist_data method,
+        to a .h5s HDFStore or a .parquet dataset depending on self.storage_format.
         """
 
         # Example method to save watchlist data to an Excel file
-        saveName = os.path.basename(self.name)  # Get just the name part, not the full path
-        saveName = saveName.replace(" ", "_")   # Replace spaces with underscores in the name only
+        saveName = self._save_name()
         save_directory = os.path.join(path, saveName)
         save_path = os.path.join(save_directory, saveName + ".xlsx")
         
@@ -585,7 +927,22 @@ class Watchlist(dict):
             if not full_meta_for_excel.empty:
                 full_meta_for_excel.to_excel(writer, sheet_name='full_metadata')
 
-        if self['watchlist_datasets']:
+        if isinstance(self['watchlist_datasets'], LazyDatasets):
+            # The store gets rewritten, so read everything not loaded yet from the current one first.
+            self['watchlist_datasets'] = self['watchlist_datasets'].load_all()
+
+        if self['watchlist_datasets'] and self.storage_format == "parquet":
+            self.storepath = os.path.join(save_directory, saveName + ".parquet")
+            for key, series in self["watchlist_datasets"].items():
+                if isinstance(series, pd.DataFrame) and len(series.columns) == 1:
+                    self["watchlist_datasets"][key] = series.squeeze()
+            try:
+                write_watchlist_parquet(self["watchlist_datasets"], self.storepath)
+                print("Saved watchlist datasets to .parquet dataset... save name: ", saveName)
+            except Exception as e:
+                print("Error saving watchlist data to parquet dataset. Exception: ", e)
+
+        elif self['watchlist_datasets']:
             self.storepath = os.path.join(save_directory, saveName + ".h5s")
             close_open_stores(self.storepath)  #Close any open hdf5 stores pointing to this path
 
@@ -626,7 +983,8 @@ class Watchlist(dict):
     class TimeoutError(Exception):
         pass
 
-    def get_watchlist_data(self, start_date: str = "1600-01-01", id_list: list = None, timeout: int = 60):
+    def get_watchlist_data(self, start_date: str = "1600-01-01", id_list: list = None, timeout: int = 60, max_workers: int = 16,
+                           retries: int = 1, source_limits: dict = None):
         """
         get_watchlist_data method.
 
@@ -641,6 +999,10 @@ class Watchlist(dict):
         - start_date: str, default "1900-01-01"
         - id_list: list, default None - a list of asset/ticker/macrodata codes to pull data for. If None, all assets in the watchlist will be pulled.
         - timeout: int, default 60 - timeout in seconds for each individual data pull
+        - max_workers: int, default 16 - max number of series pulled at the same time.
+        - retries: int, default 1 - number of extra attempts for a series whose pull failed or timed out.
+        - source_limits: dict, default None - per-source concurrency caps e.g. {"tv": 2}, overriding Pull_Data.SOURCE_CONCURRENCY.
+        Series are pulled concurrently, failed series get an error placeholder Series and do not stop the rest.
         """
 
         watchlist = pd.DataFrame(self["watchlist"])#; meta = pd.DataFrame(self["metadata"])
@@ -660,85 +1022,27 @@ class Watchlist(dict):
             # Use provided id_list (may contain index keys or values from the 'id' column)
             ids = list(id_list)
 
-        # Normalize requested ids to actual watchlist index entries:
-        resolved_ids = []
-        missing_ids = []
-        for req in ids:
-            # If it already matches an index entry, keep it
-            if req in watchlist.index:
-                resolved_ids.append(req)
-                continue
-
-            # If it matches a value in the 'id' column, map to the corresponding index (take first match)
-            if "id" in watchlist.columns:
-                matches = watchlist.index[watchlist["id"].astype(str) == str(req)].tolist()
-                if matches:
-                    # If multiple rows match, we keep them all to preserve data
-                    resolved_ids.extend(matches)
-                    continue
-
-            # Not found: warn and skip
-            missing_ids.append(req)
-
-        if missing_ids:
-            print(f"Warning: the following requested ids were not found in watchlist index or 'id' column and will be skipped: {missing_ids}")
-
-        # Final list to iterate
-        ids_to_process = resolved_ids
+        ids_to_process = self._resolve_ids(watchlist, ids)
 
+        # Build the pull jobs first, then pull all series concurrently with per-source limits.
+        jobs = {}
         for i in ids_to_process:
-            # Accessing watchlist row is now safe because i was resolved from the index
-            try:
-                sauce = str(watchlist.loc[i, "source"]).strip()
-            except KeyError:
-                print(f"Warning: index '{i}' not found in watchlist. Skipping.")
+            job = self._pull_job(watchlist, meta, i, start_date)
+            if job is None:
                 continue
+            print(f"Queueing data pull for series id: {job['data_code']}, from source: {job['source']},\n start_date: {start_date}), exchange_code: {job['exchange_code']}")
+            jobs[str(i)] = job
 
-            eyed = str(watchlist.loc[i, "id"]).strip()
-            try:
-                exchag = str(meta.loc["exchange", i]).strip()
-            except Exception:
-                exchag = None
+        results = Pull_Data.pull_many(jobs, timeout=timeout, retries=retries, max_workers=max_workers, source_limits=source_limits)
 
-            if sauce == "abs_series" and (exchag is None or str(exchag).strip().lower() in ["", "nan", "none", "n/a"]):
-                for cat_row in ["Catalogue", "Catalogue number", "catalog_num"]:
-                    try:
-                        cat_val = meta.loc[cat_row, i]
-                        if cat_val is not None and not pd.isna(cat_val):
-                            cat_str = str(cat_val).strip()
-                            if cat_str and cat_str.lower() not in ["nan", "none", "n/a"]:
-                                exchag = cat_str
-                                break
-                    except Exception:
-                        continue
-            print(f"Attempting data pull for series id: {eyed}, from source: {sauce},\n start_date: {start_date}), exchange_code: {exchag}")
-            
-            # Initialize variables for this iteration
-            series_meta = None
-            ds_data = None
-            last_error = None
-            
-            # Windows-compatible timeout using threading
-            def pull_data_with_timeout():
-                nonlocal series_meta, ds_data, last_error
-                try:
-                    ds = Pull_Data.dataset()
-                    ds.get_data(sauce, eyed, start_date, exchange_code=exchag, timeout=timeout)
-                    ds_data = ds.data
-                    series_meta = ds.SeriesInfo
-                    return True
-                except Exception as e:
-                    print(f"Error in data pull thread for {eyed}: {e}")
-                    last_error = e
-                    return False
-            
-            # Create and start thread
-            thread = threading.Thread(target=pull_data_with_timeout)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=timeout)
-            
-            if thread.is_alive():
+        for i, job in jobs.items():
+            sauce = job["source"]; eyed = job["data_code"]
+            result = results[i]
+            ds_data = result["data"]
+            series_meta = result["SeriesInfo"]
+            last_error = result["error"]
+
+            if isinstance(last_error, TimeoutError):
                 print(f"Timeout ({timeout}s) exceeded for {eyed} from {sauce}. Skipping...")
                 data[str(i)] = pd.Series([f"Data pull timed out after {timeout} seconds.", "Timeout exceeded", 
                                         f"Source: {sauce}"], name=f"Timeout_{eyed}", index=[0, 1, 2])
@@ -838,6 +1142,176 @@ class Watchlist(dict):
         self.update_metadata()
         self.save_watchlist()
 
+    @staticmethod
+    def _resolve_ids(watchlist: pd.DataFrame, ids: list) -> list:
+        """Map requested ids, given as watchlist index entries or as values of the 'id' column, to index entries.
+        Ids found in neither are skipped with a warning."""
+        resolved_ids = []
+        missing_ids = []
+        for req in ids:
+            # If it already matches an index entry, keep it
+            if req in watchlist.index:
+                resolved_ids.append(req)
+                continue
+
+            # If it matches a value in the 'id' column, map to the corresponding index
+            if "id" in watchlist.columns:
+                matches = watchlist.index[watchlist["id"].astype(str) == str(req)].tolist()
+                if matches:
+                    # If multiple rows match, we keep them all to preserve data
+                    resolved_ids.extend(matches)
+                    continue
+
+            # Not found: warn and skip
+            missing_ids.append(req)
+
+        if missing_ids:
+            print(f"Warning: the following requested ids were not found in watchlist index or 'id' column and will be skipped: {missing_ids}")
+        return resolved_ids
+
+    @staticmethod
+    def _pull_job(watchlist: pd.DataFrame, meta: pd.DataFrame, i, start_date: str) -> dict:
+        """Pull_Data.pull_many job (source, id, start date, exchange) for watchlist row i, None if the row is missing.
+        abs_series rows without an exchange use their catalogue number from the metadata."""
+        try:
+            sauce = str(watchlist.loc[i, "source"]).strip()
+        except KeyError:
+            print(f"Warning: index '{i}' not found in watchlist. Skipping.")
+            return None
+
+        eyed = str(watchlist.loc[i, "id"]).strip()
+        try:
+            exchag = str(meta.loc["exchange", i]).strip()
+        except Exception:
+            exchag = None
+
+        if sauce == "abs_series" and (exchag is None or str(exchag).strip().lower() in ["", "nan", "none", "n/a"]):
+            for cat_row in ["Catalogue", "Catalogue number", "catalog_num"]:
+                try:
+                    cat_val = meta.loc[cat_row, i]
+                    if cat_val is not None and not pd.isna(cat_val):
+                        cat_str = str(cat_val).strip()
+                        if cat_str and cat_str.lower() not in ["nan", "none", "n/a"]:
+                            exchag = cat_str
+                            break
+                except Exception:
+                    continue
+        return {"source": sauce, "data_code": eyed, "start_date": start_date, "exchange_code": exchag}
+
+    def refresh_watchlist_data(self, overlap_days: int = 90, id_list: list = None, timeout: int = 60, max_workers: int = 16,
+                               retries: int = 1, source_limits: dict = None, rtol: float = 1e-9) -> pd.DataFrame:
+        """
+        refresh_watchlist_data method.
+
+        Incremental version of get_watchlist_data. For each series that is already stored in the watchlist's .h5s
+        database, only observations after the last stored timestamp (minus an overlap window of overlap_days, to pick up
+        revisions) are requested from the source. The new observations are merged into the stored series and only the
+        changed datasets are written back to the store, appending rows where the series is stored in table format
+        and no overlapping values were revised. Series with nothing stored yet are pulled in full.
+        The Excel workbook is not rewritten, use save_watchlist for that.
+
+        Parameters:
+        - overlap_days: int, default 90 - how far before the last stored observation to re-pull, to catch revised values.
+        - id_list: list, default None - ids to refresh, as watchlist index entries or 'id' column values. If None, all ids in the
+        watchlist are refreshed.
+        - timeout, max_workers, retries, source_limits: as for get_watchlist_data.
+        - rtol: float, default 1e-9 - relative tolerance used when comparing re-pulled values against stored ones.
+
+        Returns:
+        - pd.DataFrame: revision report indexed by id with columns 'last_stored', 'new_last', 'new_rows', 'revised_rows',
+        'max_abs_revision', 'first_revised' and 'status'. Also stored as self.refresh_report.
+        """
+        if self.storepath is None:
+            saveName = self._save_name()
+            self.storepath = os.path.join(self.watchlists_path, saveName, saveName + (".parquet" if self.storage_format == "parquet" else ".h5s"))
+        if not os.path.exists(self.storepath):
+            print("No .h5s/.parquet database found for this watchlist, pulling full history with get_watchlist_data instead.")
+            self.get_watchlist_data(id_list=id_list, timeout=timeout, max_workers=max_workers, retries=retries, source_limits=source_limits)
+            return None
+        if not self["watchlist_datasets"]:
+            self.load_watchlist_data()
+
+        watchlist = pd.DataFrame(self["watchlist"])
+        meta = self["metadata"]
+        ids = watchlist.index.tolist() if id_list is None else self._resolve_ids(watchlist, list(id_list))
+
+        jobs = {}; stored = {}
+        for i in dict.fromkeys(ids):
+            existing = self["watchlist_datasets"].get(str(i))
+            last = last_timestamp(existing)
+            start = "1600-01-01" if last is None else (last - pd.Timedelta(days=overlap_days)).strftime('%Y-%m-%d')
+            job = self._pull_job(watchlist, meta, i, start)
+            if job is not None:
+                stored[str(i)] = (existing, last)
+                jobs[str(i)] = job
+
+        results = Pull_Data.pull_many(jobs, timeout=timeout, retries=retries, max_workers=max_workers, source_limits=source_limits)
+
+        report = {}; changed = {}
+        for i, job in jobs.items():
+            existing, last = stored[i]
+            new = results[i]["data"]
+            row = {"last_stored": last, "new_last": None, "new_rows": 0, "revised_rows": 0, "max_abs_revision": np.nan,
+                   "first_revised": None, "status": "unchanged"}
+            if new is None or len(new) == 0:
+                row["status"] = f"failed: {results[i]['error']}"
+                report[i] = row
+                continue
+            if last is None:
+                # Nothing usable stored (or only a failed-pull placeholder), so the full pull replaces it.
+                changed[i] = (new, None, True)
+                row.update({"new_last": last_timestamp(new), "new_rows": len(new),
+                            "status": "replaced placeholder" if is_placeholder(existing) else "full pull"})
+                report[i] = row
+                continue
+
+            new = new[pd.DatetimeIndex(new.index) >= pd.Timestamp(job["start_date"])]
+            merged, new_rows, revisions = merge_series_delta(existing, new, rtol=rtol)
+            row.update({"new_last": last_timestamp(merged), "new_rows": len(new_rows), "revised_rows": len(revisions)})
+            if len(revisions) > 0:
+                row["max_abs_revision"] = revisions.max()
+                row["first_revised"] = revisions.index.min()
+            if len(new_rows) > 0 or len(revisions) > 0:
+                changed[i] = (merged, new_rows, len(revisions) > 0)
+                row["status"] = "revised" if len(revisions) > 0 else "appended"
+            report[i] = row
+
+        if changed and self.storepath.endswith(".parquet"):
+            # The parquet dataset is rewritten as a whole, with an atomic swap.
+            for i, (merged, new_rows, rewrite) in changed.items():
+                self["watchlist_datasets"][i] = merged
+                if i in self["metadata"].columns:
+                    self["metadata"].loc["end_date", i] = last_timestamp(merged).date()
+                    self["metadata"].loc["length", i] = len(merged)
+            write_watchlist_parquet(self["watchlist_datasets"], self.storepath)
+            self.update_metadata()
+        elif changed:
+            close_open_stores(self.storepath)
+            with pd.HDFStore(self.storepath, mode='a') as store:
+                key_mapping = store['_key_mapping'].to_dict() if '/_key_mapping' in store.keys() else {}
+                for i, (merged, new_rows, rewrite) in changed.items():
+                    skey = sanitize_hdf_key(i)
+                    key_mapping[skey] = i
+                    is_table = ('/' + skey) in store.keys() and store.get_storer(skey).is_table
+                    try:
+                        if is_table and not rewrite:
+                            store.append(skey, new_rows)
+                        else:
+                            store.put(skey, merged, format='table')
+                    except Exception as e:
+                        print(f"Could not write {i} in table format, rewriting it in fixed format. Error: {e}")
+                        store.put(skey, merged)
+                    self["watchlist_datasets"][i] = merged
+                    if i in self["metadata"].columns:
+                        self["metadata"].loc["end_date", i] = last_timestamp(merged).date()
+                        self["metadata"].loc["length", i] = len(merged)
+                store['_key_mapping'] = pd.Series(key_mapping, name='original_keys')
+            self.update_metadata()
+
+        self.refresh_report = pd.DataFrame.from_dict(report, orient='index')
+        print("Watchlist refresh report: \n", self.refresh_report)
+        return self.refresh_report
+
     def update_metadata(self):
         
         #Drop any duplicates in the metadata
@@ -845,7 +1319,12 @@ class Watchlist(dict):
         # Update the metadata with the new data
         if self["watchlist_datasets"]:
             print("Running watchlist update_metadata method.....")
-            for key in self["watchlist_datasets"].keys():
+            datasets = self["watchlist_datasets"]
+            for key in datasets.keys():
+                if isinstance(datasets, LazyDatasets) and not datasets.is_loaded(key):
+                    # Not read from the store yet, it gets squeezed & renamed by _prepare_loaded when it is.
+                    self._set_watchlist_title(key, self._series_title(key))
+                    continue
                 series = self["watchlist_datasets"][key]
                 #first reduce dataframes to series if the df has only a single column
                 if isinstance(series, pd.DataFrame):
@@ -856,29 +1335,7 @@ class Watchlist(dict):
                         print(f"Skipping this one {key}, it is a DataFrame with more than one columns,", series.columns)
                         continue
             
-                # Prefer canonical metadata title, then full_metadata title, then series name/key fallback
-                title = None
-                try:
-                    if "metadata" in self and "title" in self["metadata"].index and key in self["metadata"].columns:
-                        metadata_title = self["metadata"].loc["title", key]
-                        if metadata_title is not None and not pd.isna(metadata_title) and str(metadata_title).strip() != "":
-                            title = str(metadata_title)
-                except Exception:
-                    pass
-
-                if title is None:
-                    try:
-                        full_meta = self["full_metadata"].get(key)
-                        if isinstance(full_meta, pd.Series):
-                            if "title" in full_meta.index and full_meta.loc["title"] is not None and not pd.isna(full_meta.loc["title"]):
-                                full_title = str(full_meta.loc["title"]).strip()
-                                if full_title:
-                                    title = full_title
-                    except Exception:
-                        pass
-
-                if title is None:
-                    title = series.name if series is not None and series.name not in [None, ""] else key
+                title = self._series_title(key, series)
                 
                 # Rename the series to have the proper title
                 try:
@@ -893,55 +1350,85 @@ class Watchlist(dict):
                 self["watchlist_datasets"][key] = series
 
                 #Update the watchlist with improved metadata as well as the metadata DataFrame
-                self["watchlist"].loc[key, "id"] = key
-                
-                # Fix Warning 1: Ensure title column is object dtype before assignment
-                if "title" not in self["watchlist"].columns:
-                    self["watchlist"]["title"] = ""
-                self["watchlist"]["title"] = self["watchlist"]["title"].astype('object')
-                self["watchlist"].loc[key, "title"] = str(title)  # Explicitly convert to string
+                self._set_watchlist_title(key, title)
                 
         else:
             print("Download datasets for the watchlist first using get_watchlist_data() or load_watchlist_data() methods.....")
             return
 
-    def load_watchlist_data(self, ask_input: bool = False):
+    def _series_title(self, key: str, series: Union[pd.Series, pd.DataFrame] = None) -> str:
+        """Title for a dataset: canonical metadata title, then full_metadata title, then the series name/key as fallback."""
+        try:
+            if "metadata" in self and "title" in self["metadata"].index and key in self["metadata"].columns:
+                metadata_title = self["metadata"].loc["title", key]
+                if metadata_title is not None and not pd.isna(metadata_title) and str(metadata_title).strip() != "":
+                    return str(metadata_title)
+        except Exception:
+            pass
+
+        try:
+            full_meta = self["full_metadata"].get(key)
+            if isinstance(full_meta, pd.Series):
+                if "title" in full_meta.index and full_meta.loc["title"] is not None and not pd.isna(full_meta.loc["title"]):
+                    full_title = str(full_meta.loc["title"]).strip()
+                    if full_title:
+                        return full_title
+        except Exception:
+            pass
+
+        return series.name if series is not None and series.name not in [None, ""] else key
+
+    def _set_watchlist_title(self, key: str, title: str):
+        self["watchlist"].loc[key, "id"] = key
+        # Fix Warning 1: Ensure title column is object dtype before assignment
+        if "title" not in self["watchlist"].columns:
+            self["watchlist"]["title"] = ""
+        self["watchlist"]["title"] = self["watchlist"]["title"].astype('object')
+        self["watchlist"].loc[key, "title"] = str(title)  # Explicitly convert to string
+
+    def _prepare_loaded(self, key: str, data: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame]:
+        """Applied to each dataset lazily read from the store, does what update_metadata does for loaded datasets."""
+        data = coerce_datetime_index(data, key)
+        if isinstance(data, pd.DataFrame) and len(data.columns) == 1:
+            data = data.squeeze(axis=1)
+        if isinstance(data, pd.Series):
+            data = data.rename(self._series_title(key, data))
+        return data
+
+    def load_watchlist_data(self, ask_input: bool = False, lazy: bool = True, cache_size: int = None):
         """load_watchlist_data method.
-        This function loads the watchlist data from a .h5s database file. The data is stored in the 'watchlist_datasets' dictionary.
-        Or just drop a given data_name from the watchlist_datasets dictionary, watchlist and metadata dataframes."""
+        This function loads the watchlist data from a .h5s database file (or .parquet dataset). The data is stored in the 'watchlist_datasets' dictionary.
+
+        With lazy=True (default) only the dataset keys are read here and 'watchlist_datasets' is a LazyDatasets mapping,
+        each dataset is read from the store the first time it is accessed. cache_size bounds how many of the datasets read
+        that way are kept in memory (None for no bound). lazy=False reads every dataset straight away, as a plain dict."""
         
         print("Database filepath: ", self.storepath)
-        if self.storepath is not None and os.path.isfile(self.storepath):
-            with pd.HDFStore(self.storepath, mode='a') as data:
+        if self.storepath is not None and self.storepath.endswith(".parquet") and os.path.isdir(self.storepath):
+            if lazy:
+                keys = pq.read_table(self.storepath + fdel + PARQUET_META_FILE, columns=["series_id"]).column("series_id").to_pylist()
+                path = self.storepath
+                self['watchlist_datasets'] = LazyDatasets(keys, lambda key: read_watchlist_parquet(path, ids=[key])[key],
+                                                          postprocess=self._prepare_loaded, cache_size=cache_size)
+            else:
+                self['watchlist_datasets'] = read_watchlist_parquet(self.storepath)
+            self.update_metadata()
+        elif self.storepath is not None and os.path.isfile(self.storepath):
+            with pd.HDFStore(self.storepath, mode='r') as data:
                 # Load key mapping if it exists
                 key_mapping = {}
-                if '_key_mapping' in data.keys():
-                    mapping_series = data['_key_mapping']
-                    key_mapping = mapping_series.to_dict()
-                
-                # Load data with original keys restored
-                self['watchlist_datasets'] = {}
-                for sanitized_key in data.keys():
-                    if sanitized_key.startswith('/_key_mapping'):
-                        continue  # Skip the mapping key
-                    
-                    clean_key = sanitized_key.lstrip('/')
-                    original_key = key_mapping.get(clean_key, clean_key)
-                    series = data[sanitized_key]
-                    
-                    # FIX: Attempt to convert index to DatetimeIndex if it's not already
-                    if not isinstance(series.index, pd.DatetimeIndex):
-                        try:
-                            # Try to infer datetime from the index (handles int64 timestamps, strings, etc.)
-                            series.index = pd.to_datetime(series.index, errors='coerce')
-                            print(f"Converted index to DatetimeIndex for series: {original_key}")
-                        except Exception as e:
-                            print(f"Could not convert index to DatetimeIndex for series: {original_key}. Error: {e}")
-                            # Leave as-is; update_metadata will handle the fallback
-                    
-                    self['watchlist_datasets'][original_key] = series
-                
-                data.close()
+                if '/_key_mapping' in data.keys():
+                    key_mapping = data['_key_mapping'].to_dict()
+                # Original keys restored from the mapping -> key in the store
+                store_keys = {key_mapping.get(k.lstrip('/'), k.lstrip('/')): k for k in data.keys() if not k.startswith('/_key_mapping')}
+
+                if not lazy:
+                    self['watchlist_datasets'] = {key: coerce_datetime_index(data[skey], key) for key, skey in store_keys.items()}
+
+            if lazy:
+                path = self.storepath
+                self['watchlist_datasets'] = LazyDatasets(list(store_keys), lambda key: pd.read_hdf(path, key=store_keys[key]),
+                                                          postprocess=self._prepare_loaded, cache_size=cache_size)
             self.update_metadata()
         else:
             print("No .h5s database found for this watchlist. Get and save data first....")
@@ -954,7 +1441,7 @@ class Watchlist(dict):
                     return
             return
         
-        print("Loaded database from .h5s file, keys: ", list(self["watchlist_datasets"].keys()))
+        print("Loaded database from " + os.path.basename(self.storepath) + ", keys: ", list(self["watchlist_datasets"].keys()))
 
     def insert_data(self, data: Union[pd.DataFrame, pd.Series], metadata: pd.Series):
         """ INSERT DATA METHOD.
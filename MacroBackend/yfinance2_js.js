@@ -7,20 +7,19 @@ const yahooFinance = new YahooFinance.default({
 async function searchSymbols(searchTerm) {
     try {
         const results = await yahooFinance.search(searchTerm);
-        const formattedResults = {
+        return {
             quotes: results.quotes || [],
             news: results.news || []
         };
-        console.log(JSON.stringify(formattedResults));
     } catch (error) {
-        console.log(JSON.stringify({
+        return {
             success: false,
             operation: 'search',
             error: error.message,
             searchTerm: searchTerm,
             quotes: [],
             news: []
-        }));
+        };
     }
 }
 
@@ -64,7 +63,7 @@ async function fetchData(symbol, period1, period2, interval = '1d') {
             AdjClose: item.adjClose || item.close || null
         }));
 
-        console.log(JSON.stringify({
+        return {
             success: true,
             operation: 'fetch',
             data: data,
@@ -72,16 +71,16 @@ async function fetchData(symbol, period1, period2, interval = '1d') {
             start_date: startDate.toISOString().split('T')[0],
             end_date: endDate.toISOString().split('T')[0],
             interval: interval
-        }));
+        };
 
     } catch (error) {
-        console.log(JSON.stringify({
+        return {
             success: false,
             operation: 'fetch',
             error: error.message,
             symbol: symbol,
             data: []
-        }));
+        };
     }
 }
 
@@ -96,7 +95,7 @@ async function handleStdinInput() {
     process.stdin.on('end', async () => {
         try {
             const searchTerm = JSON.parse(input.trim());
-            await searchSymbols(searchTerm);
+            console.log(JSON.stringify(await searchSymbols(searchTerm)));
         } catch (error) {
             console.log(JSON.stringify({
                 success: false,
@@ -129,7 +128,7 @@ async function main() {
                 }));
                 return;
             }
-            await searchSymbols(args[1]);
+            console.log(JSON.stringify(await searchSymbols(args[1])));
             break;
 
         case 'fetch':
@@ -155,7 +154,7 @@ async function main() {
                 return;
             }
             
-            await fetchData(symbol, startTimestamp, endTimestamp, interval);
+            console.log(JSON.stringify(await fetchData(symbol, startTimestamp, endTimestamp, interval)));
             break;
 
         default:
@@ -166,10 +165,14 @@ async function main() {
     }
 }
 
-// Run main function
-main().catch(error => {
-    console.log(JSON.stringify({
-        success: false,
-        error: error.message
-    }));
-});
\ No newline at end of file
+module.exports = { searchSymbols, fetchData };
+
+// Run main function when used as a one-shot script (js_worker.js requires this file as a module instead)
+if (require.main === module) {
+    main().catch(error => {
+        console.log(JSON.stringify({
+            success: false,
+            error: error.message
+        }));
+    });
+}
\ No newline at end of file
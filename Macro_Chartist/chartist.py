@@ -306,7 +306,8 @@ def run_chartist(InputsPath: str = "", sheet_name: str = "", use_def_control: bo
     ######### OPTIONS TO PULL DATA FROM DIFFERENT API SOURCES ########################################################## 
         else:
             data = Pull_Data.dataset()
-            data.get_data(source = Source, data_code = ticker, exchange_code = exchange, start_date = DataStart, end_date = EndDateStr)    
+            data.get_data(source = Source, data_code = ticker, exchange_code = exchange, start_date = DataStart, end_date = EndDateStr,
+                          use_cache = Pull_Data.PULL_CACHE_ENABLED, max_stale = Pull_Data.PULL_CACHE_MAX_STALE)    
             
             if isinstance(data.data, pd.Series):
                 TheData = data.data
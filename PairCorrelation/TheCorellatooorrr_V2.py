@@ -19,64 +19,19 @@ from tkinter.filedialog import askopenfilename
 Tk().withdraw() # we don't want a full GUI, so keep the root window from appearing
 
 def CovCorrCalc(AssetPrice1: np.ndarray, AssetPrice2: np.ndarray) -> np.ndarray:         #Function for the cov and Corr. 
-    num = len(AssetPrice1)
-    Numerator = 0; asset1_std = 0; asset2_std = 0
-    mean_asset1 = np.mean(AssetPrice1)
-    mean_asset2 = np.mean(AssetPrice2)
-    CovCorr = []
-
-    for i in range(int(num)):   
-        Numerator += (AssetPrice1[i] - mean_asset1)*(AssetPrice2[i] - mean_asset2)
-        asset1_std += (AssetPrice1[i] - mean_asset1)**2
-        asset2_std += (AssetPrice2[i] - mean_asset2)**2
-    Denominator = np.real((asset1_std**0.5)*(asset2_std**0.5))
-    CovCorr.append(Numerator/(num-1))     #Co-variance of asset pair over the datasets.
-    CovCorr.append(np.real(Numerator/Denominator))  #Correlation co-efficient of asset pair over the datasets.
-    
+    AssetPrice1 = np.asarray(AssetPrice1, dtype=float); AssetPrice2 = np.asarray(AssetPrice2, dtype=float)
+    d1 = AssetPrice1 - AssetPrice1.mean(); d2 = AssetPrice2 - AssetPrice2.mean()
+    Numerator = np.dot(d1, d2)
+    Denominator = np.sqrt(np.dot(d1, d1)*np.dot(d2, d2))
+    CovCorr = [Numerator/(len(AssetPrice1)-1), Numerator/Denominator]   #Co-variance & correlation co-efficient of asset pair over the datasets.
     return CovCorr       #Returns a two number list that has the covariance in the first slot and correlation in the second.
 
 ########################## Correlation for certain periods calculated like a moving average function:
-### This is a slow, bullshit, manual way to do this that I wrote early on in my coding career.
-## Must replace with a more efficient method that uses numpy and pandas to do the same thing.   
+## Rolling windows are done with pandas now (same as efficient_cov_corr). For many series at once use 
+## MacroBackend.stats.rolling_cov_corr_matrix / watchlist_corr_matrix.
 def CovCorrMA(period: int, AssetPrice1: np.ndarray, AssetPrice2: np.ndarray, index) -> pd.DataFrame:
-    ProperLength = len(index)
-    Numerator = 0; asset1_std = 0; asset2_std = 0; count = 0
-    num = len(AssetPrice1)
-    
-    CovColName = 'CV_'+str(period)+'day'
-    CorrColName = 'CC_'+str(period)+'day'
-    Cov = np.array([]); Corr = np.array([])
-    asset1Sublist = []; asset2Sublist = []
-
-    for it in range(num):
-        mean_asset1 = np.mean(AssetPrice1[it:(it+(period))])
-        mean_asset2 = np.mean(AssetPrice2[it:(it+(period))])            
-        if(it > (num-int(period))):
-            break 
-        for jay in range(int(period)):
-            count = (it + jay); #print('Corr calc. man, calc std, period: ',period,'count: ',count, type(count))
-            Numerator += (AssetPrice1[count] - mean_asset1)*(AssetPrice2[count] - mean_asset2)
-            asset1_std += (AssetPrice1[count] - mean_asset1)**2
-            asset2_std += (AssetPrice2[count] - mean_asset2)**2
-            asset1Sublist.append(AssetPrice1[count])
-            asset2Sublist.append(AssetPrice2[count])
-        asset1_std /= period; asset2_std /= period
-        asset1_std= asset1_std**0.5; asset2_std= asset2_std**0.5
-        C1_std = np.std(asset1Sublist); C2_std = np.std(asset2Sublist)
-        Denominator = np.real((asset1_std)*(asset2_std))
-        PeriodCov = (np.real(Numerator/(period-1)))
-        PeriodCorr = (np.real(PeriodCov/Denominator))
-        Cov = np.append(Cov,PeriodCov)
-        Corr = np.append(Corr,PeriodCorr)
-        Numerator = 0        ## Reset the counter variables.
-        asset1_std = 0
-        asset2_std = 0
-        asset1Sublist = []; asset2Sublist = [] 
-    
-    Cov = np.pad(Cov,((ProperLength-len(Cov),0)),constant_values=(np.nan))
-    Corr = np.pad(Corr,((ProperLength-len(Corr),0)),constant_values=(np.nan))
-    CovCorrDict = {CovColName:Cov,CorrColName:Corr}
-    CovCorrDF = pd.DataFrame(CovCorrDict, index=index)
+    CovCorrDF = efficient_cov_corr(int(period), np.asarray(AssetPrice1, dtype=float), np.asarray(AssetPrice2, dtype=float))
+    CovCorrDF.index = index
     return CovCorrDF       #Dataframe containing the MA for the given period, 1st column co-variance, second column correlation co-efficient. 
 
 def efficient_cov_corr(period, asset_price1, asset_price2):
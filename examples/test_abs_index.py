@@ -0,0 +1,223 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+pytest.importorskip("readabs")
+pytest.importorskip("tables")
+from MacroBackend.ABS_backend import readabs_py as rpy
+from MacroBackend.Utilities import Search_DF_np
+
+WORDS = ["Employed", "Unemployment", "rate", "Persons", "Males", "Females", "Trend", "Seasonally", "Adjusted", "Wages",
+         "Price", "Index", "Hours", "Industry", "Australia", "Victoria", "Queensland", "Total"]
+
+
+def master_index(n: int = 2000, n_catalogs: int = 40, seed: int = 0) -> pd.DataFrame:
+    """Synthetic ABS master index: indexed by Series ID (as Search_DF_np needs) and with the id also as a column. Every
+    50th series is listed under two catalogs, like series the ABS publishes in more than one release."""
+    rng = np.random.default_rng(seed)
+    ids = [f"A{8400000 + i:07d}{chr(65 + i % 26)}" for i in range(n)]
+    cats = [f"{6200 + rng.integers(n_catalogs)}.0" for _ in range(n)]
+    desc = [" ;  ".join(rng.choice(WORDS, 3, replace=False)) + " ;" for _ in range(n)]
+    frame = pd.DataFrame({"Series ID": ids, "Catalogue number": cats, "Data Item Description": desc,
+                          "Table Title": [f"Table {i % 30}" for i in range(n)]}, index=ids)
+    dup = frame.iloc[::50].copy()
+    dup["Catalogue number"] = "5206.0"
+    return pd.concat([frame, dup])
+
+
+def write_index(path: str, frame: pd.DataFrame) -> str:
+    frame.to_hdf(path, key="data", mode="w")
+    return path
+
+
+def legacy_catalogue_num(path: str, series_id: str):
+    """get_catalogue_num_for_series before the index service: read the file and search it on every call."""
+    masterIndex = pd.read_hdf(path, key='data')
+    result = Search_DF_np(masterIndex, series_id, verbose=False)
+    if result is not None and not result.empty:
+        return result.loc['Catalogue number']
+    return None
+
+
+def legacy_metadata(path: str, series_id: str, catalog_num: str):
+    masterIndex = pd.read_hdf(path, key='data')
+    result = masterIndex[(masterIndex['Catalogue number'] == catalog_num) & (masterIndex['Series ID'] == series_id)]
+    return result.iloc[0] if not result.empty else None
+
+
+class FakeCatalogs:
+    """Stands in for ra.read_abs_cat: a catalog is a data dict and a metadata frame with a series_id column."""
+    def __init__(self, catalogs: dict):
+        self.catalogs = catalogs
+        self.calls = []
+
+    def __call__(self, cat, verbose=False):
+        self.calls.append(str(cat))
+        ids = self.catalogs[str(cat)]
+        meta = pd.DataFrame({"series_id": ids, "did": [f"Description of {i}" for i in ids], "table": "1"})
+        return {"1": pd.DataFrame({sid: np.arange(3.0) for sid in ids})}, meta
+
+
+@pytest.fixture
+def index_file(tmp_path):
+    return write_index(str(tmp_path / "abs_master_index.h5"), master_index())
+
+
+@pytest.fixture
+def service(index_file, tmp_path):
+    return rpy.ABSIndexService(index_path=index_file, cache_dir=str(tmp_path / "catalog_cache"))
+
+
+@pytest.fixture
+def fake_catalogs(monkeypatch):
+    fake = FakeCatalogs({"6202.0": ["A84423050A", "A84423043C"], "6291.0": ["A1000000X", "A1000001Y"], "5206.0": ["A2302459A"]})
+    monkeypatch.setattr(rpy.ra, "read_abs_cat", fake)
+    return fake
+
+
+def test_lookups_match_the_legacy_file_search(index_file, service):
+    frame = pd.read_hdf(index_file, key="data")
+    rng = np.random.default_rng(1)
+    for sid in list(rng.choice(frame.index.unique(), 60, replace=False)) + [frame.index[0], frame.index[50]]:
+        assert service.catalogue_for(sid) == legacy_catalogue_num(index_file, sid)
+        for cat in frame.loc[[sid], "Catalogue number"]:
+            pd.testing.assert_series_equal(service.metadata_for(sid, cat), legacy_metadata(index_file, sid, cat))
+        pd.testing.assert_series_equal(service.metadata_for(sid), frame.loc[[sid]].iloc[0])
+    assert service.catalogue_for(" " + frame.index[3] + " ") == frame["Catalogue number"].iloc[3]
+    assert service.catalogue_for("NOPE") is None and legacy_catalogue_num(index_file, "NOPE") is None
+    assert service.metadata_for(frame.index[0], "9999.0") is None
+    assert len(service.index_rows(frame.index[50])) == 2
+
+
+def test_index_read_once_and_reloaded_when_the_file_changes(index_file, service, monkeypatch):
+    reads = []
+    read = rpy.read_index_table
+    monkeypatch.setattr(rpy, "read_index_table", lambda path: reads.append(path) or read(path))
+    for sid in service.master_index.index[:100]:
+        service.catalogue_for(sid)
+    assert len(reads) == 1
+    changed = master_index(2001, seed=3)
+    changed.loc[changed.index[0], "Catalogue number"] = "1234.5"
+    write_index(index_file, changed)
+    os.utime(index_file, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert service.catalogue_for(changed.index[0]) == "1234.5" and len(reads) == 2
+
+
+def test_title_search_finds_rows_with_every_term(index_file, service):
+    frame = pd.read_hdf(index_file, key="data")
+    text = (frame["Data Item Description"] + " " + frame["Series ID"]).str.lower()
+    for term in ["unemployment", "rate, persons", "A84000", "Trend,Victoria", "nope"]:
+        mask = np.logical_and.reduce([text.str.contains(t.strip().lower(), regex=False) for t in term.split(",")])
+        # Row for row, unlike Search_DF_np which returns rows with a repeated Series ID twice (it selects by label).
+        pd.testing.assert_frame_equal(service.search_titles(term), frame[mask], obj=term)
+
+
+def test_catalogs_are_cached_in_memory_and_on_disk(index_file, tmp_path, fake_catalogs):
+    cache_dir = str(tmp_path / "catalog_cache")
+    service = rpy.ABSIndexService(index_path=index_file, cache_dir=cache_dir, memory_catalogs=1)
+    first = service.read_catalog("6202.0")
+    assert service.read_catalog("6202.0") is first and fake_catalogs.calls == ["6202.0"]
+    service.read_catalog("6291.0")
+    service.read_catalog("6202.0")  # evicted from memory by 6291.0, read back from disk
+    assert fake_catalogs.calls == ["6202.0", "6291.0"]
+    fresh = rpy.ABSIndexService(index_path=index_file, cache_dir=cache_dir)
+    data, meta = fresh.read_catalog("6202.0")
+    pd.testing.assert_frame_equal(meta, first[1])
+    assert fake_catalogs.calls == ["6202.0", "6291.0"]
+    fresh.read_catalog("6202.0", refresh=True)
+    assert fake_catalogs.calls[-1] == "6202.0" and len(fake_catalogs.calls) == 3
+
+
+def test_expired_and_corrupt_cache_files_are_downloaded_again(index_file, tmp_path, fake_catalogs):
+    cache_dir = str(tmp_path / "catalog_cache")
+    rpy.ABSIndexService(index_path=index_file, cache_dir=cache_dir).read_catalog("6202.0")
+    path = rpy.ABSIndexService(index_path=index_file, cache_dir=cache_dir)._catalog_path("6202.0")
+    old = time.time() - rpy.CATALOG_CACHE_TTL - 60
+    os.utime(path, (old, old))
+    rpy.ABSIndexService(index_path=index_file, cache_dir=cache_dir).read_catalog("6202.0")
+    assert fake_catalogs.calls == ["6202.0"] * 2
+    with open(path, "wb") as f:
+        f.write(b"not a pickle")
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        data, meta = rpy.ABSIndexService(index_path=index_file, cache_dir=cache_dir).read_catalog("6202.0")
+    assert "Discarding" in out.getvalue() and fake_catalogs.calls == ["6202.0"] * 3
+    assert list(meta["series_id"]) == ["A84423050A", "A84423043C"] and not os.path.exists(path + ".tmp")
+
+
+def test_series_missing_from_the_index_are_scanned_for_once(service, fake_catalogs, monkeypatch):
+    listings = []
+    catalogue = pd.DataFrame({"title": ["Labour Force", "Detailed LF", "National Accounts"]}, index=["6202.0", "6291.0", "5206.0"])
+    monkeypatch.setattr(rpy.ra, "abs_catalogue", lambda cache_only=False, verbose=False: listings.append(1) or catalogue)
+    monkeypatch.setattr(rpy, "get_abs_index", lambda: service)
+    with contextlib.redirect_stdout(io.StringIO()):
+        found = rpy.search_series_by_id("A1000001Y")
+    assert found["series_id"] == "A1000001Y" and listings == [1] and fake_catalogs.calls == ["6202.0", "6291.0"]
+    assert service.catalogue_for("A1000001Y") == "6291.0"
+    fake_catalogs.calls.clear()
+    assert rpy.search_series_by_id("A1000001Y")["did"] == "Description of A1000001Y"
+    assert listings == [1] and fake_catalogs.calls == []
+    assert rpy.get_catalogue_num_for_series("A84423050A") == "6202.0"
+    with pytest.raises(ValueError):
+        rpy.get_catalogue_num_for_series("A9999999Z")
+
+
+def test_indexed_series_read_only_their_catalog(service, fake_catalogs, monkeypatch):
+    monkeypatch.setattr(rpy.ra, "abs_catalogue", lambda **kwargs: pytest.fail("catalogue listing not needed"))
+    monkeypatch.setattr(rpy, "get_abs_index", lambda: service)
+    frame = service.master_index
+    sid = frame.index[50]  # listed under two catalogs, 5206.0 second
+    fake_catalogs.catalogs[frame["Catalogue number"].iloc[50]] = [sid]
+    assert rpy.search_series_by_id(sid)["series_id"] == sid
+    assert fake_catalogs.calls == [frame["Catalogue number"].iloc[50]]
+    expected = frame[(frame.index == sid) & (frame["Catalogue number"] == "5206.0")].iloc[0]
+    pd.testing.assert_series_equal(rpy.get_metadata_from_index(sid, "5206.0"), expected)
+
+
+def benchmark(n_rows: int = 20000, n_lookups: int = 200):
+    print(f"Benchmark: {n_lookups} series id lookups in a {n_rows}-row ABS master index")
+    frame = master_index(n_rows)
+    ids = list(np.random.default_rng(0).choice(frame.index.unique(), n_lookups))
+    with tempfile.TemporaryDirectory() as folder:
+        path = write_index(os.path.join(folder, "abs_master_index.h5"), frame)
+        t0 = time.perf_counter()
+        for sid in ids:
+            legacy_catalogue_num(path, sid)
+        t_old = time.perf_counter() - t0
+        service = rpy.ABSIndexService(index_path=path, cache_dir=os.path.join(folder, "cache"))
+        t0 = time.perf_counter()
+        for sid in ids:
+            service.catalogue_for(sid)
+        t_new = time.perf_counter() - t0
+    print(f"  read + search per lookup {t_old * 1000:.0f}ms, index service {t_new * 1000:.1f}ms (incl. first load), "
+          f"{t_old / t_new:.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests for the ABS master index / catalog cache service, and a lookup benchmark.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.rows, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
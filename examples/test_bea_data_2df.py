@@ -0,0 +1,173 @@
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+pytest.importorskip("customtkinter")
+from MacroBackend.BEA_Data.bea_data_mate.BEA_API_backend import BEA_Data, convert_to_float_with_commas
+
+# Saved BEA API responses (trimmed NIPA tables: annual, quarterly with comma-formatted values, monthly and an
+# underlying-detail table with several lines per description).
+SAMPLES = sorted(glob.glob(os.path.join(wd, "bea_samples", "*.json")))
+
+
+def legacy_data_2df(Data: pd.DataFrame, frequency: str, tDesc: str):
+    """BEA_Data.Data_2DF as it was before the single pivot: filter, concat and convert once per line."""
+    categories = Data['LineDescription'].unique()
+    SeriesInfo = pd.Series(Data.iloc[0], name=tDesc)
+    SeriesInfo.drop(['LineDescription', 'NoteRef', 'LineNumber', 'TimePeriod', 'DataValue'], axis=0, inplace=True)
+    i = 0; names = []; codes = []
+    for cat in categories:
+        category = pd.DataFrame(Data[Data['LineDescription'] == cat])
+        category.drop_duplicates("TimePeriod", inplace=True)
+        if frequency == 'M':
+            periods = category["TimePeriod"].to_list()
+            refd = [str(per).replace('M', "-") for per in periods]
+            idx = pd.PeriodIndex(refd, freq=frequency)
+            category.drop("TimePeriod", axis=1, inplace=True)
+        else:
+            idx = pd.PeriodIndex(category["TimePeriod"], freq=frequency)
+        dtI = idx.to_timestamp(freq=frequency, how='start')
+        category.set_index(dtI, inplace=True)
+        catSeries = pd.Series(category["DataValue"], name=cat)
+        names.append(cat); codes.append(str(category['SeriesCode'].iloc[0]))
+        if i == 0:
+            FinalData = catSeries.copy()
+        else:
+            if len(FinalData.index.difference(catSeries.index)) > 0:
+                NanSeries = pd.Series(np.nan, index=FinalData.index.difference(catSeries.index))
+                bilp = pd.concat([NanSeries, catSeries], axis=0); bilp.rename(catSeries.name, inplace=True)
+                if (FinalData.index.is_monotonic_increasing or FinalData.index.is_monotonic_decreasing) and \
+                        (bilp.index.is_monotonic_increasing or bilp.index.is_monotonic_decreasing):
+                    bilp = bilp.sort_index().reindex(index=FinalData.index.sort_values(), method='pad')
+                FinalData = pd.concat([FinalData, bilp], axis=1)
+            else:
+                FinalData = pd.concat([FinalData, catSeries], axis=1)
+        i += 1
+    FinalData.index.rename("TimePeriod", inplace=True)
+    for column in FinalData.columns:
+        FinalData[column] = FinalData[column].apply(convert_to_float_with_commas)
+    SeriesCodes = pd.Series(codes, index=names)
+    SeriesInfo = pd.concat([SeriesInfo, SeriesCodes], axis=0).rename('SeriesInfo')
+    return SeriesInfo, FinalData
+
+
+def load_sample(path: str) -> tuple:
+    """Returns (raw payload, long Data table, frequency) for a saved response."""
+    with open(path) as f:
+        payload = json.load(f)
+    params = {p["ParameterName"]: p["ParameterValue"] for p in payload["BEAAPI"]["Request"]["RequestParam"]}
+    return payload, pd.DataFrame(payload["BEAAPI"]["Results"]["Data"]), params["FREQUENCY"]
+
+
+def _assert_same(new: tuple, old: tuple):
+    pd.testing.assert_series_equal(new[0], old[0])
+    pd.testing.assert_frame_equal(new[1], old[1], check_freq=False)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_matches_legacy_on_saved_payloads(path):
+    _, data, freq = load_sample(path)
+    new = BEA_Data.Data_2DF(None, data, freq, "Table")
+    _assert_same(new, legacy_data_2df(data, freq, "Table"))
+    assert new[1].dtypes.eq(float).all() and new[1].index.is_monotonic_increasing
+
+
+def test_comma_values_and_shared_descriptions():
+    _, data, freq = load_sample(os.path.join(wd, "bea_samples", "T10505_Q.json"))
+    assert data["DataValue"].str.contains(",").any()
+    assert data.groupby("LineDescription")["LineNumber"].nunique().max() > 1  # e.g. "Goods" under exports and imports
+    info, table = BEA_Data.Data_2DF(None, data, freq, "Table")
+    assert list(table.columns) == list(data["LineDescription"].unique())
+    first = data.drop_duplicates(["LineDescription", "TimePeriod"]).iloc[0]
+    assert table.iloc[0, 0] == float(first["DataValue"].replace(",", ""))
+    assert info[first["LineDescription"]] == first["SeriesCode"]
+
+
+def test_shuffled_rows_give_the_same_frame():
+    _, data, freq = load_sample(os.path.join(wd, "bea_samples", "T20804_M.json"))
+    info, table = BEA_Data.Data_2DF(None, data, freq, "Table")
+    order = data.groupby("LineDescription", sort=False).ngroup()
+    shuffled = data.sample(frac=1.0, random_state=0).assign(_o=order).sort_values("_o", kind="stable").drop(columns="_o")
+    shuffled = shuffled.reset_index(drop=True)
+    pd.testing.assert_frame_equal(BEA_Data.Data_2DF(None, shuffled, freq, "Table")[1], table)
+
+
+def test_gaps_and_missing_values():
+    _, data, freq = load_sample(os.path.join(wd, "bea_samples", "T10105_A.json"))
+    lines = data["LineDescription"].unique()
+    data = data[~((data["LineDescription"] == lines[3]) & (data["TimePeriod"].isin(["2010", "2011"])))].copy()
+    _assert_same(BEA_Data.Data_2DF(None, data, freq, "Table"), legacy_data_2df(data, freq, "Table"))
+    # BEA marks suppressed values "(NA)" or "(D)". The legacy float() conversion raised on these, now they are NaN.
+    data.loc[data.index[5], "DataValue"] = "(NA)"
+    table = BEA_Data.Data_2DF(None, data, freq, "Table")[1]
+    assert np.isnan(table.iloc[5, 0]) and table.iloc[:, 0].notna().sum() == len(table) - 1
+
+
+def test_single_line_table():
+    _, data, freq = load_sample(os.path.join(wd, "bea_samples", "T10105_A.json"))
+    one = data[data["LineNumber"] == "1"]
+    info, table = BEA_Data.Data_2DF(None, one, freq, "Table")
+    assert table.shape == (one["TimePeriod"].nunique(), 1)
+
+
+def test_get_bea_data_uses_saved_response(monkeypatch):
+    payload, data, freq = load_sample(os.path.join(wd, "bea_samples", "T10505_Q.json"))
+    client = BEA_Data.__new__(BEA_Data)
+    monkeypatch.setattr(client, "national_income_and_product_accounts", lambda *args, **kwargs: payload, raising=False)
+    client.Get_BEA_Data(dataset="NIPA", tCode="T10505", frequency=freq)
+    ref_info, ref_table = legacy_data_2df(data, freq, client.Data_name)
+    pd.testing.assert_frame_equal(client.Data["Series_Split"], ref_table, check_freq=False)
+    assert client.Data["SeriesInfo"]["Source"] == "Bureau of economic analysis"
+    pd.testing.assert_series_equal(client.Data["SeriesInfo"][ref_info.index], ref_info, check_names=False)
+
+
+def synthetic_detail_table(n_lines: int = 400, n_periods: int = 300, seed: int = 0) -> pd.DataFrame:
+    """An NIUnderlyingDetail sized monthly table in the API's long layout, with comma formatted values."""
+    rng = np.random.default_rng(seed)
+    periods = pd.period_range("2000-01", periods=n_periods, freq="M").strftime("%YM%m")
+    values = rng.uniform(100, 1e6, size=(n_lines, n_periods))
+    return pd.DataFrame({"TableName": "U20405", "SeriesCode": np.repeat([f"DS{i:05d}" for i in range(n_lines)], n_periods),
+                         "LineNumber": np.repeat(np.arange(1, n_lines + 1).astype(str), n_periods),
+                         "LineDescription": np.repeat([f"Line {i} description" for i in range(n_lines)], n_periods),
+                         "TimePeriod": np.tile(periods, n_lines), "METRIC_NAME": "Current Dollars", "CL_UNIT": "Level",
+                         "UNIT_MULT": "6", "DataValue": [f"{v:,.1f}" for v in values.ravel()], "NoteRef": "U20405"})
+
+
+def benchmark(n_lines: int = 400, n_periods: int = 300):
+    print(f"Benchmark: Data_2DF on tables in the API's long layout")
+    for label, data, freq in [(os.path.basename(p), *load_sample(p)[1:]) for p in SAMPLES] + \
+                             [(f"synthetic {n_lines}x{n_periods} M", synthetic_detail_table(n_lines, n_periods), "M")]:
+        t0 = time.perf_counter(); legacy_data_2df(data, freq, "Table"); t_old = time.perf_counter() - t0
+        t0 = time.perf_counter(); BEA_Data.Data_2DF(None, data, freq, "Table"); t_new = time.perf_counter() - t0
+        print(f"  {label:>24}: {len(data):>7} rows, legacy {t_old:.3f}s, pivot {t_new * 1000:.1f}ms, "
+              f"{t_old / t_new:.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for BEA_Data.Data_2DF on saved BEA responses.")
+    parser.add_argument("--lines", type=int, default=400, help="Lines in the synthetic benchmark table")
+    parser.add_argument("--periods", type=int, default=300, help="Periods per line in the synthetic benchmark table")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.lines, args.periods)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import os
+import sys
+import time
+import argparse
+import hashlib
+
+import pandas as pd
+import pytest
+
+# Ensure repo root and the bea_data_mate package folder are importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+bea_root = os.path.join(repo_root, "MacroBackend", "BEA_Data", "bea_data_mate")
+for path in (repo_root, bea_root):
+    if path not in sys.path:
+        sys.path.append(path)
+
+import beaapiloc
+from beaapiloc import throttling_caller as tc
+
+MAX_REQUESTS = beaapiloc.MAX_REQUESTS_PER_MINUTE
+MAX_BYTES = beaapiloc.MAX_DATA_PER_MINUTE
+MAX_ERRORS = beaapiloc.MAX_ERRORS_PER_MINUTE
+
+
+class FakeClock:
+    """Clock and sleep for the limiter: time only moves when someone sleeps or the test advances it."""
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class Table:
+    """Stands in for the DataFrame a BEA call returns: only attrs["response_size"] is used."""
+    def __init__(self, size: float):
+        self.attrs = {"response_size": size}
+
+
+def limiter(clock: FakeClock, state_file: str = None) -> tc.SlidingWindowLimiter:
+    return tc.SlidingWindowLimiter(MAX_REQUESTS, MAX_BYTES, MAX_ERRORS, state_file=state_file, clock=clock)
+
+
+def max_in_window(times: list, window: float = 60.0) -> int:
+    times = sorted(times)
+    best, j = 0, 0
+    for i, t in enumerate(times):
+        while times[j] + window <= t:
+            j += 1
+        best = max(best, i - j + 1)
+    return best
+
+
+def test_request_limit_is_a_sliding_window():
+    clock = FakeClock()
+    lim = limiter(clock)
+    for _ in range(MAX_REQUESTS):
+        assert lim.reserve() == 0
+        clock.advance(0.1)
+    # The first request was booked 10s ago, its slot frees at +60s, plus the safety margin.
+    assert lim.reserve() == pytest.approx(60 - 10 + 1)
+    assert lim.usage()["requests"] == MAX_REQUESTS + 1
+    clock.advance(60)
+    # Sliding, not fixed: the early requests have expired, the rest of the minute is still counted.
+    usage = lim.usage()["requests"]
+    assert 0 < usage < MAX_REQUESTS
+
+
+def test_byte_and_error_limits():
+    clock = FakeClock()
+    lim = limiter(clock)
+    assert lim.reserve() == 0
+    lim.record(size=MAX_BYTES * 0.6)
+    clock.advance(5)
+    assert lim.reserve() == 0
+    lim.record(size=MAX_BYTES * 0.6)
+    clock.advance(5)
+    # Over the byte limit until the first response leaves the window at +60s.
+    assert lim.reserve() == pytest.approx(50 + 1)
+
+    clock = FakeClock()
+    lim = limiter(clock)
+    for _ in range(MAX_ERRORS):
+        lim.record(errors=1, requests=1)
+        clock.advance(1)
+    assert lim.usage()["errors"] == MAX_ERRORS
+    assert lim.reserve() == pytest.approx(60 - MAX_ERRORS + 1)
+
+
+def test_block_for_holds_every_request():
+    clock = FakeClock()
+    lim = limiter(clock)
+    lim.block_for(60)
+    assert lim.blocked_until == clock.now + 60
+    assert lim.reserve() == pytest.approx(61)
+    clock.advance(61)
+    assert lim.reserve() == 0
+
+
+def test_caller_never_exceeds_the_limits():
+    clock = FakeClock()
+    caller = tc.ThrottlingCaller(clock=clock, sleep=clock.sleep)
+    starts = []
+
+    def beacall():
+        starts.append(clock.now)
+        clock.advance(0.05)
+        return Table(200_000)
+
+    for _ in range(350):
+        caller.single_call(beacall)
+    assert max_in_window(starts) <= MAX_REQUESTS
+    # 350 requests need three full windows of waiting, and no more than that (plus margins).
+    assert 3 * 60 <= starts[-1] - starts[0] <= 3 * 60 + 3 * 2
+    assert len(clock.sleeps) == 3
+    # Each request is counted once: reserved in wait_until_available, then only its bytes logged.
+    assert caller.limiter.usage()["requests"] == len([t for t in starts if t > clock.now - 60])
+
+
+def test_caller_counts_response_errors_and_backs_off_after_failures():
+    clock = FakeClock()
+    caller = tc.ThrottlingCaller(clock=clock, sleep=clock.sleep)
+
+    def bad_response():
+        raise beaapiloc.BEAAPIResponseError("bad request", response_size=1234)
+
+    for _ in range(MAX_ERRORS):
+        with pytest.raises(beaapiloc.BEAAPIResponseError):
+            caller.single_call(bad_response)
+    usage = caller.limiter.usage()
+    assert usage == {"requests": MAX_ERRORS, "size": 1234 * MAX_ERRORS, "errors": MAX_ERRORS}
+    caller.single_call(lambda: Table(0))
+    assert clock.sleeps == [pytest.approx(61)]
+
+    def failure():
+        raise beaapiloc.BEAAPIFailure("timed out")
+
+    with pytest.raises(beaapiloc.BEAAPIFailure):
+        caller.single_call(failure)
+    assert caller.wait_prev_failure
+    caller.single_call(lambda: Table(0))
+    assert clock.sleeps[-1] == pytest.approx(61) and not caller.wait_prev_failure
+
+
+def test_log_query_without_reserve_counts_the_request():
+    clock = FakeClock()
+    caller = tc.ThrottlingCaller(clock=clock, sleep=clock.sleep)
+    caller.log_query(10)
+    caller.log_query(20, err=True, n=clock.now - 5)
+    assert caller.limiter.usage() == {"requests": 2, "size": 30, "errors": 1}
+    frame = caller.rel_queries
+    assert list(frame.columns) == ["time", "size", "errors"] and len(frame) == 2
+
+
+def test_state_file_shares_limits_between_callers(tmp_path):
+    clock = FakeClock()
+    state = str(tmp_path / "bea_throttle.json")
+    a = tc.ThrottlingCaller(state_file=state, clock=clock, sleep=clock.sleep)
+    b = tc.ThrottlingCaller(state_file=state, clock=clock, sleep=clock.sleep)
+    for i in range(MAX_REQUESTS):
+        (a if i % 2 else b).single_call(lambda: Table(100))
+    assert a.limiter.usage()["requests"] == MAX_REQUESTS == b.limiter.usage()["requests"]
+    b.single_call(lambda: Table(100))
+    assert clock.sleeps == [pytest.approx(61)] and not os.path.exists(state + ".lock")
+
+
+def test_state_file_name_hashes_the_full_key(tmp_path, monkeypatch):
+    monkeypatch.setenv("BEAAPI_THROTTLE_DIR", str(tmp_path))
+    monkeypatch.setattr(tc, "throttling_data", {})
+    key_a = "ABCDEF12-0000-4000-8000-000000000001"
+    key_b = "ABCDEF12-0000-4000-8000-000000000002"  # same first 8 characters
+    a, b = tc.get_throttling_caller(key_a), tc.get_throttling_caller(key_b)
+    assert a is not b and tc.get_throttling_caller(key_a) is a
+    file_a, file_b = a.limiter.state_file, b.limiter.state_file
+    assert file_a != file_b and os.path.dirname(file_a) == str(tmp_path)
+    assert os.path.basename(file_a) == f"bea_throttle_{hashlib.sha256(key_a.encode()).hexdigest()[:16]}.json"
+    for key, path in ((key_a, file_a), (key_b, file_b)):
+        assert not any(part in os.path.basename(path) for part in key.split("-"))
+    a.log_query(10)
+    assert b.limiter.usage()["requests"] == 0
+
+
+class LegacyThrottlingCaller:
+    """The DataFrame log ThrottlingCaller used before the sliding window limiter (bookkeeping only, it never
+    sleeps here as every logged query is older than the window). Kept for the benchmark."""
+    def __init__(self):
+        self.rel_queries = pd.DataFrame({'time': pd.Series(dtype='datetime64[ns]'), 'size': pd.Series(dtype='float'),
+                                         'errors': pd.Series(dtype='int')})
+
+    def check(self) -> None:
+        n = pd.Timestamp.now()
+        for col in ("time", "size", "errors"):
+            mask = self.rel_queries['time'] >= n - pd.Timedelta(1, "minute")
+            self.rel_queries[col][mask].sum() if col != "time" else self.rel_queries[mask].shape[0]
+
+    def log_query(self, size: float, n: pd.Timestamp) -> None:
+        self.rel_queries = pd.concat([self.rel_queries, pd.DataFrame({'time': [n], 'size': [size], 'errors': [0]})],
+                                     axis=0).reset_index(drop=True)
+
+
+def benchmark(n_calls: int = 5000):
+    print(f"Benchmark: throttling bookkeeping for {n_calls} BEA calls (no waiting)")
+    old = LegacyThrottlingCaller()
+    past = pd.Timestamp.now() - pd.Timedelta(2, "minute")
+    t0 = time.perf_counter()
+    for _ in range(n_calls):
+        old.check(); old.log_query(1000.0, past)
+    t_old = time.perf_counter() - t0
+    clock = FakeClock()
+    caller = tc.ThrottlingCaller(clock=clock, sleep=clock.sleep)
+    t0 = time.perf_counter()
+    for _ in range(n_calls):
+        caller.wait_until_available(); caller.log_query(1000.0); clock.advance(1.0)
+    t_new = time.perf_counter() - t0
+    print(f"  DataFrame log {t_old * 1000:.0f}ms, sliding window {t_new * 1000:.1f}ms, {t_old / t_new:.0f}x "
+          f"(log length {len(old.rel_queries)} vs {len(caller.limiter.events())})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake clock tests for the BEA API throttle, and a bookkeeping benchmark.")
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.calls)
+
+
+if __name__ == "__main__":
+    main()
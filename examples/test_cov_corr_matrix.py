@@ -0,0 +1,227 @@
+import os
+import ast
+import sys
+import time
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/, stats.py imports its siblings directly.
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+for p in (repo_root, os.path.join(repo_root, "MacroBackend")):
+    if p not in sys.path:
+        sys.path.append(p)
+
+import stats
+
+
+def _corellatooorrr_funcs() -> dict:
+    """CovCorrCalc, CovCorrMA and efficient_cov_corr from PairCorrelation/TheCorellatooorrr_V2.py. That file is a script
+    (it opens a Tk window and reads its input sheet on import), so only the function definitions are executed."""
+    path = os.path.join(repo_root, "PairCorrelation", "TheCorellatooorrr_V2.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    wanted = {"CovCorrCalc", "CovCorrMA", "efficient_cov_corr"}
+    module = ast.Module(body=[n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name in wanted], type_ignores=[])
+    namespace = {"np": np, "pd": pd}
+    exec(compile(module, path, "exec"), namespace)
+    return {name: namespace[name] for name in wanted}
+
+
+funcs = _corellatooorrr_funcs()
+CovCorrCalc, CovCorrMA, efficient_cov_corr = funcs["CovCorrCalc"], funcs["CovCorrMA"], funcs["efficient_cov_corr"]
+
+
+#### The loop implementations from before the vectorized versions, kept here as the reference.
+def legacy_cov_corr_calc(AssetPrice1, AssetPrice2):
+    num = len(AssetPrice1)
+    Numerator = 0; asset1_std = 0; asset2_std = 0
+    mean_asset1 = np.mean(AssetPrice1); mean_asset2 = np.mean(AssetPrice2)
+    for i in range(int(num)):
+        Numerator += (AssetPrice1[i] - mean_asset1)*(AssetPrice2[i] - mean_asset2)
+        asset1_std += (AssetPrice1[i] - mean_asset1)**2
+        asset2_std += (AssetPrice2[i] - mean_asset2)**2
+    Denominator = np.real((asset1_std**0.5)*(asset2_std**0.5))
+    return [Numerator/(num-1), np.real(Numerator/Denominator)]
+
+
+def legacy_cov_corr_ma(period: int, AssetPrice1, AssetPrice2, index) -> pd.DataFrame:
+    num = len(AssetPrice1)
+    Cov = []; Corr = []
+    for it in range(num - period + 1):
+        a = AssetPrice1[it:it + period]; b = AssetPrice2[it:it + period]
+        Numerator = np.sum((a - a.mean()) * (b - b.mean()))
+        Denominator = np.sqrt(np.sum((a - a.mean())**2) / period) * np.sqrt(np.sum((b - b.mean())**2) / period)
+        Cov.append(Numerator/(period-1)); Corr.append(Numerator/(period-1)/Denominator)
+    pad = [np.nan] * (len(index) - len(Cov))
+    return pd.DataFrame({'CV_'+str(period)+'day': pad + Cov, 'CC_'+str(period)+'day': pad + Corr}, index=index)
+
+
+def _prices(n: int = 800, n_series: int = 6, seed: int = 0, nan_frac: float = 0.0, level: float = 100.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    common = rng.standard_normal(n).cumsum()
+    data = {f"S{i}": level + (0.3 + 0.1 * i) * common + rng.standard_normal(n).cumsum() for i in range(n_series)}
+    df = pd.DataFrame(data, index=pd.date_range("2010-01-04", periods=n, freq="B"))
+    if nan_frac:
+        df = df.mask(rng.random(df.shape) < nan_frac)
+    return df
+
+
+def pairwise_reference(data: pd.DataFrame, windows: list, min_periods: int = None) -> pd.DataFrame:
+    """rolling_cov_corr_matrix's output built one pair at a time with pandas rolling cov/corr."""
+    out = []
+    for window in windows:
+        mp = window if min_periods is None else min_periods
+        for s1, s2 in itertools.combinations(data.columns, 2):
+            a, b = data[s1], data[s2]
+            cov = a.rolling(window, min_periods=mp).cov(b); corr = a.rolling(window, min_periods=mp).corr(b)
+            out.append(pd.DataFrame({"date": data.index, "window": window, "series1": s1, "series2": s2,
+                                     "cov": cov.to_numpy(), "corr": corr.to_numpy()}))
+    ref = pd.concat(out, ignore_index=True)
+    ref = ref[ref["cov"].notna()]
+    return ref.sort_values(["window", "series1", "series2", "date"], kind="stable").reset_index(drop=True)
+
+
+def direct_reference(data: pd.DataFrame, windows: list) -> pd.DataFrame:
+    """Two-pass cov/corr on each full window, for data where pandas' running sums lose precision."""
+    out = []
+    for window in windows:
+        for s1, s2 in itertools.combinations(data.columns, 2):
+            a, b = data[s1].to_numpy(), data[s2].to_numpy()
+            for end in range(window, len(data) + 1):
+                x = a[end - window:end] - a[end - window:end].mean(); y = b[end - window:end] - b[end - window:end].mean()
+                den = np.sqrt((x * x).sum() * (y * y).sum())
+                out.append((data.index[end - 1], window, s1, s2, (x * y).sum() / (window - 1),
+                            (x * y).sum() / den if den > 0 else np.nan))
+    ref = pd.DataFrame(out, columns=["date", "window", "series1", "series2", "cov", "corr"])
+    return ref.sort_values(["window", "series1", "series2", "date"], kind="stable").reset_index(drop=True)
+
+
+def _assert_matches_pandas(got: pd.DataFrame, ref: pd.DataFrame):
+    assert len(got) == len(ref)
+    pd.testing.assert_frame_equal(got[["date", "window", "series1", "series2"]], ref[["date", "window", "series1", "series2"]],
+                                  check_dtype=False)
+    np.testing.assert_allclose(got["cov"], ref["cov"], rtol=1e-7, atol=1e-10)
+    both = ref["corr"].notna().to_numpy()
+    assert (got["corr"].notna().to_numpy() == both).all()
+    np.testing.assert_allclose(got["corr"].to_numpy()[both], ref["corr"].to_numpy()[both], rtol=1e-7, atol=1e-9)
+
+
+def test_cov_corr_calc_matches_legacy_loop():
+    data = _prices(500, 2, seed=3)
+    a, b = data["S0"].to_numpy(), data["S1"].to_numpy()
+    np.testing.assert_allclose(CovCorrCalc(a, b), legacy_cov_corr_calc(a, b), rtol=1e-12)
+    np.testing.assert_allclose(CovCorrCalc(a, b)[1], np.corrcoef(a, b)[0, 1], rtol=1e-12)
+
+
+@pytest.mark.parametrize("period", [5, 30, 90])
+def test_cov_corr_ma_matches_pandas_and_legacy_covariance(period):
+    data = _prices(400, 2, seed=period)
+    a, b = data["S0"].to_numpy(), data["S1"].to_numpy()
+    got = CovCorrMA(period, a, b, data.index)
+    ref = efficient_cov_corr(period, a, b); ref.index = data.index
+    pd.testing.assert_frame_equal(got, ref)
+    old = legacy_cov_corr_ma(period, a, b, data.index)
+    np.testing.assert_allclose(got.iloc[:, 0], old.iloc[:, 0], rtol=1e-9, atol=1e-10)
+    # The loop divided a sample covariance by population standard deviations, the correlations were period/(period-1)
+    # too large. That factor is the only difference.
+    np.testing.assert_allclose(got.iloc[:, 1], old.iloc[:, 1] * (period - 1) / period, rtol=1e-9, atol=1e-8)
+    assert (got.iloc[:, 1].dropna().abs() <= 1).all()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 16])
+def test_matrix_matches_pandas_per_pair(chunk_size):
+    data = _prices(600, 7, seed=1)
+    got = stats.rolling_cov_corr_matrix(data, [5, 30, 120], return_type="log", chunk_size=chunk_size)
+    _assert_matches_pandas(got, pairwise_reference(stats.to_returns(data, "log"), [5, 30, 120]))
+
+
+def test_output_is_sorted_by_name_not_column_order():
+    data = _prices(200, 4, seed=8)
+    data.columns = ["SPX", "DXY", "M2", "BTC"]
+    got = stats.rolling_cov_corr_matrix(data, [10, 40], return_type="pct")
+    _assert_matches_pandas(got, pairwise_reference(stats.to_returns(data, "pct"), [10, 40]))
+    assert tuple(got.loc[0, ["series1", "series2"]]) == ("DXY", "BTC")
+    assert "BTC" not in set(got["series1"])  # pairs keep data's column order, BTC is the last column
+
+
+def test_matrix_matches_efficient_cov_corr_on_levels():
+    data = _prices(300, 2, seed=2)
+    got = stats.rolling_cov_corr_matrix(data, [20], return_type="level")
+    ref = efficient_cov_corr(20, data["S0"].to_numpy(), data["S1"].to_numpy()).dropna()
+    np.testing.assert_allclose(got["cov"], ref["CV_20day"], rtol=1e-9)
+    np.testing.assert_allclose(got["corr"], ref["CC_20day"], rtol=1e-9)
+
+
+def test_missing_values_are_left_out_pairwise():
+    data = _prices(500, 5, seed=4, nan_frac=0.05)
+    data.iloc[:120, 2] = np.nan  # a late starting series
+    got = stats.rolling_cov_corr_matrix(data, [30, 60], return_type="level", chunk_size=2, min_periods=20)
+    _assert_matches_pandas(got, pairwise_reference(data, [30, 60], min_periods=20))
+
+
+def test_large_levels_and_flat_windows():
+    # Large offsets make Σx² - (Σx)²/n cancel badly (pandas' own rolling sums drift here, so the reference is two-pass),
+    # flat stretches have zero variance and no correlation.
+    data = _prices(400, 3, seed=5, level=1e7)
+    data.iloc[100:160, 1] = data.iloc[100, 1]
+    got = stats.rolling_cov_corr_matrix(data, [10, 50], return_type="level")
+    _assert_matches_pandas(got, direct_reference(data, [10, 50]))
+
+
+def test_step_thins_dates_and_empty_inputs():
+    data = _prices(200, 3, seed=6)
+    full = stats.rolling_cov_corr_matrix(data, [10], return_type="level")
+    thin = stats.rolling_cov_corr_matrix(data, [10], return_type="level", step=5)
+    assert set(thin["date"]) == set(data.index[::5]) & set(full["date"])
+    pd.testing.assert_frame_equal(thin.reset_index(drop=True),
+                                  full[full["date"].isin(thin["date"])].reset_index(drop=True))
+    assert stats.rolling_cov_corr_matrix(data[["S0"]], [10]).empty
+    assert list(stats.rolling_cov_corr_matrix(data.iloc[:5], [10], return_type="level").columns) == \
+        ["date", "window", "series1", "series2", "cov", "corr"]
+
+
+def _time(fn, repeat: int = 1) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def benchmark(sizes: tuple = (10, 25, 50, 100), n: int = 2500, windows: tuple = (30, 90, 365)):
+    print(f"Benchmark: rolling cov/corr for every pair, {n} dates, windows {list(windows)}")
+    for n_series in sizes:
+        data = stats.to_returns(_prices(n, n_series, seed=n_series), "log")
+        t_new = _time(lambda: stats.rolling_cov_corr_matrix(data, list(windows), return_type="level"))
+        pairs = n_series * (n_series - 1) // 2
+        if n_series <= 50:
+            t_old = _time(lambda: pairwise_reference(data, list(windows)))
+            print(f"  {n_series:>4} series ({pairs:>5} pairs): per pair pandas {t_old:.2f}s, matrix {t_new:.2f}s, "
+                  f"{t_old / t_new:.1f}x")
+        else:
+            print(f"  {n_series:>4} series ({pairs:>5} pairs): matrix {t_new:.2f}s")
+    a, b = data.iloc[1:, 0].to_numpy(), data.iloc[1:, 1].to_numpy()
+    t_old = _time(lambda: legacy_cov_corr_ma(90, a, b, data.index[1:]))
+    t_new = _time(lambda: CovCorrMA(90, a, b, data.index[1:]), 5)
+    print(f"  CovCorrMA, one pair, 90 day window: loop {t_old:.3f}s, pandas {t_new * 1000:.1f}ms, {t_old / t_new:.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Equivalence tests and scaling benchmark for rolling_cov_corr_matrix and CovCorrCalc.")
+    parser.add_argument("--dates", type=int, default=2500)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50, 100], help="Numbers of series to time")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(tuple(args.sizes), args.dates)
+
+
+if __name__ == "__main__":
+    main()
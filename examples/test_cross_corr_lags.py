@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/, stats.py imports its siblings directly.
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+for p in (repo_root, os.path.join(repo_root, "MacroBackend")):
+    if p not in sys.path:
+        sys.path.append(p)
+
+import stats
+
+
+def loop_lags(series1: pd.Series, series2: pd.Series, max_lag: int) -> pd.Series:
+    """The shift loop that Pair_stats used for lag scans."""
+    return pd.Series({k: series1.corr(series2.shift(k)) for k in range(-max_lag, max_lag + 1)}, name="corr")
+
+
+def _lagged_pair(n: int = 2000, lag: int = 17, seed: int = 0, nan_frac: float = 0.0, noise: float = 0.5) -> tuple:
+    """series2 leads series1 by lag periods: series1[t] ~ series2[t - lag]."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2005-01-03", periods=n + abs(lag), freq="B")
+    driver = rng.standard_normal(n + abs(lag))
+    s2 = pd.Series(driver, index=idx, name="leader")
+    s1 = pd.Series(np.roll(driver, lag) + noise * rng.standard_normal(n + abs(lag)), index=idx, name="follower")
+    s1, s2 = s1.iloc[abs(lag):], s2.iloc[abs(lag):]
+    if nan_frac:
+        s1[rng.random(len(s1)) < nan_frac] = np.nan
+        s2[rng.random(len(s2)) < nan_frac] = np.nan
+    return s1, s2
+
+
+@pytest.mark.parametrize("lag", [0, 5, -12, 40])
+@pytest.mark.parametrize("nan_frac", [0.0, 0.1])
+def test_matches_shift_loop(lag, nan_frac):
+    s1, s2 = _lagged_pair(800, lag=lag, seed=abs(lag), nan_frac=nan_frac)
+    curve = stats.cross_corr_lags(s1, s2, 60)
+    pd.testing.assert_series_equal(curve, loop_lags(s1, s2, 60), check_index_type=False, rtol=1e-8, atol=1e-10)
+    assert curve.idxmax() == lag
+
+
+def test_random_walk_levels_and_long_gaps():
+    # Trending levels (large means) and a long block of missing data in one series.
+    rng = np.random.default_rng(5)
+    idx = pd.date_range("2000-01-01", periods=1500, freq="D")
+    s2 = pd.Series(1000 + rng.standard_normal(1500).cumsum(), index=idx)
+    s1 = s2.shift(9) * 2 + rng.standard_normal(1500)
+    s1.iloc[300:700] = np.nan
+    pd.testing.assert_series_equal(stats.cross_corr_lags(s1, s2, 100), loop_lags(s1, s2, 100),
+                                   check_index_type=False, check_names=False, rtol=1e-7, atol=1e-9)
+
+
+def test_misaligned_indexes_are_aligned_first():
+    s1, s2 = _lagged_pair(600, lag=8, seed=2)
+    s2 = s2.iloc[50:]
+    s1 = s1.drop(s1.index[200:220])
+    aligned = pd.concat([s1, s2], axis=1)
+    ref = loop_lags(aligned.iloc[:, 0], aligned.iloc[:, 1], 30)
+    pd.testing.assert_series_equal(stats.cross_corr_lags(s1, s2, 30), ref, check_index_type=False, rtol=1e-8, atol=1e-10)
+
+
+def test_lag_subset_and_out_of_range_lags():
+    s1, s2 = _lagged_pair(100, lag=3, seed=9)
+    curve = stats.cross_corr_lags(s1, s2, 150, lags=[-3, 0, 3, 120])
+    assert list(curve.index) == [-3, 0, 3, 120]
+    assert curve.idxmax() == 3
+    full = stats.cross_corr_lags(s1, s2, 150)
+    assert full.loc[[-150, 150]].isna().all()  # lags longer than the series have no overlap
+
+
+def test_constant_series_gives_nan():
+    s1, s2 = _lagged_pair(200, lag=0)
+    s2[:] = 1.0
+    assert stats.cross_corr_lags(s1, s2, 10).isna().all()
+
+
+@pytest.mark.parametrize("corr_method", ["pearson", "spearman"])
+def test_find_optimal_lag_without_any_valid_correlation(corr_method):
+    pair = stats.Pair_stats.__new__(stats.Pair_stats)
+    pair.series1, pair.series2 = _lagged_pair(200, lag=0)
+    pair.series2[:] = 1.0
+    pair.corr_method = corr_method
+    assert pair.find_optimal_lag(10) == (None, pytest.approx(np.nan, nan_ok=True))
+    assert len(pair.lag_test) == 22 and pair.lag_test.isna().all()
+    pair.series1, pair.series2 = _lagged_pair(200, lag=4, seed=2)
+    assert pair.find_optimal_lag(10)[0] == 4
+
+
+def benchmark(n: int = 7500, max_lag: int = 500):
+    s1, s2 = _lagged_pair(n, lag=123, seed=1, nan_frac=0.02)
+    print(f"Benchmark: {n} points, lags -{max_lag}..{max_lag}")
+    t0 = time.perf_counter(); ref = loop_lags(s1, s2, max_lag); t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter(); curve = stats.cross_corr_lags(s1, s2, max_lag); t_fft = time.perf_counter() - t0
+    print(f"  shift loop:      {t_loop:.3f}s, best lag {ref.idxmax()}")
+    print(f"  cross_corr_lags: {t_fft * 1000:.2f}ms, best lag {curve.idxmax()}")
+    print(f"  speedup: {t_loop / t_fft:.0f}x, max abs difference {np.nanmax(np.abs(curve.values - ref.values)):.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for stats.cross_corr_lags vs the shift loop.")
+    parser.add_argument("--n", type=int, default=7500, help="Number of points in the benchmark series")
+    parser.add_argument("--max-lag", type=int, default=500, help="Largest lag scanned in the benchmark")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.n, args.max_lag)
+
+
+if __name__ == "__main__":
+    main()
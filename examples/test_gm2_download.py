@@ -0,0 +1,206 @@
+import os
+import sys
+import time
+import argparse
+import threading
+import contextlib
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root and the Global M2 folder are importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+gm2_dir = os.path.join(repo_root, "Liquidity", "Global_M2")
+for path in (repo_root, gm2_dir):
+    if path not in sys.path:
+        sys.path.append(path)
+
+pytest.importorskip("openpyxl")
+with contextlib.redirect_stdout(io.StringIO()):
+    import gm2_data_handler as gm2
+
+
+def country_list(n: int = 12) -> pd.DataFrame:
+    """Config table like M2Info_Top50.xlsx: every 4th country reports M2 in USD (no FX pull), hyphenated names
+    exercise the HDF key mapping on resume."""
+    names = [f"Country-{j} Land" for j in range(n)]
+    return pd.DataFrame({"M2_Symbol": [f"M2{j}" for j in range(n)], "M2_exchange": "ECONOMICS",
+                         "FX_Symbol": [f"USDC{j:02d}" if j % 2 else f"C{j:02d}USD" for j in range(n)], "FX_Exchange": "FX_IDC",
+                         "M2_currency_code": ["USD" if j % 4 == 0 else f"C{j:02d}" for j in range(n)]}, index=names)
+
+
+class FakeTv:
+    """Stands in for the TradingView pull: monthly bars per symbol after a fixed latency. fail_first makes a symbol
+    time out on its first k calls, broken symbols always fail and empty ones return no bars."""
+    def __init__(self, symbols, latency: float = 0.0, fail_first: dict = None, broken=(), empty=(), seed: int = 0):
+        rng = np.random.default_rng(seed)
+        idx = pd.date_range("2000-01-01", periods=300, freq="MS") + pd.Timedelta("14D")  # mid month, like TV bars
+        self.bars = {s: pd.DataFrame({"open": 1.0, "close": rng.uniform(1, 100) * np.exp(rng.normal(0, 0.01, len(idx)).cumsum())},
+                                     index=idx) for s in symbols}
+        self.latency = latency
+        self.fail_first = dict(fail_first or {})
+        self.broken, self.empty = set(broken), set(empty)
+        self.calls = []
+        self.active = 0; self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, symbol, exchange, n_bars, timeout):
+        with self.lock:
+            self.calls.append(symbol)
+            self.active += 1; self.max_active = max(self.max_active, self.active)
+            failing = self.fail_first.get(symbol, 0) > 0
+            if failing:
+                self.fail_first[symbol] -= 1
+        try:
+            time.sleep(self.latency)
+            if failing or symbol in self.broken:
+                raise TimeoutError(f"{exchange}:{symbol} timed out after {timeout}s")
+            if symbol in self.empty:
+                return None
+            return self.bars[symbol].iloc[-n_bars:].copy()
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _symbols(config: pd.DataFrame) -> list:
+    return list(config["M2_Symbol"]) + list(config["FX_Symbol"])
+
+
+@pytest.fixture
+def handler(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        g = gm2.Global_M2()
+    g.country_list = country_list()
+    g.wd = tmp_path
+    return g
+
+
+def _download(handler, fetcher, **kwargs):
+    kwargs.setdefault("backoff", 0.001)
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return handler.download_data(fetcher=fetcher, **kwargs)
+
+
+def test_concurrent_download_matches_serial(handler):
+    fake = FakeTv(_symbols(handler.country_list), latency=0.02)
+    serial = {c: df.copy() for c, df in _download(handler, fake, max_workers=1).items()}
+    assert fake.max_active == 1
+    parallel = _download(handler, fake, max_workers=6)
+    assert fake.max_active > 1 and list(parallel) == list(handler.country_list.index) == list(serial)
+    for country in serial:
+        pd.testing.assert_frame_equal(parallel[country], serial[country])
+    assert all(r["status"] == "ok" and r["error"] is None for r in handler.download_report.values())
+    assert handler.failed_downloads == []
+    usd = handler.data_dict["Country-0 Land"]
+    assert (usd.iloc[:, 1] == 1.0).all() and "C00USD" not in fake.calls  # USD countries skip the FX pull
+
+
+def test_transient_failures_are_retried(handler):
+    config = handler.country_list
+    fake = FakeTv(_symbols(config), fail_first={"M21": 2, "USDC03": 1})
+    data = _download(handler, fake, attempts=3)
+    assert len(data) == len(config) and fake.calls.count("M21") == 3 and fake.calls.count("USDC03") == 2
+    assert handler.failed_downloads == []
+
+
+def test_failed_countries_do_not_stop_the_rest(handler):
+    config = handler.country_list
+    fake = FakeTv(_symbols(config), broken={"M22"}, empty={"M25"}, fail_first={"M27": 5})
+    data = _download(handler, fake, attempts=2)
+    failed = {"Country-2 Land", "Country-5 Land", "Country-7 Land"}
+    assert set(data) == set(config.index) - failed
+    assert fake.calls.count("M22") == 2 and fake.calls.count("M27") == 2
+    assert sorted(handler.failed_downloads) == sorted(f"{c}_M2" for c in failed)
+    for country in failed:
+        assert handler.download_report[country]["status"] == "failed"
+    assert "no data returned for ECONOMICS:M25" in handler.download_report["Country-5 Land"]["error"]
+    assert "timed out" in handler.download_report["Country-2 Land"]["error"]
+
+
+def test_fx_failure_leaves_the_country_out(handler):
+    config = handler.country_list
+    fake = FakeTv(_symbols(config), broken={"USDC01", "C00USD"})  # C00USD belongs to a USD country, never pulled
+    data = _download(handler, fake, attempts=2)
+    assert "Country-1 Land" not in data and "Country-0 Land" in data
+    assert handler.failed_downloads == ["Country-1 Land_FX"]
+    report = handler.download_report["Country-1 Land"]
+    assert report["status"] == "failed" and report["error"].startswith("FX download failed")
+    assert {r["status"] for r in handler.download_report.values()} == {"ok", "failed"}
+
+
+def test_resume_only_downloads_missing_countries(handler):
+    config = handler.country_list
+    fake = FakeTv(_symbols(config), broken={"M23", "M26"})
+    first = {c: df.copy() for c, df in _download(handler, fake, attempts=1).items()}
+    with contextlib.redirect_stdout(io.StringIO()):
+        handler.save_to_hdf5("resume.h5")
+    fake.broken.clear(); fake.calls.clear()
+    data = _download(handler, fake, resume=True, filename="resume.h5")
+    assert sorted(fake.calls) == ["C06USD", "M23", "M26", "USDC03"]
+    assert list(data) == list(config.index)
+    assert handler.download_report["Country-1 Land"]["status"] == "stored"
+    assert handler.download_report["Country-3 Land"]["status"] == "ok"
+    for country, df in first.items():
+        np.testing.assert_allclose(data[country].to_numpy(), df.to_numpy())
+
+
+def test_default_fetcher_uses_the_session_pool(handler, monkeypatch):
+    fake = FakeTv(_symbols(handler.country_list))
+    pulls = []
+
+    class Pool:
+        def get_hist(self, symbol, exchange, interval, n_bars, timeout, attempts):
+            pulls.append((symbol, interval, timeout, attempts))
+            return fake(symbol, exchange, n_bars, timeout)
+
+    class Tv:
+        def __init__(self, use_pool=False):
+            assert use_pool
+            self.token = "unauthorized_user_token"
+
+    monkeypatch.setattr(gm2.tvDatafeedz, "TvDatafeed", Tv)
+    monkeypatch.setattr(gm2.tvDatafeedz, "get_session_pool", lambda token, size: Pool())
+    data = _download(handler, None, countries=["Country-1 Land", "Country-4 Land"], timeout=7)
+    assert list(data) == ["Country-1 Land", "Country-4 Land"]
+    assert {p[0] for p in pulls} == {"M21", "USDC01", "M24"}
+    assert all(p[1] == gm2.tvDatafeedz.Interval.in_monthly and p[2] == 7 and p[3] == 1 for p in pulls)
+
+
+def benchmark(n_countries: int = 40, latency: float = 0.15, workers: int = 8):
+    print(f"Benchmark: {n_countries} countries, {latency * 1000:.0f}ms per pull, 5% of pulls time out once")
+    with contextlib.redirect_stdout(io.StringIO()):
+        g = gm2.Global_M2()
+    g.country_list = country_list(n_countries)
+    symbols = _symbols(g.country_list)
+    flaky = {s: 1 for s in symbols[::20]}
+    times = {}
+    for n in (1, workers):
+        fake = FakeTv(symbols, latency=latency, fail_first=flaky)
+        t0 = time.perf_counter(); _download(g, fake, max_workers=n, backoff=0.05)
+        times[n] = time.perf_counter() - t0
+        assert len(g.data_dict) == n_countries
+    print(f"  one at a time {times[1]:.2f}s, {workers} workers {times[workers]:.2f}s, {times[1] / times[workers]:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests for the concurrent Global M2 download against a fake TradingView, and a benchmark.")
+    parser.add_argument("--countries", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.15, help="Seconds per simulated pull")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.countries, args.latency, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import os
+import sys
+import time
+import argparse
+import contextlib
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root and the Global M2 folder are importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+gm2_dir = os.path.join(repo_root, "Liquidity", "Global_M2")
+for path in (repo_root, gm2_dir):
+    if path not in sys.path:
+        sys.path.append(path)
+
+pytest.importorskip("openpyxl")
+with contextlib.redirect_stdout(io.StringIO()):
+    import gm2_data_handler as gm2
+
+
+def spiked_matrix(n_dates: int = 500, n_countries: int = 50, n_spikes: int = 200, missing: float = 0.0, seed: int = 0):
+    """
+    M2_USD-like (dates x countries) matrix: trending log random walks on different scales, with n_spikes points
+    multiplied by 0.2, 5 or 10 (data entry / unit errors). Returns (index, clean, spiked, truth mask).
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("1984-01-01", periods=n_dates, freq="MS")
+    clean = 1e11 * np.exp(rng.normal(0.005, 0.004, (n_dates, n_countries)).cumsum(axis=0)) * rng.uniform(0.5, 5, n_countries)
+    if missing:
+        clean[rng.random(clean.shape) < missing] = np.nan
+    truth = np.zeros(clean.shape, dtype=bool)
+    candidates = np.flatnonzero(~np.isnan(clean))
+    truth.flat[rng.choice(candidates, n_spikes, replace=False)] = True
+    spiked = clean.copy()
+    spiked[truth] *= rng.choice([0.2, 5, 10], n_spikes)
+    return index, clean, spiked, truth
+
+
+def _identify(series: pd.Series, **kwargs) -> list:
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return gm2.identify_outliers(series, **kwargs)["outlier_indices"]
+
+
+@pytest.mark.parametrize("method,kwargs", [("iqr", {}), ("iqr", {"iqr_multiplier": 0.3}), ("zscore", {}),
+                                           ("zscore", {"z_score_threshold": 1.0}), ("pct_change", {"pct_change_threshold": 3}),
+                                           ("magnitude", {"threshold": 3e11})])
+def test_full_sample_methods_flag_the_same_dates_as_identify_outliers(method, kwargs):
+    index, _, spiked, _ = spiked_matrix(300, 30, 60, missing=0.05, seed=1)
+    spiked[:, 0] = 7.0  # constant column, no spread: zscore flags nothing
+    mask = gm2.detect_outliers(spiked, [method], **kwargs)[0]
+    for j in range(spiked.shape[1]):
+        assert list(index[mask[:, j]]) == _identify(pd.Series(spiked[:, j], index=index), method=method, **kwargs), j
+
+
+def test_unknown_methods_and_missing_threshold():
+    values = spiked_matrix(50, 3, 5)[2]
+    with pytest.raises(ValueError, match="Unknown"):
+        gm2.detect_outliers(values, ["iqr", "nope"])
+    with pytest.raises(ValueError, match="pct_change_threshold"):
+        gm2.detect_outliers(values, ["pct_change"])
+
+
+@pytest.mark.parametrize("methods,kwargs,recall,false_positives", [
+    (["mad"], {}, 0.99, 25),
+    (["iqr"], {"window": 13}, 0.95, 25),
+    (["zscore"], {"window": 25, "z_score_threshold": 2.5}, 0.8, 10),
+])
+def test_spike_recall(methods, kwargs, recall, false_positives):
+    _, _, spiked, truth = spiked_matrix(missing=0.02)
+    flags = gm2.detect_outliers(spiked, methods, **kwargs).any(axis=0)
+    assert flags[truth].mean() >= recall
+    assert (flags & ~truth).sum() <= false_positives
+
+
+def test_pct_change_also_flags_the_return_from_a_spike():
+    _, _, spiked, truth = spiked_matrix()
+    mad, pct = gm2.detect_outliers(spiked, ["mad", "pct_change"], pct_change_threshold=50)
+    assert pct[truth].mean() > 0.97  # not the first row, nor a spike right after another
+    after = np.vstack([np.zeros((1, truth.shape[1]), dtype=bool), truth[:-1]])
+    assert not (pct & ~truth & ~after).any()  # as in identify_outliers: the value after a spike is a big change too
+
+
+def test_full_sample_statistics_miss_spikes_on_trending_series():
+    # Why the rolling methods exist: over 40 years of growth a x5 spike early on is still inside the full sample IQR.
+    _, _, spiked, truth = spiked_matrix()
+    full = gm2.detect_outliers(spiked, ["iqr"]).any(axis=0)
+    rolling = gm2.detect_outliers(spiked, ["mad"]).any(axis=0)
+    assert full[truth].mean() < 0.7 < rolling[truth].mean()
+
+
+def test_nan_quantiles_match_numpy():
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=(120, 9))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:, 4] = np.nan
+    windows = gm2.rolling_windows(values, 13)
+    q25, q50, q90 = gm2.nan_quantiles(windows, (0.25, 0.5, 0.9))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for got, q in ((q25, 0.25), (q50, 0.5), (q90, 0.9)):
+            np.testing.assert_allclose(got, np.nanquantile(windows, q, axis=-1), equal_nan=True)
+
+
+def test_interpolation_matches_pandas_at_flagged_points():
+    index, clean, spiked, truth = spiked_matrix(200, 10, 40, missing=0.05, seed=2)
+    truth[0, 0] = truth[-1, 1] = True
+    filled = gm2.interpolate_flagged(spiked, truth)
+    for j in range(spiked.shape[1]):
+        series = pd.Series(np.where(truth[:, j], np.nan, spiked[:, j]))
+        expected = series.interpolate(method="linear", limit_direction="both")
+        np.testing.assert_allclose(filled[truth[:, j], j], expected[truth[:, j]], rtol=1e-12)
+    np.testing.assert_array_equal(filled[~truth], spiked[~truth])  # unflagged points (NaNs too) untouched
+    assert np.nanmax(np.abs(filled[truth] / clean[truth] - 1)) < 0.05
+
+
+def _handler(index, spiked):
+    with contextlib.redirect_stdout(io.StringIO()):
+        g = gm2.Global_M2()
+    g.data_dict = {}
+    for j in range(spiked.shape[1]):
+        fx = 1.3 if j % 2 else 0.8
+        g.data_dict[f"Country {j}"] = pd.DataFrame({f"C{j}_M2_LCU": spiked[:, j] / fx, f"C{j}_FX_Rate": fx,
+                                                    f"C{j}_M2_USD": spiked[:, j]}, index=index)
+    return g
+
+
+def test_clean_outliers_matches_the_per_country_loop():
+    index, _, spiked, _ = spiked_matrix(240, 12, 50, seed=4)
+    g = _handler(index, spiked)
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = g.clean_outliers(method="zscore", z_score_threshold=2.0)
+    total = 0
+    for j, country in enumerate(g.data_dict):
+        series = pd.Series(spiked[:, j], index=index)
+        dates = _identify(series, method="zscore", z_score_threshold=2.0)
+        assert report[country]["outlier_indices"] == dates
+        assert all(m == ["zscore"] for m in report[country]["outlier_methods"])
+        legacy = series.copy()
+        legacy[dates] = np.nan
+        legacy = legacy.interpolate(method="linear").bfill().ffill()
+        df = g.data_dict[country]
+        np.testing.assert_allclose(df.iloc[:, -1], legacy, rtol=1e-12)
+        np.testing.assert_allclose(df.iloc[:, 0] * df.iloc[:, 1], df.iloc[:, 2], rtol=1e-12)
+        total += len(dates)
+    assert total and len(g.outlier_mask.flagged(spiked)) == total
+
+
+def test_clean_outliers_audit_keeps_each_method():
+    index, _, spiked, truth = spiked_matrix(240, 8, 30, seed=5)
+    g = _handler(index, spiked)
+    with contextlib.redirect_stdout(io.StringIO()):
+        g.clean_outliers(method=["mad", "pct_change"], pct_change_threshold=50, countries=["Country 1", "Country 2", "Nowhere"])
+    audit = g.outlier_mask.flagged(spiked)
+    assert set(audit["country"]) <= {"Country 1", "Country 2"} and list(audit.columns) == ["date", "country", "value", "mad", "pct_change"]
+    assert (audit["mad"] | audit["pct_change"]).all()
+    untouched = g.data_dict["Country 0"].iloc[:, -1].to_numpy()
+    np.testing.assert_array_equal(untouched, spiked[:, 0])
+    mad = g.outlier_mask.method_mask("mad")
+    assert mad.shape == (240, 2) and mad.to_numpy().sum() == audit["mad"].sum()
+
+
+def test_detection_is_faster_than_the_per_country_loop():
+    index, _, spiked, _ = spiked_matrix(400, 40)
+    t0 = time.perf_counter()
+    for j in range(spiked.shape[1]):
+        _identify(pd.Series(spiked[:, j], index=index), method="iqr")
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter(); gm2.detect_outliers(spiked, ["iqr"]); t_matrix = time.perf_counter() - t0
+    assert t_matrix < t_loop
+
+
+def benchmark(n_dates: int = 500, n_countries: int = 50, n_spikes: int = 200):
+    print(f"Benchmark: outlier detection on {n_dates} dates x {n_countries} countries, {n_spikes} injected spikes")
+    index, clean, spiked, truth = spiked_matrix(n_dates, n_countries, n_spikes)
+    t0 = time.perf_counter()
+    loop = np.zeros(spiked.shape, dtype=bool)
+    for j in range(n_countries):
+        loop[:, j] = index.isin(_identify(pd.Series(spiked[:, j], index=index), method="iqr"))
+    t_loop = time.perf_counter() - t0
+    print(f"  identify_outliers per country (iqr, full sample): {t_loop * 1000:.0f}ms, recall {loop[truth].mean():.2f}, "
+          f"false positives {(loop & ~truth).sum()}")
+    for methods, kwargs in [(["iqr"], {}), (["mad"], {}), (["mad", "pct_change"], {"pct_change_threshold": 50}),
+                            (["iqr"], {"window": 13}), (["zscore"], {"window": 25, "z_score_threshold": 2.5})]:
+        t0 = time.perf_counter(); flags = gm2.detect_outliers(spiked, methods, **kwargs).any(axis=0)
+        dt = time.perf_counter() - t0
+        label = "+".join(methods) + (f", window {kwargs['window']}" if "window" in kwargs else "")
+        print(f"  detect_outliers {label}: {dt * 1000:.1f}ms, recall {flags[truth].mean():.2f}, "
+              f"false positives {(flags & ~truth).sum()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Equivalence and spike recall tests, and a benchmark, for the Global M2 outlier detection.")
+    parser.add_argument("--dates", type=int, default=500)
+    parser.add_argument("--countries", type=int, default=50)
+    parser.add_argument("--spikes", type=int, default=200)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.dates, args.countries, args.spikes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import io
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root and the Global M2 folder are importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+gm2_dir = os.path.join(repo_root, "Liquidity", "Global_M2")
+for path in (repo_root, gm2_dir):
+    if path not in sys.path:
+        sys.path.append(path)
+
+pytest.importorskip("openpyxl")
+pytest.importorskip("tables")
+with contextlib.redirect_stdout(io.StringIO()):
+    import gm2_data_handler as gm2
+
+
+class History:
+    """
+    TradingView as seen at a point in time: monthly M2 and FX bars per symbol up to self.now. M2 is published a few
+    months late for some countries while FX is always current, so a short pull's first FX bar can come after its
+    first M2 bar (NaN FX there). Every 4th country reports in USD (no FX pull, repeated column name). revise() changes
+    a recent M2 value, as statistics offices do.
+    """
+    def __init__(self, n: int = 10, seed: int = 0):
+        self.rng = np.random.default_rng(seed)
+        full = pd.date_range("1995-01-01", "2028-12-01", freq="MS")
+        self.countries = [f"Country-{j} Land" for j in range(n)]
+        self.bars, self.lags = {}, {}
+        rows = []
+        for j, country in enumerate(self.countries):
+            ix = full[self.rng.integers(0, 120):]
+            m2 = 1e11 * self.rng.uniform(0.1, 20) * np.exp(self.rng.normal(0.005, 0.01, len(ix)).cumsum())
+            m2[self.rng.integers(0, len(ix) - 80, 5)] = np.nan
+            self.bars[f"M2{j}"] = pd.DataFrame({"close": m2}, index=ix)
+            self.lags[f"M2{j}"] = int(self.rng.integers(0, 4))
+            fx = f"USDC{j:02d}" if j % 2 else f"C{j:02d}USD"
+            self.bars[fx] = pd.DataFrame({"close": self.rng.uniform(0.5, 2) * np.exp(self.rng.normal(0, 0.02, len(full)).cumsum())},
+                                         index=full)
+            rows.append({"M2_Symbol": f"M2{j}", "M2_exchange": "ECONOMICS", "FX_Symbol": fx, "FX_Exchange": "FX_IDC",
+                         "M2_currency_code": "USD" if j % 4 == 0 else f"C{j:02d}"})
+        self.config = pd.DataFrame(rows, index=self.countries)
+        self.now = pd.Timestamp("2024-06-15")
+        self.bars_pulled = 0
+        self.latency = (0.0, 0.0)  # seconds per pull, seconds per bar
+
+    def __call__(self, symbol, exchange, n_bars, timeout):
+        bars = self.bars[symbol]
+        last = self.now - pd.DateOffset(months=self.lags.get(symbol, 0))
+        out = bars[bars.index <= last].iloc[-n_bars:]
+        self.bars_pulled += len(out)
+        if self.latency[0] or self.latency[1]:
+            time.sleep(self.latency[0] + self.latency[1] * len(out))
+        return out.copy()
+
+    def revise(self, months_back: int = 1):
+        symbol = f"M2{self.rng.integers(0, len(self.countries))}"
+        bars = self.bars[symbol]
+        date = (self.now - pd.DateOffset(months=self.lags[symbol] + months_back)).to_period("M").to_timestamp()
+        if date in bars.index:
+            bars.loc[date, "close"] *= 1.01
+        return symbol, date
+
+
+def make_handler(history: History, folder) -> "gm2.Global_M2":
+    with contextlib.redirect_stdout(io.StringIO()):
+        g = gm2.Global_M2()
+    g.country_list = history.config
+    g.wd = Path(folder)
+    countries = history.countries
+    g.aggregates = {"All": countries, "Head": countries[:6], "Tail": countries[4:], "Pair": countries[1:3]}
+    return g
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return fn(*args, **kwargs)
+
+
+def full_rebuild(history: History, folder):
+    g = make_handler(history, folder)
+    _quiet(g.download_data, n_bars=1000, fetcher=history, max_workers=4, backoff=0.001)
+    _quiet(g.create_all_aggregates)
+    return g
+
+
+def assert_same_data(got: dict, expected: dict):
+    assert sorted(got) == sorted(expected)
+    for country, df in expected.items():
+        assert got[country].index.equals(df.index), country
+        np.testing.assert_allclose(got[country].to_numpy(dtype=float), df.to_numpy(dtype=float), rtol=1e-12,
+                                   equal_nan=True, err_msg=country)
+
+
+def assert_same_aggregates(got, expected):
+    assert sorted(got.aggregate_series) == sorted(expected.aggregate_series)
+    for name, series in expected.aggregate_series.items():
+        assert got.aggregate_series[name].index.equals(series.index), name
+        np.testing.assert_allclose(got.aggregate_series[name].to_numpy(), series.to_numpy(), rtol=1e-12, err_msg=name)
+    for name, coverage in expected.aggregate_coverage.items():
+        np.testing.assert_array_equal(got.aggregate_coverage[name].to_numpy(), coverage.to_numpy())
+
+
+def test_short_pulls_start_with_missing_fx(tmp_path):
+    history = History()
+    g = make_handler(history, tmp_path)
+    _quiet(g.download_data, n_bars=5, fetcher=history, backoff=0.001)
+    lagged = [c for j, c in enumerate(history.countries) if j % 4 and history.lags[f"M2{j}"] > 0]
+    assert lagged and all(g.data_dict[c].iloc[0].isna().any() for c in lagged)
+
+
+def test_monthly_updates_match_a_full_rebuild(tmp_path):
+    history = History()
+    g = make_handler(history, tmp_path)
+    _quiet(g.download_data, n_bars=1000, fetcher=history, max_workers=4, backoff=0.001)
+    _quiet(g.save_to_hdf5, "m2.h5")
+    _quiet(g.create_all_aggregates)
+    revised = []
+    for now in pd.date_range("2024-07-15", periods=18, freq="MS") + pd.Timedelta("14D"):
+        history.now = now
+        revised.append(history.revise(months_back=int(history.rng.integers(0, 4))))
+        _quiet(g.update_data, "m2.h5", fetcher=history, max_workers=4, backoff=0.001, now=now)
+        if now.month % 6 == 0:  # check along the way, not just at the end
+            assert_same_data(g.data_dict, full_rebuild(history, tmp_path).data_dict)
+    expected = full_rebuild(history, tmp_path)
+    assert_same_data(g.data_dict, expected.data_dict)
+    assert_same_aggregates(g, expected)
+    stored = make_handler(history, tmp_path)
+    _quiet(stored.load_from_hdf5, "m2.h5")
+    assert_same_data(stored.data_dict, expected.data_dict)
+    for symbol, date in revised:
+        country = history.countries[int(symbol[2:])]
+        if date in expected.data_dict[country].index:
+            assert g.data_dict[country].loc[date].iloc[0] == pytest.approx(history.bars[symbol].loc[date, "close"])
+
+
+def test_revision_where_the_short_fx_pull_has_no_bars(tmp_path):
+    history = History()
+    j = next(j for j in range(len(history.countries)) if j % 4 and history.lags[f"M2{j}"] == 3)
+    country, symbol = history.countries[j], f"M2{j}"
+    g = make_handler(history, tmp_path)
+    _quiet(g.download_data, n_bars=1000, fetcher=history, backoff=0.001)
+    _quiet(g.save_to_hdf5, "m2.h5")
+    history.now = history.now + pd.DateOffset(months=1)
+    # The next pull is 7 bars: M2 from watermark - 5 months, FX (3 months more current) from watermark - 2 months.
+    date = g.watermarks()[country] - pd.DateOffset(months=4)
+    history.bars[symbol].loc[date, "close"] *= 1.05
+    changes = _quiet(g.update_data, "m2.h5", fetcher=history, now=history.now, countries=[country])
+    assert changes[country][0] == date
+    expected = full_rebuild(history, tmp_path).data_dict[country]
+    np.testing.assert_allclose(g.data_dict[country].to_numpy(), expected.to_numpy(), rtol=1e-12)
+    assert not g.data_dict[country].loc[date:].isna().any().any()
+
+
+def test_update_reports_changes_and_is_a_no_op_when_nothing_is_new(tmp_path):
+    history = History()
+    g = make_handler(history, tmp_path)
+    _quiet(g.download_data, n_bars=1000, fetcher=history, backoff=0.001)
+    _quiet(g.save_to_hdf5, "m2.h5")
+    assert _quiet(g.update_data, "m2.h5", fetcher=history, now=history.now) == {}
+    history.now = history.now + pd.DateOffset(months=1)
+    changes = _quiet(g.update_data, "m2.h5", fetcher=history, now=history.now)
+    marks = g.watermarks()
+    assert changes and all(changes[c][1] >= 1 and changes[c][0] <= marks[c] for c in changes)
+    with pd.HDFStore(str(tmp_path / "m2.h5"), mode="r") as store:
+        for country, df in g.data_dict.items():
+            assert store.get_storer(g._hdf_key(country)).nrows == len(df)
+
+
+def test_update_aggregates_matches_create_all_aggregates(tmp_path):
+    history = History(seed=4)
+    g = full_rebuild(history, tmp_path)
+    since = pd.Timestamp("2023-01-01")
+    for j, country in enumerate(history.countries[::3]):
+        df = g.data_dict[country].copy()
+        df.iloc[df.index >= since, -1] *= 1 + 0.01 * (j + 1)
+        df.iloc[-1, -1] = np.nan  # a gap at the end, filled from the seed in the ffill version
+        g.data_dict[country] = df
+    _quiet(g.update_aggregates, since)
+    expected = make_handler(history, tmp_path)
+    expected.data_dict = g.data_dict
+    _quiet(expected.create_all_aggregates)
+    assert_same_aggregates(g, expected)
+
+
+def benchmark(n_countries: int = 50, months: int = 6, latency: float = 0.05, per_bar: float = 0.0005):
+    print(f"Benchmark: {months} monthly refreshes of {n_countries} countries (full history ~400 months), "
+          f"pulls take {latency * 1000:.0f}ms + {per_bar * 1000:.1f}ms per bar")
+    history = History(n_countries)
+    with tempfile.TemporaryDirectory() as folder:
+        g = full_rebuild(history, folder)
+        history.latency = (latency, per_bar)
+        _quiet(g.save_to_hdf5, "m2.h5")
+        t_full = t_inc = 0.0
+        bars_full = bars_inc = 0
+        for now in pd.date_range(history.now, periods=months, freq="MS")[1:] + pd.Timedelta("14D"):
+            history.now = now
+            history.revise()
+            history.bars_pulled = 0
+            t0 = time.perf_counter(); _quiet(g.update_data, "m2.h5", fetcher=history, max_workers=4, now=now); t_inc += time.perf_counter() - t0
+            bars_inc += history.bars_pulled; history.bars_pulled = 0
+            t0 = time.perf_counter()
+            f = full_rebuild(history, folder); _quiet(f.save_to_hdf5, "full.h5")
+            t_full += time.perf_counter() - t0
+            bars_full += history.bars_pulled
+    print(f"  full download + rebuild + save {t_full:.2f}s ({bars_full} bars pulled), "
+          f"incremental {t_inc:.2f}s ({bars_inc} bars pulled), {t_full / t_inc:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental vs full rebuild tests and benchmark for the Global M2 updates.")
+    parser.add_argument("--countries", type=int, default=50)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per pull")
+    parser.add_argument("--per-bar", type=float, default=0.0005, help="Simulated seconds per bar pulled")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.countries, args.months, args.latency, args.per_bar)
+
+
+if __name__ == "__main__":
+    main()
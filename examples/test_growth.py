@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import growth, Utilities, PriceImporter
+
+
+#### The loop implementations the growth module replaced, kept here as the reference.
+def legacy_yoy4monthly(series: pd.Series) -> pd.Series:
+    series = series.ffill()
+    YoYCalc = [np.nan for i in range(12)]
+    for i in range(12, len(series), 1):
+        YoYCalc.append(((series.iloc[i] - series.iloc[i-12]) / series.iloc[i-12]) * 100)
+    return pd.Series(YoYCalc, index=series.index, name='YoY % change')
+
+
+def legacy_month_period_ann_growth(data: pd.Series, months: int) -> pd.Series:
+    """Utilities.MonthPeriodAnnGrowth for monthly data as it was: rolling mean of the MoM % change scaled to a year."""
+    DeltaPC = data.ffill().pct_change() * 100
+    return DeltaPC.rolling(months).mean() * 12 / months
+
+
+def _monthly(n: int = 240, index: str = "datetime", seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0.004, 0.01, n)))
+    if index == "range":
+        idx = pd.RangeIndex(n)
+    elif index == "period":
+        idx = pd.period_range("2000-01", periods=n, freq="M")
+    else:
+        idx = pd.date_range("2000-01-31", periods=n, freq="ME")
+    return pd.Series(values, index=idx, name="M2")
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        yield
+
+
+@pytest.mark.parametrize("index", ["datetime", "range", "period"])
+def test_yoy4monthly_matches_legacy_on_any_index(index):
+    series = _monthly(index=index)
+    series.iloc[[30, 31, 100]] = np.nan
+    expected = legacy_yoy4monthly(series.copy())
+    got = PriceImporter.YoY4Monthly(series.copy())
+    pd.testing.assert_series_equal(got, expected, check_freq=False)
+
+
+def test_positional_growth_on_range_index_frame():
+    frame = pd.DataFrame({"a": _monthly(60, "range"), "b": _monthly(60, "range", seed=1)})
+    got = growth.pct_growth(frame, periods=3)
+    pd.testing.assert_frame_equal(got, (frame / frame.shift(3) - 1) * 100)
+    assert got.index.equals(frame.index)
+
+
+def test_offset_still_needs_a_datetime_index():
+    with pytest.raises(TypeError):
+        growth.pct_growth(_monthly(60, "range"), offset="365D")
+    with pytest.raises(TypeError):
+        growth.lagged_values(_monthly(60, "period"), pd.DateOffset(years=1))
+    with pytest.raises(TypeError):
+        growth.pct_growth([1.0, 2.0, 3.0], periods=1)
+    with pytest.raises(ValueError):
+        growth.pct_growth(_monthly(60), periods=1, offset="30D")
+
+
+def test_date_indexes_are_sorted_others_left_in_order():
+    series = _monthly(48)
+    shuffled = series.sample(frac=1.0, random_state=0)
+    pd.testing.assert_series_equal(growth.pct_growth(shuffled, periods=12), growth.pct_growth(series, periods=12), check_freq=False)
+    periods = _monthly(48, "period")
+    pd.testing.assert_series_equal(growth.pct_growth(periods.iloc[::-1], periods=12), growth.pct_growth(periods, periods=12))
+    reversed_range = _monthly(48, "range").iloc[::-1]
+    got = growth.pct_growth(reversed_range, periods=12)
+    assert got.index.equals(reversed_range.index)
+
+
+def test_yoy_monthly_and_quarterly_by_position():
+    series = _monthly(240)
+    pd.testing.assert_series_equal(growth.yoy_growth(series), series.pct_change(12) * 100)
+    quarterly = series.resample("QE").last()
+    pd.testing.assert_series_equal(growth.yoy_growth(quarterly), quarterly.pct_change(4) * 100)
+    with pytest.raises(ValueError):
+        growth.period_growth(quarterly, 2)
+
+
+def test_daily_growth_is_date_aligned():
+    idx = pd.bdate_range("2015-01-01", periods=1500)
+    series = pd.Series(np.linspace(100, 200, len(idx)), index=idx)
+    got = growth.pct_growth(series, offset="365D")
+    for t in idx[[300, 700, 1499]]:
+        base = series.loc[:t - pd.Timedelta("365D")].iloc[-1]
+        assert got[t] == pytest.approx((series[t] / base - 1) * 100)
+    assert got.loc[:idx[0] + pd.Timedelta("364D")].isna().all()
+
+
+def test_annualized_growth_compounds():
+    series = _monthly(120)
+    got = growth.annualized_growth(series, 3)
+    expected = ((series / series.shift(3)) ** 4 - 1) * 100
+    pd.testing.assert_series_equal(got, expected)
+    linear = growth.annualized_growth(series, 3, compound=False)
+    pd.testing.assert_series_equal(linear, (series / series.shift(3) - 1) * 100 * 4)
+
+
+def test_month_period_ann_growth_matches_legacy():
+    series = _monthly(120)
+    pd.testing.assert_series_equal(Utilities.MonthPeriodAnnGrowth(series, 6), legacy_month_period_ann_growth(series, 6),
+                                   check_names=False)
+
+
+def test_freq_group_aliases():
+    assert [growth.freq_group(f) for f in ["QE-DEC", "2h", "W-SUN", "MS", "ms", "B", "YE-JUN", "BME"]] == \
+        ["Q", "D", "W", "M", "D", "D", "Y", "M"]
+    with pytest.raises(ValueError):
+        growth.freq_group("X")
+    irregular = pd.Series(1.0, index=pd.DatetimeIndex(["2020-01-31", "2020-03-02", "2020-03-31", "2020-05-01"]))
+    assert growth.infer_freq_group(irregular) == "M"
+
+
+def benchmark(n: int = 600, n_columns: int = 500):
+    print(f"Benchmark: YoY % change of monthly data")
+    series = _monthly(n, "range")
+    t0 = time.perf_counter(); legacy_yoy4monthly(series); t_old = time.perf_counter() - t0
+    t0 = time.perf_counter(); PriceImporter.YoY4Monthly(series.copy()); t_new = time.perf_counter() - t0
+    print(f"  YoY4Monthly, {n} months: loop {t_old * 1000:.1f}ms, vectorized {t_new * 1000:.2f}ms, {t_old / t_new:.0f}x")
+    frame = pd.DataFrame({f"S{i}": _monthly(n, seed=i) for i in range(n_columns)})
+    t0 = time.perf_counter()
+    for col in frame.columns:
+        legacy_yoy4monthly(frame[col])
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter(); growth.yoy_growth(frame); t_new = time.perf_counter() - t0
+    print(f"  {n_columns} series x {n} months: loop per series {t_old:.2f}s, yoy_growth on the frame {t_new * 1000:.1f}ms, "
+          f"{t_old / t_new:.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for the vectorized growth module.")
+    parser.add_argument("--months", type=int, default=600)
+    parser.add_argument("--columns", type=int, default=500)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        benchmark(args.months, args.columns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import Utilities, PriceImporter
+
+
+class CountingServer(object):
+    """Local keep-alive HTTP server that counts TCP connections and requests. Paths starting with /fail/<n>/ answer
+    503 for the first n requests to that path, /gzip returns a gzip encoded body when the client accepts it."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.connections = 0; self.requests = 0
+        self.failures = {}
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Headers and body are separate writes, avoid the delayed ACK stall.
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self)
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+            def process_request(self, request, client_address):
+                with stub.lock:
+                    stub.connections += 1
+                super().process_request(request, client_address)
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:%d" % self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _handle(self, h):
+        with self.lock:
+            self.requests += 1
+            seen = self.failures[h.path] = self.failures.get(h.path, 0) + 1
+        time.sleep(self.latency)
+        if h.path.startswith("/fail/") and seen <= int(h.path.split("/")[2]):
+            h.send_response(503); h.send_header("Content-Length", "0"); h.end_headers()
+            return
+        body = json.dumps({"path": h.path, "data": list(range(50))}).encode()
+        h.send_response(200)
+        h.send_header("Content-Type", "application/json")
+        if h.path.startswith("/gzip") and "gzip" in h.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            h.send_header("Content-Encoding", "gzip")
+        h.send_header("Content-Length", str(len(body)))
+        h.end_headers()
+        h.wfile.write(body)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server():
+    s = CountingServer()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def manager():
+    m = Utilities.HTTPSessionManager(pool_maxsize=8, retries=3, backoff_factor=0.01, backoff_jitter=0.0, timeout=10)
+    yield m
+    m.close()
+
+
+def test_sequential_pulls_reuse_one_connection(server, manager):
+    for i in range(100):
+        assert manager.get(f"{server.url}/series/{i}").json()["path"] == f"/series/{i}"
+    assert server.requests == 100 and server.connections == 1
+
+
+def test_bare_requests_open_a_connection_per_pull(server):
+    for i in range(20):
+        requests.get(f"{server.url}/series/{i}", timeout=10)
+    assert server.connections == 20
+
+
+def test_threaded_pulls_stay_within_pool_size(server, manager):
+    server.latency = 0.01
+    with ThreadPoolExecutor(8) as ex:
+        results = list(ex.map(lambda i: manager.get(f"{server.url}/series/{i}").status_code, range(100)))
+    assert results == [200] * 100
+    assert server.connections <= manager.pool_maxsize
+
+
+def test_transport_retries_on_503(server, manager):
+    r = manager.get(f"{server.url}/fail/2/x")
+    assert r.status_code == 200 and server.requests == 3
+
+
+def test_no_retry_session_makes_one_attempt(server, manager):
+    r = manager.get(f"{server.url}/fail/2/x", retry=False)
+    assert r.status_code == 503 and server.requests == 1
+    assert manager.no_retry_session is manager.no_retry_session
+    assert manager.no_retry_session is not manager.session
+
+
+def test_own_retry_loop_is_not_multiplied(server, manager, monkeypatch):
+    # _treasury_get_json retries max_retries times itself, through a session without transport retries.
+    monkeypatch.setattr(PriceImporter.time, "sleep", lambda s: None)
+    with pytest.raises(requests.HTTPError):
+        PriceImporter._treasury_get_json(manager.no_retry_session, f"{server.url}/fail/99/page", max_retries=3)
+    assert server.requests == 3
+
+
+def test_treasury_paginator_defaults_to_no_retry_session(monkeypatch):
+    used = []
+
+    def fake_get_json(session, url, max_retries=5):
+        used.append(session)
+        return {"data": [{"record_date": "2024-01-01"}], "meta": {"total-count": 1, "total-pages": 1}}
+
+    monkeypatch.setattr(PriceImporter, "_treasury_get_json", fake_get_json)
+    PriceImporter.treasury_api_paginated(base_url="http://127.0.0.1:9")
+    assert used == [Utilities.http.no_retry_session]
+
+
+def test_gzip_is_requested_and_decoded(server, manager):
+    r = manager.get(f"{server.url}/gzip")
+    assert r.headers["Content-Encoding"] == "gzip" and r.json()["data"] == list(range(50))
+
+
+def test_configure_rebuilds_sessions(manager):
+    first, first_plain = manager.session, manager.no_retry_session
+    manager.configure(pool_maxsize=4)
+    assert manager.session is not first and manager.no_retry_session is not first_plain
+    with pytest.raises(ValueError):
+        manager.configure(nope=1)
+
+
+def benchmark(n: int = 100, latency: float = 0.002, threads: int = 8):
+    server = CountingServer(latency)
+    print(f"Benchmark: {n} series pulls against a local server ({latency * 1000:.0f}ms per response)")
+    manager = Utilities.HTTPSessionManager(pool_maxsize=threads)
+    runs = [("requests.get, sequential", lambda i: requests.get(f"{server.url}/s/{i}", timeout=10), 1),
+            ("pooled session, sequential", lambda i: manager.get(f"{server.url}/s/{i}"), 1),
+            (f"requests.get, {threads} threads", lambda i: requests.get(f"{server.url}/s/{i}", timeout=10), threads),
+            (f"pooled session, {threads} threads", lambda i: manager.get(f"{server.url}/s/{i}"), threads)]
+    for label, get, workers in runs:
+        server.connections = 0
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(workers) as ex:
+            list(ex.map(get, range(n)))
+        print(f"  {label:>28}: {server.connections:>4} connections, {time.perf_counter() - t0:.3f}s")
+    manager.close(); server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for the pooled HTTP session in Utilities.")
+    parser.add_argument("--pulls", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.pulls, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import os
+import sys
+import time
+import argparse
+import contextlib
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root and the NetLiquidity folder are importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+nlq_dir = os.path.join(repo_root, "Liquidity", "NetLiquidity")
+for path in (repo_root, nlq_dir):
+    if path not in sys.path:
+        sys.path.append(path)
+
+with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    import nlq_clean
+
+NetLiquidity = nlq_clean.NetLiquidity
+
+
+class Sources:
+    """
+    FRED and the Treasury API as seen at a point in time: weekly (Wednesday) WALCL and WTREGEN, business daily
+    RRPONTSYD (a few missing days) and Treasury TGA. revise() changes a recent observation, as the sources do.
+    """
+    def __init__(self, seed: int = 0):
+        self.rng = np.random.default_rng(seed)
+        days = pd.date_range("2003-01-01", "2026-06-30", freq="D")
+        wed, bdays = days[days.dayofweek == 2], days[days.dayofweek < 5]
+        walk = lambda level, scale, index: level + self.rng.normal(0, scale, len(index)).cumsum()
+        self.truth = {"fed_balance_sheet": pd.Series(walk(7000, 20, wed), index=wed, name="WALCL"),
+                      "tga_fred_weekly": pd.Series(walk(500, 10, wed), index=wed, name="WTREGEN"),
+                      "reverse_repo": pd.Series(walk(1000, 15, bdays), index=bdays, name="RRPONTSYD"),
+                      "tga_treasury_daily": pd.Series(walk(600, 8, bdays), index=bdays, name="TGA Balance (Billions USD)")}
+        self.truth["reverse_repo"].iloc[self.rng.integers(0, len(bdays), 5)] = np.nan
+
+    def core_data(self, asof) -> dict:
+        data = {key: series[series.index <= asof].copy() for key, series in self.truth.items()}
+        data["series_type"] = "total_assets"
+        return data
+
+    def updates(self, watermarks: dict, asof, lookback_days: int = 35) -> dict:
+        """What NLQDataFetcher.get_nlq_updates returns: each component from lookback_days before its watermark."""
+        return {key: series[(series.index <= asof) & (series.index >= watermarks[key] - pd.Timedelta(days=lookback_days))]
+                for key, series in self.truth.items()}
+
+    def revise(self, asof, days: int = 20):
+        key = self.rng.choice(["fed_balance_sheet", "reverse_repo", "tga_treasury_daily", "tga_fred_weekly"])
+        series = self.truth[key]
+        recent = np.flatnonzero((series.index <= asof) & (series.index > asof - pd.Timedelta(days=days)))
+        if len(recent):
+            series.iloc[self.rng.choice(recent)] += 5
+
+
+def settings(end) -> pd.DataFrame:
+    return pd.DataFrame({"Additional FRED Data": {"Start date": "2005-01-01", "End date": end.strftime("%Y-%m-%d")}})
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def full_calculation(sources: Sources, asof):
+    nlq = _quiet(NetLiquidity, input_settings=settings(asof), core_data=sources.core_data(asof))
+    return nlq, _quiet(nlq.calculate_all)
+
+
+def assert_same_results(got: dict, expected: dict):
+    assert list(got) == list(expected)
+    for key, series in expected.items():
+        if series is None:  # tga_fred_daily is never resampled
+            assert got[key] is None, key
+            continue
+        assert got[key].index.equals(series.index), key
+        np.testing.assert_allclose(got[key].to_numpy(dtype=float), series.to_numpy(dtype=float), rtol=1e-12,
+                                   equal_nan=True, err_msg=key)
+
+
+def test_daily_updates_through_saved_state_match_calculate_all(tmp_path):
+    sources = Sources()
+    state = str(tmp_path / "nlq_state.pkl")
+    asof = pd.Timestamp("2025-01-10")
+    nlq, _ = full_calculation(sources, asof)
+    _quiet(nlq.save_state, state)
+    for step in range(40):
+        asof = asof + pd.Timedelta(days=int(sources.rng.integers(1, 5)))
+        if step % 3 == 0:
+            sources.revise(asof)
+        nlq = _quiet(NetLiquidity.load_state, state)
+        updates = sources.updates(nlq.watermarks(), asof, nlq.revision_window)
+        got = _quiet(nlq.update, updates, end_date=asof.strftime("%Y-%m-%d"))
+        _quiet(nlq.save_state, state)
+        expected, results = full_calculation(sources, asof)
+        assert_same_results(got, results)
+        assert nlq.daily_index.equals(expected.daily_index)
+
+
+def test_revision_older_than_the_window_recalculates_in_full(tmp_path):
+    sources = Sources(seed=1)
+    asof = pd.Timestamp("2025-03-05")
+    nlq, _ = full_calculation(sources, asof)
+    sources.truth["tga_fred_weekly"].iloc[10] += 3
+    asof = asof + pd.Timedelta(days=2)
+    updates = sources.updates(nlq.watermarks(), asof)
+    updates["tga_fred_weekly"] = sources.core_data(asof)["tga_fred_weekly"]
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        got = nlq.update(updates, end_date=asof.strftime("%Y-%m-%d"))
+    assert "recalculating in full" in out.getvalue()
+    assert_same_results(got, full_calculation(sources, asof)[1])
+
+
+def test_update_without_new_data_only_extends_the_daily_index():
+    sources = Sources(seed=2)
+    asof = pd.Timestamp("2025-05-09")
+    nlq, before = full_calculation(sources, asof)
+    before = {key: series.copy() for key, series in before.items() if series is not None}
+    later = asof + pd.Timedelta(days=3)
+    got = _quiet(nlq.update, sources.updates(nlq.watermarks(), asof), end_date=later.strftime("%Y-%m-%d"))
+    assert nlq.daily_index[-1] == later
+    assert got["nlq_weekly"].equals(before["nlq_weekly"])
+    daily = got["nlq_daily_treasury"]
+    pd.testing.assert_series_equal(daily.loc[:asof], before["nlq_daily_treasury"])
+    assert (daily.loc[asof:] == daily.loc[asof]).all()  # forward filled over the weekend
+
+
+def test_load_state_sets_the_init_defaults_for_old_state_files(tmp_path):
+    sources = Sources(seed=3)
+    asof = pd.Timestamp("2025-02-14")
+    core = sources.core_data(asof)
+    state = str(tmp_path / "old_state.pkl")
+    # A state file from before revision_window and the calculated series were saved
+    pd.to_pickle({"start_date": "2005-01-01", "fed_balance_sheet": core["fed_balance_sheet"],
+                  "reverse_repo": core["reverse_repo"], "tga_treasury": core["tga_treasury_daily"],
+                  "revision_window": None}, state)
+    nlq = _quiet(NetLiquidity.load_state, state)
+    fresh = _quiet(NetLiquidity, input_settings=settings(asof), core_data=core)
+    assert set(vars(fresh)) <= set(vars(nlq))
+    assert nlq.revision_window == 35 and nlq.series_type == "total_assets" and nlq.nlq_weekly is None
+    assert nlq.tga_fred.empty and nlq.input_settings is None and nlq.end_date is not None
+    assert nlq.core_data["series_type"] == "total_assets"
+    # Nothing calculated yet: update falls back to calculate_all
+    asof = asof + pd.Timedelta(days=4)
+    got = _quiet(nlq.update, sources.updates(nlq.watermarks(), asof), end_date=asof.strftime("%Y-%m-%d"))
+    core = sources.core_data(asof)
+    core["tga_fred_weekly"] = nlq.tga_fred
+    expected = _quiet(NetLiquidity, input_settings=settings(asof), core_data=core)
+    assert_same_results(got, _quiet(expected.calculate_all))
+
+
+def test_first_change():
+    index = pd.date_range("2025-01-01", periods=6, freq="D")
+    old = pd.Series([1.0, 2.0, np.nan, 4.0, 5.0, 6.0], index=index)
+    assert nlq_clean._first_change(old, old.iloc[2:].copy()) is None
+    revised = old.iloc[3:].copy(); revised.iloc[1] += 1
+    assert nlq_clean._first_change(old, revised) == index[4]
+    extended = pd.concat([old.iloc[4:], pd.Series([7.0], index=[index[-1] + pd.Timedelta(days=1)])])
+    assert nlq_clean._first_change(old, extended) == extended.index[-1]
+    assert nlq_clean._first_change(old.iloc[:0], extended) == extended.index[0]
+
+
+def benchmark(updates: int = 30):
+    print(f"Benchmark: {updates} daily NLQ refreshes, update vs calculate_all (fetching not included)")
+    sources = Sources()
+    asof = pd.Timestamp("2025-01-10")
+    t_inc, t_io, t_full = [], [], []
+    state = os.path.join(wd, "_bench_nlq_state.pkl")
+    try:
+        nlq, _ = full_calculation(sources, asof)
+        _quiet(nlq.save_state, state)
+        for _ in range(updates):
+            asof = asof + pd.Timedelta(days=1)
+            sources.revise(asof)
+            t0 = time.perf_counter(); nlq = _quiet(NetLiquidity.load_state, state); t_io.append(time.perf_counter() - t0)
+            new_data = sources.updates(nlq.watermarks(), asof, nlq.revision_window)
+            t0 = time.perf_counter(); _quiet(nlq.update, new_data, end_date=asof.strftime("%Y-%m-%d"))
+            t_inc.append(time.perf_counter() - t0)
+            t0 = time.perf_counter(); _quiet(nlq.save_state, state); t_io[-1] += time.perf_counter() - t0
+            t0 = time.perf_counter(); full_calculation(sources, asof); t_full.append(time.perf_counter() - t0)
+    finally:
+        if os.path.exists(state):
+            os.remove(state)
+    print(f"  median calculate_all {np.median(t_full) * 1000:.1f}ms, update {np.median(t_inc) * 1000:.1f}ms "
+          f"({np.median(t_full) / np.median(t_inc):.1f}x), load_state + save_state {np.median(t_io) * 1000:.1f}ms")
+    print("  The daily refresh saves mostly on fetching: only revision_window days per component instead of the full history.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental NetLiquidity update vs calculate_all tests, and a benchmark.")
+    parser.add_argument("--updates", type=int, default=30)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.updates)
+
+
+if __name__ == "__main__":
+    main()
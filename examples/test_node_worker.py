@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import shutil
+import threading
+
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend.js_funcs import NodeWorker, NodeWorkerPool, NodeWorkerError
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+# Stub worker speaking the same line-delimited JSON-RPC protocol as js_worker.js.
+STUB_JS = r"""
+const readline = require('readline');
+const respond = (msg) => process.stdout.write(JSON.stringify(msg) + '\n');
+const methods = {
+    ping: async () => ({ pong: true, pid: process.pid }),
+    echo: async (params) => ({ echo: params, pid: process.pid }),
+    sleep: async (params) => new Promise((res) => setTimeout(() => res({ slept: params.ms }), params.ms)),
+    fail: async (params) => { throw new Error(params.message || 'failed'); },
+    crash: async () => { process.exit(3); },
+};
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on('line', async (line) => {
+    if (!line.trim()) return;
+    const request = JSON.parse(line);
+    const handler = methods[request.method];
+    if (!handler) { respond({ id: request.id, error: `Unknown method: ${request.method}` }); return; }
+    try { respond({ id: request.id, result: await handler(request.params || {}) }); }
+    catch (error) { respond({ id: request.id, error: error.message }); }
+});
+rl.on('close', () => process.exit(0));
+"""
+
+
+@pytest.fixture
+def stub_script(tmp_path):
+    path = tmp_path / "stub_worker.js"
+    path.write_text(STUB_JS)
+    return str(path)
+
+
+@pytest.fixture
+def worker(stub_script):
+    w = NodeWorker(script=stub_script, env=os.environ.copy())
+    yield w
+    w.close()
+
+
+def test_echo_and_ping(worker):
+    assert worker.call("echo", {"x": 1, "s": "abc"}, timeout=10)["echo"] == {"x": 1, "s": "abc"}
+    assert worker.ping()
+    assert worker.in_flight == 0
+
+
+def test_concurrent_calls_share_one_process_and_complete_out_of_order(worker):
+    worker.start()
+    futs = [worker.submit("sleep", {"ms": ms}) for ms in (300, 200, 100, 0)]
+    t0 = time.perf_counter()
+    results = [f.result(timeout=10) for f in futs]
+    assert [r["slept"] for r in results] == [300, 200, 100, 0]
+    assert time.perf_counter() - t0 < 0.6  # they ran at the same time, not one after another
+    assert worker.restarts == 0 and worker.in_flight == 0
+
+
+def test_js_errors_are_raised_and_worker_survives(worker):
+    with pytest.raises(NodeWorkerError, match="boom"):
+        worker.call("fail", {"message": "boom"}, timeout=10)
+    with pytest.raises(NodeWorkerError, match="Unknown method"):
+        worker.call("nope", timeout=10)
+    assert worker.alive and worker.ping()
+
+
+def test_timeout_stops_tracking_request(worker):
+    worker.start()
+    with pytest.raises(TimeoutError):
+        worker.call("sleep", {"ms": 500}, timeout=0.1)
+    assert worker.in_flight == 0
+    time.sleep(0.6)  # the late answer arrives and is dropped
+    assert worker.in_flight == 0
+    assert worker.call("echo", {"after": True}, timeout=10)["echo"] == {"after": True}
+
+
+def test_many_threads_calling_at_once(worker):
+    errors = []; results = {}
+
+    def run(i):
+        try:
+            results[i] = worker.call("echo", {"i": i}, timeout=10)["echo"]["i"]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(100)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert results == {i: i for i in range(100)}
+    assert worker.in_flight == 0
+
+
+def test_crash_fails_pending_and_restarts(worker):
+    worker.start()
+    pid = worker.call("ping", timeout=10)["pid"]
+    slow = worker.submit("sleep", {"ms": 2000})
+    with pytest.raises(NodeWorkerError, match="exited"):
+        worker.call("crash", timeout=10)
+    with pytest.raises(NodeWorkerError):
+        slow.result(timeout=10)
+    new_pid = worker.call("ping", timeout=10)["pid"]
+    assert new_pid != pid and worker.restarts == 1
+
+
+def test_pool_spreads_load_and_retries_dead_worker(stub_script):
+    pool = NodeWorkerPool(size=2, script=stub_script, env=os.environ.copy())
+    try:
+        assert pool.ping()  # starts both workers
+        busy = pool.workers[0].submit("sleep", {"ms": 300})
+        pids = {pool.call("echo", {}, timeout=10)["pid"] for _ in range(3)}
+        busy.result(timeout=10)
+        assert pids == {pool.workers[1].proc.pid}  # the busy worker was skipped
+        pool.workers[1].proc.kill()
+        pool.workers[1].proc.wait()
+        assert pool.call("ping", timeout=10)["pong"]
+        assert pool.ping()
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from MacroBackend import Pull_Data
+from openbb_backend import main as backend
+
+
+class FakeDataset:
+    """Stands in for Pull_Data.dataset: sleeps for a fixed latency, counts upstream pulls and can be told to fail,
+    time out (placeholder Series, as Pull_Data returns) or return nothing for given codes."""
+    latency = 0.05
+    calls = 0
+    fail = set(); timeout = set(); empty = set()
+    lock = threading.Lock()
+
+    def get_data(self, source, data_code, start_date="1800-01-01", **kwargs):
+        with FakeDataset.lock:
+            FakeDataset.calls += 1
+        time.sleep(FakeDataset.latency)
+        self.data_code = data_code
+        if data_code in FakeDataset.fail:
+            self.data = None
+        elif data_code in FakeDataset.timeout:
+            self.data = pd.Series(["Data pull timed out after 60 seconds."], name=f"Timeout_{data_code}", index=[0])
+        elif data_code in FakeDataset.empty:
+            self.data = pd.Series(dtype=float, name=data_code)
+        else:
+            idx = pd.date_range(start_date, periods=200, freq="MS")
+            self.data = pd.Series(np.arange(200, dtype=float), index=idx, name=data_code)
+
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    monkeypatch.setattr(Pull_Data, "dataset", FakeDataset)
+    FakeDataset.calls = 0; FakeDataset.latency = 0.05
+    FakeDataset.fail = set(); FakeDataset.timeout = set(); FakeDataset.empty = set()
+    backend.response_cache.clear()
+    backend.response_cache.hits = backend.response_cache.misses = 0
+    return FakeDataset
+
+
+async def _get(client, url):
+    t0 = time.perf_counter()
+    r = await client.get(url)
+    return r, time.perf_counter() - t0
+
+
+async def _load(urls: list) -> tuple:
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        t0 = time.perf_counter()
+        out = await asyncio.gather(*[_get(client, u) for u in urls])
+        return out, time.perf_counter() - t0
+
+
+def _run(urls: list) -> tuple:
+    return asyncio.run(_load(urls))
+
+
+def test_identical_concurrent_requests_coalesce(fake_source):
+    out, _ = _run(["/fred_series?series_id=GDP&start_date=2000-01-01"] * 50)
+    assert all(r.status_code == 200 for r, _ in out)
+    assert len({r.text for r, _ in out}) == 1
+    assert fake_source.calls == 1
+
+
+def test_cached_until_ttl(fake_source, monkeypatch):
+    _run(["/pull_series?source=fred&data_code=CPI"])
+    _run(["/pull_series?source=fred&data_code=CPI"])
+    assert fake_source.calls == 1 and backend.response_cache.hits == 1
+    monkeypatch.setattr(backend.response_cache, "ttl", 0.0)
+    backend.response_cache.clear()
+    _run(["/pull_series?source=fred&data_code=CPI"])
+    time.sleep(0.01)
+    _run(["/pull_series?source=fred&data_code=CPI"])
+    assert fake_source.calls == 3
+
+
+@pytest.mark.parametrize("kind", ["fail", "timeout"])
+def test_failed_pulls_are_not_cached(fake_source, kind):
+    getattr(fake_source, kind).add("BAD")
+    out, _ = _run(["/pull_series?source=fred&data_code=BAD"] * 5)
+    assert all(r.status_code == 404 and "error" in r.json() for r, _ in out)
+    assert fake_source.calls == 1  # concurrent requests still share the failed fetch
+    getattr(fake_source, kind).clear()
+    out, _ = _run(["/pull_series?source=fred&data_code=BAD"])
+    assert out[0][0].status_code == 200 and len(out[0][0].json()) == 200
+    assert fake_source.calls == 2
+
+
+def test_empty_results_are_not_cached(fake_source):
+    fake_source.empty.add("EMPTY")
+    _run(["/pull_series?source=fred&data_code=EMPTY"])
+    _run(["/pull_series?source=fred&data_code=EMPTY"])
+    assert fake_source.calls == 2
+
+
+def test_cacheable_rules():
+    assert not backend._cacheable(None)
+    assert not backend._cacheable([])
+    assert not backend._cacheable({"error": "nope"})
+    assert backend._cacheable([{"date": "2020-01-01", "value": 1.0}])
+    assert backend._cacheable({"stats": {}, "equity_curve": [1]})
+
+
+def test_slow_requests_do_not_block_others(fake_source):
+    fake_source.latency = 0.3
+    urls = [f"/pull_series?source=fred&data_code=S{i}" for i in range(backend.MAX_WORKERS)]
+    _, elapsed = _run(urls)
+    assert fake_source.calls == len(urls)
+    assert elapsed < 0.3 * len(urls) / 2
+
+
+def load_test(n_requests: int = 400, n_series: int = 20, latency: float = 0.05, repeat: int = 2):
+    """Dashboard-refresh style load: n_requests concurrent requests spread over n_series distinct series, run
+    repeat times. The first round is cold (upstream pulls, coalesced), later rounds are served from the cache."""
+    FakeDataset.latency = latency; FakeDataset.calls = 0
+    FakeDataset.fail = set(); FakeDataset.timeout = set(); FakeDataset.empty = set()
+    Pull_Data.dataset = FakeDataset
+    backend.response_cache.clear()
+    rng = np.random.default_rng(0)
+    print(f"Load test: {n_requests} concurrent requests over {n_series} series, upstream latency {latency * 1000:.0f}ms, "
+          f"{backend.MAX_WORKERS} workers")
+    for rnd in range(repeat):
+        urls = [f"/fred_series?series_id=SER{k}&start_date=2000-01-01" for k in rng.integers(0, n_series, n_requests)]
+        out, elapsed = _run(urls)
+        lat = np.array([t for _, t in out]) * 1000
+        ok = sum(r.status_code == 200 for r, _ in out)
+        print(f"  round {rnd + 1} ({'cold' if rnd == 0 else 'warm'}): {ok}/{n_requests} ok in {elapsed:.2f}s, "
+              f"p50 {np.percentile(lat, 50):.1f}ms, p99 {np.percentile(lat, 99):.1f}ms, upstream pulls so far {FakeDataset.calls}")
+    sequential = n_requests * latency
+    print(f"  uncached sequential serving would take ~{sequential:.1f}s per round")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and load test for the OpenBB backend worker pool and cache.")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--series", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    load_test(args.requests, args.series, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import datetime
+import threading
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import Pull_Data
+
+
+class FakeUpstream:
+    """Replaces dataset.pull_data: counts upstream pulls, sleeps for a latency and sets the same kind of side
+    effects as the tv source (splits "ticker,exchange", sets start/end dates from the data)."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self.version = 1
+        self.lock = threading.Lock()
+
+    def __call__(self, ds):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        ticker, exchange = [s.strip() for s in ds.data_code.split(",")]
+        ds.data_code = ticker; ds.exchange_code = exchange; ds.data_freq = "D"
+        idx = pd.date_range("2020-01-01", periods=500, freq="D")
+        ds.data = pd.Series(np.arange(500, dtype=float) * self.version, index=idx, name=ticker)
+        ds.start_date = ds.data.index[0]; ds.end_date = ds.data.index[-1]
+        ds.dataName = f"{ticker} ({exchange})"
+        ds.SeriesInfo = pd.Series({"id": ticker, "title": f"{ticker} close", "observation_start": idx[0],
+                                   "last_updated": datetime.date(2024, 5, 1), "units": "USD", "popularity": np.int64(71),
+                                   "scale": np.float64(1.5), "seasonal_adjustment": None}, name=ticker)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    up = FakeUpstream()
+    monkeypatch.setattr(Pull_Data.dataset, "pull_data", lambda self: up(self))
+    return up
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    c = Pull_Data.PullCache(cache_dir=str(tmp_path / "pull_cache"))
+    monkeypatch.setattr(Pull_Data, "_pull_cache", c)
+    return c
+
+
+def _pull(code: str = "SPX,SP", **kwargs):
+    ds = Pull_Data.dataset()
+    ds.get_data("tv", code, "2020-01-01", end_date="2024-06-01", **kwargs)
+    return ds
+
+
+def test_cache_is_opt_in(upstream, cache):
+    _pull(); _pull()
+    assert upstream.calls == 2
+    assert cache.stats["puts"] == 0 and not os.listdir(cache.cache_dir)
+
+
+def test_hit_restores_data_info_and_attributes(upstream, cache):
+    first = _pull(use_cache=True)
+    second = _pull(use_cache=True)
+    assert upstream.calls == 1
+    assert cache.stats["misses"] == 1 and cache.stats["hits"] == 1 and cache.stats["puts"] == 1
+    pd.testing.assert_series_equal(second.data, first.data, check_freq=False)
+    pd.testing.assert_series_equal(second.SeriesInfo, first.SeriesInfo)
+    for key in ("observation_start", "last_updated", "seasonal_adjustment"):
+        assert type(second.SeriesInfo[key]) is type(first.SeriesInfo[key])
+    assert second.SeriesInfo["popularity"] == 71 and second.SeriesInfo["scale"] == 1.5  # numpy scalars come back as numbers
+    for attr in Pull_Data.CACHED_ATTRS:
+        assert getattr(second, attr) == getattr(first, attr)
+    assert second.data_code == "SPX" and second.exchange_code == "SP"
+    assert isinstance(second.start_date, pd.Timestamp)
+
+
+def test_different_parameters_are_different_entries(upstream, cache):
+    _pull(use_cache=True); _pull("NDX,NASDAQ", use_cache=True); _pull(use_cache=True, data_freq="1w")
+    assert upstream.calls == 3
+    _pull("NDX,NASDAQ", use_cache=True)
+    assert upstream.calls == 3
+
+
+def test_expired_entry_is_pulled_again_by_default(upstream, cache):
+    cache.ttls["tv"] = 0.05
+    _pull(use_cache=True)
+    time.sleep(0.1)
+    _pull(use_cache=True)
+    assert upstream.calls == 2 and cache.stats["stale_hits"] == 0
+
+
+def test_stale_while_revalidate_when_asked(upstream, cache):
+    cache.ttls["tv"] = 0.05; cache.max_stale = 60
+    _pull(use_cache=True)
+    time.sleep(0.1)
+    upstream.version = 2; upstream.latency = 0.2
+    t0 = time.perf_counter()
+    stale = _pull(use_cache=True)
+    assert time.perf_counter() - t0 < 0.15  # served from the cache, not after the upstream latency
+    assert stale.data.iloc[1] == 1.0 and cache.stats["stale_hits"] == 1
+    for _ in range(100):
+        if upstream.calls == 2 and not cache._revalidating:
+            break
+        time.sleep(0.02)
+    cache.ttls["tv"] = 60
+    assert _pull(use_cache=True).data.iloc[1] == 2.0
+    assert upstream.calls == 2 and cache.stats["revalidations"] == 1
+
+
+def test_batch_pulls_use_the_cache_and_serve_stale_entries(upstream, cache, monkeypatch):
+    pull = lambda: Pull_Data._pull_single("tv", "SPX,SP", "2020-01-01", end_date="2024-06-01")
+    pull(); data, _ = pull()
+    assert upstream.calls == 1 and cache.stats["hits"] == 1 and data.iloc[1] == 1.0
+    cache.ttls["tv"] = 0.05  # cache.max_stale stays 0, PULL_CACHE_MAX_STALE applies
+    time.sleep(0.1)
+    upstream.version = 2
+    data, _ = pull()
+    assert data.iloc[1] == 1.0 and cache.stats["stale_hits"] == 1
+    for _ in range(100):
+        if upstream.calls == 2 and not cache._revalidating:
+            break
+        time.sleep(0.02)
+    assert upstream.calls == 2
+    monkeypatch.setattr(Pull_Data, "PULL_CACHE_ENABLED", False)
+    pull()
+    assert upstream.calls == 3 and cache.stats["hits"] == 1
+
+
+def test_lru_eviction_by_size(upstream, cache):
+    _pull("A,X", use_cache=True)
+    size = sum(e["size"] for e in cache._index.values())
+    cache.max_bytes = int(size * 2.5)
+    _pull("B,X", use_cache=True); _pull("A,X", use_cache=True); _pull("C,X", use_cache=True)
+    assert cache.stats["evictions"] == 1
+    assert sorted(e["data_code"] for e in cache._index.values()) == ["A,X", "C,X"]
+    assert len([f for f in os.listdir(cache.cache_dir) if f.endswith(cache.ext)]) == 2
+
+
+def test_unreadable_file_is_a_miss(upstream, cache):
+    _pull(use_cache=True)
+    entry = next(iter(cache._index.values()))
+    with open(os.path.join(cache.cache_dir, entry["file"]), "w") as f:
+        f.write("not a table")
+    _pull(use_cache=True)
+    assert upstream.calls == 2 and cache.stats["misses"] == 2
+
+
+def test_read_does_not_hold_the_cache_lock(upstream, cache):
+    _pull("SLOW,X", use_cache=True); _pull("FAST,X", use_cache=True)
+    read_file = cache._read_file
+
+    def slow_read(path, entry):
+        if entry["data_code"] == "SLOW,X":
+            time.sleep(0.5)
+        return read_file(path, entry)
+
+    cache._read_file = slow_read
+    t = threading.Thread(target=_pull, args=("SLOW,X",), kwargs={"use_cache": True})
+    t.start(); time.sleep(0.05)
+    t0 = time.perf_counter()
+    _pull("FAST,X", use_cache=True)
+    assert time.perf_counter() - t0 < 0.3
+    t.join()
+    assert upstream.calls == 2
+
+
+def test_index_is_merged_between_processes(tmp_path):
+    # Separate PullCache objects on one folder behave like separate processes: only index.json is shared.
+    folder = str(tmp_path / "shared")
+    caches = [Pull_Data.PullCache(cache_dir=folder) for _ in range(4)]
+    data = pd.Series([1.0, 2.0], index=pd.date_range("2024-01-01", periods=2))
+
+    def writer(i, c):
+        for j in range(10):
+            c.put(f"k{i}_{j}", "fred", f"S{i}_{j}", data, pd.Series({"id": f"S{i}_{j}"}))
+
+    threads = [threading.Thread(target=writer, args=(i, c)) for i, c in enumerate(caches)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with open(os.path.join(folder, "index.json")) as f:
+        assert len(json.load(f)) == 40
+    reader = Pull_Data.PullCache(cache_dir=folder)
+    assert reader.get("k3_9")[3] == "fresh"
+    caches[0].clear()
+    assert reader.get("k3_9")[3] == "miss"  # the clear is seen by the other instance
+    caches[1].put("again", "fred", "S", data)
+    assert reader.get("again")[3] == "fresh" and caches[2].get("k0_0")[3] == "miss"
+    assert not [f for f in os.listdir(folder) if f.endswith(".lock") or f.endswith(".tmp")]
+
+
+def test_empty_and_missing_data_are_not_cached(tmp_path):
+    c = Pull_Data.PullCache(cache_dir=str(tmp_path / "c"))
+    c.put("a", "fred", "A", pd.Series(dtype=float))
+    c.put("b", "fred", "B", None)
+    assert c.stats["puts"] == 0 and c.get("a")[3] == "miss"
+
+
+def benchmark(n_series: int = 50, latency: float = 0.2):
+    import tempfile
+    up = FakeUpstream(latency)
+    Pull_Data.dataset.pull_data = lambda self: up(self)
+    with tempfile.TemporaryDirectory() as folder:
+        Pull_Data._pull_cache = Pull_Data.PullCache(cache_dir=folder)
+        codes = [f"S{i},X" for i in range(n_series)]
+        print(f"Benchmark: {n_series} series, upstream latency {latency * 1000:.0f}ms")
+        for label in ("cold", "warm"):
+            t0 = time.perf_counter()
+            for code in codes:
+                _pull(code, use_cache=True)
+            print(f"  {label}: {time.perf_counter() - t0:.2f}s, upstream pulls {up.calls}, stats {Pull_Data._pull_cache.stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for the Pull_Data pull cache.")
+    parser.add_argument("--series", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.series, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+import sys
+import time
+import threading
+import argparse
+
+import pandas as pd
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import Pull_Data
+
+
+class FakeSource:
+    """Stand-in for the real source pulls. Sleeps for a fixed latency per source, records the peak number of
+    simultaneous pulls per source and can be told to hang or fail on given series codes."""
+
+    def __init__(self, latency: dict, hang: dict = None, fail: set = None):
+        self.latency = latency
+        self.hang = hang or {}
+        self.fail = fail or set()
+        self.lock = threading.Lock()
+        self.running = {}
+        self.peak = {}
+        self.calls = 0
+
+    def __call__(self, source, data_code, start_date, exchange_code, timeout, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.running[source] = self.running.get(source, 0) + 1
+            self.peak[source] = max(self.peak.get(source, 0), self.running[source])
+        try:
+            time.sleep(self.hang.get(data_code, self.latency.get(source, 0.01)))
+            if data_code in self.fail:
+                raise Pull_Data.get_data_failure(f"No data returned for {data_code} from {source}.")
+            data = pd.Series([1.0, 2.0, 3.0], index=pd.date_range("2024-01-01", periods=3), name=data_code)
+            return data, pd.Series({"id": data_code, "source": source})
+        finally:
+            with self.lock:
+                self.running[source] -= 1
+
+
+def _jobs(n_per_source: dict) -> dict:
+    jobs = {}
+    for source, n in n_per_source.items():
+        for i in range(n):
+            jobs[f"{source}_{i}"] = {"source": source, "data_code": f"{source}_{i}"}
+    return jobs
+
+
+def _sequential(jobs: dict, pull_func) -> dict:
+    """The current path: one series after another."""
+    out = {}
+    for key, job in jobs.items():
+        out[key] = pull_func(job["source"], job["data_code"], "1800-01-01", None, 60)
+    return out
+
+
+def test_results_and_failures_are_kept_per_series():
+    fake = FakeSource({"fred": 0.01, "tv": 0.01}, fail={"tv_1"})
+    res = Pull_Data.pull_many(_jobs({"fred": 4, "tv": 3}), retries=1, retry_wait=0.01, pull_func=fake)
+    assert len(res) == 7
+    assert res["tv_1"]["data"] is None and isinstance(res["tv_1"]["error"], Pull_Data.get_data_failure)
+    assert res["tv_1"]["attempts"] == 2
+    ok = [k for k in res if k != "tv_1"]
+    assert all(res[k]["error"] is None and res[k]["data"] is not None for k in ok)
+
+
+def test_source_caps_are_respected():
+    fake = FakeSource({"fred": 0.05, "tv": 0.05})
+    Pull_Data.pull_many(_jobs({"fred": 12, "tv": 12}), max_workers=32, source_limits={"fred": 4, "tv": 2},
+                        pull_func=fake)
+    assert fake.peak["fred"] <= 4
+    assert fake.peak["tv"] <= 2
+
+
+def test_timed_out_pull_keeps_its_slot_until_it_finishes():
+    # tv_0 hangs well past the timeout. With a cap of 1, its retry and the other tv series must not start
+    # until the hung pull has actually returned.
+    fake = FakeSource({"tv": 0.01}, hang={"tv_0": 1.5})
+    res = Pull_Data.pull_many(_jobs({"tv": 3}), timeout=0.3, retries=3, retry_wait=0.05,
+                              source_limits={"tv": 1}, pull_func=fake)
+    assert fake.peak["tv"] == 1
+    assert isinstance(res["tv_0"]["error"], TimeoutError)
+    assert res["tv_1"]["error"] is None and res["tv_2"]["error"] is None
+
+
+def test_concurrent_is_faster_than_sequential():
+    latency = {"fred": 0.05, "tv": 0.05, "yfinance": 0.05}
+    jobs = _jobs({"fred": 8, "tv": 3, "yfinance": 4})
+    t0 = time.perf_counter()
+    _sequential(jobs, FakeSource(latency))
+    t_seq = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    Pull_Data.pull_many(jobs, pull_func=FakeSource(latency))
+    t_par = time.perf_counter() - t0
+    assert t_par < t_seq / 3
+
+
+def benchmark(n_series: int = 60, latency: float = 0.1):
+    latency_map = {"fred": latency, "tv": latency * 2, "yfinance": latency, "bea": latency * 3, "abs_series": latency * 3}
+    per_source = max(1, n_series // len(latency_map))
+    jobs = _jobs({s: per_source for s in latency_map})
+    print(f"Benchmark: {len(jobs)} series over {len(latency_map)} fake sources, base latency {latency}s")
+
+    t0 = time.perf_counter()
+    _sequential(jobs, FakeSource(latency_map))
+    t_seq = time.perf_counter() - t0
+    fake = FakeSource(latency_map)
+    t0 = time.perf_counter()
+    Pull_Data.pull_many(jobs, pull_func=fake)
+    t_par = time.perf_counter() - t0
+
+    slowest = max(per_source / Pull_Data.SOURCE_CONCURRENCY.get(s, Pull_Data.DEFAULT_SOURCE_CONCURRENCY) * lat
+                  for s, lat in latency_map.items())
+    print(f"  sequential: {t_seq:.2f}s")
+    print(f"  pull_many:  {t_par:.2f}s  (slowest source bound ~{slowest:.2f}s)")
+    print(f"  speedup:    {t_seq / t_par:.1f}x")
+    print(f"  peak concurrent pulls per source: {fake.peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for Pull_Data.pull_many using fake sources.")
+    parser.add_argument("--series", type=int, default=60, help="Number of series in the benchmark")
+    parser.add_argument("--latency", type=float, default=0.1, help="Base latency of a fake pull in seconds")
+    args = parser.parse_args()
+
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name}: ok")
+    benchmark(args.series, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend.ABS_backend import abs_series_by_r as absr
+
+# Stand-in for r_worker.r, run with this Python instead of Rscript. Same line-delimited JSON protocol, with a few
+# extra methods to make the worker misbehave. STUB_STARTUP mimics the time R takes to start and load its packages,
+# STUB_CATALOG maps ABS series ids to workbook paths for the abs_series job.
+STUB_SOURCE = r'''
+import os, sys, json, time
+time.sleep(float(os.environ.get("STUB_STARTUP", "0")))
+catalog = json.loads(os.environ.get("STUB_CATALOG", "{}"))
+
+def respond(msg):
+    sys.stdout.write(json.dumps(msg) + "\n"); sys.stdout.flush()
+
+def abs_series(params):
+    return {sid: {"path": catalog[sid]} if sid in catalog else {"error": f"No series {sid}"} for sid in params["series_ids"]}
+
+def crash_once(params):
+    if not os.path.exists(params["flag"]):
+        open(params["flag"], "w").close()
+        os._exit(3)
+    return "recovered"
+
+methods = {
+    "ping": lambda p: {"pong": True, "pid": os.getpid()},
+    "echo": lambda p: p,
+    "sleep": lambda p: time.sleep(p["seconds"]) or p["seconds"],
+    "fail": lambda p: (_ for _ in ()).throw(RuntimeError("object 'x' not found")),
+    "crash": lambda p: os._exit(2),
+    "crash_once": crash_once,
+    "abs_series": abs_series,
+    "rba_get_series": lambda p: [{"date": "2024-01-31", "value": 4.35, "series_id": p["series_id"]}],
+}
+
+for line in sys.stdin:
+    if not line.strip():
+        continue
+    request = json.loads(line)
+    handler = methods.get(request.get("method"))
+    if handler is None:
+        respond({"id": request.get("id"), "error": "Unknown method: " + str(request.get("method"))}); continue
+    if request["method"] == "echo" and request["params"].get("noise"):
+        sys.stdout.write("[1] library chatter on stdout\n")
+        sys.stderr.write("Warning message: chatter on stderr\n"); sys.stderr.flush()
+        respond({"id": -1, "result": "late answer to an old job"})
+    try:
+        respond({"id": request["id"], "result": handler(request.get("params") or {})})
+    except Exception as e:
+        respond({"id": request["id"], "error": str(e)})
+'''
+
+
+@pytest.fixture
+def stub_script(tmp_path):
+    path = tmp_path / "r_worker_stub.py"
+    path.write_text(STUB_SOURCE)
+    return str(path)
+
+
+@pytest.fixture
+def worker(stub_script):
+    w = absr.RWorker(script=stub_script, rscript=sys.executable)
+    yield w
+    w.close()
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def test_one_process_serves_many_jobs(worker):
+    pids = {worker.call("ping")["pid"] for _ in range(20)}
+    assert len(pids) == 1 and worker.restarts == 0 and worker.alive
+    assert worker.call("echo", {"a": [1, 2.5, None], "b": "x"}) == {"a": [1, 2.5, None], "b": "x"}
+    assert worker.ping()
+
+
+def test_job_errors_keep_the_worker(worker):
+    pid = worker.call("ping")["pid"]
+    with pytest.raises(absr.RWorkerError, match="object 'x' not found"):
+        worker.call("fail")
+    with pytest.raises(absr.RWorkerError, match="Unknown method"):
+        worker.call("nope")
+    assert worker.call("ping")["pid"] == pid and worker.restarts == 0
+
+
+def test_timeout_kills_and_next_call_restarts(worker):
+    pid = worker.call("ping")["pid"]
+    t0 = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        worker.call("sleep", {"seconds": 5}, timeout=0.3)
+    assert time.perf_counter() - t0 < 2 and not worker.alive
+    assert worker.call("ping")["pid"] != pid and worker.restarts == 1
+
+
+def test_dead_worker_is_restarted_and_the_call_retried(worker, tmp_path):
+    worker.call("ping")
+    assert _quiet(worker.call, "crash_once", {"flag": str(tmp_path / "crashed")}) == "recovered"
+    assert worker.restarts == 1
+    with pytest.raises(absr.RWorkerError, match="exited"):
+        _quiet(worker.call, "crash", retries=1)
+    assert worker.restarts == 2
+    assert worker.ping() and worker.restarts == 3  # the next call starts a fresh process
+
+
+def test_stray_output_and_stale_answers_are_ignored(worker):
+    assert _quiet(worker.call, "echo", {"noise": True}) == {"noise": True}
+    for _ in range(50):
+        if worker.last_stderr:
+            break
+        time.sleep(0.01)
+    assert "chatter on stderr" in worker.last_stderr
+
+
+def test_concurrent_calls_are_queued_and_time_out_per_job(worker):
+    worker.call("ping")
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(worker.call("sleep", {"seconds": 0.15}, timeout=0.5))
+        except Exception as e:
+            errors.append(e)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=run) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 5 x 0.15s in a row is longer than any one timeout, yet none times out: waiting for the lock doesn't count.
+    assert not errors and results == [0.15] * 5 and time.perf_counter() - t0 >= 0.7 and worker.restarts == 0
+
+
+def test_missing_script():
+    with pytest.raises(FileNotFoundError):
+        absr.RWorker(script="/nonexistent/r_worker.r").start()
+
+
+def _abs_workbook(path: str, series: dict) -> str:
+    """Minimal ABS style time series workbook: metadata rows (Series ID last) above the observations."""
+    dates = pd.date_range("2020-01-01", periods=24, freq="MS")
+    meta_rows = ["Unit", "Series Type", "Data Type", "Frequency", "Series ID"]
+    frame = pd.DataFrame({f"{title} ;": ["Number", "Seasonally Adjusted", "STOCK", "Month", sid] + list(values)
+                          for sid, (title, values) in series.items()}, index=meta_rows + list(dates))
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"a": ["Index sheet"]}).to_excel(writer, sheet_name="Index")
+        frame.to_excel(writer, sheet_name="Data1")
+    return path
+
+
+@pytest.fixture
+def abs_stub(tmp_path, stub_script, monkeypatch):
+    pytest.importorskip("openpyxl")
+    book = _abs_workbook(str(tmp_path / "6202001.xlsx"), {"A84423050A": ("Unemployment rate ; Persons", np.arange(24) / 10 + 3.5),
+                                                           "A84423043C": ("Employed total ; Persons", np.arange(24) * 1000.0 + 14e6)})
+    monkeypatch.setenv("STUB_CATALOG", json.dumps({"A84423050A": book, "A84423043C": book}))
+    w = absr.RWorker(script=stub_script, rscript=sys.executable)
+    monkeypatch.setattr(absr, "get_r_worker", lambda: w)
+    managed, reads = [], []
+    monkeypatch.setattr(absr, "_manage_abs_file_storage", lambda paths, verbose=False: managed.append(paths))
+    read_excel = pd.read_excel
+    monkeypatch.setattr(absr.pd, "read_excel", lambda *a, **k: reads.append(a[0]) or read_excel(*a, **k))
+    yield w, managed, reads
+    w.close()
+
+
+def test_abs_batch_reads_each_workbook_once(abs_stub, tmp_path):
+    worker, managed, reads = abs_stub
+    results, errors = _quiet(absr.abs_download_batch_with_r, ["A84423050A", "A84423043C", "A0000000X", "A84423050A"],
+                             save_path=str(tmp_path))
+    assert set(results) == {"A84423050A", "A84423043C"} and set(errors) == {"A0000000X"}
+    assert isinstance(errors["A0000000X"], ValueError)
+    data, meta = results["A84423050A"]
+    assert isinstance(data.index, pd.DatetimeIndex) and len(data) == 24 and data.iloc[0] == pytest.approx(3.5)
+    assert meta["title"] == "Unemployment rate ; Persons ;" and meta.name == "A84423050A"
+    assert len(reads) == 1 and managed == [[reads[0]]]
+    with pytest.raises(ValueError):
+        absr.abs_download_batch_with_r([" ", ""])
+
+
+def test_abs_single_series_goes_through_the_worker(abs_stub, tmp_path):
+    worker, managed, reads = abs_stub
+    data, meta = _quiet(absr.abs_download_with_r, "A84423043C", save_path=str(tmp_path))
+    assert data.iloc[-1] == pytest.approx(14e6 + 23000)
+    with pytest.raises(ValueError, match="No series"):
+        _quiet(absr.abs_download_with_r, "A0000000X", save_path=str(tmp_path))
+    assert worker.restarts == 0
+
+
+def test_rba_series_and_worker_errors(stub_script, monkeypatch):
+    w = absr.RWorker(script=stub_script, rscript=sys.executable)
+    monkeypatch.setattr(absr, "get_r_worker", lambda: w)
+    try:
+        df = absr.get_rba_series("FIRMMCRTD", save_path="/tmp")
+        assert df.to_dict("records") == [{"date": "2024-01-31", "value": 4.35, "series_id": "FIRMMCRTD"}]
+        with pytest.raises(ValueError, match="R worker error"):
+            absr._rba_call("fail", {})
+    finally:
+        w.close()
+
+
+def benchmark(n_jobs: int = 20, startup: float = 0.5):
+    print(f"Benchmark: {n_jobs} jobs, worker startup {startup * 1000:.0f}ms (stands in for Rscript + package loading)")
+    with tempfile.TemporaryDirectory() as folder:
+        script = os.path.join(folder, "r_worker_stub.py")
+        with open(script, "w") as f:
+            f.write(STUB_SOURCE)
+        os.environ["STUB_STARTUP"] = str(startup)
+        try:
+            t0 = time.perf_counter()
+            for i in range(n_jobs):
+                w = absr.RWorker(script=script, rscript=sys.executable)
+                w.call("echo", {"i": i}); w.close()
+            t_old = time.perf_counter() - t0
+            w = absr.RWorker(script=script, rscript=sys.executable)
+            t0 = time.perf_counter()
+            for i in range(n_jobs):
+                w.call("echo", {"i": i})
+            t_new = time.perf_counter() - t0
+            w.close()
+        finally:
+            del os.environ["STUB_STARTUP"]
+    print(f"  process per job {t_old:.2f}s, persistent worker {t_new:.2f}s (incl. one startup), {t_old / t_new:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests for the persistent R worker against a stub worker, and a benchmark.")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--startup", type=float, default=0.5, help="Simulated worker startup time, seconds")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.jobs, args.startup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/, stats.py imports its siblings directly.
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+for p in (repo_root, os.path.join(repo_root, "MacroBackend")):
+    if p not in sys.path:
+        sys.path.append(p)
+
+import stats
+
+
+#### The per-window implementations that rolling_corr/rolling_qd replaced, kept here as the reference.
+def legacy_rolling_qd(series1: pd.Series, series2: pd.Series, window: int = 1) -> pd.Series:
+    if len(series1) != len(series2):
+        raise ValueError("Series must have the same length")
+    rolling_corrs = []
+    for i in range(window - 1, len(series1)):
+        rolling_corrs.append(stats.qd_corr(series1[i - (window - 1):i + 1], series2[i - (window - 1):i + 1]))
+    return pd.Series(rolling_corrs, index=series1.index[window - 1:])
+
+
+def legacy_rolling_corr(series1: pd.Series, series2: pd.Series, window: int, method: str = "pearson") -> pd.Series:
+    common_idx = series1.index.intersection(series2.index)
+    s1 = series1.loc[common_idx]
+    s2 = series2.loc[common_idx]
+    return pd.Series(index=common_idx, data=[s1.iloc[i-window:i].corr(s2.iloc[i-window:i], method=method)
+                                             if i >= window else np.nan for i in range(len(common_idx))])
+
+
+def _pair(n: int = 1500, seed: int = 0, nan_frac: float = 0.0, level: float = 0.0) -> tuple:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2000-01-03", periods=n, freq="B")
+    a = rng.standard_normal(n).cumsum() + level
+    b = 0.6 * a + rng.standard_normal(n).cumsum() + level
+    s1 = pd.Series(a, index=idx, name="a"); s2 = pd.Series(b, index=idx, name="b")
+    if nan_frac:
+        s1[rng.random(n) < nan_frac] = np.nan
+        s2[rng.random(n) < nan_frac] = np.nan
+    return s1, s2
+
+
+@pytest.mark.parametrize("window", [2, 5, 30, 250])
+@pytest.mark.parametrize("nan_frac", [0.0, 0.05])
+def test_rolling_corr_matches_legacy(window, nan_frac):
+    s1, s2 = _pair(800, seed=window, nan_frac=nan_frac)
+    pd.testing.assert_series_equal(stats.rolling_corr(s1, s2, window), legacy_rolling_corr(s1, s2, window),
+                                   check_names=False, rtol=1e-9, atol=1e-10)
+
+
+def test_rolling_corr_stable_on_large_offsets_and_flat_windows():
+    # Large levels make Sxx - Sx²/n cancel badly, flat stretches have zero variance.
+    s1, s2 = _pair(600, seed=7, level=1e6)
+    s1.iloc[100:140] = s1.iloc[100]
+    s2.iloc[300:320] = 5.0
+    for window in (10, 60):
+        pd.testing.assert_series_equal(stats.rolling_corr(s1, s2, window), legacy_rolling_corr(s1, s2, window),
+                                       check_names=False, rtol=1e-7, atol=1e-8)
+
+
+def test_rolling_corr_misaligned_indexes():
+    s1, s2 = _pair(500, seed=3)
+    s2 = s2.iloc[40:].drop(s2.index[100:110])
+    pd.testing.assert_series_equal(stats.rolling_corr(s1, s2, 20), legacy_rolling_corr(s1, s2, 20),
+                                   check_names=False, rtol=1e-9, atol=1e-10)
+
+
+def test_rolling_corr_spearman_unchanged():
+    s1, s2 = _pair(200, seed=4)
+    pd.testing.assert_series_equal(stats.rolling_corr(s1, s2, 15, method="spearman"),
+                                   legacy_rolling_corr(s1, s2, 15, method="spearman"), check_names=False)
+
+
+@pytest.mark.parametrize("window", [1, 7, 90])
+def test_rolling_qd_matches_legacy(window):
+    s1, s2 = _pair(600, seed=window, nan_frac=0.03)
+    r1, r2 = np.log(s1.abs() + 1).diff(), np.log(s2.abs() + 1).diff()
+    pd.testing.assert_series_equal(stats.rolling_qd(r1, r2, window), legacy_rolling_qd(r1, r2, window),
+                                   rtol=1e-9, atol=1e-12)
+
+
+def test_windows_functions_match_single_window():
+    s1, s2 = _pair(700, seed=11, nan_frac=0.02)
+    windows = [30, 90, 180, 365]
+    frame = stats.rolling_corr_windows(s1, s2, windows)
+    qd = stats.rolling_qd_windows(s1, s2, windows)
+    for w in windows:
+        pd.testing.assert_series_equal(frame[w], stats.rolling_corr(s1, s2, w), check_names=False)
+        pd.testing.assert_series_equal(qd[w], stats.rolling_qd(s1, s2, w))
+
+
+def test_rolling_qd_length_mismatch_raises():
+    s1, s2 = _pair(50)
+    with pytest.raises(ValueError):
+        stats.rolling_qd(s1, s2.iloc[:40], 5)
+
+
+def benchmark(n: int = 20 * 260, windows=(30, 90, 180, 365)):
+    s1, s2 = _pair(n, seed=1)
+    print(f"Benchmark: {n} points (~{n // 260} years of business days)")
+    print(f"{'window':>8} {'legacy corr':>12} {'new corr':>10} {'legacy qd':>10} {'new qd':>10}")
+    for w in windows:
+        t0 = time.perf_counter(); legacy_rolling_corr(s1, s2, w); t_lc = time.perf_counter() - t0
+        t0 = time.perf_counter(); stats.rolling_corr(s1, s2, w); t_nc = time.perf_counter() - t0
+        t0 = time.perf_counter(); legacy_rolling_qd(s1, s2, w); t_lq = time.perf_counter() - t0
+        t0 = time.perf_counter(); stats.rolling_qd(s1, s2, w); t_nq = time.perf_counter() - t0
+        print(f"{w:>8} {t_lc:>11.3f}s {t_nc:>9.4f}s {t_lq:>9.3f}s {t_nq:>9.4f}s")
+    t0 = time.perf_counter(); stats.rolling_corr_windows(s1, s2, list(windows)); t_all = time.perf_counter() - t0
+    print(f"All windows in one pass with rolling_corr_windows: {t_all:.4f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Equivalence tests and benchmark for the vectorized rolling stats.")
+    parser.add_argument("--n", type=int, default=20 * 260, help="Number of points in the benchmark series")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.n)
+
+
+if __name__ == "__main__":
+    main()
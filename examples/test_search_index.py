@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import Utilities
+
+WORDS = ["gross", "domestic", "product", "consumer", "price", "index", "CPI", "PCE", "personal", "income", "real",
+         "employment", "payrolls", "nonfarm", "manufacturing", "PMI", "exports", "imports", "U.S.", "S&P", "yield",
+         "treasury", "10-year", "inflation", "wages", "housing", "starts", "retail", "sales", "M2", "money", "supply"]
+
+
+def synthetic_index(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    """A source index table shaped like the BEA/ABS ones: an id, a title and a units column."""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS, dtype=object)
+    picks = rng.integers(0, len(words), size=(n, 5))
+    titles = [" ".join(words[row]) for row in picks]
+    ids = [f"SER{i:06d}{w[:3].upper()}" for i, w in enumerate(words[picks[:, 0]])]
+    units = rng.choice(np.array(["Index 2017=100", "Millions of Dollars", "Percent", "Thousands"], dtype=object), size=n)
+    return pd.DataFrame({"id": ids, "title": titles, "units": units}, index=pd.RangeIndex(n, name="row"))
+
+
+def reference(df: pd.DataFrame, term: str) -> pd.DataFrame:
+    """What the GUI search returned before the index: Search_DF_np over the columns."""
+    out = Utilities.Search_DF_np(df, term, index_or_cols="columns", verbose=False)
+    return out
+
+
+@pytest.fixture(scope="module")
+def table():
+    return synthetic_index()
+
+
+@pytest.fixture(scope="module")
+def index(table):
+    return Utilities.SearchIndex(table)
+
+
+@pytest.mark.parametrize("term", ["PI", "cpi", "rice", "gross dom", "domestic product", "consumer, price", "U.S.",
+                                  "S&P", "10-year", "ear yie", "SER0001", "dollars", "M2, money, supply", "nothing here",
+                                  "pay*rolls", "^gross", "(PMI|PCE)", "x"])
+def test_matches_search_df_np(table, index, term):
+    got = index.search(term)
+    ref = reference(table, term)
+    assert list(got.index) == list(ref.index)
+
+
+def test_substring_inside_token(index):
+    # "PI" must find titles containing "CPI" and "PMI" is not a match, as with str.contains.
+    res = index.search("PI")
+    titles = res["title"].str.lower()
+    assert titles.str.contains("cpi").any()
+    assert titles.str.contains("pi").all()
+
+
+def test_term_is_matched_as_a_whole_within_one_cell(table):
+    df = pd.DataFrame({"title": ["gross output", "domestic product"], "units": ["domestic", "gross"]})
+    idx = Utilities.SearchIndex(df)
+    # Both tokens are in each row, but never as the contiguous phrase in one cell.
+    assert idx.search("gross domestic").empty
+    assert list(idx.search("gross, domestic").index) == [0, 1]
+
+
+def test_search_cols_restricts_columns(table):
+    idx = Utilities.SearchIndex(table, search_cols=["id"])
+    assert idx.search("consumer").empty
+    assert len(idx.search("ser00001")) == 10
+
+
+def test_load_search_index_reuses_until_file_changes(tmp_path, table):
+    path = str(tmp_path / "index.csv")
+    table.to_csv(path)
+    first = Utilities.load_search_index(path)
+    assert Utilities.load_search_index(path) is first
+    time.sleep(0.01)
+    table.iloc[:10].to_csv(path)
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    second = Utilities.load_search_index(path)
+    assert second is not first and len(second.df) == 10
+
+
+def benchmark(n: int = 500_000, queries=("gross domestic", "PI", "consumer, price, index", "treasury yield", "pay*rolls")):
+    df = synthetic_index(n, seed=1)
+    print(f"Benchmark: synthetic index with {n} rows")
+    t0 = time.perf_counter(); idx = Utilities.SearchIndex(df); t_build = time.perf_counter() - t0
+    print(f"  index build: {t_build:.2f}s (once per file)")
+    print(f"{'query':>26} {'rows':>8} {'Search_DF_np':>13} {'SearchIndex':>12} {'repeat':>10}")
+    for q in queries:
+        t0 = time.perf_counter(); ref = reference(df, q); t_ref = time.perf_counter() - t0
+        t0 = time.perf_counter(); got = idx.search_rows(q); t_idx = time.perf_counter() - t0
+        t0 = time.perf_counter(); idx.search_rows(q); t_rep = time.perf_counter() - t0
+        assert len(got) == len(ref)
+        print(f"{q:>26} {len(got):>8} {t_ref:>12.3f}s {t_idx * 1000:>10.1f}ms {t_rep * 1000:>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for Utilities.SearchIndex.")
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows in the synthetic benchmark index")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.rows)
+
+
+if __name__ == "__main__":
+    main()
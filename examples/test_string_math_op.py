@@ -0,0 +1,208 @@
+import os
+import re
+import sys
+import time
+import argparse
+import operator
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import Utilities
+from MacroBackend.Utilities import StringMathOp, compile_expression
+
+
+class LegacyStringMathOp:
+    """StringMathOp as it was before the expression compiler: brackets evaluated recursively, then the operators
+    applied pair by pair on Series, in order of precedence. Kept here as the reference."""
+    def __init__(self, data: pd.DataFrame, components: list, indexes: list):
+        self.operators = {'+': (operator.add, 1), '-': (operator.sub, 1), '*': (operator.mul, 2), '/': (operator.truediv, 2)}
+        self.Data = data
+        self.colMap = dict(zip(indexes, components))
+        self.counter = 0
+
+    def op(self, MathOpStr: list) -> pd.Series:
+        for precedence in [2, 1]:
+            x = 0
+            while x < len(MathOpStr):
+                if isinstance(MathOpStr[x], str) and MathOpStr[x] in self.operators and self.operators[MathOpStr[x]][1] == precedence:
+                    if x == 0 or x >= len(MathOpStr)-1:
+                        raise ValueError(f"Invalid operator position: {MathOpStr[x]}")
+                    result = self.operators[MathOpStr[x]][0](MathOpStr[x-1], MathOpStr[x+1])
+                    MathOpStr[x-1] = pd.Series(result, name=f"RES_{self.counter}")
+                    del MathOpStr[x:x+2]
+                    continue
+                x += 1
+        if len(MathOpStr) != 1:
+            raise ValueError(f"Invalid expression, multiple terms remain: {MathOpStr}")
+        return MathOpStr[0]
+
+    def func(self, MathOpStr: str) -> pd.Series:
+        df = self.Data
+        results = {}; tokens = []
+        while '(' in MathOpStr:
+            start = MathOpStr.rfind('('); end = MathOpStr.find(')', start)
+            if end == -1:
+                raise ValueError("Missing closing parenthesis")
+            results[f'RES_{self.counter}'] = self.func(MathOpStr[start+1:end])
+            MathOpStr = MathOpStr[:start] + f'RES_{self.counter}' + MathOpStr[end+1:]
+            self.counter += 1
+        for token in re.split(r'(\W)', MathOpStr):
+            if not token or token.isspace():
+                continue
+            if token in self.operators:
+                tokens.append(token)
+            elif token in results:
+                tokens.append(results[token])
+            elif token.isdigit():
+                try:
+                    tokens.append(df[self.colMap[int(token)]])
+                except KeyError:
+                    raise ValueError(f"Invalid column reference: {token}")
+        result = self.op(tokens)
+        return pd.Series(result, index=df.index, name=result.name)
+
+
+def _components(n: int = 500, k: int = 5, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(rng.uniform(0.5, 50, size=(n, k)), columns=[f"T{i}" for i in range(1, k + 1)],
+                        index=pd.date_range("2015-01-01", periods=n, freq="h"))
+    data.iloc[::37, 1] = np.nan
+    return data
+
+
+def _evaluate(cls, data: pd.DataFrame, expression: str) -> pd.Series:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return cls(data, list(data.columns), list(range(1, len(data.columns) + 1))).func(expression)
+
+
+def random_expression(rng, n_refs: int = 5) -> str:
+    """Random expression over component references with single level brackets, the grammar the legacy evaluator
+    handled (a bracket inside a bracket lost the inner result there, see test_nested_brackets)."""
+    def flat(k):
+        expr = str(rng.integers(1, n_refs + 1))
+        for _ in range(k - 1):
+            expr += f" {rng.choice(list('+-*/'))} {rng.integers(1, n_refs + 1)}"
+        return expr
+    terms = [f"({flat(rng.integers(2, 4))})" if rng.random() < 0.4 else flat(rng.integers(1, 3)) for _ in range(rng.integers(1, 5))]
+    expr = terms[0]
+    for term in terms[1:]:
+        expr += f" {rng.choice(list('+-*/'))} {term}"
+    return expr
+
+
+@pytest.mark.parametrize("expression", ["1 + 2", "1 - 2 - 3", "1 / 2 / 3", "1 + 2 * 3", "(1 + 2) * 3", "1*2+3*4-5/1",
+                                        "(1 + 2) / (3 - 4) * 5", "(1)", "2", "1/(2-3*4+5)"])
+def test_matches_legacy_on_fixed_expressions(expression):
+    data = _components()
+    np.testing.assert_allclose(_evaluate(StringMathOp, data, expression), _evaluate(LegacyStringMathOp, data, expression),
+                               rtol=1e-12, equal_nan=True)
+
+
+def test_matches_legacy_on_random_expressions():
+    data = _components(300)
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        expression = random_expression(rng)
+        got = _evaluate(StringMathOp, data, expression)
+        ref = _evaluate(LegacyStringMathOp, data, expression)
+        np.testing.assert_allclose(got, ref, rtol=1e-12, equal_nan=True, err_msg=expression)
+        assert got.index.equals(data.index)
+
+
+def test_nested_brackets():
+    data = _components(100)
+    a, b, c, d, e = (data[col].to_numpy() for col in data.columns)
+    expected = {"((1 + 2) / (3 - 4)) * 5": (a + b) / (c - d) * e, "(((1)))": a, "1/(2-(3*(4+5)))": a / (b - c * (d + e))}
+    for expression, values in expected.items():
+        np.testing.assert_allclose(_evaluate(StringMathOp, data, expression), values, rtol=1e-12, equal_nan=True)
+        with pytest.raises(ValueError):  # the legacy evaluator dropped inner results of nested brackets
+            _evaluate(LegacyStringMathOp, data, expression)
+
+
+def test_constants_unary_minus_and_folding():
+    data = _components(50)
+    a, b = data["T1"].to_numpy(), data["T2"].to_numpy()
+    np.testing.assert_allclose(_evaluate(StringMathOp, data, "-1 + 2"), -a + b, equal_nan=True)
+    np.testing.assert_allclose(_evaluate(StringMathOp, data, "1 * -(2 - 1)"), a * -(b - a), equal_nan=True)
+    np.testing.assert_allclose(_evaluate(StringMathOp, data, "(1 + 2) / 2.0 * 100.0"), (a + b) / 2 * 100, equal_nan=True)
+    assert compile_expression("1 * (2.0 * 50.0 - .5)").source == "(c1 * (99.5))"
+    assert compile_expression("--1").source == "(-(-c1))"
+    np.testing.assert_allclose(_evaluate(StringMathOp, data, "3.0 / 4.0"), np.full(50, 0.75))
+    assert np.isinf(_evaluate(StringMathOp, data, "1.0 / 0.0")).all()
+
+
+def test_references_and_result_naming():
+    data = _components(20)
+    compiled = compile_expression("3 * (1 + 3) - 2")
+    assert compiled.refs == [3, 1, 2] and compile_expression("3 * (1 + 3) - 2") is compiled
+    op = StringMathOp(data, list(data.columns), [1, 2, 3, 4, 5])
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = op.func("1 + 2"); second = op.func("1")
+    assert (first.name, second.name) == ("RES_0", "RES_1")
+    second.iloc[0] = -1.0
+    assert data["T1"].iloc[0] != -1.0  # a bare reference is a copy, not a view of the column
+
+
+@pytest.mark.parametrize("expression,message", [("(1 + 2", "Unbalanced"), ("1 + 2)", "Unbalanced"), ("1 +", "ends with"),
+                                                ("* 1", "operator position"), ("1 2", "unexpected"), ("1 & 2", "Invalid character"),
+                                                ("9 + 1", "Invalid column reference"), ("", "Empty"), ("()", "operator position")])
+def test_errors_are_value_errors(expression, message):
+    with pytest.raises(ValueError, match=message):
+        _evaluate(StringMathOp, _components(10), expression)
+
+
+def test_numexpr_path_matches_numpy(monkeypatch):
+    pytest.importorskip("numexpr")
+    data = _components(2000)
+    expression = "((1 + 2) / (3 - 4) * 5 - 2.0) / -1"
+    monkeypatch.setattr(Utilities, "NUMEXPR_MIN_ROWS", 10**9)
+    plain = _evaluate(StringMathOp, data, expression)
+    monkeypatch.setattr(Utilities, "NUMEXPR_MIN_ROWS", 0)
+    np.testing.assert_allclose(_evaluate(StringMathOp, data, expression), plain, rtol=1e-12, equal_nan=True)
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def benchmark(n_rows: int = 1_000_000, n_calls: int = 200):
+    expression = "(1 + 2) * (3 - 4) / 5 + (1 - 3) * 2 / (2 + 4)"
+    print(f"Benchmark: StringMathOp on '{expression}' "
+          f"(numexpr {'on' if Utilities.NUMEXPR_AVAILABLE else 'not installed'})")
+    data = _components(n_rows)
+    t_old = _best(lambda: _evaluate(LegacyStringMathOp, data, expression))
+    t_new = _best(lambda: _evaluate(StringMathOp, data, expression))
+    print(f"  {n_rows} rows: legacy {t_old * 1000:.1f}ms, compiled {t_new * 1000:.1f}ms, {t_old / t_new:.1f}x")
+    small = _components(250)
+    t_old = _best(lambda: [_evaluate(LegacyStringMathOp, small, expression) for _ in range(n_calls)], 1)
+    t_new = _best(lambda: [_evaluate(StringMathOp, small, expression) for _ in range(n_calls)], 1)
+    print(f"  {n_calls} calls on 250 rows: legacy {t_old * 1000:.0f}ms, compiled {t_new * 1000:.0f}ms, {t_old / t_new:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grammar & equivalence tests and benchmark for StringMathOp.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.rows)
+
+
+if __name__ == "__main__":
+    main()
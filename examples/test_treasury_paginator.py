@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+import pytest
+import requests
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import PriceImporter
+
+ACCOUNTS = ["Treasury General Account (TGA) Closing Balance", "Treasury General Account (TGA) Opening Balance",
+            "Federal Reserve Account"]
+
+
+def dts_records(n_days: int = 1500) -> list:
+    """Rows shaped like the DTS operating_cash_balance table, three account types per day."""
+    days = pd.bdate_range("2018-01-02", periods=n_days).strftime("%Y-%m-%d")
+    return [{"record_date": d, "account_type": a, "close_today_bal": str(1000 + i), "open_today_bal": str(900 + i),
+             "open_month_bal": "null"} for i, d in enumerate(days) for a in ACCOUNTS]
+
+
+class PagedTreasuryStub(object):
+    """Local HTTP server serving records in pages like the fiscaldata API (data + meta total-count/total-pages).
+    Counts requests and peak concurrent requests, adds latency and can fail given pages (503) a number of times."""
+
+    def __init__(self, records: list, latency: float = 0.05, fail: dict = None, meta_pages: bool = True):
+        self.records = records
+        self.latency = latency
+        self.fail = dict(fail or {})
+        self.meta_pages = meta_pages
+        self.requests = 0; self.active = 0; self.peak = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:%d/services/api/fiscal_service" % self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _handle(self, h):
+        q = parse_qs(urlparse(h.path).query)
+        page = int(q.get("page[number]", ["1"])[0]); size = int(q.get("page[size]", ["100"])[0])
+        with self.lock:
+            self.requests += 1; self.active += 1
+            self.peak = max(self.peak, self.active)
+            failing = self.fail.get(page, 0) > 0
+            if failing:
+                self.fail[page] -= 1
+        try:
+            time.sleep(self.latency)
+            if failing:
+                h.send_response(503); h.end_headers()
+                return
+            rows = self.records
+            for f in q.get("filter", []):
+                field, op, value = f.split(":", 2)
+                rows = [r for r in rows if (r[field] >= value if op == "gte" else r[field] <= value)]
+            total_pages = (len(rows) + size - 1) // size
+            meta = {"count": 0, "total-count": len(rows)}
+            if self.meta_pages:
+                meta["total-pages"] = total_pages
+            data = rows[(page - 1) * size:page * size]
+            meta["count"] = len(data)
+            body = json.dumps({"data": data, "meta": meta}).encode()
+            h.send_response(200)
+            h.send_header("Content-Type", "application/json"); h.send_header("Content-Length", str(len(body)))
+            h.end_headers()
+            h.wfile.write(body)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def close(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def records():
+    return dts_records(400)
+
+
+def _pull(stub, **kwargs):
+    kwargs.setdefault("page_size", 100)
+    return PriceImporter.treasury_api_paginated(endpoint="/v1/accounting/dts/operating_cash_balance", start_date="2000-01-01",
+                                                session=requests.Session(), base_url=stub.url, **kwargs)
+
+
+def test_all_pages_assembled_in_order(records):
+    stub = PagedTreasuryStub(records)
+    try:
+        data = _pull(stub, max_workers=6)
+    finally:
+        stub.close()
+    pd.testing.assert_frame_equal(data, pd.DataFrame(records))
+    assert stub.requests == 12
+    assert stub.peak > 1
+
+
+def test_total_count_fallback_without_total_pages(records):
+    stub = PagedTreasuryStub(records, meta_pages=False)
+    try:
+        data = _pull(stub)
+    finally:
+        stub.close()
+    assert len(data) == len(records) and stub.requests == 12
+
+
+def test_date_filter_is_passed_through(records):
+    stub = PagedTreasuryStub(records)
+    try:
+        data = PriceImporter.treasury_api_paginated(endpoint="/v1/accounting/dts/operating_cash_balance", start_date="2018-03-01",
+                                                    end_date="2018-03-31", page_size=10, session=requests.Session(), base_url=stub.url)
+    finally:
+        stub.close()
+    assert data["record_date"].min() >= "2018-03-01" and data["record_date"].max() <= "2018-03-31"
+    assert len(data) == len([r for r in records if "2018-03-01" <= r["record_date"] <= "2018-03-31"])
+
+
+def test_transient_failure_is_retried(records):
+    stub = PagedTreasuryStub(records, fail={4: 1})
+    try:
+        data = _pull(stub)
+    finally:
+        stub.close()
+    assert len(data) == len(records)
+    assert stub.requests == 13
+
+
+def test_failed_page_truncates_without_gap(records):
+    stub = PagedTreasuryStub(records, fail={5: 10})
+    try:
+        data = _pull(stub, max_retries=2)
+    finally:
+        stub.close()
+    pd.testing.assert_frame_equal(data, pd.DataFrame(records[:400]))
+
+
+def test_first_page_failure_returns_empty(records):
+    stub = PagedTreasuryStub(records, fail={1: 10})
+    try:
+        data = _pull(stub, max_retries=1)
+    finally:
+        stub.close()
+    assert data.empty
+
+
+def test_pull_tga_data(monkeypatch, records):
+    stub = PagedTreasuryStub(records, latency=0.0)
+    monkeypatch.setattr(PriceImporter, "TREASURY_API_URL", stub.url)
+    try:
+        tga = PriceImporter.PullTGA_Data(AccountName=ACCOUNTS[0], start_date="2000-01-01")
+    finally:
+        stub.close()
+    assert len(tga) == 400 and (tga["account_type"] == ACCOUNTS[0]).all()
+    assert tga.index.name == "record_date" and tga.index.is_monotonic_increasing
+
+
+def benchmark(n_days: int = 6000, latency: float = 0.1, page_size: int = 1000):
+    records = dts_records(n_days)
+    print(f"Benchmark: {len(records)} records, {page_size} per page, {latency * 1000:.0f}ms per request")
+    for workers in (1, 6):
+        stub = PagedTreasuryStub(records, latency=latency)
+        t0 = time.perf_counter()
+        data = _pull(stub, page_size=page_size, max_workers=workers)
+        elapsed = time.perf_counter() - t0
+        stub.close()
+        print(f"  max_workers={workers}: {elapsed:.2f}s, {stub.requests} requests, {len(data)} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and benchmark for PriceImporter.treasury_api_paginated.")
+    parser.add_argument("--days", type=int, default=6000)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.days, args.latency)
+
+
+if __name__ == "__main__":
+    main()
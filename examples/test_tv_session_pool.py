@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend.tvDatafeedz.main import TVFrameParser, BarBuffer, TVSessionPool, collect_bars, ws_message
+
+ws_sync = pytest.importorskip("websockets.sync.server")
+
+# The hello packet TV sends when a socket opens. It is not JSON-RPC, the client just has to skip it.
+_HELLO_BODY = json.dumps({"session_id": "<0.1373.2139>_sfo-charts-free-1-webchart-4@sfo-compute-1_x", "timestamp": 1707000000,
+                          "release": "registry.xtools.tv/tvbs_release/webchart:release_207-21", "protocol": "json",
+                          "javastudies": ["3.66"]})
+HELLO = "~m~%d~m~%s" % (len(_HELLO_BODY), _HELLO_BODY)
+
+
+def _bars(symbol: str, n: int) -> list:
+    """Deterministic daily bars for a symbol: [ts, open, high, low, close, volume]."""
+    seed = sum(ord(c) for c in symbol)
+    rng = np.random.default_rng(seed)
+    start = int(pd.Timestamp("2020-01-01").timestamp())
+    close = 100 + rng.standard_normal(n).cumsum()
+    return [[start + 86400 * i, close[i] - 0.5, close[i] + 1.0, close[i] - 1.0, close[i], float(1000 + i)] for i in range(n)]
+
+
+def _series_frames(cs: str, symbol: str, n_bars: int, chunk: int = 37) -> list:
+    """Frames for one series: symbol_resolved, the bars in a timescale_update, series_completed. The packets are glued
+    together and cut into arbitrary chunks so that packets are split across websocket frames, as on the real socket."""
+    bars = [{"i": i, "v": v} for i, v in enumerate(_bars(symbol, n_bars))]
+    text = ws_message("symbol_resolved", [cs, "symbol_1", {"name": symbol.split(":")[-1], "type": "index"}])
+    text += ws_message("timescale_update", [cs, {"s1": {"node": "sfo", "s": bars, "ns": {"d": "", "indexes": []}}}, {}])
+    text += "~m~4~m~~h~7"
+    text += ws_message("series_completed", [cs, "s1", "s1_1", "streaming", {"rt_update_period": 1}])
+    return [text[i:i + chunk] for i in range(0, len(text), chunk)]
+
+
+class ReplayServer:
+    """Local websocket server that answers create_series requests by replaying TV style frames after a delay.
+    Counts connections and peak chart sessions open at once on one socket."""
+
+    def __init__(self, latency: float = 0.1, drop_first: bool = False, unknown: tuple = ()):
+        self.latency = latency
+        self.drop_first = drop_first
+        self.unknown = set(unknown)
+        self.connections = 0
+        self.peak_sessions = 0
+        self.heartbeats_echoed = 0
+        self.auth_tokens = []
+        self._lock = threading.Lock()
+        self.server = ws_sync.serve(self._handler, "127.0.0.1", 0)
+        self.url = "ws://127.0.0.1:%d" % self.server.socket.getsockname()[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _handler(self, ws):
+        with self._lock:
+            self.connections += 1
+            conn_no = self.connections
+        send_lock = threading.Lock()
+        symbols = {}; open_sessions = set()
+
+        def send(text):
+            with send_lock:
+                ws.send(text)
+
+        def reply(cs, symbol, n_bars):
+            time.sleep(self.latency)
+            try:
+                if symbol in self.unknown:
+                    send(ws_message("symbol_error", [cs, "symbol_1", "invalid symbol"]))
+                    return
+                # Packets may be split across frames, but a series' frames are never interleaved with another's.
+                with send_lock:
+                    for frame in _series_frames(cs, symbol, n_bars):
+                        ws.send(frame)
+            except Exception:
+                pass
+
+        send(HELLO)
+        parser = TVFrameParser()
+        try:
+            for text in ws:
+                for kind, msg in parser.feed(text):
+                    if kind == "heartbeat":
+                        self.heartbeats_echoed += 1
+                        continue
+                    if kind != "message":
+                        continue
+                    m, p = msg["m"], msg["p"]
+                    if m == "set_auth_token":
+                        self.auth_tokens.append(p[0])
+                    elif m == "chart_create_session":
+                        open_sessions.add(p[0])
+                        with self._lock:
+                            self.peak_sessions = max(self.peak_sessions, len(open_sessions))
+                    elif m == "chart_delete_session":
+                        open_sessions.discard(p[0])
+                    elif m == "resolve_symbol":
+                        symbols[p[0]] = json.loads(p[2][1:])["symbol"]
+                    elif m == "create_series":
+                        if self.drop_first and conn_no == 1:
+                            ws.close()
+                            return
+                        threading.Thread(target=reply, args=(p[0], symbols[p[0]], p[5]), daemon=True).start()
+        except Exception:
+            pass
+
+    def close(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def server():
+    srv = ReplayServer()
+    yield srv
+    srv.close()
+
+
+def _expected(symbol: str, n: int) -> pd.DataFrame:
+    buf = BarBuffer(n)
+    buf.add_series_update({"s1": {"s": [{"i": i, "v": v} for i, v in enumerate(_bars(symbol, n))]}})
+    return buf.to_frame(symbol)
+
+
+def test_parser_handles_split_packets_and_heartbeats():
+    frames = _series_frames("cs_test", "NASDAQ:AAPL", 50, chunk=5)
+    parser = TVFrameParser()
+    kinds = [kind for f in frames for kind, _ in parser.feed(f)]
+    assert kinds.count("heartbeat") == 1
+    assert kinds.count("message") == 3
+    assert parser._buf == ""
+
+
+def test_collect_bars_matches_replayed_series():
+    frames = iter(_series_frames("cs_test", "NASDAQ:AAPL", 300, chunk=64))
+    echoed = []
+    buf = collect_bars(lambda: next(frames), send=echoed.append)
+    pd.testing.assert_frame_equal(buf.to_frame("NASDAQ:AAPL"), _expected("NASDAQ:AAPL", 300))
+    assert echoed == ["~m~4~m~~h~7"]
+
+
+def test_pool_reuses_one_socket_for_many_series(server):
+    pool = TVSessionPool(size=1, sessions_per_socket=4, url=server.url, timeout=5)
+    try:
+        for sym in ["AAPL", "MSFT", "NVDA"]:
+            data = pool.get_hist(sym, "NASDAQ", n_bars=120, timeout=5)
+            pd.testing.assert_frame_equal(data, _expected(f"NASDAQ:{sym}", 120))
+    finally:
+        pool.close()
+    assert server.connections == 1
+    assert server.auth_tokens == ["unauthorized_user_token"]
+    assert server.heartbeats_echoed == 3
+
+
+def test_pool_multiplexes_concurrent_sessions(server):
+    server.latency = 0.3
+    pool = TVSessionPool(size=1, sessions_per_socket=8, url=server.url, timeout=5)
+    symbols = [f"SYM{i}" for i in range(8)]
+    out = {}
+
+    def pull(sym):
+        out[sym] = pool.get_hist(sym, "NYSE", n_bars=200, timeout=5)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=pull, args=(s,)) for s in symbols]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    pool.close()
+
+    assert server.connections == 1
+    assert server.peak_sessions > 1
+    assert elapsed < 0.3 * len(symbols) / 2
+    for sym in symbols:
+        pd.testing.assert_frame_equal(out[sym], _expected(f"NYSE:{sym}", 200))
+
+
+def test_pool_replaces_dropped_socket():
+    srv = ReplayServer(drop_first=True)
+    pool = TVSessionPool(size=1, url=srv.url, timeout=5)
+    try:
+        data = pool.get_hist("AAPL", "NASDAQ", n_bars=30, timeout=5, attempts=2)
+    finally:
+        pool.close(); srv.close()
+    assert srv.connections == 2
+    pd.testing.assert_frame_equal(data, _expected("NASDAQ:AAPL", 30))
+
+
+def test_pool_returns_none_for_unknown_symbol():
+    srv = ReplayServer(unknown=("NASDAQ:NOPE",))
+    pool = TVSessionPool(size=1, url=srv.url, timeout=5)
+    try:
+        assert pool.get_hist("NOPE", "NASDAQ", n_bars=10, timeout=5) is None
+        assert pool.get_hist("AAPL", "NASDAQ", n_bars=10, timeout=5) is not None
+    finally:
+        pool.close(); srv.close()
+    assert srv.connections == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
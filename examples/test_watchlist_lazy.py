@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import watchlist
+from MacroBackend.watchlist import Watchlist, LazyDatasets, sanitize_hdf_key
+
+
+def _series(name: str, periods: int = 500, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 + rng.standard_normal(periods).cumsum(), index=pd.date_range("2005-01-03", periods=periods, freq="B"),
+                     name=name)
+
+
+def stored_series(n: int, periods: int = 500) -> dict:
+    # Ids with characters that need the HDF key mapping, as real tickers do.
+    return {f"SER.{i:04d}:X" if i % 3 == 0 else f"SER{i:04d}": _series(f"S{i}", periods, seed=i) for i in range(n)}
+
+
+def make_watchlist(folder: str, stored: dict, storage: str = "hdf") -> Watchlist:
+    ids = list(stored)
+    wl_df = pd.DataFrame({"id": ids, "source": ["fred"] * len(ids), "title": [f"Title of {i}" for i in ids]}, index=ids)
+    meta = pd.DataFrame(index=watchlist.METADATA_INDEX, columns=ids, dtype=object)
+    wl = Watchlist(wl_df, meta, watchlist_name="lazy_test", watchlists_path=folder)
+    if storage == "parquet":
+        wl.storepath = watchlist.write_watchlist_parquet(stored, os.path.join(folder, "lazy_test.parquet"))
+    else:
+        wl.storepath = os.path.join(folder, "lazy_test.h5s")
+        with pd.HDFStore(wl.storepath, mode="w") as store:
+            for key, data in stored.items():
+                store.put(sanitize_hdf_key(key), data)
+            store["_key_mapping"] = pd.Series({sanitize_hdf_key(k): k for k in stored}, name="original_keys")
+    return wl
+
+
+class CountingLoader:
+    def __init__(self, data: dict, delay: float = 0.0):
+        self.data = data; self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key):
+        with self.lock:
+            self.calls.append(key)
+        time.sleep(self.delay)
+        return self.data[key].copy()
+
+
+def test_keys_len_and_membership_do_not_load():
+    loader = CountingLoader({k: _series(k) for k in "abc"})
+    lazy = LazyDatasets(list("abc"), loader)
+    assert len(lazy) == 3 and list(lazy) == ["a", "b", "c"] and "b" in lazy and "z" not in lazy
+    assert list(lazy.keys()) == ["a", "b", "c"]
+    assert loader.calls == [] and not lazy.is_loaded("a")
+    with pytest.raises(KeyError):
+        lazy["z"]
+    assert lazy.get("z") is None and loader.calls == []
+
+
+def test_first_access_loads_once_and_postprocesses():
+    loader = CountingLoader({k: _series(k) for k in "abc"})
+    lazy = LazyDatasets(list("abc"), loader, postprocess=lambda key, data: data.rename(f"title {key}"))
+    first = lazy["b"]
+    assert lazy["b"] is first and first.name == "title b"
+    assert loader.calls == ["b"] and lazy.loads == 1 and lazy.is_loaded("b") and not lazy.is_loaded("a")
+
+
+def test_lru_bound_evicts_and_reloads():
+    loader = CountingLoader({k: _series(k) for k in "abcd"})
+    lazy = LazyDatasets(list("abcd"), loader, cache_size=2)
+    lazy["a"]; lazy["b"]; lazy["a"]; lazy["c"]  # b is the least recently used when c comes in
+    assert lazy.is_loaded("a") and lazy.is_loaded("c") and not lazy.is_loaded("b")
+    lazy["b"]
+    assert loader.calls == ["a", "b", "c", "b"]
+
+
+def test_assigned_datasets_are_pinned_and_deleted_keys_gone():
+    loader = CountingLoader({k: _series(k) for k in "ab"})
+    lazy = LazyDatasets(list("ab"), loader, cache_size=1)
+    new = _series("n", seed=9)
+    lazy["new"] = new
+    lazy["a"]; lazy["b"]
+    assert lazy["new"] is new and "new" in lazy and len(lazy) == 3
+    del lazy["a"]
+    assert "a" not in lazy and list(lazy) == ["b", "new"]
+    with pytest.raises(KeyError):
+        del lazy["a"]
+
+
+def test_concurrent_first_access_loads_once():
+    loader = CountingLoader({"a": _series("a")}, delay=0.05)
+    lazy = LazyDatasets(["a"], loader)
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(lazy["a"])) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loader.calls == ["a"] and all(o is out[0] for o in out)
+
+
+@pytest.mark.parametrize("storage", ["hdf", "parquet"])
+def test_open_reads_no_datasets_and_matches_eager(tmp_path, storage):
+    if storage == "parquet":
+        pytest.importorskip("pyarrow")
+    stored = stored_series(30)
+    wl = make_watchlist(str(tmp_path), stored, storage)
+    wl.load_watchlist_data()
+    lazy = wl["watchlist_datasets"]
+    assert isinstance(lazy, LazyDatasets) and lazy.loads == 0
+    assert set(lazy) == set(stored)
+    picked = ["SER.0003:X", "SER0007"]
+    got = {k: lazy[k] for k in picked}
+    assert lazy.loads == 2
+    wl.load_watchlist_data(lazy=False)
+    eager = wl["watchlist_datasets"]
+    assert isinstance(eager, dict) and set(eager) == set(stored)
+    for k in picked:
+        assert isinstance(got[k].index, pd.DatetimeIndex)
+        np.testing.assert_allclose(got[k].to_numpy(), stored[k].to_numpy())
+        pd.testing.assert_series_equal(got[k], eager[k], check_freq=False)
+
+
+def test_save_after_lazy_open_keeps_every_dataset(tmp_path):
+    stored = stored_series(12)
+    wl = make_watchlist(str(tmp_path), stored)
+    wl.load_watchlist_data(cache_size=2)
+    wl["watchlist_datasets"]["SER0001"]
+    wl.save_watchlist(path=str(tmp_path))
+    with pd.HDFStore(wl.storepath, mode="r") as store:
+        assert len([k for k in store.keys() if not k.startswith("/_key_mapping")]) == 12
+
+
+def open_latency(n_series: int = 500, periods: int = 2500, storage: str = "hdf") -> dict:
+    """Seconds to open an n-series watchlist lazily and eagerly, and to then read two series lazily."""
+    out = {}
+    with tempfile.TemporaryDirectory() as folder:
+        wl = make_watchlist(folder, stored_series(n_series, periods), storage)
+        for lazy in (True, False):
+            t0 = time.perf_counter(); wl.load_watchlist_data(lazy=lazy)
+            out["lazy open" if lazy else "eager open"] = time.perf_counter() - t0
+            if lazy:
+                keys = list(wl["watchlist_datasets"])[:2]
+                t0 = time.perf_counter()
+                for k in keys:
+                    wl["watchlist_datasets"][k]
+                out["lazy, then 2 series"] = time.perf_counter() - t0
+    return out
+
+
+def test_lazy_open_is_faster_than_eager():
+    times = open_latency(120, 500)
+    assert times["lazy open"] < times["eager open"]
+
+
+def benchmark(n_series: int = 500, periods: int = 2500):
+    print(f"Benchmark: opening a {n_series}-series watchlist ({periods} observations each)")
+    import contextlib, io
+    for storage in ("hdf", "parquet"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            times = open_latency(n_series, periods, storage)
+        print(f"  {storage:>8}: " + ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in times.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests and open latency benchmark for lazily loaded watchlists.")
+    parser.add_argument("--series", type=int, default=500)
+    parser.add_argument("--periods", type=int, default=2500)
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.series, args.periods)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+pytest.importorskip("pyarrow")
+from MacroBackend import watchlist
+from MacroBackend.watchlist import datasets_to_long, long_to_datasets, write_watchlist_parquet, read_watchlist_parquet
+
+
+def _series(name: str, periods: int = 300, start: str = "2015-01-01", freq: str = "D", seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 + rng.standard_normal(periods).cumsum(), index=pd.date_range(start, periods=periods, freq=freq),
+                     name=name)
+
+
+def mixed_datasets() -> dict:
+    """Watchlist datasets of the kinds the sources return: plain series, OHLCV frames and frames with text columns."""
+    idx = pd.date_range("2020-01-01", periods=6, freq="MS")
+    ohlcv = pd.DataFrame({"Open": np.arange(6.0), "High": np.arange(6.0) + 1, "Low": np.arange(6.0) - 1,
+                          "Close": np.arange(6.0) + 0.5, "Volume": np.arange(6, dtype="int64") * 1000}, index=idx)
+    table = pd.DataFrame({"value": [1.5, np.nan, 2.5, 3.0, 4.0, 5.0],
+                          "status": ["final", "final", None, "preliminary", "final", "revised"],
+                          "flag": [True, False, True, True, False, False],
+                          "released": pd.to_datetime(["2020-02-03", "2020-03-02", None, "2020-05-04", "2020-06-01", "2020-07-01"]),
+                          "mixed": pd.Series([1, "n/a", 2.5, None, "(D)", 7], dtype=object, index=idx),
+                          "grade": pd.Categorical(["a", "b", "a", "c", "b", "a"]),
+                          "count": pd.array([1, 2, 3, 4, 5, 6], dtype="int32")}, index=idx)
+    placeholder = pd.Series(["Data pull timed out after 60 seconds.", "Timeout exceeded"], name="Timeout_XYZ",
+                            index=pd.date_range("2024-01-01", periods=2))
+    return {"SPX": _series("SPX"), "M2SL": _series("M2SL", 120, freq="MS", seed=1), "BTCUSD": ohlcv,
+            "release table": table, "XYZ": placeholder, "int_series": pd.Series(np.arange(5, dtype="int64"), name="n",
+                                                                                 index=pd.date_range("2024-01-01", periods=5))}
+
+
+def _assert_round_trip(got: dict, expected: dict):
+    assert set(got) == set(expected)
+    for key, exp in expected.items():
+        if isinstance(exp, pd.Series):
+            pd.testing.assert_series_equal(got[key], exp, check_freq=False)
+        else:
+            pd.testing.assert_frame_equal(got[key], exp, check_freq=False)
+
+
+def test_long_table_keeps_every_column():
+    data = mixed_datasets()
+    long, meta = datasets_to_long(data)
+    table = long[long["series_id"] == "release table"]
+    assert sorted(table["column"].unique()) == sorted(data["release table"].columns)
+    assert set(table.loc[table["column"] == "status", "text"].dropna()) == {"final", "preliminary", "revised"}
+    mixed = table[table["column"] == "mixed"]
+    assert mixed["value"].dropna().tolist() == [1.0, 2.5, 7.0] and mixed["text"].dropna().tolist() == ["n/a", "(D)"]
+    assert len(long) == sum(d.size for d in data.values())
+
+
+def test_round_trip_in_memory():
+    data = mixed_datasets()
+    _assert_round_trip(long_to_datasets(*datasets_to_long(data)), data)
+
+
+def test_round_trip_through_parquet(tmp_path):
+    data = mixed_datasets()
+    path = write_watchlist_parquet(data, str(tmp_path / "wl.parquet"))
+    _assert_round_trip(read_watchlist_parquet(path), data)
+
+
+def test_filters_on_ids_and_dates(tmp_path):
+    data = mixed_datasets()
+    path = write_watchlist_parquet(data, str(tmp_path / "wl.parquet"))
+    got = read_watchlist_parquet(path, ids=["release table", "SPX"], start_date="2020-03-01", end_date="2020-05-01")
+    assert set(got) == {"release table"}  # SPX has no observations in the range
+    pd.testing.assert_frame_equal(got["release table"], data["release table"].loc["2020-03-01":"2020-05-01"], check_freq=False)
+    got = read_watchlist_parquet(path, ids=["SPX"], start_date="2015-03-01")
+    pd.testing.assert_series_equal(got["SPX"], data["SPX"].loc["2015-03-01":], check_freq=False)
+
+
+def test_overwrite_is_atomic(tmp_path, monkeypatch):
+    path = str(tmp_path / "wl.parquet")
+    first = {"SPX": _series("SPX")}
+    write_watchlist_parquet(first, path)
+
+    def broken(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(watchlist.pq, "write_to_dataset", broken)
+    with pytest.raises(OSError):
+        write_watchlist_parquet(mixed_datasets(), path)
+    _assert_round_trip(read_watchlist_parquet(path), first)
+    assert os.listdir(tmp_path) == ["wl.parquet"]
+
+
+def synthetic_watchlist(n_series: int = 200, periods: int = 5000) -> dict:
+    return {f"SER{i:04d}": _series(f"SER{i:04d}", periods, start="2000-01-03", freq="B", seed=i) for i in range(n_series)}
+
+
+def _folder_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def benchmark(n_series: int = 200, periods: int = 5000, excel: bool = True):
+    data = synthetic_watchlist(n_series, periods)
+    print(f"Benchmark: {n_series} series x {periods} observations")
+    with tempfile.TemporaryDirectory() as folder:
+        def parquet_save(path):
+            write_watchlist_parquet(data, path)
+
+        def hdf_save(path):
+            with pd.HDFStore(path, mode="w") as store:
+                for key, s in data.items():
+                    store.put(watchlist.sanitize_hdf_key(key), s)
+
+        def hdf_load(path):
+            with pd.HDFStore(path, mode="r") as store:
+                return {k: store[k] for k in store.keys()}
+
+        def excel_save(path):
+            pd.DataFrame(data).to_excel(path)
+
+        formats = [("parquet", parquet_save, read_watchlist_parquet), ("hdf", hdf_save, hdf_load)]
+        if excel:
+            formats.append(("excel", excel_save, lambda p: pd.read_excel(p, index_col=0)))
+        for label, save, load in formats:
+            path = os.path.join(folder, "wl." + {"excel": "xlsx"}.get(label, label))
+            t0 = time.perf_counter(); save(path); t_save = time.perf_counter() - t0
+            t0 = time.perf_counter(); load(path); t_load = time.perf_counter() - t0
+            print(f"  {label:>8}: save {t_save:.2f}s, load {t_load:.2f}s, size {_folder_size(path) / 1e6:.1f}MB")
+        path = os.path.join(folder, "wl.parquet")
+        t0 = time.perf_counter(); read_watchlist_parquet(path, ids=["SER0007"], start_date="2015-01-01")
+        print(f"  parquet, one series from 2015: {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip tests and save/load benchmark for the watchlist Parquet backend.")
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--periods", type=int, default=5000)
+    parser.add_argument("--no-excel", action="store_true", help="Leave Excel out of the benchmark, it is slow")
+    parser.add_argument("--bench-only", action="store_true", help="Skip the tests")
+    args = parser.parse_args()
+    if not args.bench_only:
+        code = pytest.main([__file__, "-q"])
+        if code != 0:
+            sys.exit(code)
+    benchmark(args.series, args.periods, not args.no_excel)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ensure repo root is importable when run from examples/
+wd = os.path.dirname(__file__)
+repo_root = os.path.dirname(wd)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from MacroBackend import Pull_Data, watchlist
+from MacroBackend.watchlist import Watchlist, last_timestamp, is_placeholder, merge_series_delta, sanitize_hdf_key
+
+
+def _placeholder(eyed: str = "SPX", kind: str = "Timeout") -> pd.Series:
+    """Same shape as the placeholders get_watchlist_data stores for failed pulls."""
+    return pd.Series(["Data pull timed out after 60 seconds.", "Timeout exceeded", "Source: tv"],
+                     name=f"{kind}_{eyed}", index=[0, 1, 2])
+
+
+def _series(start: str, periods: int, name: str, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 + rng.standard_normal(periods).cumsum(), index=pd.date_range(start, periods=periods, freq="D"),
+                     name=name)
+
+
+def test_last_timestamp_ignores_placeholders():
+    ph = _placeholder()
+    assert is_placeholder(ph)
+    assert last_timestamp(ph) is None
+    # As read back from the store, after the index has been coerced to datetimes (1970 epoch) and the series renamed.
+    loaded = watchlist.coerce_datetime_index(ph.copy().rename("S&P 500"))
+    assert isinstance(loaded.index, pd.DatetimeIndex)
+    assert last_timestamp(loaded) is None
+
+
+def test_last_timestamp_index_types():
+    assert last_timestamp(None) is None
+    assert last_timestamp(pd.Series(dtype=float)) is None
+    assert last_timestamp(pd.Series([1.0, 2.0, 3.0])) is None  # RangeIndex is not read as epoch timestamps
+    assert last_timestamp(pd.Series([1.0, 2.0], index=["2024-01-01", "2024-02-01"])) == pd.Timestamp("2024-02-01")
+    s = _series("2024-01-01", 10, "x")
+    assert last_timestamp(s) == pd.Timestamp("2024-01-10")
+    assert last_timestamp(s.to_frame()) == pd.Timestamp("2024-01-10")
+
+
+def test_merge_series_delta_reports_revisions():
+    old = _series("2024-01-01", 30, "x")
+    new = old.iloc[-10:].copy()
+    new.iloc[2] += 5.0
+    new = pd.concat([new, _series("2024-01-31", 5, "x", seed=1)])
+    merged, new_rows, revisions = merge_series_delta(old, new)
+    assert len(merged) == 35 and len(new_rows) == 5
+    assert list(revisions.index) == [old.index[22]]
+    assert np.isclose(revisions.iloc[0], 5.0)
+    assert merged.loc[old.index[22]] == new.loc[old.index[22]]
+
+
+def _make_watchlist(tmp_path, stored: dict) -> Watchlist:
+    ids = list(stored)
+    wl_df = pd.DataFrame({"id": ids, "source": ["fred"] * len(ids), "title": ids}, index=ids)
+    meta = pd.DataFrame(index=watchlist.METADATA_INDEX, columns=ids, dtype=object)
+    wl = Watchlist(wl_df, meta, watchlist_name="refresh_test", watchlists_path=str(tmp_path))
+    wl.storepath = os.path.join(str(tmp_path), "refresh_test.h5s")
+    with pd.HDFStore(wl.storepath, mode="w") as store:
+        for key, data in stored.items():
+            store.put(sanitize_hdf_key(key), data, format="table" if not is_placeholder(data) else "fixed")
+        store["_key_mapping"] = pd.Series({sanitize_hdf_key(k): k for k in stored}, name="original_keys")
+    return wl
+
+
+def test_refresh_replaces_placeholder_instead_of_merging(tmp_path, monkeypatch):
+    real_old = _series("2024-01-01", 60, "GOOD")
+    full = _series("2000-01-01", 9000, "BAD", seed=3)
+    fresh = pd.concat([real_old.iloc[-20:], _series("2024-03-01", 3, "GOOD", seed=4)])
+    requested = {}
+
+    def fake_pull_many(jobs, **kwargs):
+        requested.update({k: j["start_date"] for k, j in jobs.items()})
+        return {"GOOD": {"data": fresh, "SeriesInfo": None, "error": None},
+                "BAD": {"data": full, "SeriesInfo": None, "error": None}}
+
+    monkeypatch.setattr(Pull_Data, "pull_many", fake_pull_many)
+    wl = _make_watchlist(tmp_path, {"GOOD": real_old, "BAD": _placeholder("BAD")})
+    report = wl.refresh_watchlist_data(overlap_days=30)
+
+    # The placeholder has no usable last timestamp: the whole history is asked for and it replaces the placeholder.
+    assert requested["BAD"] == "1600-01-01"
+    assert report.loc["BAD", "status"] == "replaced placeholder"
+    out = wl["watchlist_datasets"]["BAD"]
+    assert len(out) == len(full) and not is_placeholder(out)
+    assert pd.to_datetime(out.index).min() == full.index.min()
+    with pd.HDFStore(wl.storepath, mode="r") as store:
+        assert len(store[sanitize_hdf_key("BAD")]) == len(full)
+
+    assert report.loc["GOOD", "status"] == "appended"
+    assert report.loc["GOOD", "new_rows"] == 3
+    assert len(wl["watchlist_datasets"]["GOOD"]) == 63
+
+
+def test_refresh_builds_jobs_like_get_watchlist_data(tmp_path, monkeypatch):
+    # Index keys differ from the source ids, and the ABS row has no exchange, only a catalogue number.
+    wl_df = pd.DataFrame({"id": ["GDP", "A2304402X"], "source": ["fred", "abs_series"], "title": ["GDP", "ABS GDP"]},
+                         index=["us_gdp", "au_gdp"])
+    meta = pd.DataFrame(index=watchlist.METADATA_INDEX + ["Catalogue"], columns=wl_df.index, dtype=object)
+    meta.loc["Catalogue", "au_gdp"] = "5206.0"
+    wl = Watchlist(wl_df, meta, watchlist_name="jobs_test", watchlists_path=str(tmp_path))
+    stored = {"us_gdp": _series("2024-01-01", 60, "GDP"), "au_gdp": _series("2024-01-01", 60, "ABS GDP", seed=1)}
+    wl.storepath = os.path.join(str(tmp_path), "jobs_test.h5s")
+    with pd.HDFStore(wl.storepath, mode="w") as store:
+        for key, data in stored.items():
+            store.put(sanitize_hdf_key(key), data, format="table")
+        store["_key_mapping"] = pd.Series({sanitize_hdf_key(k): k for k in stored}, name="original_keys")
+    calls = []
+
+    def fake_pull_many(jobs, **kwargs):
+        calls.append({k: dict(j) for k, j in jobs.items()})
+        return {k: {"data": None, "SeriesInfo": None, "error": "offline"} for k in jobs}
+
+    monkeypatch.setattr(Pull_Data, "pull_many", fake_pull_many)
+    monkeypatch.setattr(Watchlist, "save_watchlist", lambda self, *a, **k: None)
+    wl.refresh_watchlist_data(id_list=["A2304402X", "GDP", "nowhere"])
+    wl.get_watchlist_data(id_list=["A2304402X", "GDP", "nowhere"])
+    refresh, full = calls
+    assert list(refresh) == list(full) == ["au_gdp", "us_gdp"]
+    assert refresh["au_gdp"]["exchange_code"] == full["au_gdp"]["exchange_code"] == "5206.0"
+    for key in refresh:
+        assert {k: v for k, v in refresh[key].items() if k != "start_date"} == {k: v for k, v in full[key].items() if k != "start_date"}
+
+
+def test_refresh_finds_the_store_save_watchlist_wrote(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    ids = ["SP500"]
+    wl_df = pd.DataFrame({"id": ids, "source": ["fred"], "title": ids}, index=ids)
+    meta = pd.DataFrame(index=watchlist.METADATA_INDEX, columns=ids, dtype=object)
+    wl = Watchlist(wl_df, meta, watchlist_name="my macro list", watchlists_path=str(tmp_path))
+    wl["watchlist_datasets"] = {"SP500": _series("2024-01-01", 30, "SP500")}
+    wl.save_watchlist(path=str(tmp_path))
+    assert wl.storepath == os.path.join(str(tmp_path), "my_macro_list", "my_macro_list.h5s")
+    wl.storepath = None
+
+    def no_full_pull(*args, **kwargs):
+        raise AssertionError("refresh fell back to a full pull")
+
+    monkeypatch.setattr(Watchlist, "get_watchlist_data", no_full_pull)
+    monkeypatch.setattr(Pull_Data, "pull_many", lambda jobs, **kwargs: {k: {"data": _series("2024-01-25", 10, "SP500"),
+                                                                          "SeriesInfo": None, "error": None} for k in jobs})
+    report = wl.refresh_watchlist_data(overlap_days=10)
+    assert report.loc["SP500", "new_rows"] == 4
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -4,6 +4,9 @@ Run:  uvicorn openbb_backend.main:app --host localhost --port 5050
 Then add http://localhost:5050 as a custom backend in OpenBB Pro.
 """
 import sys, os
+import asyncio, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure MacroBackend is importable
 backend_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,7 +17,7 @@ from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import pandas as pd
-from typing import Optional
+from typing import Optional, Callable, Any
 from MacroBackend import Pull_Data, Utilities
 from MacroBackend.BEA_Data import bea_data_mate
 
@@ -29,6 +32,102 @@ app.add_middleware(
 
 keys = Utilities.api_keys().keys
 
+# ──────────────────────────────────────────────
+# Worker pool & response cache
+# ──────────────────────────────────────────────
+# Data pulls are blocking (requests, file IO, pandas) so they run on a bounded thread pool rather than on the
+# event loop, otherwise one slow FRED/BEA fetch stalls every other widget. Finished responses are cached per
+# (endpoint, params) for a TTL, and identical requests that arrive while a fetch is running wait on that fetch.
+
+MAX_WORKERS = int(os.environ.get("BM_BACKEND_WORKERS", 8))
+CACHE_TTL = float(os.environ.get("BM_BACKEND_CACHE_TTL", 300))
+CACHE_SIZE = int(os.environ.get("BM_BACKEND_CACHE_SIZE", 256))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="bm_backend")
+
+
+def _cacheable(value) -> bool:
+    """Only real data is cached. None, empty results and {"error": ...} payloads are returned but not stored,
+    so a failed or empty pull is retried by the next request instead of being served until the TTL runs out."""
+    if value is None:
+        return False
+    if isinstance(value, dict) and "error" in value:
+        return False
+    if isinstance(value, (list, dict, pd.Series, pd.DataFrame)) and len(value) == 0:
+        return False
+    return True
+
+
+class ResponseCache(object):
+    """In-process TTL/LRU cache of endpoint results with coalescing of concurrent identical requests.
+    Results that fail the cacheable(value) check (default _cacheable) are not stored."""
+
+    def __init__(self, ttl: float = CACHE_TTL, maxsize: int = CACHE_SIZE, cacheable: Callable[[Any], bool] = _cacheable):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.cacheable = cacheable
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._inflight = {}             # key -> asyncio.Task
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value, ttl: float = None):
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def fetch(self, key, func: Callable[[], Any], ttl: float = None):
+        """Return the cached value for key, else run func on the worker pool. Exceptions are raised and, like
+        None/empty/error results, are not cached."""
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            loop = asyncio.get_running_loop()
+            task = loop.create_task(self._run(key, loop.run_in_executor(_executor, func), ttl))
+            self._inflight[key] = task
+        # shield so that a client disconnecting does not cancel the fetch other requests are waiting on.
+        return await asyncio.shield(task)
+
+    async def _run(self, key, fut, ttl):
+        try:
+            value = await fut
+            if self.cacheable(value):
+                self.put(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+response_cache = ResponseCache()
+
+
+@app.on_event("shutdown")
+def _shutdown_executor():
+    _executor.shutdown(wait=False)
+
+
+@app.exception_handler(Pull_Data.get_data_failure)
+async def _no_data_handler(request, exc):
+    return JSONResponse({"error": str(exc)}, status_code=404)
+
 # ──────────────────────────────────────────────
 # Widget registry
 # ──────────────────────────────────────────────
@@ -126,40 +225,44 @@ def _series_to_records(series: pd.Series, value_col: str = "value") -> list[dict
     return df.to_dict(orient="records")
 
 
+def _pull_records(source: str, data_code: str, start_date: str, value_col: str, **kwargs) -> list[dict]:
+    kwargs.setdefault("use_cache", Pull_Data.PULL_CACHE_ENABLED)
+    kwargs.setdefault("max_stale", Pull_Data.PULL_CACHE_MAX_STALE)
+    ds = Pull_Data.dataset()
+    ds.get_data(source=source, data_code=data_code, start_date=start_date, **kwargs)
+    if ds.data is None or str(getattr(ds.data, "name", "")).startswith(("Timeout_", "Error_")):
+        # Timed out/failed pulls come back as None or a placeholder Series of messages, neither is data.
+        raise Pull_Data.get_data_failure(f"No data returned for {data_code} from {source}.")
+    return _series_to_records(ds.data, value_col=value_col)
+
+
 @app.get("/fred_series")
 async def fred_series(series_id: str = "GDP", start_date: str = "2000-01-01"):
-    ds = Pull_Data.dataset()
-    ds.get_data(source="fred", data_code=series_id, start_date=start_date)
-    return JSONResponse(_series_to_records(ds.data, value_col=series_id))
+    records = await response_cache.fetch(("fred_series", series_id, start_date),
+                                         lambda: _pull_records("fred", series_id, start_date, series_id))
+    return JSONResponse(records)
 
 
 @app.get("/bea_series")
 async def bea_series(table_code: str = "T10101", series_code: str = "A191RL",
                      frequency: str = "Q"):
     data_code = f"NIPA|{table_code}|{series_code}"
-    ds = Pull_Data.dataset()
-    ds.get_data(source="bea", data_code=data_code, start_date="1900-01-01", data_freq=frequency)
-    return JSONResponse(_series_to_records(ds.data, value_col=series_code))
+    records = await response_cache.fetch(("bea_series", data_code, frequency),
+                                         lambda: _pull_records("bea", data_code, "1900-01-01", series_code, data_freq=frequency))
+    return JSONResponse(records)
 
 
 @app.get("/pull_series")
 async def pull_series(source: str = "fred", data_code: str = "GDP",
                       start_date: str = "2000-01-01"):
-    ds = Pull_Data.dataset()
-    ds.get_data(source=source, data_code=data_code, start_date=start_date)
-    return JSONResponse(_series_to_records(ds.data, value_col=data_code))
+    records = await response_cache.fetch(("pull_series", source, data_code, start_date),
+                                         lambda: _pull_records(source, data_code, start_date, data_code))
+    return JSONResponse(records)
 
 
-@app.get("/watchlist_view")
-async def watchlist_view(watchlist_name: str = ""):
+def _watchlist_rows(watchlist_name: str, wl_xlsx: str) -> list[dict]:
     from MacroBackend.watchlist import Watchlist
     wl = Watchlist(watchlist_name=watchlist_name)
-    wl_dir = os.path.join(project_root, "User_Data", "Watchlists")
-    wl_xlsx = os.path.join(wl_dir, watchlist_name, watchlist_name + ".xlsx")
-
-    if not os.path.exists(wl_xlsx):
-        return JSONResponse({"error": f"Watchlist '{watchlist_name}' not found at {wl_xlsx}"}, status_code=404)
-
     wl.load_watchlist(filepath=wl_xlsx)
     watchlist_df = wl["watchlist"]
     meta_df = wl["metadata"]
@@ -175,24 +278,33 @@ async def watchlist_view(watchlist_name: str = ""):
             entry["start_date"] = str(col.get("start_date", ""))
             entry["end_date"] = str(col.get("end_date", ""))
         rows.append(entry)
+    return rows
+
+
+@app.get("/watchlist_view")
+async def watchlist_view(watchlist_name: str = ""):
+    wl_dir = os.path.join(project_root, "User_Data", "Watchlists")
+    wl_xlsx = os.path.join(wl_dir, watchlist_name, watchlist_name + ".xlsx")
+
+    if not os.path.exists(wl_xlsx):
+        return JSONResponse({"error": f"Watchlist '{watchlist_name}' not found at {wl_xlsx}"}, status_code=404)
 
+    # Keyed on the file's mtime so the Excel file is only re-read after the watchlist is saved again.
+    stat = os.stat(wl_xlsx)
+    rows = await response_cache.fetch(("watchlist_view", wl_xlsx, stat.st_mtime_ns, stat.st_size),
+                                      lambda: _watchlist_rows(watchlist_name, wl_xlsx), ttl=float("inf"))
     return JSONResponse(rows)
 
 
-@app.get("/backtest_sma")
-async def backtest_sma(symbol: str = "SPY", fast: int = 10, slow: int = 50,
-                       start_date: str = "2015-01-01"):
-    try:
-        import vectorbt as vbt
-    except ImportError:
-        return JSONResponse({"error": "vectorbt not installed. Run: pip install vectorbt"}, status_code=500)
+def _backtest_sma(symbol: str, fast: int, slow: int, start_date: str):
+    import vectorbt as vbt
 
     # Pull price data via yfinance through Pull_Data
     ds = Pull_Data.dataset()
     ds.get_data(source="yfinance", data_code=symbol, start_date=start_date)
     close = ds.data.dropna()
     if close.empty:
-        return JSONResponse({"error": f"No price data returned for {symbol}"}, status_code=404)
+        return None
 
     fast_ma = vbt.MA.run(close, window=fast)
     slow_ma = vbt.MA.run(close, window=slow)
@@ -208,4 +320,19 @@ async def backtest_sma(symbol: str = "SPY", fast: int = 10, slow: int = 50,
     equity = pf.value()
     eq_records = _series_to_records(equity, value_col="equity")
 
-    return JSONResponse({"stats": clean_stats, "equity_curve": eq_records})
+    return {"stats": clean_stats, "equity_curve": eq_records}
+
+
+@app.get("/backtest_sma")
+async def backtest_sma(symbol: str = "SPY", fast: int = 10, slow: int = 50,
+                       start_date: str = "2015-01-01"):
+    try:
+        import vectorbt as vbt
+    except ImportError:
+        return JSONResponse({"error": "vectorbt not installed. Run: pip install vectorbt"}, status_code=500)
+
+    result = await response_cache.fetch(("backtest_sma", symbol, fast, slow, start_date),
+                                        lambda: _backtest_sma(symbol, fast, slow, start_date))
+    if result is None:
+        return JSONResponse({"error": f"No price data returned for {symbol}"}, status_code=404)
+    return JSONResponse(result)